@@ -9,6 +9,9 @@ Usage:
     python benchmark_parameter_operations.py --config config.yaml
     python benchmark_parameter_operations.py --config config.yaml --benchmark all --iterations 1000
     python benchmark_parameter_operations.py --config config.yaml --benchmark handler-selection --output results.json
+
+For end-to-end tool benchmarks that need no live Checkmk server, see
+``python -m benchmarks.e2e``.
 """
 
 import asyncio
@@ -22,22 +25,24 @@ from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 import multiprocessing
+import platform
 
 from checkmk_mcp_server.services.parameter_service import ParameterService
 from checkmk_mcp_server.services.handlers import get_handler_registry
 from checkmk_mcp_server.api_client import CheckmkClient
-from checkmk_mcp_server.config import Config
+from checkmk_mcp_server.async_api_client import AsyncCheckmkClient
+from checkmk_mcp_server.config import AppConfig, load_config
 from checkmk_mcp_server.mcp_server.server import CheckmkMCPServer
 
 
 class ParameterBenchmark:
     """Comprehensive benchmarking for parameter operations."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: AppConfig):
         self.config = config
-        self.client = CheckmkClient(config.checkmk)
+        self.client = AsyncCheckmkClient(CheckmkClient(config.checkmk))
         self.parameter_service = ParameterService(self.client, config)
-        self.mcp_server = CheckmkMCPServer(self.client, config)
+        self.mcp_server = CheckmkMCPServer(config)
         self.handler_registry = get_handler_registry()
         
         self.benchmark_results = {
@@ -51,8 +56,8 @@ class ParameterBenchmark:
         return {
             "cpu_count": multiprocessing.cpu_count(),
             "memory_total_gb": psutil.virtual_memory().total / (1024**3),
-            "python_version": f"{psutil.PYTHON}",
-            "platform": psutil.PLATFORM
+            "python_version": platform.python_version(),
+            "platform": platform.platform()
         }
     
     def _measure_performance(self, func, *args, iterations: int = 100, warmup: int = 10) -> Dict[str, Any]:
@@ -308,6 +313,7 @@ class ParameterBenchmark:
     async def benchmark_mcp_tools(self, iterations: int = 200, concurrent: int = 5) -> Dict[str, Any]:
         """Benchmark MCP tool performance."""
         print(f"🌐 Benchmarking MCP tools ({iterations} iterations, {concurrent} concurrent)...")
+        await self.mcp_server.initialize()
         
         mcp_test_cases = [
             {
@@ -342,9 +348,10 @@ class ParameterBenchmark:
         
         for test_case in mcp_test_cases:
             async def call_mcp_tool():
-                return await self.mcp_server.call_tool(
-                    test_case["tool_name"], 
-                    test_case["arguments"]
+                return await self.mcp_server.tool_registry.execute_tool_call(
+                    test_case["tool_name"],
+                    test_case["arguments"],
+                    lambda: True,
                 )
             
             tool_results = await self._measure_async_performance(
@@ -611,7 +618,7 @@ async def main():
     args = parser.parse_args()
     
     # Load configuration
-    config = Config.from_file(args.config)
+    config = load_config(args.config)
     
     # Initialize benchmark
     benchmark = ParameterBenchmark(config)
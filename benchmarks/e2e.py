@@ -0,0 +1,558 @@
+"""End-to-end MCP tool benchmarks against a synthetic Checkmk site.
+
+Each scenario runs a tool (or service operation) through the full server
+stack - tool registry, services, async client, REST client and HTTP - against
+a local ``FakeCheckmkServer``, so results are reproducible without a live
+site. Per scenario the suite records sequential latency percentiles,
+throughput at a fixed concurrency, REST requests and bytes per call, and peak
+RSS. Results are written as JSON and can be compared between runs.
+
+Usage:
+    python -m benchmarks.e2e --hosts 1000 --services-per-host 20 --output run.json
+    python -m benchmarks.e2e --scenario list_hosts --latency-ms 20 --concurrency 16
+    python -m benchmarks.e2e --compare baseline.json run.json
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from checkmk_mcp_server.config import (
+    AppConfig,
+    BatchConfig,
+    CheckmkConfig,
+    LLMConfig,
+    SlowCallConfig,
+)
+from checkmk_mcp_server.mcp_server.server import CheckmkMCPServer
+
+from .fake_checkmk import (
+    FakeCheckmkServer,
+    Inventory,
+    InventorySpec,
+    add_inventory_arguments,
+    inventory_spec_from_args,
+)
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - resource fallback below
+    psutil = None
+
+# Bulk parameter scenario size (operations per call)
+BULK_OPERATIONS = 10
+
+# Metrics compared between runs; "higher" marks metrics where bigger is better
+COMPARED_METRICS = {
+    "latency_ms.p50": "lower",
+    "latency_ms.p95": "lower",
+    "latency_ms.p99": "lower",
+    "throughput.calls_per_second": "higher",
+    "peak_rss_mb": "lower",
+}
+
+
+class Scenario:
+    """A benchmarked operation and how to call it."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        call: Callable[[CheckmkMCPServer, Inventory, int], Awaitable[Dict[str, Any]]],
+    ):
+        """
+        Initialize scenario.
+
+        Args:
+            name: Scenario name
+            description: What the scenario measures
+            call: Coroutine function (server, inventory, iteration) returning
+                a dict with ``success`` and ``response_bytes``
+        """
+        self.name = name
+        self.description = description
+        self.call = call
+
+
+def _tool_call(
+    tool: str, arguments: Callable[[Inventory, int], Dict[str, Any]]
+) -> Callable[[CheckmkMCPServer, Inventory, int], Awaitable[Dict[str, Any]]]:
+    async def call(server: CheckmkMCPServer, inventory: Inventory, iteration: int):
+        raw = await server.tool_registry.execute_tool_call(
+            tool, arguments(inventory, iteration), lambda: True
+        )
+        text = raw["content"][0]["text"]
+        success = not raw["isError"]
+        if success:
+            try:
+                success = json.loads(text).get("success") is not False
+            except (ValueError, AttributeError):
+                pass
+        return {"success": success, "response_bytes": len(text.encode("utf-8"))}
+
+    return call
+
+
+def effective_parameters_args(inventory: Inventory, iteration: int) -> Dict[str, Any]:
+    """Arguments for ``get_effective_parameters`` rotating over services."""
+    host_name, service_name = inventory.sample_service(iteration)
+    return {"host_name": host_name, "service_name": service_name}
+
+
+async def _bulk_set_parameters(
+    server: CheckmkMCPServer, inventory: Inventory, iteration: int
+) -> Dict[str, Any]:
+    operations = []
+    for offset in range(BULK_OPERATIONS):
+        host_name = inventory.host_names[
+            (iteration * BULK_OPERATIONS + offset) % len(inventory.host_names)
+        ]
+        operations.append(
+            {
+                "host_name": host_name,
+                "service_name": "CPU load",
+                "parameters": {"levels": (4.0, 8.0)},
+            }
+        )
+    result = await server.parameter_service.set_bulk_parameters(operations)
+    success = result.success and result.data.failed_operations == 0
+    return {
+        "success": success,
+        "response_bytes": len(result.model_dump_json().encode("utf-8")),
+    }
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario(
+            "list_hosts",
+            "list_hosts tool over all host configs",
+            _tool_call("list_hosts", lambda inventory, i: {}),
+        ),
+        Scenario(
+            "get_health_dashboard",
+            "get_health_dashboard tool",
+            _tool_call("get_health_dashboard", lambda inventory, i: {}),
+        ),
+        Scenario(
+            "list_all_services",
+            "list_all_services tool over every service",
+            _tool_call("list_all_services", lambda inventory, i: {}),
+        ),
+        Scenario(
+            "get_effective_parameters",
+            "get_effective_parameters tool, rotating hosts and services",
+            _tool_call("get_effective_parameters", effective_parameters_args),
+        ),
+        Scenario(
+            "set_bulk_parameters",
+            f"ParameterService.set_bulk_parameters with {BULK_OPERATIONS} operations",
+            _bulk_set_parameters,
+        ),
+    ]
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Percentile with linear interpolation between closest ranks.
+
+    Args:
+        values: Samples (need not be sorted)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float: Interpolated percentile (0.0 for no samples)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_latencies(seconds: List[float]) -> Dict[str, float]:
+    """Latency statistics in milliseconds."""
+    if not seconds:
+        return {"count": 0}
+    ms = [s * 1000 for s in seconds]
+    return {
+        "count": len(ms),
+        "mean": round(sum(ms) / len(ms), 3),
+        "min": round(min(ms), 3),
+        "p50": round(percentile(ms, 50), 3),
+        "p95": round(percentile(ms, 95), 3),
+        "p99": round(percentile(ms, 99), 3),
+        "max": round(max(ms), 3),
+    }
+
+
+class PeakRSSSampler:
+    """Samples resident set size in a background thread while active.
+
+    Without psutil the process-lifetime peak from ``resource`` is reported,
+    which can only grow between scenarios.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """
+        Initialize sampler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def current_rss() -> int:
+        """Current (psutil) or peak (resource) RSS in bytes."""
+        if psutil is not None:
+            return psutil.Process().memory_info().rss
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, self.current_rss())
+
+    def __enter__(self) -> "PeakRSSSampler":
+        self.peak_bytes = self.current_rss()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self.current_rss())
+
+
+def build_config(fake: FakeCheckmkServer, work_dir: Path) -> AppConfig:
+    """
+    Application config pointing at the fake server.
+
+    State the server writes (job journals, slow call log) goes to ``work_dir``
+    so benchmark runs never touch the user's ``~/.checkmk_mcp``.
+
+    Args:
+        fake: Running fake server
+        work_dir: Directory for files written during the run
+
+    Returns:
+        AppConfig: Configuration for ``CheckmkMCPServer``
+    """
+    return AppConfig(
+        checkmk=CheckmkConfig(
+            server_url=fake.url,
+            username="automation",
+            password="benchmark",
+            site=fake.site,
+            max_retries=0,
+        ),
+        llm=LLMConfig(),
+        batch=BatchConfig(jobs_dir=str(work_dir / "jobs")),
+        slow_calls=SlowCallConfig(path=str(work_dir / "slow_calls.jsonl")),
+    )
+
+
+async def run_scenario(
+    server: CheckmkMCPServer,
+    fake: FakeCheckmkServer,
+    scenario: Scenario,
+    iterations: int = 20,
+    warmup: int = 2,
+    concurrency: int = 8,
+) -> Dict[str, Any]:
+    """
+    Benchmark one scenario.
+
+    Args:
+        server: Initialized MCP server
+        fake: Fake Checkmk server the MCP server talks to
+        scenario: Scenario to run
+        iterations: Measured calls, both sequentially and concurrently
+        warmup: Unmeasured calls before measuring
+        concurrency: Calls in flight during the throughput phase
+
+    Returns:
+        Dict: Latency, throughput, REST traffic and memory results
+    """
+    inventory = fake.inventory
+    for iteration in range(warmup):
+        await scenario.call(server, inventory, iteration)
+
+    gc.collect()
+    fake.reset_stats()
+    latencies: List[float] = []
+    failures = 0
+    response_bytes = 0
+    with PeakRSSSampler() as rss:
+        for iteration in range(iterations):
+            started = time.perf_counter()
+            outcome = await scenario.call(server, inventory, iteration)
+            latencies.append(time.perf_counter() - started)
+            failures += not outcome["success"]
+            response_bytes += outcome["response_bytes"]
+        traffic = fake.get_stats()
+
+        semaphore = asyncio.Semaphore(concurrency)
+        concurrent_latencies: List[float] = []
+
+        async def bounded(iteration: int) -> None:
+            nonlocal failures
+            async with semaphore:
+                started = time.perf_counter()
+                outcome = await scenario.call(server, inventory, iteration)
+                concurrent_latencies.append(time.perf_counter() - started)
+                failures += not outcome["success"]
+
+        started = time.perf_counter()
+        await asyncio.gather(*(bounded(i) for i in range(iterations)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "description": scenario.description,
+        "iterations": iterations,
+        "failures": failures,
+        "latency_ms": summarize_latencies(latencies),
+        "throughput": {
+            "concurrency": concurrency,
+            "calls": iterations,
+            "seconds": round(elapsed, 3),
+            "calls_per_second": round(iterations / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": summarize_latencies(concurrent_latencies),
+        },
+        "response_bytes_per_call": response_bytes // max(iterations, 1),
+        "rest_requests_per_call": round(traffic["requests"] / max(iterations, 1), 2),
+        "rest_bytes_per_call": traffic["bytes_sent"] // max(iterations, 1),
+        "rest_routes": traffic["routes"],
+        "peak_rss_mb": round(rss.peak_bytes / (1024 * 1024), 2),
+    }
+
+
+async def run_suite(
+    spec: InventorySpec,
+    scenario_names: Optional[List[str]] = None,
+    iterations: int = 20,
+    warmup: int = 2,
+    concurrency: int = 8,
+    work_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    Run scenarios against a fresh fake Checkmk server.
+
+    Args:
+        spec: Synthetic inventory to serve
+        scenario_names: Scenarios to run (all by default)
+        iterations: Measured calls per scenario and phase
+        warmup: Unmeasured calls per scenario
+        concurrency: Calls in flight during the throughput phase
+        work_dir: Directory for server state (a temporary one by default)
+
+    Returns:
+        Dict: Run metadata and per-scenario results
+    """
+    names = scenario_names or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory(prefix="checkmk-bench-") as tmp:
+        work_path = Path(work_dir or tmp)
+        with FakeCheckmkServer(spec) as fake:
+            server = CheckmkMCPServer(build_config(fake, work_path))
+            await server.initialize()
+            results: Dict[str, Any] = {}
+            try:
+                for name in names:
+                    results[name] = await run_scenario(
+                        server,
+                        fake,
+                        SCENARIOS[name],
+                        iterations=iterations,
+                        warmup=warmup,
+                        concurrency=concurrency,
+                    )
+            finally:
+                await server.shutdown()
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "system": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "inventory": spec.model_dump(),
+        "settings": {
+            "iterations": iterations,
+            "warmup": warmup,
+            "concurrency": concurrency,
+        },
+        "scenarios": results,
+    }
+
+
+def _metric(result: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = result
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    metrics: Optional[Dict[str, str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare two suite results scenario by scenario.
+
+    Args:
+        baseline: Earlier ``run_suite`` output
+        current: Later ``run_suite`` output
+        metrics: Dotted metric paths and whether ``"lower"`` or ``"higher"``
+            is better (defaults to ``COMPARED_METRICS``)
+
+    Returns:
+        Dict: Per scenario and metric, both values, the relative change and
+        whether the change is an improvement
+    """
+    comparison: Dict[str, Dict[str, Any]] = {}
+    for name, result in current.get("scenarios", {}).items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        changes = {}
+        for path, better in (metrics or COMPARED_METRICS).items():
+            old, new = _metric(before, path), _metric(result, path)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else 0.0
+            changes[path] = {
+                "baseline": old,
+                "current": new,
+                "change": round(change, 4),
+                "improved": change < 0 if better == "lower" else change > 0,
+            }
+        comparison[name] = changes
+    return comparison
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    """Print a one-line summary per scenario."""
+    inventory = results["inventory"]
+    print(
+        f"Inventory: {inventory['hosts']} hosts x {inventory['services_per_host']} "
+        f"services, {inventory['rules_per_ruleset']} rules/ruleset, "
+        f"latency {inventory['latency'] * 1000:.0f}ms"
+    )
+    for name, result in results["scenarios"].items():
+        latency = result["latency_ms"]
+        print(
+            f"  {name:<26} p50 {latency['p50']:>9.1f}ms  p95 {latency['p95']:>9.1f}ms  "
+            f"p99 {latency['p99']:>9.1f}ms  "
+            f"{result['throughput']['calls_per_second']:>8.1f} calls/s  "
+            f"{result['rest_requests_per_call']:>6.1f} req/call  "
+            f"peak {result['peak_rss_mb']:.0f}MB"
+            + (f"  {result['failures']} failed" if result["failures"] else "")
+        )
+
+
+def print_comparison(comparison: Dict[str, Dict[str, Any]]) -> None:
+    """Print metric changes between two runs."""
+    for name, metrics in comparison.items():
+        print(f"  {name}")
+        for path, values in metrics.items():
+            marker = "better" if values["improved"] else "worse"
+            if values["change"] == 0:
+                marker = "same"
+            print(
+                f"    {path:<28} {values['baseline']:>10} -> {values['current']:>10} "
+                f"({values['change']:+.1%}, {marker})"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="End-to-end MCP tool benchmarks against a synthetic Checkmk site"
+    )
+    add_inventory_arguments(parser)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run (repeatable, default all)",
+    )
+    parser.add_argument("--iterations", type=int, default=20, help="Calls per phase")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured calls")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Calls in flight for throughput"
+    )
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        help="Compare two result files instead of running",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        comparison = compare_results(baseline, current)
+        print_comparison(comparison)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(comparison, f, indent=2)
+        return 0
+
+    # Tool calls log every request at INFO; keep the benchmark output readable
+    logging.basicConfig(level=logging.WARNING)
+    spec = inventory_spec_from_args(args)
+    results = asyncio.run(
+        run_suite(
+            spec,
+            args.scenario,
+            iterations=args.iterations,
+            warmup=args.warmup,
+            concurrency=args.concurrency,
+        )
+    )
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,820 @@
+"""Synthetic Checkmk REST API server for offline benchmarks.
+
+The server answers the REST endpoints the MCP tools use with generated
+inventories shaped like real Checkmk 2.4 responses: host configs, services
+with monitoring columns, service discovery check tables, parameter rules and
+Event Console events. Every response can be delayed to model network and
+server latency, so benchmarks can run end to end without a live site.
+
+Example:
+    with FakeCheckmkServer(InventorySpec(hosts=500, services_per_host=20)) as fake:
+        config = CheckmkConfig(server_url=fake.url, site=fake.site, ...)
+
+The server can also run on its own, so it does not share a process (and the
+GIL) with the code under test; it prints its URL on the first stdout line:
+    python -m benchmarks.fake_checkmk --hosts 500 --latency-ms 20
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from pydantic import BaseModel, Field
+
+
+# (service description, check plugin, parameter ruleset); descriptions with
+# "{n}" are repeated with a counter to reach the requested services per host
+SERVICE_TEMPLATES: List[Tuple[str, str, Optional[str]]] = [
+    ("CPU load", "cpu_loads", "cpu_load"),
+    ("CPU utilization", "kernel_util", "cpu_utilization"),
+    ("Memory", "mem_linux", "memory_linux"),
+    ("Uptime", "uptime", "uptime"),
+    ("TCP Connections", "tcp_conn_stats", "tcp_conn_stats"),
+    ("Disk IO SUMMARY", "diskstat", "disk_io"),
+    ("Check_MK", "check_mk", None),
+    ("Filesystem /data{n}", "df", "filesystem"),
+    ("Interface eth{n}", "if64", "if"),
+    ("Temperature Zone {n}", "lnx_thermal", "temperature"),
+]
+
+STATE_NAMES = {0: "ok", 1: "warning", 2: "critical", 3: "unknown"}
+
+DEFAULT_SERVICE_COLUMNS = ["host_name", "description"]
+
+
+class InventorySpec(BaseModel):
+    """Size and behaviour of a synthetic Checkmk site."""
+
+    hosts: int = Field(default=100, description="Number of hosts")
+    services_per_host: int = Field(default=20, description="Services per host")
+    rules_per_ruleset: int = Field(
+        default=10, description="Parameter rules per ruleset"
+    )
+    events: int = Field(default=200, description="Event Console events")
+    folders: int = Field(default=5, description="Folders hosts are spread over")
+    problem_ratio: float = Field(
+        default=0.05, description="Share of services not in OK state"
+    )
+    latency: float = Field(default=0.0, description="Delay per response in seconds")
+    latency_jitter: float = Field(
+        default=0.0, description="Random extra delay per response in seconds"
+    )
+    seed: int = Field(default=42, description="Random seed for generated data")
+
+
+class Inventory:
+    """Generated hosts, services, rules and events for a synthetic site."""
+
+    def __init__(self, spec: InventorySpec, site: str = "bench"):
+        """
+        Generate an inventory.
+
+        Args:
+            spec: Inventory size and behaviour
+            site: Site name reported in responses
+        """
+        self.spec = spec
+        self.site = site
+        self._random = random.Random(spec.seed)
+        self._lock = threading.Lock()
+        self.hosts: Dict[str, Dict[str, Any]] = {}
+        self.services: List[Dict[str, Any]] = []
+        self.services_by_host: Dict[str, List[Dict[str, Any]]] = {}
+        self.rules: Dict[str, List[Dict[str, Any]]] = {}
+        self.events: List[Dict[str, Any]] = []
+
+        for index in range(spec.hosts):
+            self._add_host(f"host{index:05d}", f"/folder{index % max(spec.folders, 1)}")
+        self._generate_rules()
+        self._generate_events()
+
+    @property
+    def host_names(self) -> List[str]:
+        """Host names in creation order."""
+        return list(self.hosts)
+
+    @property
+    def rulesets(self) -> List[str]:
+        """Parameter rulesets with generated rules."""
+        return list(self.rules)
+
+    def service_names(self, host_name: str) -> List[str]:
+        """Service descriptions of a host."""
+        return [service["description"] for service in self.services_by_host[host_name]]
+
+    def sample_service(self, index: int) -> Tuple[str, str]:
+        """Host and service description for the ``index``-th call of a run.
+
+        Walks hosts and services in a fixed order, so runs with the same
+        inventory spec touch the same objects.
+        """
+        host_names = self.host_names
+        host_name = host_names[index % len(host_names)]
+        services = self.services_by_host[host_name]
+        return host_name, services[index % len(services)]["description"]
+
+    def _add_host(self, name: str, folder: str, attributes: Optional[Dict] = None):
+        index = len(self.hosts)
+        attributes = dict(attributes or {})
+        attributes.setdefault(
+            "ipaddress", f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}"
+        )
+        attributes.setdefault("alias", name.upper())
+        attributes.setdefault("tag_agent", "cmk-agent")
+        self.hosts[name] = {
+            "name": name,
+            "folder": folder,
+            "attributes": attributes,
+            "labels": {"cmk/os_family": "linux", "env": ("prod", "test")[index % 2]},
+        }
+        services = [
+            self._make_service(name, number)
+            for number in range(self.spec.services_per_host)
+        ]
+        self.services_by_host[name] = services
+        self.services.extend(services)
+
+    def _make_service(self, host_name: str, number: int) -> Dict[str, Any]:
+        fixed = [t for t in SERVICE_TEMPLATES if "{n}" not in t[0]]
+        repeated = [t for t in SERVICE_TEMPLATES if "{n}" in t[0]]
+        if number < len(fixed):
+            description, plugin, ruleset = fixed[number]
+            item = None
+        else:
+            offset = number - len(fixed)
+            template, plugin, ruleset = repeated[offset % len(repeated)]
+            description = template.format(n=offset // len(repeated))
+            item = description.split(" ", 1)[1]
+
+        state = 0
+        if self._random.random() < self.spec.problem_ratio:
+            state = self._random.choice([1, 2, 2, 3])
+        now = time.time()
+        return {
+            "host_name": host_name,
+            "description": description,
+            "check_plugin": plugin,
+            "ruleset": ruleset,
+            "item": item,
+            "state": state,
+            "state_type": 1,
+            "plugin_output": f"{STATE_NAMES[state].upper()} - {description}",
+            "perf_data": f"util={self._random.uniform(0, 100):.2f};80;90;0;100",
+            "last_check": int(now - self._random.uniform(0, 60)),
+            "last_state_change": int(now - self._random.uniform(60, 86400)),
+            "acknowledged": int(state != 0 and self._random.random() < 0.3),
+            "scheduled_downtime_depth": int(self._random.random() < 0.01),
+            "check_command": f"check_mk-{plugin}",
+            "current_attempt": 1,
+            "max_check_attempts": 1,
+            "has_been_checked": 1,
+            "is_flapping": 0,
+        }
+
+    def _generate_rules(self) -> None:
+        rulesets = sorted({t[2] for t in SERVICE_TEMPLATES if t[2]})
+        host_names = self.host_names
+        for short_name in rulesets:
+            ruleset = f"checkgroup_parameters:{short_name}"
+            self.rules[ruleset] = [
+                self._make_rule(ruleset, index, host_names)
+                for index in range(self.spec.rules_per_ruleset)
+            ]
+
+    def _make_rule(
+        self,
+        ruleset: str,
+        index: int,
+        host_names: List[str],
+        folder: Optional[str] = None,
+        value_raw: Optional[str] = None,
+        conditions: Optional[Dict[str, Any]] = None,
+        properties: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        if conditions is None:
+            conditions = {}
+            # Every third rule applies to all hosts, the others to a few hosts
+            if index % 3 and host_names:
+                conditions["host_name"] = {
+                    "match_on": self._random.sample(host_names, min(3, len(host_names))),
+                    "operator": "one_of",
+                }
+        rule_id = str(uuid.UUID(int=self._random.getrandbits(128)))
+        return {
+            "domainType": "rule",
+            "id": rule_id,
+            "title": f"Rule {index} in {ruleset}",
+            "links": [{"rel": "self", "href": f"/objects/rule/{rule_id}"}],
+            "extensions": {
+                "ruleset": ruleset,
+                "folder": folder or "/",
+                "folder_index": index,
+                "properties": properties
+                or {"disabled": False, "description": f"Generated rule {index}"},
+                "value_raw": value_raw
+                or repr({"levels": (80.0 + index % 10, 90.0 + index % 10)}),
+                "conditions": conditions,
+            },
+        }
+
+    def _generate_events(self) -> None:
+        host_names = self.host_names or ["unknown"]
+        now = datetime.now()
+        for index in range(self.spec.events):
+            state = self._random.choice(["ok", "warning", "critical", "unknown"])
+            first = now - timedelta(minutes=self._random.randint(1, 10000))
+            self.events.append(
+                {
+                    "domainType": "event_console",
+                    "id": str(index + 1),
+                    "title": f"Synthetic event {index + 1}",
+                    "extensions": {
+                        "site_id": self.site,
+                        "host": self._random.choice(host_names),
+                        "ipaddress": "",
+                        "application": self._random.choice(["sshd", "kernel", "cron"]),
+                        "text": f"Synthetic event {index + 1}",
+                        "state": state,
+                        "phase": self._random.choice(["open", "open", "ack"]),
+                        "first": first.isoformat(),
+                        "last": (first + timedelta(minutes=5)).isoformat(),
+                        "count": self._random.randint(1, 20),
+                        "comment": "",
+                        "contact": "",
+                        "facility": "kern",
+                        "priority": "notice",
+                        "rule_id": "synthetic",
+                    },
+                }
+            )
+
+    # Response builders
+
+    def host_config(self, name: str, effective: bool = False) -> Dict[str, Any]:
+        """Host config object as returned by /objects/host_config/{name}."""
+        host = self.hosts[name]
+        extensions = {
+            "folder": host["folder"],
+            "attributes": host["attributes"],
+            "effective_attributes": dict(host["attributes"], site=self.site)
+            if effective
+            else None,
+            "is_cluster": False,
+            "is_offline": False,
+            "cluster_nodes": None,
+        }
+        return {
+            "domainType": "host_config",
+            "id": name,
+            "title": name,
+            "links": [{"rel": "self", "href": f"/objects/host_config/{name}"}],
+            "members": {},
+            "extensions": extensions,
+        }
+
+    def service_objects(
+        self,
+        services: List[Dict[str, Any]],
+        columns: Optional[List[str]],
+        query: Any = None,
+    ) -> List[Dict[str, Any]]:
+        """Service objects with only the requested columns, filtered by query."""
+        columns = columns or DEFAULT_SERVICE_COLUMNS
+        if "host_name" not in columns:
+            columns = ["host_name", *columns]
+        if "description" not in columns:
+            columns = [*columns, "description"]
+        result = []
+        for service in services:
+            if query and not matches_query(service, query):
+                continue
+            result.append(
+                {
+                    "domainType": "service",
+                    "id": f"{service['host_name']}:{service['description']}",
+                    "title": service["description"],
+                    "links": [],
+                    "members": {},
+                    "extensions": {
+                        column: service.get(column) for column in columns
+                    },
+                }
+            )
+        return result
+
+    def discovery(self, host_name: str) -> Dict[str, Any]:
+        """Service discovery result with the host's check table."""
+        check_table = {}
+        for service in self.services_by_host[host_name]:
+            key = f"{service['check_plugin']}-{service['item'] or ''}"
+            check_table[key] = {
+                "domainType": "service_discovery",
+                "id": key,
+                "extensions": {
+                    "host_name": host_name,
+                    "check_plugin_name": service["check_plugin"],
+                    "service_name": service["description"],
+                    "service_item": service["item"],
+                    "service_phase": "monitored",
+                },
+            }
+        return {
+            "domainType": "service_discovery",
+            "id": f"service_discovery-{host_name}",
+            "extensions": {"check_table": check_table, "host_labels": {}},
+        }
+
+    def add_rule(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a rule created through the API."""
+        ruleset = body.get("ruleset", "unknown")
+        with self._lock:
+            rules = self.rules.setdefault(ruleset, [])
+            rule = self._make_rule(
+                ruleset,
+                len(rules),
+                [],
+                folder=body.get("folder"),
+                value_raw=body.get("value_raw"),
+                conditions=body.get("conditions") or {},
+                properties=body.get("properties"),
+            )
+            rules.append(rule)
+        return rule
+
+    def find_rule(self, rule_id: str) -> Optional[Dict[str, Any]]:
+        """Rule by ID from any ruleset."""
+        for rules in self.rules.values():
+            for rule in rules:
+                if rule["id"] == rule_id:
+                    return rule
+        return None
+
+    def delete_rule(self, rule_id: str) -> bool:
+        """Remove a rule; returns False if it does not exist."""
+        with self._lock:
+            for rules in self.rules.values():
+                for index, rule in enumerate(rules):
+                    if rule["id"] == rule_id:
+                        del rules[index]
+                        return True
+        return False
+
+    def add_hosts(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Store hosts created through the API."""
+        with self._lock:
+            created = []
+            for entry in entries:
+                name = entry.get("host_name") or entry.get("name")
+                self._add_host(name, entry.get("folder", "/"), entry.get("attributes"))
+                created.append(self.host_config(name))
+            return created
+
+
+_CMP_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    ">": lambda a, b: a > b,
+    "<=": lambda a, b: a <= b,
+    ">=": lambda a, b: a >= b,
+    "~": lambda a, b: re.search(str(b), str(a)) is not None,
+    "~~": lambda a, b: re.search(str(b), str(a), re.IGNORECASE) is not None,
+}
+
+
+def matches_query(row: Dict[str, Any], query: Any) -> bool:
+    """
+    Evaluate a Checkmk REST API query expression against a row.
+
+    Args:
+        row: Row values by column name
+        query: Query expression as a dict or JSON string
+
+    Returns:
+        bool: True if the row matches
+    """
+    if isinstance(query, str):
+        query = json.loads(query)
+    op = query.get("op")
+    if op == "and":
+        return all(matches_query(row, expr) for expr in query["expr"])
+    if op == "or":
+        return any(matches_query(row, expr) for expr in query["expr"])
+    if op == "not":
+        return not matches_query(row, query["expr"])
+
+    column = str(query.get("left", "")).split(".")[-1]
+    value = row.get(column)
+    right = query.get("right")
+    if isinstance(value, (int, float)) and not isinstance(right, (int, float)):
+        try:
+            right = type(value)(right)
+        except (TypeError, ValueError):
+            pass
+    compare = _CMP_OPS.get(op)
+    if compare is None:
+        raise ValueError(f"Unsupported query operator: {op}")
+    try:
+        return compare(value, right)
+    except TypeError:
+        return False
+
+
+class FakeCheckmkServer:
+    """Local HTTP server answering Checkmk REST API requests from an inventory."""
+
+    def __init__(
+        self,
+        spec: Optional[InventorySpec] = None,
+        site: str = "bench",
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize the fake server.
+
+        Args:
+            spec: Inventory size and behaviour
+            site: Site name used in the API base path
+            host: Bind address
+            port: Bind port (0 picks a free port)
+        """
+        self.spec = spec or InventorySpec()
+        self.site = site
+        self.inventory = Inventory(self.spec, site)
+        self.request_counts: Counter = Counter()
+        self.bytes_sent = 0
+        self._stats_lock = threading.Lock()
+        self._latency_random = random.Random(self.spec.seed)
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self._routes = self._build_routes()
+
+    @property
+    def url(self) -> str:
+        """Server URL to use as ``CheckmkConfig.server_url``."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_prefix(self) -> str:
+        """Path prefix of the REST API."""
+        return f"/{self.site}/check_mk/api/1.0"
+
+    def start(self) -> "FakeCheckmkServer":
+        """Start serving in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, name="fake-checkmk", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeCheckmkServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Request counts per route and bytes sent."""
+        with self._stats_lock:
+            return {
+                "requests": sum(self.request_counts.values()),
+                "bytes_sent": self.bytes_sent,
+                "routes": dict(self.request_counts),
+            }
+
+    def reset_stats(self) -> None:
+        """Clear request counters."""
+        with self._stats_lock:
+            self.request_counts.clear()
+            self.bytes_sent = 0
+
+    def delay(self) -> None:
+        """Sleep for the configured response latency."""
+        seconds = self.spec.latency
+        if self.spec.latency_jitter:
+            with self._stats_lock:
+                seconds += self._latency_random.uniform(0, self.spec.latency_jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _build_routes(self) -> List[Tuple[str, "re.Pattern", Callable]]:
+        routes = [
+            ("GET", "/version", self._version),
+            ("GET", "/domain-types/host_config/collections/all", self._list_host_configs),
+            ("POST", "/domain-types/host_config/collections/all", self._create_host),
+            ("GET", "/objects/host_config/{name}", self._get_host_config),
+            ("POST", "/domain-types/host_config/actions/bulk-create/invoke", self._bulk_create_hosts),
+            ("GET", "/domain-types/service/collections/all", self._list_services),
+            ("POST", "/domain-types/service/collections/all", self._list_services),
+            ("GET", "/objects/host/{name}/collections/services", self._list_host_services),
+            ("POST", "/objects/host/{name}/collections/services", self._list_host_services),
+            ("GET", "/objects/service_discovery/{name}", self._service_discovery),
+            ("GET", "/domain-types/ruleset/collections/all", self._list_rulesets),
+            ("GET", "/objects/ruleset/{name}", self._get_ruleset),
+            ("GET", "/domain-types/rule/collections/all", self._list_rules),
+            ("POST", "/domain-types/rule/collections/all", self._create_rule),
+            ("GET", "/objects/rule/{name}", self._get_rule),
+            ("PUT", "/objects/rule/{name}", self._update_rule),
+            ("DELETE", "/objects/rule/{name}", self._delete_rule),
+            ("POST", "/domain-types/activation_run/actions/activate-changes/invoke", self._activate_changes),
+            ("GET", "/domain-types/event_console/collections/all", self._list_events),
+        ]
+        compiled = []
+        for method, template, handler in routes:
+            pattern = re.escape(template).replace(r"\{name\}", r"(?P<name>[^/]+)")
+            compiled.append((method, re.compile(f"^{pattern}$"), handler, template))
+        return compiled
+
+    def dispatch(
+        self, method: str, path: str, query: Dict[str, str], body: Any
+    ) -> Tuple[int, Any]:
+        """
+        Route a request to its handler.
+
+        Args:
+            method: HTTP method
+            path: Request path including the API prefix
+            query: Query string parameters
+            body: Parsed JSON body
+
+        Returns:
+            Tuple of HTTP status and JSON-serializable response
+        """
+        if not path.startswith(self.api_prefix):
+            return 404, _problem(404, "Not Found", f"Unknown site path: {path}")
+        endpoint = path[len(self.api_prefix):]
+        for route_method, pattern, handler, template in self._routes:
+            if route_method != method:
+                continue
+            match = pattern.match(endpoint)
+            if match:
+                with self._stats_lock:
+                    self.request_counts[f"{method} {template}"] += 1
+                kwargs = {k: unquote(v) for k, v in match.groupdict().items()}
+                return handler(query=query, body=body or {}, **kwargs)
+        with self._stats_lock:
+            self.request_counts[f"{method} <unrouted>"] += 1
+        return 404, _problem(404, "Not Found", f"No fake route for {method} {endpoint}")
+
+    # Route handlers
+
+    def _version(self, **_):
+        return 200, {
+            "site": self.site,
+            "group": "",
+            "rest_api": {"revision": "0"},
+            "versions": {"checkmk": "2.4.0p1", "python": "3.12.3"},
+            "edition": "cre",
+            "demo": False,
+        }
+
+    def _list_host_configs(self, query, **_):
+        effective = query.get("effective_attributes") == "true"
+        inventory = self.inventory
+        return 200, {
+            "domainType": "host_config",
+            "value": [inventory.host_config(name, effective) for name in list(inventory.hosts)],
+        }
+
+    def _get_host_config(self, query, name, **_):
+        if name not in self.inventory.hosts:
+            return 404, _problem(404, "Not Found", f"Host {name} not found")
+        return 200, self.inventory.host_config(
+            name, query.get("effective_attributes") == "true"
+        )
+
+    def _create_host(self, body, **_):
+        return 200, self.inventory.add_hosts([body])[0]
+
+    def _bulk_create_hosts(self, body, **_):
+        return 200, {"value": self.inventory.add_hosts(body.get("entries", []))}
+
+    def _list_services(self, query, body, **_):
+        request = dict(query)
+        request.update(body)
+        services = self.inventory.services
+        host_name = request.get("host_name")
+        if host_name:
+            services = self.inventory.services_by_host.get(host_name, [])
+        return 200, {
+            "domainType": "service",
+            "value": self.inventory.service_objects(
+                services, _as_list(request.get("columns")), request.get("query")
+            ),
+        }
+
+    def _list_host_services(self, query, body, name, **_):
+        if name not in self.inventory.hosts:
+            return 404, _problem(404, "Not Found", f"Host {name} not found")
+        request = dict(query)
+        request.update(body)
+        return 200, {
+            "domainType": "service",
+            "value": self.inventory.service_objects(
+                self.inventory.services_by_host[name],
+                _as_list(request.get("columns")),
+                request.get("query"),
+            ),
+        }
+
+    def _service_discovery(self, name, **_):
+        if name not in self.inventory.hosts:
+            return 404, _problem(404, "Not Found", f"Host {name} not found")
+        return 200, self.inventory.discovery(name)
+
+    def _list_rulesets(self, **_):
+        return 200, {
+            "domainType": "ruleset",
+            "value": [
+                {
+                    "domainType": "ruleset",
+                    "id": ruleset,
+                    "title": ruleset.split(":")[-1].replace("_", " ").title(),
+                    "extensions": {"name": ruleset, "number_of_rules": len(rules)},
+                }
+                for ruleset, rules in self.inventory.rules.items()
+            ],
+        }
+
+    def _get_ruleset(self, name, **_):
+        rules = self.inventory.rules.get(name)
+        if rules is None:
+            return 404, _problem(404, "Not Found", f"Ruleset {name} not found")
+        return 200, {
+            "domainType": "ruleset",
+            "id": name,
+            "title": name,
+            "extensions": {"name": name, "number_of_rules": len(rules)},
+        }
+
+    def _list_rules(self, query, **_):
+        ruleset = query.get("ruleset_name")
+        if ruleset not in self.inventory.rules:
+            return 404, _problem(404, "Not Found", f"Ruleset {ruleset} not found")
+        return 200, {"domainType": "rule", "value": list(self.inventory.rules[ruleset])}
+
+    def _create_rule(self, body, **_):
+        return 200, self.inventory.add_rule(body)
+
+    def _get_rule(self, name, **_):
+        rule = self.inventory.find_rule(name)
+        if rule is None:
+            return 404, _problem(404, "Not Found", f"Rule {name} not found")
+        return 200, rule
+
+    def _update_rule(self, body, name, **_):
+        rule = self.inventory.find_rule(name)
+        if rule is None:
+            return 404, _problem(404, "Not Found", f"Rule {name} not found")
+        extensions = rule["extensions"]
+        for key in ("value_raw", "conditions"):
+            if key in body:
+                extensions[key] = body[key]
+        extensions["properties"].update(body.get("properties") or {})
+        return 200, rule
+
+    def _delete_rule(self, name, **_):
+        if not self.inventory.delete_rule(name):
+            return 404, _problem(404, "Not Found", f"Rule {name} not found")
+        return 204, None
+
+    def _activate_changes(self, **_):
+        return 200, {
+            "domainType": "activation_run",
+            "id": str(uuid.uuid4()),
+            "title": "Activation status: Complete.",
+            "extensions": {"sites": [self.site], "is_running": False},
+        }
+
+    def _list_events(self, query, **_):
+        events = self.inventory.events
+        for key in ("host", "application", "state", "phase"):
+            if query.get(key):
+                events = [e for e in events if e["extensions"][key] == query[key]]
+        return 200, {"domainType": "event_console", "value": events}
+
+
+def _as_list(value: Any) -> Optional[List[str]]:
+    if value is None or isinstance(value, list):
+        return value
+    return [value]
+
+
+def _problem(status: int, title: str, detail: str) -> Dict[str, Any]:
+    return {"status": status, "title": title, "detail": detail}
+
+
+def _make_handler(server: FakeCheckmkServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; without this, delayed ACKs
+        # add ~40ms to every keep-alive response
+        disable_nagle_algorithm = True
+
+        def _handle(self) -> None:
+            parsed = urlparse(self.path)
+            query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+            body = None
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                try:
+                    body = json.loads(self.rfile.read(length))
+                except ValueError:
+                    body = None
+            status, payload = server.dispatch(self.command, parsed.path, query, body)
+            encoded = b"" if status == 204 else json.dumps(payload).encode("utf-8")
+            server.delay()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+            with server._stats_lock:
+                server.bytes_sent += len(encoded)
+
+        do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    return Handler
+
+
+def add_inventory_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add command line options for an ``InventorySpec``."""
+    parser.add_argument("--hosts", type=int, default=200, help="Number of hosts")
+    parser.add_argument(
+        "--services-per-host", type=int, default=20, help="Services per host"
+    )
+    parser.add_argument(
+        "--rules-per-ruleset", type=int, default=20, help="Rules per parameter ruleset"
+    )
+    parser.add_argument("--events", type=int, default=500, help="Event Console events")
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="Delay per REST response"
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=0.0, help="Random extra delay per response"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Inventory random seed")
+
+
+def inventory_spec_from_args(args: argparse.Namespace) -> InventorySpec:
+    """Build an ``InventorySpec`` from parsed ``add_inventory_arguments`` options."""
+    return InventorySpec(
+        hosts=args.hosts,
+        services_per_host=args.services_per_host,
+        rules_per_ruleset=args.rules_per_ruleset,
+        events=args.events,
+        latency=args.latency_ms / 1000,
+        latency_jitter=args.jitter_ms / 1000,
+        seed=args.seed,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Serve a synthetic site until stdin closes or the process is interrupted."""
+    parser = argparse.ArgumentParser(description="Synthetic Checkmk REST API server")
+    add_inventory_arguments(parser)
+    parser.add_argument("--site", default="bench", help="Site name")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=0, help="Port (0 picks one)")
+    args = parser.parse_args(argv)
+
+    fake = FakeCheckmkServer(
+        inventory_spec_from_args(args), site=args.site, host=args.host, port=args.port
+    )
+    with fake:
+        print(fake.url, flush=True)
+        try:
+            # The parent closes stdin (or exits) to stop the server
+            sys.stdin.read()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
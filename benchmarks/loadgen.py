@@ -0,0 +1,627 @@
+"""Concurrent MCP load generator over stdio.
+
+Starts the synthetic Checkmk server and the MCP server as separate
+subprocesses, connects an ``mcp`` client session over stdio, and drives a
+weighted mix of tool calls either at a fixed concurrency (closed loop) or at
+a fixed arrival rate (open loop). It reports per-tool latency percentiles and
+errors, and the server's event loop lag from ``get_server_metrics``.
+
+In rate mode latency is measured from each call's scheduled start, so a
+server that falls behind shows up as queueing delay instead of a lower
+request rate.
+
+The server command is configurable, so the same run can be repeated against
+other server builds or transports and compared with ``--compare``:
+
+    python -m benchmarks.loadgen --concurrency 32 --duration 30 --output a.json
+    python -m benchmarks.loadgen --rate 50 --mix list_hosts=1,get_host=4
+    python -m benchmarks.loadgen --server-command "python my_server.py --config {config}"
+    python -m benchmarks.loadgen --compare a.json b.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from .e2e import (
+    compare_results,
+    effective_parameters_args,
+    print_comparison,
+    summarize_latencies,
+)
+from .fake_checkmk import (
+    Inventory,
+    InventorySpec,
+    add_inventory_arguments,
+    inventory_spec_from_args,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MIX = (
+    "list_hosts=2,get_host=3,list_host_services=3,get_effective_parameters=3,"
+    "list_all_services=1,get_health_dashboard=1"
+)
+
+# Arguments per tool for the i-th call; tools not listed are called without
+TOOL_ARGUMENTS: Dict[str, Callable[[Inventory, int], Dict[str, Any]]] = {
+    "get_host": lambda inventory, i: {
+        "name": inventory.sample_service(i)[0],
+        "include_status": False,
+    },
+    "list_host_services": lambda inventory, i: {
+        "host_name": inventory.sample_service(i)[0]
+    },
+    "list_host_events": lambda inventory, i: {
+        "host_name": inventory.sample_service(i)[0]
+    },
+    "get_effective_parameters": effective_parameters_args,
+}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Parse a tool mix such as ``"list_hosts=2,get_host=3"``.
+
+    Args:
+        mix: Comma separated ``tool=weight`` pairs (weight defaults to 1)
+
+    Returns:
+        Dict: Weight per tool
+    """
+    weights: Dict[str, float] = {}
+    for entry in mix.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        tool, _, weight = entry.partition("=")
+        value = float(weight) if weight else 1.0
+        if value <= 0:
+            raise ValueError(f"Tool weight must be positive: {entry}")
+        weights[tool.strip()] = value
+    if not weights:
+        raise ValueError("Tool mix is empty")
+    return weights
+
+
+class ToolSampler:
+    """Picks tools by weight and builds their arguments."""
+
+    def __init__(self, weights: Dict[str, float], inventory: Inventory, seed: int = 0):
+        """
+        Initialize sampler.
+
+        Args:
+            weights: Weight per tool
+            inventory: Inventory the fake server serves (same spec and seed)
+            seed: Random seed for the call sequence
+        """
+        self.tools = list(weights)
+        self.weights = list(weights.values())
+        self.inventory = inventory
+        self._random = random.Random(seed)
+        self._counter = 0
+
+    def next_call(self) -> tuple:
+        """Next (tool, arguments) pair."""
+        tool = self._random.choices(self.tools, self.weights)[0]
+        index = self._counter
+        self._counter += 1
+        build = TOOL_ARGUMENTS.get(tool)
+        return tool, build(self.inventory, index) if build else {}
+
+
+class LoadResults:
+    """Latency samples and errors per tool."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, tool: str, seconds: float, error: Optional[str]) -> None:
+        """Record one finished call."""
+        self.latencies[tool].append(seconds)
+        if error:
+            self.errors[tool][error] += 1
+
+    @property
+    def calls(self) -> int:
+        """Number of finished calls."""
+        return sum(len(samples) for samples in self.latencies.values())
+
+    @property
+    def error_count(self) -> int:
+        """Number of failed calls."""
+        return sum(sum(kinds.values()) for kinds in self.errors.values())
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-tool call counts, errors and latency percentiles."""
+        return {
+            tool: {
+                "calls": len(samples),
+                "errors": sum(self.errors[tool].values()),
+                "error_kinds": dict(self.errors[tool]),
+                "latency_ms": summarize_latencies(samples),
+            }
+            for tool, samples in sorted(self.latencies.items())
+        }
+
+
+def tool_payload(result: Any) -> Any:
+    """
+    Decoded JSON payload of a ``CallToolResult``.
+
+    The server returns the raw result dict from its call_tool handler, which
+    the MCP framework wraps as text, so the tool's own JSON may sit one
+    ``content[0].text`` level deeper.
+    """
+    for content in result.content:
+        text = getattr(content, "text", None)
+        if text is None:
+            continue
+        try:
+            payload = json.loads(text)
+        except ValueError:
+            return None
+        while isinstance(payload, dict) and isinstance(payload.get("content"), list):
+            if payload.get("isError"):
+                return {"success": False, "isError": True}
+            inner = payload["content"][0].get("text") if payload["content"] else None
+            try:
+                payload = json.loads(inner) if inner is not None else None
+            except ValueError:
+                return None
+        return payload
+    return None
+
+
+def classify_result(result: Any) -> Optional[str]:
+    """
+    Error kind of a ``CallToolResult``, or None for success.
+
+    Tool errors come back as ``isError`` results; handler failures are
+    successful MCP calls whose JSON payload has ``"success": false``.
+    """
+    if result.isError:
+        return "tool_error"
+    payload = tool_payload(result)
+    if isinstance(payload, dict) and payload.get("success") is False:
+        return "tool_error" if payload.get("isError") else "failed"
+    return None
+
+
+async def _timed_call(
+    session: ClientSession,
+    tool: str,
+    arguments: Dict[str, Any],
+    results: LoadResults,
+    started: float,
+    timeout: float,
+) -> None:
+    error: Optional[str] = None
+    try:
+        result = await asyncio.wait_for(session.call_tool(tool, arguments), timeout)
+        error = classify_result(result)
+    except asyncio.TimeoutError:
+        error = "timeout"
+    except Exception as e:
+        error = type(e).__name__
+    results.record(tool, time.perf_counter() - started, error)
+
+
+async def run_closed_loop(
+    session: ClientSession,
+    sampler: ToolSampler,
+    concurrency: int,
+    duration: float,
+    max_calls: Optional[int] = None,
+    timeout: float = 60.0,
+) -> LoadResults:
+    """
+    Keep ``concurrency`` calls in flight until the duration or call budget ends.
+
+    Args:
+        session: Initialized client session
+        sampler: Tool and argument source
+        concurrency: Calls in flight
+        duration: Seconds to generate load
+        max_calls: Optional total call budget
+        timeout: Per-call timeout in seconds
+
+    Returns:
+        LoadResults: Recorded samples
+    """
+    results = LoadResults()
+    deadline = time.perf_counter() + duration
+    issued = 0
+
+    async def worker() -> None:
+        nonlocal issued
+        while time.perf_counter() < deadline and (max_calls is None or issued < max_calls):
+            issued += 1
+            tool, arguments = sampler.next_call()
+            await _timed_call(
+                session, tool, arguments, results, time.perf_counter(), timeout
+            )
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
+
+
+async def run_open_loop(
+    session: ClientSession,
+    sampler: ToolSampler,
+    rate: float,
+    duration: float,
+    timeout: float = 60.0,
+) -> LoadResults:
+    """
+    Start calls at a fixed rate regardless of how many are still in flight.
+
+    Args:
+        session: Initialized client session
+        sampler: Tool and argument source
+        rate: Calls started per second
+        duration: Seconds to generate load
+        timeout: Per-call timeout in seconds
+
+    Returns:
+        LoadResults: Recorded samples, timed from each call's scheduled start
+    """
+    results = LoadResults()
+    tasks = []
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    for index in range(max(int(rate * duration), 1)):
+        scheduled = start + index * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tool, arguments = sampler.next_call()
+        tasks.append(
+            asyncio.create_task(
+                _timed_call(session, tool, arguments, results, scheduled, timeout)
+            )
+        )
+    await asyncio.gather(*tasks)
+    return results
+
+
+class FakeServerProcess:
+    """Runs ``benchmarks.fake_checkmk`` in a subprocess."""
+
+    def __init__(self, spec: InventorySpec, site: str = "bench"):
+        """
+        Initialize process wrapper.
+
+        Args:
+            spec: Inventory to serve
+            site: Site name
+        """
+        self.spec = spec
+        self.site = site
+        self.url: Optional[str] = None
+        self._process: Optional[subprocess.Popen] = None
+
+    def start(self) -> "FakeServerProcess":
+        """Start the server and wait for its URL."""
+        spec = self.spec
+        command = [
+            sys.executable,
+            "-m",
+            "benchmarks.fake_checkmk",
+            "--site", self.site,
+            "--hosts", str(spec.hosts),
+            "--services-per-host", str(spec.services_per_host),
+            "--rules-per-ruleset", str(spec.rules_per_ruleset),
+            "--events", str(spec.events),
+            "--latency-ms", str(spec.latency * 1000),
+            "--jitter-ms", str(spec.latency_jitter * 1000),
+            "--seed", str(spec.seed),
+        ]  # fmt: skip
+        self._process = subprocess.Popen(
+            command,
+            cwd=PROJECT_ROOT,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.url = self._process.stdout.readline().strip()
+        if not self.url.startswith("http"):
+            self.stop()
+            raise RuntimeError("Fake Checkmk server did not start")
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._process.stdout.close()
+        self._process = None
+
+    def __enter__(self) -> "FakeServerProcess":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def write_server_config(
+    url: str, site: str, work_dir: Path, loop_lag_interval: float = 0.05
+) -> Path:
+    """
+    Write an MCP server config file pointing at the fake server.
+
+    Args:
+        url: Fake server URL
+        site: Site name
+        work_dir: Directory for the config and files the server writes
+        loop_lag_interval: Seconds between event loop lag probes
+
+    Returns:
+        Path: JSON config file
+    """
+    config = {
+        "checkmk": {
+            "server_url": url,
+            "username": "automation",
+            "password": "benchmark",
+            "site": site,
+            "max_retries": 0,
+        },
+        "llm": {},
+        "batch": {"jobs_dir": str(work_dir / "jobs")},
+        "metrics": {"loop_lag_interval": loop_lag_interval},
+        "slow_calls": {"path": str(work_dir / "slow_calls.jsonl")},
+        "log_level": "WARNING",
+    }
+    path = work_dir / "config.json"
+    path.write_text(json.dumps(config, indent=2))
+    return path
+
+
+def default_server_command(config_path: Path) -> List[str]:
+    """Command that starts this repository's MCP server over stdio."""
+    return [
+        sys.executable,
+        str(PROJECT_ROOT / "mcp_checkmk_server.py"),
+        "--config",
+        str(config_path),
+        "--log-level",
+        "WARNING",
+    ]
+
+
+async def fetch_server_metrics(session: ClientSession) -> Dict[str, Any]:
+    """Event loop lag and executor stats reported by the server."""
+    try:
+        result = await session.call_tool("get_server_metrics", {})
+        data = (tool_payload(result) or {}).get("data", {})
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    server_metrics = data.get("server_metrics", {})
+    return {
+        "event_loop": server_metrics.get("event_loop", {}),
+        "event_loop_lag_ms": data.get("service_metrics", {})
+        .get("timing_stats", {})
+        .get("event_loop.lag", {}),
+        "executor": server_metrics.get("executor", {}),
+    }
+
+
+async def run_loadgen(
+    spec: InventorySpec,
+    mix: Dict[str, float],
+    concurrency: int = 8,
+    rate: Optional[float] = None,
+    duration: float = 10.0,
+    max_calls: Optional[int] = None,
+    warmup_calls: int = 5,
+    timeout: float = 60.0,
+    server_command: Optional[List[str]] = None,
+    label: Optional[str] = None,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Run one load test against a fresh fake site and MCP server.
+
+    Args:
+        spec: Synthetic inventory to serve
+        mix: Weight per tool
+        concurrency: Calls in flight (closed loop)
+        rate: Calls started per second; switches to open loop when set
+        duration: Seconds to generate load
+        max_calls: Optional total call budget (closed loop)
+        warmup_calls: Unmeasured calls before the run
+        timeout: Per-call timeout in seconds
+        server_command: Server command; ``{config}`` is replaced with the
+            generated config path (defaults to ``mcp_checkmk_server.py``)
+        label: Free-form name stored with the results
+        seed: Random seed for the call sequence
+
+    Returns:
+        Dict: Run metadata, totals, per-tool results and server metrics
+    """
+    inventory = Inventory(spec)
+    with tempfile.TemporaryDirectory(prefix="checkmk-loadgen-") as tmp:
+        work_dir = Path(tmp)
+        with FakeServerProcess(spec, inventory.site) as fake:
+            config_path = write_server_config(fake.url, inventory.site, work_dir)
+            if server_command:
+                command = [part.replace("{config}", str(config_path)) for part in server_command]
+            else:
+                command = default_server_command(config_path)
+            parameters = StdioServerParameters(
+                command=command[0],
+                args=command[1:],
+                cwd=str(PROJECT_ROOT),
+                env={**os.environ, "PYTHONUNBUFFERED": "1"},
+            )
+
+            with open(work_dir / "server.log", "w") as errlog:
+                async with AsyncExitStack() as stack:
+                    read, write = await stack.enter_async_context(
+                        stdio_client(parameters, errlog=errlog)
+                    )
+                    session = await stack.enter_async_context(ClientSession(read, write))
+                    await session.initialize()
+
+                    sampler = ToolSampler(mix, inventory, seed)
+                    for _ in range(warmup_calls):
+                        tool, arguments = sampler.next_call()
+                        await session.call_tool(tool, arguments)
+
+                    started = time.perf_counter()
+                    if rate:
+                        results = await run_open_loop(
+                            session, sampler, rate, duration, timeout
+                        )
+                    else:
+                        results = await run_closed_loop(
+                            session, sampler, concurrency, duration, max_calls, timeout
+                        )
+                    elapsed = time.perf_counter() - started
+                    server_metrics = await fetch_server_metrics(session)
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "label": label,
+        "server_command": server_command or ["mcp_checkmk_server.py"],
+        "inventory": spec.model_dump(),
+        "settings": {
+            "mode": "open_loop" if rate else "closed_loop",
+            "concurrency": None if rate else concurrency,
+            "rate": rate,
+            "duration": duration,
+            "max_calls": max_calls,
+            "mix": mix,
+        },
+        "totals": {
+            "calls": results.calls,
+            "errors": results.error_count,
+            "seconds": round(elapsed, 3),
+            "calls_per_second": round(results.calls / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": summarize_latencies(
+                [s for samples in results.latencies.values() for s in samples]
+            ),
+        },
+        "scenarios": results.summary(),
+        "server": server_metrics,
+    }
+
+
+def print_load_results(results: Dict[str, Any]) -> None:
+    """Print totals, per-tool percentiles and event loop lag."""
+    totals = results["totals"]
+    settings = results["settings"]
+    mode = (
+        f"rate {settings['rate']}/s"
+        if settings["rate"]
+        else f"concurrency {settings['concurrency']}"
+    )
+    print(
+        f"{totals['calls']} calls in {totals['seconds']}s ({mode}): "
+        f"{totals['calls_per_second']} calls/s, {totals['errors']} errors"
+    )
+    for tool, result in results["scenarios"].items():
+        latency = result["latency_ms"]
+        print(
+            f"  {tool:<26} {result['calls']:>6} calls  p50 {latency['p50']:>9.1f}ms  "
+            f"p95 {latency['p95']:>9.1f}ms  p99 {latency['p99']:>9.1f}ms"
+            + (f"  {result['errors']} errors {result['error_kinds']}" if result["errors"] else "")
+        )
+    lag = results["server"].get("event_loop_lag_ms") or {}
+    if lag:
+        print(
+            f"  event loop lag             p50 {lag.get('p50_ms', 0):>9.1f}ms  "
+            f"p95 {lag.get('p95_ms', 0):>9.1f}ms  max {lag.get('max_ms', 0):.1f}ms"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Concurrent MCP stdio load generator against a synthetic Checkmk site"
+    )
+    add_inventory_arguments(parser)
+    parser.add_argument(
+        "--mix", default=DEFAULT_MIX, help="Weighted tool mix, e.g. list_hosts=2,get_host=3"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Calls in flight (closed loop)"
+    )
+    parser.add_argument(
+        "--rate", type=float, help="Calls started per second (open loop)"
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load")
+    parser.add_argument("--calls", type=int, help="Stop after this many calls")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured calls")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-call timeout")
+    parser.add_argument(
+        "--server-command",
+        help="Server command line; {config} is replaced with the config file path",
+    )
+    parser.add_argument("--label", help="Name stored with the results")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        help="Compare two result files instead of running",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        print_comparison(compare_results(baseline, current))
+        return 0
+
+    results = asyncio.run(
+        run_loadgen(
+            inventory_spec_from_args(args),
+            parse_mix(args.mix),
+            concurrency=args.concurrency,
+            rate=args.rate,
+            duration=args.duration,
+            max_calls=args.calls,
+            warmup_calls=args.warmup,
+            timeout=args.timeout,
+            server_command=shlex.split(args.server_command) if args.server_command else None,
+            label=args.label,
+            seed=args.seed,
+        )
+    )
+    print_load_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
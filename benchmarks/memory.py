@@ -0,0 +1,461 @@
+"""Memory benchmarks for large inventories, stage by stage.
+
+A large result passes through several representations before it reaches
+the MCP client: raw response bytes, the decoded JSON, normalized dicts,
+pydantic models, the result model, its ``model_dump()`` and finally the
+serialized text. Each stage runs under ``tracemalloc`` against a synthetic
+site and reports:
+
+- retained bytes: memory the stage output holds on to;
+- peak bytes: its transient high-water mark;
+- both of the above per row;
+- peak RSS;
+- the top allocation sites.
+
+Earlier stages stay alive while later ones run, as they do inside a tool
+call. The results show which representation dominates and where streaming
+or compact models would pay off. Two runs can be compared with
+``--compare``. ``--fail-above`` makes the comparison exit non-zero on
+regressions.
+
+Usage:
+    python -m benchmarks.memory --hosts 2000 --services-per-host 30 --output mem.json
+    python -m benchmarks.memory --dataset rules --rules-per-ruleset 5000 --top 5
+    python -m benchmarks.memory --compare base.json mem.json --fail-above 0.10
+"""
+
+import argparse
+import gc
+import json
+import linecache
+import sys
+import threading
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from checkmk_mcp_server.api_client import CheckmkClient
+from checkmk_mcp_server.async_api_client import AsyncCheckmkClient
+from checkmk_mcp_server.config import AppConfig, CheckmkConfig, LLMConfig
+from checkmk_mcp_server.mcp_server.utils.serialization import safe_json_dumps
+from checkmk_mcp_server.services.host_service import HostService
+from checkmk_mcp_server.services.models.hosts import HostListResult
+from checkmk_mcp_server.services.models.services import ServiceListResult
+from checkmk_mcp_server.services.service_service import ServiceService
+
+from .e2e import PeakRSSSampler, compare_results, print_comparison
+from .fake_checkmk import (
+    Inventory,
+    InventorySpec,
+    add_inventory_arguments,
+    inventory_spec_from_args,
+)
+from .loadgen import FakeServerProcess
+
+DATASETS = ("services", "hosts", "rules")
+
+# Metrics compared between memory runs (all lower is better)
+MEMORY_METRICS = {
+    "retained_bytes_per_row": "lower",
+    "peak_bytes_per_row": "lower",
+}
+
+# Allocation sites in these files are measurement overhead (including the
+# RSS sampler thread), not the stage
+_IGNORED_FILES = (
+    tracemalloc.__file__,
+    linecache.__file__,
+    threading.__file__,
+    "*/psutil/*",
+    __file__,
+)
+
+
+class StageMeter:
+    """Measures allocations of consecutive stages under tracemalloc."""
+
+    def __init__(self, rows: int, top: int = 10):
+        """
+        Initialize meter.
+
+        Args:
+            rows: Rows in the dataset, for per-row figures
+            top: Allocation sites reported per stage
+        """
+        self.rows = max(rows, 1)
+        self.top = top
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    def measure(self, name: str, stage: Callable[[], Any]) -> Any:
+        """
+        Run a stage and record its allocations.
+
+        Args:
+            name: Stage name
+            stage: Callable producing the stage output
+
+        Returns:
+            The stage output (kept alive by the caller for later stages)
+        """
+        with PeakRSSSampler() as rss:
+            gc.collect()
+            before = _snapshot()
+            start_current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            output = stage()
+            current, peak = tracemalloc.get_traced_memory()
+            after = _snapshot()
+
+        retained = current - start_current
+        transient_peak = peak - start_current
+        self.stages[name] = {
+            "retained_bytes": retained,
+            "peak_bytes": transient_peak,
+            "retained_bytes_per_row": round(retained / self.rows, 1),
+            "peak_bytes_per_row": round(transient_peak / self.rows, 1),
+            "peak_rss_mb": round(rss.peak_bytes / (1024 * 1024), 2),
+            "top_allocations": top_allocations(before, after, self.top),
+        }
+        return output
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, path) for path in _IGNORED_FILES]
+    )
+
+
+def top_allocations(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int
+) -> List[Dict[str, Any]]:
+    """
+    Allocation sites that grew the most between two snapshots.
+
+    Args:
+        before: Snapshot taken before the stage
+        after: Snapshot taken after the stage
+        limit: Number of sites to return
+
+    Returns:
+        List of sites with ``file:line``, size and block count growth
+    """
+    sites = []
+    for stat in after.compare_to(before, "lineno"):
+        if stat.size_diff <= 0:
+            continue
+        frame = stat.traceback[0]
+        sites.append(
+            {
+                "site": f"{_short_path(frame.filename)}:{frame.lineno}",
+                "code": linecache.getline(frame.filename, frame.lineno).strip(),
+                "bytes": stat.size_diff,
+                "blocks": stat.count_diff,
+            }
+        )
+        if len(sites) >= limit:
+            break
+    return sites
+
+
+def _short_path(filename: str) -> str:
+    for marker in ("checkmk_mcp_server", "site-packages", "benchmarks"):
+        index = filename.find(marker)
+        if index >= 0:
+            return filename[index:]
+    return filename
+
+
+class MemoryBenchmark:
+    """Runs the stage pipeline for each dataset against a fake server."""
+
+    def __init__(self, url: str, inventory: Inventory, top: int = 10):
+        """
+        Initialize benchmark.
+
+        Args:
+            url: Base URL of a running fake Checkmk server
+            inventory: Inventory the server serves
+            top: Allocation sites reported per stage
+        """
+        self.inventory = inventory
+        self.top = top
+        config = AppConfig(
+            checkmk=CheckmkConfig(
+                server_url=url,
+                username="automation",
+                password="benchmark",
+                site=inventory.site,
+                max_retries=0,
+            ),
+            llm=LLMConfig(),
+        )
+        self.client = CheckmkClient(config.checkmk)
+        async_client = AsyncCheckmkClient(self.client)
+        self.service_service = ServiceService(async_client, config)
+        self.host_service = HostService(async_client, config)
+
+    def _fetch(self, method: str, endpoint: str, **kwargs) -> Any:
+        response = self.client.session.request(
+            method, f"{self.client.base_url}{endpoint}", **kwargs
+        )
+        response.raise_for_status()
+        # Reading .content here keeps the raw body in this stage's numbers
+        response.content
+        return response
+
+    def _value_of(self, decoded: Dict[str, Any]) -> Callable[..., Dict[str, Any]]:
+        # Lets list_rules run its normalization on already decoded data
+        return lambda *args, **kwargs: decoded
+
+    def run_services(self) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """Stages of ``list_all_services``."""
+        rows = len(self.inventory.services)
+        meter = StageMeter(rows, self.top)
+        body = {"columns": ["host_name", "description", "state", "plugin_output", "state_type"]}
+        response = meter.measure(
+            "raw_response",
+            lambda: self._fetch("POST", "/domain-types/service/collections/all", json=body),
+        )
+        decoded = meter.measure("json_decode", response.json)
+        services = meter.measure(
+            "model_conversion",
+            lambda: [
+                self.service_service._convert_api_service_to_model(item)
+                for item in decoded.get("value", [])
+            ],
+        )
+        result = meter.measure(
+            "list_result",
+            lambda: ServiceListResult(
+                services=services,
+                total_count=len(services),
+                stats=self.service_service._calculate_service_stats(services),
+            ),
+        )
+        dumped = meter.measure("model_dump", result.model_dump)
+        meter.measure(
+            "serialization", lambda: safe_json_dumps({"success": True, "data": dumped})
+        )
+        return rows, meter.stages
+
+    def run_hosts(self) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """Stages of ``list_hosts``."""
+        rows = len(self.inventory.hosts)
+        meter = StageMeter(rows, self.top)
+        response = meter.measure(
+            "raw_response",
+            lambda: self._fetch(
+                "GET",
+                "/domain-types/host_config/collections/all",
+                params={"effective_attributes": "true"},
+            ),
+        )
+        decoded = meter.measure("json_decode", response.json)
+        hosts = meter.measure(
+            "model_conversion",
+            lambda: [
+                self.host_service._convert_api_host_to_model(item)
+                for item in decoded.get("value", [])
+            ],
+        )
+        result = meter.measure(
+            "list_result",
+            lambda: HostListResult(
+                hosts=hosts,
+                total_count=len(hosts),
+                stats=self.host_service._calculate_host_stats(hosts),
+            ),
+        )
+        dumped = meter.measure("model_dump", result.model_dump)
+        meter.measure(
+            "serialization", lambda: safe_json_dumps({"success": True, "data": dumped})
+        )
+        return rows, meter.stages
+
+    def run_rules(self) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """Stages of ``list_rules`` for the largest ruleset."""
+        ruleset = max(self.inventory.rules, key=lambda r: len(self.inventory.rules[r]))
+        rows = len(self.inventory.rules[ruleset])
+        meter = StageMeter(rows, self.top)
+        response = meter.measure(
+            "raw_response",
+            lambda: self._fetch(
+                "GET",
+                "/domain-types/rule/collections/all",
+                params={"ruleset_name": ruleset},
+            ),
+        )
+        decoded = meter.measure("json_decode", response.json)
+        original = self.client._make_request
+        self.client._make_request = self._value_of(decoded)
+        try:
+            rules = meter.measure("normalization", lambda: self.client.list_rules(ruleset))
+        finally:
+            self.client._make_request = original
+        meter.measure(
+            "serialization", lambda: safe_json_dumps({"success": True, "data": rules})
+        )
+        return rows, meter.stages
+
+    def run(self, dataset: str) -> Dict[str, Any]:
+        """
+        Measure one dataset.
+
+        Args:
+            dataset: One of ``DATASETS``
+
+        Returns:
+            Dict: Row count and per-stage results
+        """
+        if dataset not in DATASETS:
+            raise ValueError(f"Unknown dataset: {dataset}")
+        rows, stages = getattr(self, f"run_{dataset}")()
+        return {"rows": rows, "stages": stages}
+
+
+def run_memory_benchmark(
+    spec: InventorySpec,
+    datasets: Optional[List[str]] = None,
+    top: int = 10,
+    frames: int = 1,
+) -> Dict[str, Any]:
+    """
+    Run the memory benchmark against a fresh fake server.
+
+    The server runs in a subprocess so its own allocations stay out of
+    the measurements.
+
+    Args:
+        spec: Synthetic inventory to serve
+        datasets: Datasets to measure (all by default)
+        top: Allocation sites reported per stage
+        frames: Traceback frames tracemalloc keeps per allocation
+
+    Returns:
+        Dict: Run metadata, per-dataset stages, and flattened ``scenarios``
+        keyed ``dataset/stage`` for comparison between runs
+    """
+    datasets = datasets or list(DATASETS)
+    results: Dict[str, Any] = {}
+    server = FakeServerProcess(spec).start()
+    try:
+        benchmark = MemoryBenchmark(server.url, Inventory(spec, server.site), top)
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start(frames)
+        try:
+            for dataset in datasets:
+                results[dataset] = benchmark.run(dataset)
+                gc.collect()
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+    finally:
+        server.stop()
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "inventory": spec.model_dump(),
+        "datasets": results,
+        "scenarios": {
+            f"{dataset}/{stage}": values
+            for dataset, result in results.items()
+            for stage, values in result["stages"].items()
+        },
+    }
+
+
+def regressions(
+    comparison: Dict[str, Dict[str, Any]], threshold: float
+) -> List[str]:
+    """
+    Metrics that got worse by more than ``threshold`` (0.1 = 10%).
+
+    Args:
+        comparison: ``compare_results`` output
+        threshold: Allowed relative increase
+
+    Returns:
+        List of ``"scenario metric"`` entries over the threshold
+    """
+    return [
+        f"{scenario} {metric}"
+        for scenario, metrics in comparison.items()
+        for metric, values in metrics.items()
+        if not values["improved"] and values["change"] > threshold
+    ]
+
+
+def print_memory_results(results: Dict[str, Any]) -> None:
+    """Print per-stage figures and the top allocation site of each stage."""
+    for dataset, result in results["datasets"].items():
+        print(f"{dataset} ({result['rows']} rows)")
+        for stage, values in result["stages"].items():
+            print(
+                f"  {stage:<18} retained {values['retained_bytes'] / 1048576:>8.2f}MB "
+                f"({values['retained_bytes_per_row']:>8.0f} B/row)  "
+                f"peak {values['peak_bytes'] / 1048576:>8.2f}MB "
+                f"({values['peak_bytes_per_row']:>8.0f} B/row)  "
+                f"rss {values['peak_rss_mb']:.0f}MB"
+            )
+            for site in values["top_allocations"][:3]:
+                print(f"      {site['bytes'] / 1048576:>7.2f}MB  {site['site']}  {site['code']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Per-stage memory benchmarks against a synthetic Checkmk site"
+    )
+    add_inventory_arguments(parser)
+    parser.add_argument(
+        "--dataset",
+        action="append",
+        choices=DATASETS,
+        help="Dataset to measure (repeatable, default all)",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Allocation sites per stage")
+    parser.add_argument(
+        "--frames", type=int, default=1, help="Traceback frames kept per allocation"
+    )
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        help="Compare two result files instead of running",
+    )
+    parser.add_argument(
+        "--fail-above",
+        type=float,
+        help="With --compare, exit 1 if a metric grew by more than this fraction",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        comparison = compare_results(baseline, current, MEMORY_METRICS)
+        print_comparison(comparison)
+        if args.fail_above is not None:
+            worse = regressions(comparison, args.fail_above)
+            if worse:
+                print(f"Regressions over {args.fail_above:.0%}: {', '.join(worse)}")
+                return 1
+        return 0
+
+    results = run_memory_benchmark(
+        inventory_spec_from_args(args), args.dataset, args.top, args.frames
+    )
+    print_memory_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
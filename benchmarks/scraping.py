@@ -0,0 +1,674 @@
+"""Recorded-fixture benchmark for the historical data scraping pipeline.
+
+``ScraperService.scrape_historical_data`` runs these steps:
+
+1. authenticate;
+2. fetch the service ``view.py`` page;
+3. parse it with BeautifulSoup;
+4. run the graph, AJAX and table extractors, where the graph extractor
+   re-parses the page, pulls the ``cmk.graphs.load_graph_content()``
+   parameters and POSTs them to ``ajax_render_graph_content.py``.
+
+This benchmark replays stored, sanitized responses of both endpoints
+through a local HTTP stand-in. It times every stage and records its
+allocations for each graph period, so parser and extractor changes can be
+measured without a live site. Stages nest (``graph`` contains
+``graph.extract``, which contains ``ajax.parse``), so times are inclusive.
+
+Fixtures live in ``benchmarks/fixtures/scraping`` as ``view_<period>.html``
+and ``ajax_<period>.json``. They can be re-recorded from a real site and are
+sanitized on the way. Review them before committing:
+    python -m benchmarks.scraping --record config.yaml --host srv01 --service "CPU load"
+
+Usage:
+    python -m benchmarks.scraping --iterations 20 --output scrape.json
+    python -m benchmarks.scraping --period 400d --no-allocations
+    python -m benchmarks.scraping --compare base.json scrape.json
+"""
+
+import argparse
+import html
+import json
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, quote_plus, urlparse
+
+from checkmk_mcp_server.config import CheckmkConfig, load_config
+from checkmk_mcp_server.services.web_scraping.extractors.ajax_extractor import (
+    AjaxExtractor,
+)
+from checkmk_mcp_server.services.web_scraping.extractors.graph_extractor import (
+    GraphExtractor,
+)
+from checkmk_mcp_server.services.web_scraping.extractors.table_extractor import (
+    TableExtractor,
+)
+from checkmk_mcp_server.services.web_scraping.parsers.html_parser import HtmlParser
+from checkmk_mcp_server.services.web_scraping.scraper_service import ScraperService
+
+from .e2e import compare_results, print_comparison, summarize_latencies
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "scraping"
+PERIODS = ("4h", "25h", "8d", "400d")
+
+# Names the fixtures are sanitized to
+FIXTURE_HOST = "bench-host"
+FIXTURE_SERVICE = "Temperature Zone 0"
+FIXTURE_SITE = "bench"
+FIXTURE_SERVER = "checkmk.example.com"
+
+# (stage, class, method) timed around every call; stages nest. The
+# "authenticate" stage is timed around AuthHandler.authenticate_session
+STAGES: List[Tuple[str, type, str]] = [
+    ("fetch_page", ScraperService, "_fetch_page"),
+    ("parse_html", HtmlParser, "parse_html"),
+    ("validate_page", HtmlParser, "_validate_content"),
+    ("graph", ScraperService, "_extract_graph_data"),
+    ("graph.extract", GraphExtractor, "extract_graph_data"),
+    ("graph.reparse_html", GraphExtractor, "_parse_html_with_fallback"),
+    ("graph.parameters", GraphExtractor, "extract_graph_parameters"),
+    ("ajax.request", AjaxExtractor, "make_ajax_request"),
+    ("ajax.parse", AjaxExtractor, "parse_ajax_response"),
+    ("ajax", ScraperService, "_extract_ajax_data"),
+    ("table", ScraperService, "_extract_table_data"),
+    ("table.extract", TableExtractor, "extract_table_data"),
+    ("process_results", ScraperService, "_process_results"),
+    ("total", ScraperService, "scrape_historical_data"),
+]
+
+# Metrics compared between runs (all lower is better)
+SCRAPING_METRICS = {
+    "latency_ms.p50": "lower",
+    "latency_ms.p95": "lower",
+    "peak_bytes": "lower",
+}
+
+
+def period_seconds(period: str) -> int:
+    """Length of a graph period such as ``"25h"`` or ``"8d"`` in seconds."""
+    match = re.fullmatch(r"(\d+)([hd])", period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    return int(match.group(1)) * (3600 if match.group(2) == "h" else 86400)
+
+
+def load_fixtures(
+    directory: Path = FIXTURE_DIR, periods: Optional[List[str]] = None
+) -> Dict[str, Dict[str, str]]:
+    """
+    Load recorded responses.
+
+    Args:
+        directory: Fixture directory
+        periods: Periods to load (default all of ``PERIODS``)
+
+    Returns:
+        Dict: ``{period: {"view": html, "ajax": body}}``
+    """
+    fixtures = {}
+    for period in periods or PERIODS:
+        view = directory / f"view_{period}.html"
+        ajax = directory / f"ajax_{period}.json"
+        if not view.exists() or not ajax.exists():
+            raise FileNotFoundError(f"Missing fixtures for period {period} in {directory}")
+        fixtures[period] = {
+            "view": view.read_text(encoding="utf-8"),
+            "ajax": ajax.read_text(encoding="utf-8"),
+        }
+    return fixtures
+
+
+class ReplayServer:
+    """Local HTTP stand-in serving recorded scraping responses.
+
+    Answers the REST version call used for authentication, the GUI start
+    page, ``view.py`` (by its ``graph_range``) and
+    ``ajax_render_graph_content.py`` (by the length of the requested time
+    range).
+    """
+
+    def __init__(
+        self,
+        fixtures: Dict[str, Dict[str, str]],
+        site: str = FIXTURE_SITE,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize the replay server.
+
+        Args:
+            fixtures: ``load_fixtures`` output
+            site: Site name in the URL paths
+            host: Bind address
+            port: Bind port (0 picks a free port)
+        """
+        self.fixtures = fixtures
+        self.site = site
+        self.request_counts: Counter = Counter()
+        self._stats_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Server URL to use as ``CheckmkConfig.server_url``."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ReplayServer":
+        """Start serving in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, name="scrape-replay", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Request counts per route."""
+        with self._stats_lock:
+            return dict(self.request_counts)
+
+    def dispatch(
+        self, method: str, path: str, query: Dict[str, str], body: str
+    ) -> Tuple[int, str, str]:
+        """
+        Answer a request from the fixtures.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            query: Query string parameters
+            body: Raw request body
+
+        Returns:
+            Tuple of status, content type and body
+        """
+        gui = f"/{self.site}/check_mk/"
+        route = None
+        response: Tuple[int, str, str] = (404, "text/plain", "Not found")
+
+        if method == "GET" and path == f"{gui}api/1.0/version":
+            route = "GET /version"
+            payload = {"site": self.site, "versions": {"checkmk": "2.3.0p10"}}
+            response = (200, "application/json", json.dumps(payload))
+        elif method == "GET" and path == gui:
+            route = "GET /"
+            response = (200, "text/html", "<html><body>Checkmk</body></html>")
+        elif method == "GET" and path == f"{gui}view.py":
+            route = "GET view.py"
+            fixture = self.fixtures.get(query.get("graph_range", ""))
+            if fixture:
+                response = (200, "text/html; charset=utf-8", fixture["view"])
+        elif method == "POST" and path == f"{gui}ajax_render_graph_content.py":
+            route = "POST ajax_render_graph_content.py"
+            period = self._period_for_request(body)
+            if period:
+                response = (200, "application/json", self.fixtures[period]["ajax"])
+
+        with self._stats_lock:
+            self.request_counts[route or f"{method} <unrouted>"] += 1
+        return response
+
+    def _period_for_request(self, body: str) -> Optional[str]:
+        try:
+            request = json.loads(parse_qs(body)["request"][0])
+            start, end = request["graph_data_range"]["time_range"]
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+        span = end - start
+        return min(self.fixtures, key=lambda p: abs(period_seconds(p) - span), default=None)
+
+
+def _make_handler(server: ReplayServer) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _handle(self) -> None:
+            parsed = urlparse(self.path)
+            query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode("utf-8") if length else ""
+            status, content_type, payload = server.dispatch(
+                self.command, parsed.path, query, body
+            )
+            encoded = payload.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+        do_GET = do_POST = _handle
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    return Handler
+
+
+class StageRecorder:
+    """Times pipeline stages and optionally tracks their allocations.
+
+    Stages are recorded by wrapping the methods in ``STAGES`` on their
+    classes while the recorder is active. Allocation peaks of nested stages
+    are folded into the enclosing ones, so every stage reports its own
+    high-water mark even though tracemalloc has a single peak counter.
+    """
+
+    def __init__(self, stages: List[Tuple[str, type, str]], allocations: bool = False):
+        """
+        Initialize recorder.
+
+        Args:
+            stages: ``(stage, class, method)`` entries to wrap
+            allocations: Track allocations with tracemalloc (slows stages down)
+        """
+        self.stages = stages
+        self.allocations = allocations
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+        self.peaks: Dict[str, List[int]] = defaultdict(list)
+        self.retained: Dict[str, List[int]] = defaultdict(list)
+        self._originals: List[Tuple[type, str, Any]] = []
+        self._stack: List[Dict[str, int]] = []
+
+    def __enter__(self) -> "StageRecorder":
+        for name, owner, attribute in self.stages:
+            original = owner.__dict__[attribute]
+            self._originals.append((owner, attribute, original))
+            setattr(owner, attribute, self._wrap(name, original))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for owner, attribute, original in reversed(self._originals):
+            setattr(owner, attribute, original)
+        self._originals.clear()
+
+    def _wrap(self, name: str, function):
+        recorder = self
+
+        def wrapper(*args, **kwargs):
+            with recorder.stage(name):
+                return function(*args, **kwargs)
+
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    def stage(self, name: str) -> "_Stage":
+        """Context manager recording one stage execution."""
+        return _Stage(self, name)
+
+    def _enter(self) -> None:
+        if not self.allocations:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        for frame in self._stack:
+            frame["peak"] = max(frame["peak"], peak)
+        tracemalloc.reset_peak()
+        self._stack.append({"start": current, "peak": current})
+
+    def _exit(self, name: str, duration: float) -> None:
+        self.durations[name].append(duration)
+        if not self.allocations:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        frame = self._stack.pop()
+        frame["peak"] = max(frame["peak"], peak)
+        for outer in self._stack:
+            outer["peak"] = max(outer["peak"], frame["peak"])
+        self.peaks[name].append(frame["peak"] - frame["start"])
+        self.retained[name].append(current - frame["start"])
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage latency and allocation figures in ``STAGES`` order."""
+        order = [name for name, _, _ in self.stages] + ["authenticate"]
+        summary = {}
+        for name in order:
+            if name not in self.durations:
+                continue
+            values: Dict[str, Any] = {
+                "calls": len(self.durations[name]),
+                "latency_ms": summarize_latencies(self.durations[name]),
+            }
+            if self.peaks.get(name):
+                values["peak_bytes"] = max(self.peaks[name])
+                values["retained_bytes"] = max(self.retained[name])
+            summary[name] = values
+        return summary
+
+
+class _Stage:
+    def __init__(self, recorder: StageRecorder, name: str):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.recorder._enter()
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.recorder._exit(self.name, time.perf_counter() - self.start)
+
+
+def _scraper_for(url: str, site: str) -> ScraperService:
+    return ScraperService(
+        CheckmkConfig(
+            server_url=url,
+            username="automation",
+            password="benchmark",
+            site=site,
+            max_retries=0,
+        )
+    )
+
+
+def _run_period(
+    scraper: ScraperService, period: str, iterations: int, allocations: bool
+) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    recorder = StageRecorder(STAGES, allocations)
+    points = 0
+    was_tracing = tracemalloc.is_tracing()
+    if allocations and not was_tracing:
+        tracemalloc.start()
+    try:
+        with recorder:
+            for _ in range(iterations):
+                with recorder.stage("authenticate"):
+                    scraper.session = scraper.auth_handler.authenticate_session()
+                points = len(
+                    scraper.scrape_historical_data(period, FIXTURE_HOST, FIXTURE_SERVICE)
+                )
+    finally:
+        if allocations and not was_tracing:
+            tracemalloc.stop()
+    return recorder.summary(), points
+
+
+def run_scrape_benchmark(
+    fixtures: Optional[Dict[str, Dict[str, str]]] = None,
+    iterations: int = 10,
+    warmup: int = 1,
+    allocations: bool = True,
+) -> Dict[str, Any]:
+    """
+    Replay recorded responses through ``scrape_historical_data``.
+
+    Timings come from passes without tracemalloc. With ``allocations``, one
+    extra traced pass per period records peak and retained bytes per stage.
+
+    Args:
+        fixtures: ``load_fixtures`` output (default: the stored fixtures)
+        iterations: Timed scrapes per period
+        warmup: Untimed scrapes per period before measuring
+        allocations: Also record allocations per stage
+
+    Returns:
+        Dict: Settings, per-period stages and flattened ``scenarios`` keyed
+        ``period/stage`` for comparison between runs
+    """
+    fixtures = fixtures or load_fixtures()
+    periods: Dict[str, Any] = {}
+    with ReplayServer(fixtures) as replay:
+        scraper = _scraper_for(replay.url, replay.site)
+        for period in fixtures:
+            for _ in range(warmup):
+                scraper.scrape_historical_data(period, FIXTURE_HOST, FIXTURE_SERVICE)
+            stages, points = _run_period(scraper, period, iterations, False)
+            if allocations:
+                traced, _ = _run_period(scraper, period, 1, True)
+                for name, values in traced.items():
+                    if "peak_bytes" in values and name in stages:
+                        stages[name]["peak_bytes"] = values["peak_bytes"]
+                        stages[name]["retained_bytes"] = values["retained_bytes"]
+            periods[period] = {
+                "points": points,
+                "view_bytes": len(fixtures[period]["view"].encode("utf-8")),
+                "ajax_bytes": len(fixtures[period]["ajax"].encode("utf-8")),
+                "stages": stages,
+            }
+        requests = replay.get_stats()
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "settings": {
+            "iterations": iterations,
+            "warmup": warmup,
+            "allocations": allocations,
+        },
+        "periods": periods,
+        "requests": requests,
+        "scenarios": {
+            f"{period}/{stage}": values
+            for period, result in periods.items()
+            for stage, values in result["stages"].items()
+        },
+    }
+
+
+def sanitize(text: str, host: str, service: str, site: str, server_url: str) -> str:
+    """
+    Replace site specific names and secrets in a recorded response.
+
+    The host, service, site and server names become the ``FIXTURE_*``
+    names, including their URL, HTML and JSON escaped forms. CSRF tokens
+    and session ids are blanked.
+
+    Args:
+        text: Response body
+        host: Recorded host name
+        service: Recorded service description
+        site: Recorded site name
+        server_url: Recorded server URL
+
+    Returns:
+        Sanitized body
+    """
+    replacements = []
+    for original, replacement in ((host, FIXTURE_HOST), (service, FIXTURE_SERVICE)):
+        for encode in (
+            lambda s: s,
+            quote_plus,
+            quote,
+            html.escape,
+            lambda s: json.dumps(s)[1:-1],
+        ):
+            replacements.append((encode(original), encode(replacement)))
+    server = urlparse(server_url).netloc
+    if server:
+        replacements.append((server, FIXTURE_SERVER))
+    # Longest first, so a service containing the host name is replaced whole
+    for original, replacement in sorted(set(replacements), key=lambda r: -len(r[0])):
+        if original and original != replacement:
+            text = text.replace(original, replacement)
+
+    site_patterns = [
+        (rf"/{re.escape(site)}/", f"/{FIXTURE_SITE}/"),
+        (rf"\bsite={re.escape(site)}\b", f"site={FIXTURE_SITE}"),
+        (rf'(\\?")({re.escape(site)})(\\?")', rf"\g<1>{FIXTURE_SITE}\g<3>"),
+        (rf"\bsite {re.escape(site)}\b", f"site {FIXTURE_SITE}"),
+    ]
+    secret_patterns = [
+        (r'(name=\\?"_?csrf_token\\?" value=\\?")[^"\\]*', r"\g<1>SANITIZED"),
+        (r'(\\?"_?csrf_token\\?":\s*\\?")[^"\\]*', r"\g<1>SANITIZED"),
+        (r"(_?csrf_token=)[^&\"'\s]+", r"\g<1>SANITIZED"),
+        (r"(auth_[\w-]+=)[^;\"'\s&]+", r"\g<1>SANITIZED"),
+    ]
+    if site != FIXTURE_SITE:
+        for pattern, replacement in site_patterns:
+            text = re.sub(pattern, replacement, text)
+    for pattern, replacement in secret_patterns:
+        text = re.sub(pattern, replacement, text)
+    return text
+
+
+def record_fixtures(
+    config: CheckmkConfig,
+    host: str,
+    service: str,
+    periods: Optional[List[str]] = None,
+    directory: Path = FIXTURE_DIR,
+) -> List[Path]:
+    """
+    Record ``view.py`` and AJAX responses from a live site as fixtures.
+
+    Args:
+        config: Checkmk connection settings
+        host: Host with a graph to record
+        service: Service with a graph to record
+        periods: Periods to record (default all of ``PERIODS``)
+        directory: Where to write the fixtures
+
+    Returns:
+        List of written files
+    """
+    scraper = ScraperService(config)
+    scraper.session = scraper.auth_handler.authenticate_session()
+    captured: Dict[str, str] = {}
+    original_request = scraper.session.request
+
+    def capture(method, url, *args, **kwargs):
+        response = original_request(method, url, *args, **kwargs)
+        endpoint = urlparse(url).path.rsplit("/", 1)[-1]
+        if endpoint in ("view.py", "ajax_render_graph_content.py"):
+            captured[endpoint] = response.text
+        return response
+
+    scraper.session.request = capture
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    try:
+        for period in periods or PERIODS:
+            captured.clear()
+            scraper.scrape_historical_data(period, host, service, "graph")
+            for endpoint, name in (
+                ("view.py", f"view_{period}.html"),
+                ("ajax_render_graph_content.py", f"ajax_{period}.json"),
+            ):
+                if endpoint not in captured:
+                    raise RuntimeError(f"No {endpoint} response recorded for {period}")
+                path = directory / name
+                path.write_text(
+                    sanitize(captured[endpoint], host, service, config.site, config.server_url),
+                    encoding="utf-8",
+                )
+                written.append(path)
+    finally:
+        scraper.session.request = original_request
+    return written
+
+
+def print_scrape_results(results: Dict[str, Any]) -> None:
+    """Print per-period stage timings and allocation peaks."""
+    for period, result in results["periods"].items():
+        print(
+            f"{period}: {result['points']} points, view {result['view_bytes'] / 1024:.0f}KB, "
+            f"ajax {result['ajax_bytes'] / 1024:.0f}KB"
+        )
+        for stage, values in result["stages"].items():
+            latency = values["latency_ms"]
+            line = (
+                f"  {stage:<20} p50 {latency['p50']:>8.2f}ms  p95 {latency['p95']:>8.2f}ms"
+            )
+            if "peak_bytes" in values:
+                line += f"  peak {values['peak_bytes'] / 1024:>8.0f}KB"
+            print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Replay recorded scraping responses through ScraperService"
+    )
+    parser.add_argument(
+        "--period",
+        action="append",
+        choices=PERIODS,
+        help="Period to benchmark or record (repeatable, default all)",
+    )
+    parser.add_argument("--fixtures", type=Path, default=FIXTURE_DIR, help="Fixture directory")
+    parser.add_argument("--iterations", type=int, default=10, help="Scrapes per period")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed scrapes per period")
+    parser.add_argument(
+        "--no-allocations",
+        action="store_true",
+        help="Skip the traced pass that records allocations",
+    )
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        help="Compare two result files instead of running",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="CONFIG",
+        help="Record fixtures from the site in this config file",
+    )
+    parser.add_argument("--host", help="Host to record (with --record)")
+    parser.add_argument("--service", help="Service to record (with --record)")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        print_comparison(compare_results(baseline, current, SCRAPING_METRICS))
+        return 0
+
+    if args.record:
+        if not args.host or not args.service:
+            parser.error("--record needs --host and --service")
+        written = record_fixtures(
+            load_config(args.record).checkmk,
+            args.host,
+            args.service,
+            args.period,
+            args.fixtures,
+        )
+        for path in written:
+            print(f"Recorded {path}")
+        return 0
+
+    results = run_scrape_benchmark(
+        load_fixtures(args.fixtures, args.period),
+        iterations=args.iterations,
+        warmup=args.warmup,
+        allocations=not args.no_allocations,
+    )
+    print_scrape_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+"""Benchmark of the JSON backends used for tool results.
+
+Serializes realistic tool payloads with every available backend and reports
+latency and output size per payload and backend:
+
+- ``legacy``: the former path, stdlib encoding through ``MCPJSONEncoder``
+  with the default ``", "``/``": "`` separators;
+- ``stdlib``: compact stdlib encoding;
+- ``orjson``: compact orjson encoding (when installed);
+- ``model_dump_json``: pydantic's own encoder, for payloads that are models.
+
+Payloads are a ``ServiceListResult`` and a ``HealthDashboard``, both as the
+model and as the ``{"success": True, "data": {...}}`` dict the tools return.
+
+Usage:
+    python -m benchmarks.serialization --services 20000 --output json.json
+    python -m benchmarks.serialization --compare base.json json.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from checkmk_mcp_server.mcp_server.utils import serialization
+from checkmk_mcp_server.mcp_server.utils.serialization import MCPJSONEncoder
+from checkmk_mcp_server.services.models.services import (
+    ServiceInfo,
+    ServiceListResult,
+    ServiceState,
+)
+from checkmk_mcp_server.services.models.status import (
+    HealthDashboard,
+    HostStatus,
+    ProblemCategory,
+    ProblemSeverity,
+    ProblemSummary,
+    ServiceProblem,
+)
+
+from .e2e import compare_results, print_comparison, summarize_latencies
+
+# Metrics compared between runs (all lower is better)
+SERIALIZATION_METRICS = {
+    "latency_ms.p50": "lower",
+    "latency_ms.p95": "lower",
+    "bytes": "lower",
+}
+
+_STATES = [ServiceState.OK] * 17 + [
+    ServiceState.WARNING,
+    ServiceState.CRITICAL,
+    ServiceState.UNKNOWN,
+]
+_SERVICES = [
+    (
+        "CPU load",
+        "15 min load: 0.85, 15 min load per core: 0.21 (4 cores)",
+        "load1=0.9;;;0;4 load5=0.87;;;0;4 load15=0.85;;;0;4",
+    ),
+    (
+        "Memory",
+        "Total virtual memory: 42.1% - 6.74 GB of 16.0 GB",
+        "mem_used=7234567890;;;0;17179869184",
+    ),
+    (
+        "Filesystem /",
+        "Used: 71.2% - 35.6 GB of 50.0 GB, trend: +12.3 MB / 24 hours",
+        "fs_used=35600;40000;45000;0;50000 fs_size=50000",
+    ),
+    (
+        "Interface eth0",
+        "[eth0], (up), MAC: 52:54:00:12:34:56, Speed: 10 GBit/s, In: 1.2 MB/s",
+        "in=1234567;;;0;1250000000 out=350123;;;0;1250000000",
+    ),
+    (
+        "NTP Time",
+        "Offset: 0.0123 ms, Stratum: 2, Time since last sync: 14 minutes",
+        "offset=0.0123;200;500",
+    ),
+]
+
+
+def build_service_list(services: int, seed: int = 1) -> ServiceListResult:
+    """A service listing as returned by ServiceService.list_all_services."""
+    rng = random.Random(seed)
+    now = datetime(2025, 8, 19, 10, 30, 45)
+    items = []
+    for i in range(services):
+        description, output, perfdata = _SERVICES[i % len(_SERVICES)]
+        state = rng.choice(_STATES)
+        items.append(
+            ServiceInfo(
+                host_name=f"host{i // len(_SERVICES):05d}.example.com",
+                service_name=description,
+                state=state,
+                state_type="hard",
+                plugin_output=output,
+                performance_data=perfdata,
+                last_check=now - timedelta(seconds=rng.randint(0, 60)),
+                last_state_change=now - timedelta(hours=rng.randint(1, 500)),
+                acknowledged=state != ServiceState.OK and rng.random() < 0.3,
+                check_interval=60,
+                max_check_attempts=3,
+                current_attempt=1,
+            )
+        )
+
+    stats: Dict[str, int] = {}
+    for item in items:
+        stats[item.state] = stats.get(item.state, 0) + 1
+    return ServiceListResult(
+        services=items, total_count=len(items), stats=stats, metadata={"source": "bench"}
+    )
+
+
+def build_dashboard(hosts: int, seed: int = 1) -> HealthDashboard:
+    """A health dashboard with per-host status and problem lists."""
+    rng = random.Random(seed)
+    now = datetime(2025, 8, 19, 10, 30, 45)
+    statuses = []
+    for i in range(hosts):
+        ok = rng.randint(15, 40)
+        warn, crit, unknown = rng.randint(0, 3), rng.randint(0, 2), rng.randint(0, 1)
+        total = ok + warn + crit + unknown
+        statuses.append(
+            HostStatus(
+                name=f"host{i:05d}.example.com",
+                state="UP",
+                total_services=total,
+                ok_services=ok,
+                warning_services=warn,
+                critical_services=crit,
+                unknown_services=unknown,
+                health_percentage=round(ok / total * 100, 1),
+                health_grade="B",
+                urgent_problems=crit,
+                acknowledged_problems=rng.randint(0, warn + crit),
+            )
+        )
+
+    def problem(i: int) -> ServiceProblem:
+        description, output, _ = _SERVICES[i % len(_SERVICES)]
+        return ServiceProblem(
+            host_name=f"host{i:05d}.example.com",
+            service_name=description,
+            state=ServiceState.CRITICAL,
+            severity=ProblemSeverity.CRITICAL,
+            category=ProblemCategory.PERFORMANCE,
+            plugin_output=output,
+            duration=f"{rng.randint(1, 48)}h",
+            last_state_change=now - timedelta(hours=rng.randint(1, 48)),
+            urgency_score=rng.randint(50, 100),
+            business_impact="High - production system",
+        )
+
+    problems = [problem(i) for i in range(min(hosts, 200))]
+    return HealthDashboard(
+        overall_health_percentage=92.4,
+        overall_health_grade="A-",
+        total_hosts=hosts,
+        total_services=sum(s.total_services for s in statuses),
+        service_states={"OK": 9000, "WARNING": 300, "CRITICAL": 120, "UNKNOWN": 40},
+        host_states={"UP": hosts},
+        problem_summary=ProblemSummary(
+            total_problems=len(problems),
+            critical_problems=len(problems),
+            warning_problems=0,
+            unknown_problems=0,
+            unacknowledged_problems=len(problems),
+            urgent_problems=len(problems) // 2,
+            problems_by_category={"performance": len(problems)},
+            problems_by_host={p.host_name: 1 for p in problems},
+            new_problems_last_hour=3,
+            resolved_problems_last_hour=5,
+        ),
+        critical_problems=problems,
+        urgent_problems=problems[:50],
+        host_statuses=statuses,
+        worst_performing_hosts=sorted(statuses, key=lambda s: s.health_percentage)[:10],
+        health_trend="stable",
+        recommendations=["Review filesystem growth on database hosts"],
+        alerts=[],
+        last_updated=now,
+        data_freshness="live",
+    )
+
+
+def build_payloads(services: int, hosts: int) -> Dict[str, Any]:
+    """Models and the tool-result dicts built from them."""
+    service_list = build_service_list(services)
+    dashboard = build_dashboard(hosts)
+    return {
+        "service_list": service_list,
+        "service_list_result": {"success": True, "data": service_list.model_dump()},
+        "dashboard": dashboard,
+        "dashboard_result": {"success": True, "data": dashboard.model_dump()},
+    }
+
+
+def _legacy_dumps(obj: Any) -> str:
+    """The stdlib encoding safe_json_dumps used before compact output."""
+    return json.dumps(obj, cls=MCPJSONEncoder, ensure_ascii=False)
+
+
+def available_backends() -> Dict[str, Callable[[Any], str]]:
+    """Backends that can run in this environment."""
+    backends: Dict[str, Callable[[Any], str]] = {
+        "legacy": _legacy_dumps,
+        "stdlib": serialization._stdlib_dumps,
+    }
+    if serialization.ORJSON_AVAILABLE:
+        backends["orjson"] = serialization._orjson_dumps
+    return backends
+
+
+def run_serialization_benchmark(
+    services: int = 5000,
+    hosts: int = 1000,
+    iterations: int = 20,
+    warmup: int = 2,
+    backends: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Time every backend on every payload.
+
+    Args:
+        services: Services in the service list payloads
+        hosts: Hosts in the dashboard payloads
+        iterations: Timed serializations per payload and backend
+        warmup: Untimed serializations per payload and backend
+        backends: Backend names to run (default all available)
+
+    Returns:
+        Dict with the environment and scenarios keyed "payload/backend"
+    """
+    available = available_backends()
+    selected = {name: available[name] for name in backends or available}
+    payloads = build_payloads(services, hosts)
+
+    scenarios: Dict[str, Dict[str, Any]] = {}
+    for payload_name, payload in payloads.items():
+        runs = dict(selected)
+        if hasattr(payload, "model_dump_json"):
+            runs["model_dump_json"] = lambda obj: obj.model_dump_json()
+        for backend, dumps in runs.items():
+            for _ in range(warmup):
+                dumps(payload)
+            samples = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                text = dumps(payload)
+                samples.append(time.perf_counter() - started)
+            scenarios[f"{payload_name}/{backend}"] = {
+                "latency_ms": summarize_latencies(samples),
+                "bytes": len(text.encode("utf-8")),
+            }
+
+    return {
+        "environment": {
+            "orjson": serialization.ORJSON_AVAILABLE,
+            "services": services,
+            "hosts": hosts,
+            "iterations": iterations,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def print_serialization_results(results: Dict[str, Any]) -> None:
+    """Print latency and size per payload and backend."""
+    for name, values in results["scenarios"].items():
+        latency = values["latency_ms"]
+        print(
+            f"  {name:<36} p50 {latency['p50']:>9.2f}ms  p95 {latency['p95']:>9.2f}ms  "
+            f"{values['bytes'] / 1024:>9.0f}KB"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Compare JSON backends on tool payloads")
+    parser.add_argument("--services", type=int, default=5000, help="Services per listing")
+    parser.add_argument("--hosts", type=int, default=1000, help="Hosts per dashboard")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed runs per case")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed runs per case")
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=["legacy", "stdlib", "orjson"],
+        help="Backend to run (repeatable, default all available)",
+    )
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        help="Compare two result files instead of running",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        print_comparison(compare_results(baseline, current, SERIALIZATION_METRICS))
+        return 0
+
+    if args.backend and "orjson" in args.backend and not serialization.ORJSON_AVAILABLE:
+        parser.error("orjson is not installed")
+
+    results = run_serialization_benchmark(
+        services=args.services,
+        hosts=args.hosts,
+        iterations=args.iterations,
+        warmup=args.warmup,
+        backends=args.backend,
+    )
+    print_serialization_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
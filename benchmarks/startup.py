@@ -0,0 +1,226 @@
+"""Startup benchmark: import time per module and time to first list_tools.
+
+MCP clients spawn a fresh server process per session, so every agent
+session pays for interpreter start, imports and server initialization
+before its first ``list_tools`` answer. This benchmark measures both parts
+in fresh processes:
+
+- imports: ``python -X importtime`` of the server module, reported as the
+  total and the slowest modules by cumulative and self time;
+- spawn: a child process that imports the server, initializes it and
+  answers ``list_tools`` through the MCP request handler, reporting the
+  startup milestones (ms since process start) and which heavy optional
+  modules were loaded on the way.
+
+No Checkmk site is contacted; the server only needs a config.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --output startup.json
+    python -m benchmarks.startup --compare base.json startup.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from checkmk_mcp_server.utils.startup import parse_importtime
+
+from .e2e import compare_results, print_comparison, summarize_latencies
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SERVER_MODULE = "checkmk_mcp_server.mcp_server.server"
+
+# Optional subsystems that should not be loaded before the first tool needs them
+HEAVY_MODULES = (
+    "bs4",
+    "lxml",
+    "checkmk_mcp_server.services.historical_service",
+    "checkmk_mcp_server.services.web_scraping",
+    "checkmk_mcp_server.services.streaming",
+    "checkmk_mcp_server.services.jobs",
+)
+
+# Metrics compared between runs (all lower is better)
+STARTUP_METRICS = {
+    "import_ms": "lower",
+    "first_list_tools_ms.p50": "lower",
+    "server_initialized_ms.p50": "lower",
+}
+
+_SPAWN_SCRIPT = """
+import asyncio, json, sys
+from checkmk_mcp_server.utils.startup import get_startup_timer
+timer = get_startup_timer()
+from mcp.types import ListToolsRequest
+from checkmk_mcp_server.config import AppConfig, CheckmkConfig, LLMConfig
+from checkmk_mcp_server.mcp_server.server import CheckmkMCPServer
+timer.mark("imports_done")
+
+async def main():
+    config = AppConfig(
+        checkmk=CheckmkConfig(
+            server_url="http://127.0.0.1:9", username="automation",
+            password="benchmark", site="bench", max_retries=0,
+        ),
+        llm=LLMConfig(),
+    )
+    server = CheckmkMCPServer(config)
+    await server.initialize()
+    handler = server.server.request_handlers[ListToolsRequest]
+    result = await handler(ListToolsRequest(method="tools/list"))
+    print(json.dumps({
+        "milestones_ms": timer.to_dict(),
+        "tools": len(result.root.tools),
+        "loaded_heavy_modules": [m for m in HEAVY_MODULES if m in sys.modules],
+        "created_services": server.get_server_info()["created_services"],
+    }))
+
+HEAVY_MODULES = %r
+asyncio.run(main())
+"""
+
+
+def measure_imports(module: str = SERVER_MODULE, top: int = 15) -> Dict[str, Any]:
+    """
+    Import a module in a fresh interpreter and time every import.
+
+    Args:
+        module: Module to import
+        top: Number of slowest modules reported
+
+    Returns:
+        Dict with the total import time and the slowest modules
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # A module can appear twice (as a package submodule and as the import target)
+    by_name: Dict[str, Dict[str, Any]] = {}
+    for entry in parse_importtime(completed.stderr):
+        known = by_name.get(entry["module"])
+        if known is None or entry["cumulative_ms"] > known["cumulative_ms"]:
+            by_name[entry["module"]] = entry
+    modules = list(by_name.values())
+    total = by_name[module]["cumulative_ms"] if module in by_name else 0.0
+    return {
+        "import_ms": total,
+        "slowest_cumulative": sorted(modules, key=lambda m: -m["cumulative_ms"])[:top],
+        "slowest_self": sorted(modules, key=lambda m: -m["self_ms"])[:top],
+    }
+
+
+def measure_spawn() -> Dict[str, Any]:
+    """
+    Start a server in a fresh process and answer the first list_tools.
+
+    Returns:
+        Dict with the startup milestones in ms since process start, the tool
+        count, loaded heavy modules and the services created on the way
+    """
+    completed = subprocess.run(
+        [sys.executable, "-c", _SPAWN_SCRIPT % (HEAVY_MODULES,)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_startup_benchmark(runs: int = 5, top: int = 15) -> Dict[str, Any]:
+    """
+    Measure imports once and server spawns ``runs`` times.
+
+    Args:
+        runs: Fresh server processes to start
+        top: Number of slowest modules reported
+
+    Returns:
+        Dict with the environment and an "imports" and a "spawn" scenario
+    """
+    imports = measure_imports(top=top)
+    spawns = [measure_spawn() for _ in range(runs)]
+
+    spawn: Dict[str, Any] = {
+        "tools": spawns[-1]["tools"],
+        "loaded_heavy_modules": spawns[-1]["loaded_heavy_modules"],
+        "created_services": spawns[-1]["created_services"],
+    }
+    for milestone in spawns[-1]["milestones_ms"]:
+        spawn[f"{milestone}_ms"] = summarize_latencies(
+            [s["milestones_ms"][milestone] / 1000 for s in spawns]
+        )
+
+    return {
+        "environment": {"python": sys.version.split()[0], "runs": runs},
+        "scenarios": {
+            "imports": {
+                "import_ms": imports["import_ms"],
+                "slowest_cumulative": imports["slowest_cumulative"],
+                "slowest_self": imports["slowest_self"],
+            },
+            "spawn": spawn,
+        },
+    }
+
+
+def print_startup_results(results: Dict[str, Any]) -> None:
+    """Print the import report and the spawn milestones."""
+    imports = results["scenarios"]["imports"]
+    print(f"Import of {SERVER_MODULE}: {imports['import_ms']:.0f}ms")
+    print("  Slowest modules (cumulative / self):")
+    for module in imports["slowest_cumulative"]:
+        print(
+            f"    {module['module']:<60} {module['cumulative_ms']:>8.1f}ms "
+            f"{module['self_ms']:>8.1f}ms"
+        )
+
+    spawn = results["scenarios"]["spawn"]
+    print(f"Spawn to first list_tools ({spawn['tools']} tools):")
+    for name, value in spawn.items():
+        if name.endswith("_ms"):
+            print(f"    {name:<30} p50 {value['p50']:>8.1f}ms  max {value['max']:>8.1f}ms")
+    print(f"  Heavy modules loaded: {', '.join(spawn['loaded_heavy_modules']) or 'none'}")
+    print(f"  Services created: {', '.join(spawn['created_services']) or 'none'}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Measure MCP server startup time")
+    parser.add_argument("--runs", type=int, default=5, help="Server processes to start")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to report")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        help="Compare two result files instead of running",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        print_comparison(compare_results(baseline, current, STARTUP_METRICS))
+        return 0
+
+    results = run_startup_benchmark(runs=args.runs, top=args.top)
+    print_startup_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 """Checkmk REST API client based on OpenAPI specification."""
 
+import time
 import requests
 from datetime import date
 from typing import Dict, List, Optional, Any, Tuple
@@ -12,6 +13,18 @@ from .utils import (
     extract_error_message,
     validate_api_response,
 )
+from .common import get_retry_attempt
+from .utils.call_breakdown import record_rest_call
+from .utils.slow_calls import get_slow_call_log
+from .utils.tracing import end_span, start_span
+from .utils.rate_limiter import get_rate_limiter
+from .utils.single_flight import get_single_flight, request_key
+from .utils.request_context import (
+    DeadlineExceeded,
+    bound_timeout,
+    check_deadline,
+    remaining_time,
+)
 
 # Import request context utilities with fallback
 try:
@@ -34,6 +47,25 @@ except ImportError:
         return headers.copy() if headers else {}
 
 
+def endpoint_template(endpoint: str) -> str:
+    """Replace object identifiers in an API path with ``{id}``.
+
+    ``objects/host_config/web01`` becomes ``/objects/host_config/{id}`` so that
+    per-endpoint metrics stay bounded no matter how many hosts exist.
+
+    Args:
+        endpoint: API endpoint path
+
+    Returns:
+        Endpoint path template
+    """
+    parts = endpoint.split("?", 1)[0].strip("/").split("/")
+    for index in range(len(parts) - 2):
+        if parts[index] == "objects":
+            parts[index + 2] = "{id}"
+    return "/" + "/".join(parts)
+
+
 class CheckmkAPIError(Exception):
     """Exception raised for Checkmk API errors."""
 
@@ -256,10 +288,21 @@ class CheckmkClient:
         self.base_url = f"{config.server_url}/{config.site}/check_mk/api/1.0"
         self.session = requests.Session()
 
+        # Shared with every other client talking to the same server
+        self.rate_limiter = get_rate_limiter(
+            self.base_url, getattr(config, "rate_limit", None)
+        )
+        # Identical concurrent reads share one request (per server and user)
+        self.single_flight = get_single_flight(
+            f"{config.username}@{self.base_url}", getattr(config, "coalescing", None)
+        )
+
         # Use request ID-aware logger
         from .logging_utils import get_logger_with_request_id
+        from .services.metrics import get_metrics_collector
 
         self.logger = get_logger_with_request_id(__name__)
+        self.metrics = get_metrics_collector()
 
         # Set up authentication
         self.logger.debug(f"Setting up authentication for user: {self.config.username}")
@@ -277,8 +320,21 @@ class CheckmkClient:
         self.session.headers.update({"Authorization": f"Bearer {auth_token}"})
         self.logger.debug("Authentication header set.")
 
-    @retry_on_failure(max_retries=3)
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Make HTTP request, sharing it with identical concurrent reads."""
+        key = (
+            request_key(method, endpoint, kwargs)
+            if self.single_flight is not None
+            else None
+        )
+        if key is None:
+            return self._send_request(method, endpoint, **kwargs)
+        return self.single_flight.do(
+            key, lambda: self._send_request(method, endpoint, **kwargs)
+        )
+
+    @retry_on_failure(max_retries=3)
+    def _send_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request with error handling and request ID propagation."""
         # Ensure endpoint doesn't start with / to avoid urljoin path replacement
         if endpoint.startswith("/"):
@@ -301,16 +357,37 @@ class CheckmkClient:
         self.logger.debug(f"[{request_id}] Preparing {method} request to {url}")
         self.logger.debug(f"[{request_id}] Request headers: {headers}")
 
+        waited = self.rate_limiter.acquire(method, endpoint)
+        if waited > 0:
+            self.logger.debug(
+                f"[{request_id}] Rate limited {method} {endpoint} for {waited:.3f}s"
+            )
+
+        # Never wait on the server past the request's deadline, and don't
+        # send at all if the caller has already given up
+        timeout = bound_timeout(self.config.request_timeout)
+        check_deadline(f"{method} {endpoint}")
+
+        template = endpoint_template(endpoint)
+        trace, trace_token = start_span(
+            "checkmk_api.request", kind="client", method=method, endpoint=template
+        )
+        started = time.monotonic()
+        status = "error"
+        response_bytes: Optional[int] = None
+        response_data: Any = None
         try:
             response = self.session.request(
-                method=method, url=url, timeout=self.config.request_timeout, **kwargs
+                method=method, url=url, timeout=timeout, **kwargs
             )
-            self.logger.debug(f"[{request_id}] Response status: {response.status_code}")
-            self.logger.debug(f"[{request_id}] Response headers: {response.headers}")
-            self.logger.debug(f"[{request_id}] Response text: {response.text}")
-
+            status = str(response.status_code)
+            if isinstance(response.content, bytes):
+                response_bytes = len(response.content)
+            # Bodies are not logged: decoding every response is costly at scale,
+            # and slow calls are captured by the slow call log instead
             self.logger.debug(
-                f"[{request_id}] {method} {url} -> {response.status_code}"
+                f"[{request_id}] {method} {url} -> {response.status_code} "
+                f"({response_bytes} bytes)"
             )
 
             # Handle different response codes
@@ -326,6 +403,15 @@ class CheckmkClient:
                         "message": response.text or "No error message provided"
                     }
 
+                if response.status_code == 429:
+                    delay = self.rate_limiter.handle_rate_limited(
+                        method, endpoint, response.headers.get("Retry-After")
+                    )
+                    self.logger.warning(
+                        f"[{request_id}] Checkmk rate limited {method} {endpoint}, "
+                        f"pausing requests for {delay:.1f}s"
+                    )
+
                 error_msg = extract_error_message(error_data)
                 self.logger.error(
                     f"[{request_id}] API error {response.status_code} on {method} {endpoint}: {error_msg}"
@@ -358,14 +444,50 @@ class CheckmkClient:
                 endpoint=endpoint,
             )
         except requests.exceptions.Timeout as e:
+            if remaining_time() == 0:
+                self.logger.warning(
+                    f"[{request_id}] Deadline exceeded waiting for {method} {url}"
+                )
+                raise DeadlineExceeded(
+                    f"Deadline exceeded after {timeout:.1f}s waiting for {method} {endpoint}"
+                )
             self.logger.error(f"[{request_id}] Request timeout to {url}: {e}")
             raise CheckmkAPIError(
-                f"Request timeout after {self.config.request_timeout}s. Server may be overloaded.",
+                f"Request timeout after {timeout:.1f}s. Server may be overloaded.",
                 endpoint=endpoint,
             )
         except requests.exceptions.RequestException as e:
             self.logger.error(f"[{request_id}] Request failed to {url}: {e}")
             raise CheckmkAPIError(f"Request failed: {str(e)}", endpoint=endpoint)
+        finally:
+            elapsed = time.monotonic() - started
+            self.metrics.observe_timing(
+                "checkmk_api.request",
+                elapsed,
+                method=method,
+                endpoint=template,
+                status=status,
+            )
+            retry_count = get_retry_attempt()
+            record_rest_call(method, template, elapsed, retried=retry_count > 0)
+            get_slow_call_log().check_request(
+                request_id,
+                method,
+                template,
+                elapsed,
+                status,
+                arguments={"params": kwargs.get("params"), "json": kwargs.get("json")},
+                response_bytes=response_bytes,
+                response_data=response_data,
+                retry_count=retry_count,
+            )
+            if trace is not None:
+                trace.set_attribute("status", status)
+            end_span(
+                trace,
+                trace_token,
+                None if status.isdigit() and int(status) < 400 else f"HTTP {status}",
+            )
 
     def list_hosts(self, effective_attributes: bool = False) -> List[Dict[str, Any]]:
         """
@@ -561,6 +683,26 @@ class CheckmkClient:
         self.logger.info(f"Bulk created {len(entries)} hosts")
         return response
 
+    def bulk_update_hosts(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Update multiple hosts in a single request.
+
+        Args:
+            entries: List of host updates, each with host_name and one of
+                attributes, update_attributes or remove_attributes
+
+        Returns:
+            Bulk update response
+        """
+        response = self._make_request(
+            "PUT",
+            "/domain-types/host_config/actions/bulk-update/invoke",
+            json={"entries": entries},
+        )
+
+        self.logger.info(f"Bulk updated {len(entries)} hosts")
+        return response
+
     def bulk_delete_hosts(self, host_names: List[str]) -> Dict[str, Any]:
         """
         Delete multiple hosts in a single request.
@@ -1,27 +1,142 @@
 """Async wrapper for Checkmk REST API client to support service layer."""
 
 import asyncio
+import contextvars
+import threading
 from typing import Dict, List, Optional, Any, Callable, Awaitable, TypeVar
 from functools import wraps
 
 from .api_client import CheckmkClient
+from .utils.profiling import get_active_capture
+from .utils.request_context import (
+    CANCELLATION_CONTEXT,
+    DeadlineExceeded,
+    RequestCancelled,
+    check_deadline,
+    remaining_time,
+)
 
 
 T = TypeVar('T')
 
+
+class ExecutorStats:
+    """Tracks sync client calls handed to the thread pool executor.
+
+    Queue depth is the number of calls submitted but not yet picked up by a
+    worker thread; a growing queue means the executor is the bottleneck.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+
+    def on_submit(self) -> None:
+        with self._lock:
+            self.submitted += 1
+
+    def on_start(self) -> None:
+        with self._lock:
+            self.started += 1
+
+    def on_complete(self) -> None:
+        with self._lock:
+            self.completed += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get queue depth and call counters."""
+        with self._lock:
+            return {
+                "queue_depth": self.submitted - self.started,
+                "active": self.started - self.completed,
+                "submitted": self.submitted,
+                "completed": self.completed,
+            }
+
+
+_executor_stats = ExecutorStats()
+
+
+def get_executor_stats() -> Dict[str, int]:
+    """Get statistics for sync client calls running in the executor."""
+    return _executor_stats.get_stats()
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run a blocking call in the default thread pool executor.
+
+    Every outbound request of the services layer goes through here (or through
+    the wrapped client methods, which use it), so the event loop thread never
+    waits on the network. The context is copied so request IDs, the deadline
+    and the call breakdown follow the call into the worker thread, and an
+    armed profiler capture samples the worker thread.
+
+    A worker thread cannot be interrupted, so when the awaiting coroutine is
+    cancelled or the request's deadline passes, the call is flagged as
+    cancelled instead: it never starts if still queued, and once running it
+    stops at its next checkpoint (before sending a request, or while waiting
+    on the rate limiter or a retry backoff). The caller gets control back
+    immediately either way.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for ``func``
+        **kwargs: Keyword arguments for ``func``
+
+    Returns:
+        The callable's return value
+
+    Raises:
+        DeadlineExceeded: If the request's deadline passes first
+    """
+    name = getattr(func, "__name__", "blocking call")
+    check_deadline(name)
+    _executor_stats.on_submit()
+    cancelled = threading.Event()
+
+    def run():
+        _executor_stats.on_start()
+        try:
+            if cancelled.is_set():
+                raise RequestCancelled(f"{name} cancelled before it started")
+            capture = get_active_capture()
+            if capture is not None:
+                return capture.run_in_thread(func, *args, **kwargs)
+            return func(*args, **kwargs)
+        finally:
+            _executor_stats.on_complete()
+
+    loop = asyncio.get_event_loop()
+    context = contextvars.copy_context()
+    context.run(CANCELLATION_CONTEXT.set, cancelled)
+    future = loop.run_in_executor(None, context.run, run)
+    try:
+        remaining = remaining_time()
+        if remaining is None:
+            return await future
+        done, _ = await asyncio.wait([future], timeout=remaining)
+        if not done:
+            future.cancel()
+            raise DeadlineExceeded(f"Deadline exceeded waiting for {name}")
+        return future.result()
+    except (asyncio.CancelledError, DeadlineExceeded):
+        cancelled.set()
+        raise
+
+
 def async_wrapper(method_name: str) -> Callable[[Callable[..., T]], Callable[..., Awaitable[T]]]:
     """Decorator to convert synchronous methods to async."""
 
     def decorator(func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
         @wraps(func)
         async def async_method(self, *args, **kwargs) -> T:
-            # Get the actual method from the sync client
+            # Get the actual method from the sync client and run it in a
+            # thread pool to avoid blocking
             sync_method = getattr(self.sync_client, method_name)
-            # Run the sync method in a thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                None, lambda: sync_method(*args, **kwargs)
-            )
+            return await run_blocking(sync_method, *args, **kwargs)
 
         return async_method
 
@@ -85,10 +200,22 @@ class AsyncCheckmkClient:
     @async_wrapper("bulk_create_hosts")
     async def bulk_create_hosts(
         self, hosts_data: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+    ) -> Dict[str, Any]:
         """Create multiple hosts in bulk."""
         ...
 
+    @async_wrapper("bulk_update_hosts")
+    async def bulk_update_hosts(
+        self, entries: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Update multiple hosts in bulk."""
+        ...
+
+    @async_wrapper("bulk_delete_hosts")
+    async def bulk_delete_hosts(self, host_names: List[str]) -> Dict[str, Any]:
+        """Delete multiple hosts in bulk."""
+        ...
+
     # get_host_status doesn't exist in sync client, implement as fallback
     async def get_host_status(self, host_name: str) -> Dict[str, Any]:
         """Get host status information."""
@@ -435,6 +562,11 @@ class AsyncCheckmkClient:
         """Get Checkmk version information."""
         ...
 
+    @async_wrapper("_make_request")
+    async def make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Make a REST API request to an endpoint without a dedicated method."""
+        ...
+
     # Helper methods that delegate to sync client without wrapping
     async def test_connection(self) -> bool:
         """Test connection to Checkmk server."""
@@ -463,12 +595,9 @@ class AsyncCheckmkClient:
             Dict containing activation result information
         """
         # Run the sync method in a thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None, 
-            lambda: self.sync_client.activate_changes(
-                sites=sites,
-                force_foreign_changes=force_foreign_changes,
-                redirect=redirect,
-            )
+        return await run_blocking(
+            self.sync_client.activate_changes,
+            sites=sites,
+            force_foreign_changes=force_foreign_changes,
+            redirect=redirect,
         )
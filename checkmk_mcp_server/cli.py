@@ -7,8 +7,6 @@ from typing import Optional, List, Dict
 
 from .config import load_config
 from .api_client import CheckmkClient
-from .llm_client import create_llm_client, LLMProvider
-from .host_operations import HostOperationsManager
 
 # Logging will be imported later when needed
 
@@ -37,7 +35,110 @@ except ImportError:
         return decorator
 
 
-@click.group()
+class LazyGroup(click.Group):
+    """Click group that imports some subcommands only when they are invoked.
+
+    ``lazy_subcommands`` maps a command name to ``"module:attribute"``. The
+    module is imported by ``get_command``, so running one subcommand does not
+    pay for the imports of all the others.
+    """
+
+    def __init__(self, *args, lazy_subcommands: Optional[Dict[str, str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            command = self._load_lazy_command(cmd_name)
+            if command is None:
+                return None
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_lazy_command(self, cmd_name: str) -> Optional[click.Command]:
+        import importlib
+
+        module_name, attribute = self.lazy_subcommands[cmd_name].split(":")
+        try:
+            return getattr(importlib.import_module(module_name), attribute)
+        except ImportError as e:
+            # Optional command group whose dependencies are not installed
+            logging.debug(f"{cmd_name} commands not available: {e}")
+            return None
+
+
+class CLIContext(dict):
+    """Context object whose LLM-backed entries are created on first access.
+
+    The LLM client and the operations managers built on it are only needed
+    by the natural language commands, so they are not created (and the LLM
+    SDK is not imported) for commands that never look them up. If the LLM
+    client cannot be created, all three entries are None.
+    """
+
+    LAZY_KEYS = ("llm_client", "host_manager", "service_manager")
+
+    def __missing__(self, key):
+        if key not in self.LAZY_KEYS:
+            raise KeyError(key)
+        self._create_llm_objects()
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self.LAZY_KEYS and key not in self:
+            self._create_llm_objects()
+        return super().get(key, default)
+
+    def _create_llm_objects(self) -> None:
+        checkmk_client = self["checkmk_client"]
+        app_config = self["config"]
+        try:
+            from .llm_client import create_llm_client
+
+            llm_client = create_llm_client(app_config.llm)
+            self["llm_client"] = llm_client
+
+            # Initialize host operations manager
+            from .host_operations import HostOperationsManager
+
+            self["host_manager"] = HostOperationsManager(
+                checkmk_client, llm_client, app_config
+            )
+
+            # Initialize service operations manager
+            from .service_operations import ServiceOperationsManager
+
+            self["service_manager"] = ServiceOperationsManager(
+                checkmk_client, llm_client, app_config
+            )
+
+        except Exception as e:
+            logging.getLogger(__name__).warning(
+                f"LLM client initialization failed: {e}"
+            )
+            for key in self.LAZY_KEYS:
+                self[key] = None
+
+
+def _profile_startup(ctx, param, value):
+    """Re-run the command under ``-X importtime`` and print the import tree."""
+    if not value or ctx.resilient_parsing:
+        return
+    from .utils.startup import profile_startup
+
+    args = [arg for arg in sys.argv[1:] if arg != "--profile-startup"]
+    ctx.exit(profile_startup("checkmk_mcp_server.cli", args))
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "historical": "checkmk_mcp_server.commands.historical_commands:historical"
+    },
+)
 @click.option(
     "--log-level", default=None, help="Logging level (DEBUG, INFO, WARNING, ERROR)"
 )
@@ -45,11 +146,21 @@ except ImportError:
     "--config", "--config-file", help="Path to configuration file (YAML, TOML, or JSON)"
 )
 @click.option("--request-id", help="Specific request ID to use for tracing (optional)")
+@click.option(
+    "--profile-startup",
+    is_flag=True,
+    expose_value=False,
+    is_eager=True,
+    callback=_profile_startup,
+    help="Run the command and print an import-time tree of its startup",
+)
 @click.pass_context
 @with_request_tracking("CLI Command")
 def cli(ctx, log_level: str, config: Optional[str], request_id: Optional[str]):
     """Checkmk LLM Agent - Natural language interface for Checkmk."""
     ctx.ensure_object(dict)
+    if not isinstance(ctx.obj, CLIContext):
+        ctx.obj = CLIContext(ctx.obj)
 
     # Set request ID if provided, otherwise generate one
     if request_id:
@@ -83,33 +194,8 @@ def cli(ctx, log_level: str, config: Optional[str], request_id: Optional[str]):
         checkmk_client = CheckmkClient(app_config.checkmk)
         ctx.obj["checkmk_client"] = checkmk_client
 
-        # Try to initialize LLM client
-        try:
-            from .llm_client import create_llm_client
-
-            llm_client = create_llm_client(app_config.llm)
-            ctx.obj["llm_client"] = llm_client
-
-            # Initialize host operations manager
-            from .host_operations import HostOperationsManager
-
-            host_manager = HostOperationsManager(checkmk_client, llm_client, app_config)
-            ctx.obj["host_manager"] = host_manager
-
-            # Initialize service operations manager
-            from .service_operations import ServiceOperationsManager
-
-            service_manager = ServiceOperationsManager(
-                checkmk_client, llm_client, app_config
-            )
-            ctx.obj["service_manager"] = service_manager
-
-        except Exception as e:
-            logger.warning(f"LLM client initialization failed: {e}")
-            ctx.obj["llm_client"] = None
-            ctx.obj["host_manager"] = None
-            ctx.obj["service_manager"] = None
-
+        # The LLM client and operations managers are created by CLIContext
+        # when a command first needs them
     except Exception as e:
         logger.error(f"Initialization failed: {e}")
         import click
@@ -2904,14 +2990,5 @@ Examples:
     )
 
 
-# Import and register historical commands
-try:
-    from .commands.historical_commands import historical
-    cli.add_command(historical)
-except ImportError as e:
-    # Historical commands not available, continue without them
-    logging.debug(f"Historical commands not available: {e}")
-
-
 if __name__ == "__main__":
     cli()
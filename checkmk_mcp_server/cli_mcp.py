@@ -40,7 +40,7 @@ logger = logging.getLogger(__name__)
 
 
 def _validate_context_and_input(
-    ctx_obj: Optional[MCPCLIContext], 
+    ctx_obj: Optional["MCPCLIContext"], 
     **validations: Optional[str]
 ) -> None:
     """Helper function to validate CLI context and input parameters.
@@ -64,7 +64,7 @@ def _validate_context_and_input(
 
 def _handle_api_result(
     result: Optional[Dict[str, Any]], 
-    ctx_obj: MCPCLIContext, 
+    ctx_obj: "MCPCLIContext", 
     operation_name: str,
     success_msg: Optional[str] = None,
     format_func: Optional[Callable[[Dict[str, Any]], str]] = None,
@@ -120,6 +120,16 @@ def async_command(f: Callable[..., Awaitable[Any]]) -> Callable[..., Any]:
     return wrapper
 
 
+def _profile_startup(ctx: click.Context, param: click.Parameter, value: bool) -> None:
+    """Re-run the command under ``-X importtime`` and print the import tree."""
+    if not value or ctx.resilient_parsing:
+        return
+    from .utils.startup import profile_startup
+
+    args = [arg for arg in sys.argv[1:] if arg != "--profile-startup"]
+    ctx.exit(profile_startup("checkmk_mcp_server.cli_mcp", args))
+
+
 @click.group()
 @click.option(
     "--config", "-c", type=click.Path(exists=True), help="Path to configuration file"
@@ -134,6 +144,14 @@ def async_command(f: Callable[..., Awaitable[Any]]) -> Callable[..., Any]:
 @click.option("--request-id", help="Specific request ID to use for tracing (optional)")
 @click.option("--no-color", is_flag=True, help="Disable colored output")
 @click.option("--force-direct", is_flag=True, help="Force direct CLI mode (bypass MCP)", hidden=True)
+@click.option(
+    "--profile-startup",
+    is_flag=True,
+    expose_value=False,
+    is_eager=True,
+    callback=_profile_startup,
+    help="Run the command and print an import-time tree of its startup",
+)
 @click.pass_context
 @async_command
 @with_request_tracking("MCP CLI Command")
@@ -1,11 +1,23 @@
 """Common utilities for Checkmk LLM Agent."""
 
+import asyncio
+import inspect
 import logging
 import time
+from contextvars import ContextVar
 from functools import wraps
 from typing import Any, Callable, Dict, Optional, List
 
 
+# Attempt number of the innermost retry_on_failure call (0 for the first try)
+_RETRY_ATTEMPT: ContextVar[int] = ContextVar("retry_attempt", default=0)
+
+
+def get_retry_attempt() -> int:
+    """Get how many times the current retry_on_failure call has been retried."""
+    return _RETRY_ATTEMPT.get()
+
+
 def setup_logging(level: str = "INFO") -> logging.Logger:
     """Set up logging configuration."""
     logging.basicConfig(
@@ -22,6 +34,15 @@ def retry_on_failure(
     """
     Decorator for retrying functions on failure with intelligent retry logic.
 
+    Coroutine functions wait between attempts with ``asyncio.sleep`` so a
+    retry never blocks the event loop; plain functions block their thread while
+    waiting and must therefore run off the event loop thread (e.g. in the executor, as
+    the sync API client does behind AsyncCheckmkClient).
+
+    Retries respect the request's deadline and cancellation (see
+    ``utils.request_context``): no retry is attempted when the backoff would
+    outlast the remaining budget, and a cancelled request stops waiting.
+
     Args:
         max_retries: Maximum number of retry attempts
         delay: Initial delay between retries in seconds
@@ -29,41 +50,71 @@ def retry_on_failure(
     """
 
     def decorator(func: Callable) -> Callable:
+        from .utils.request_context import interruptible_sleep, remaining_time
+
+        logger = logging.getLogger(func.__module__)
+
+        def next_wait(attempt: int, error: Exception) -> float:
+            """Seconds to wait before the next attempt, or raise ``error``."""
+            # Don't retry certain types of errors
+            if not _should_retry_error(error):
+                logger.warning(f"Non-retriable error in {func.__name__}: {error}")
+                raise error
+
+            if attempt < max_retries:
+                wait_time = delay * (backoff_multiplier**attempt)
+                remaining = remaining_time()
+                if remaining is not None and remaining <= wait_time:
+                    logger.warning(
+                        f"Not retrying {func.__name__}: {remaining:.1f}s left before "
+                        f"the deadline, retry would wait {wait_time:.1f}s. Last error: {error}"
+                    )
+                    raise error
+                logger.warning(
+                    f"Attempt {attempt + 1} failed for {func.__name__}: {error}. Retrying in {wait_time:.1f}s..."
+                )
+                return wait_time
+
+            logger.error(
+                f"All {max_retries + 1} attempts failed for {func.__name__}: {error}"
+            )
+            raise error
+
+        def log_attempt(attempt: int) -> None:
+            if attempt > 0:
+                logger.info(
+                    f"Retry attempt {attempt}/{max_retries} for {func.__name__}"
+                )
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                for attempt in range(max_retries + 1):
+                    token = _RETRY_ATTEMPT.set(attempt)
+                    try:
+                        log_attempt(attempt)
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        wait_time = next_wait(attempt, e)
+                    finally:
+                        _RETRY_ATTEMPT.reset(token)
+                    await asyncio.sleep(wait_time)
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            logger = logging.getLogger(func.__module__)
-            last_exception = None
-
             for attempt in range(max_retries + 1):
+                token = _RETRY_ATTEMPT.set(attempt)
                 try:
-                    if attempt > 0:
-                        logger.info(
-                            f"Retry attempt {attempt}/{max_retries} for {func.__name__}"
-                        )
+                    log_attempt(attempt)
                     return func(*args, **kwargs)
-
                 except Exception as e:
-                    last_exception = e
-
-                    # Don't retry certain types of errors
-                    if not _should_retry_error(e):
-                        logger.warning(f"Non-retriable error in {func.__name__}: {e}")
-                        raise e
-
-                    if attempt < max_retries:
-                        wait_time = delay * (backoff_multiplier**attempt)
-                        logger.warning(
-                            f"Attempt {attempt + 1} failed for {func.__name__}: {e}. Retrying in {wait_time:.1f}s..."
-                        )
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        logger.error(
-                            f"All {max_retries + 1} attempts failed for {func.__name__}: {e}"
-                        )
-                        raise last_exception
-
-            raise last_exception
+                    wait_time = next_wait(attempt, e)
+                finally:
+                    _RETRY_ATTEMPT.reset(token)
+                interruptible_sleep(wait_time)
 
         return wrapper
 
@@ -82,6 +133,12 @@ def _should_retry_error(error: Exception) -> bool:
     """
     import requests
 
+    from .utils.request_context import DeadlineExceeded, RequestCancelled
+
+    # The caller no longer wants the result
+    if isinstance(error, (DeadlineExceeded, RequestCancelled)):
+        return False
+
     # Always retry connection errors and timeouts
     if isinstance(
         error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
@@ -24,6 +24,57 @@ except ImportError:
     TOML_AVAILABLE = False
 
 
+class RateLimitConfig(BaseModel):
+    """Process-wide rate limits for Checkmk REST API calls."""
+
+    read_requests_per_second: Optional[float] = Field(
+        default=None, description="Read request rate (None for unlimited)"
+    )
+    read_burst: Optional[int] = Field(
+        default=None, description="Read burst capacity (defaults to one second)"
+    )
+    write_requests_per_second: Optional[float] = Field(
+        default=None, description="Write request rate (None for unlimited)"
+    )
+    write_burst: Optional[int] = Field(
+        default=None, description="Write burst capacity (defaults to one second)"
+    )
+
+    @field_validator(
+        "read_requests_per_second",
+        "read_burst",
+        "write_requests_per_second",
+        "write_burst",
+    )
+    @classmethod
+    def validate_positive(cls, v):
+        """Validate rates and bursts are positive when set."""
+        if v is not None and v <= 0:
+            raise ValueError("Rate limits must be positive (omit for unlimited)")
+        return v
+
+
+class CoalescingConfig(BaseModel):
+    """Sharing of identical concurrent Checkmk API reads."""
+
+    enabled: bool = Field(
+        default=True, description="Share identical in-flight read requests"
+    )
+    ttl: float = Field(
+        default=0.0,
+        description="Seconds a read result is reused after its request finished "
+        "(0 shares in-flight requests only)",
+    )
+
+    @field_validator("ttl")
+    @classmethod
+    def validate_ttl(cls, v: float) -> float:
+        """Validate result TTL."""
+        if v < 0:
+            raise ValueError("TTL cannot be negative")
+        return v
+
+
 class CheckmkConfig(BaseModel):
     """Configuration for Checkmk API connection."""
 
@@ -37,6 +88,14 @@ class CheckmkConfig(BaseModel):
         default=True,
         description="Automatically activate changes after rule modifications",
     )
+    rate_limit: RateLimitConfig = Field(
+        default_factory=RateLimitConfig,
+        description="Rate limits shared by all API calls to this server",
+    )
+    coalescing: CoalescingConfig = Field(
+        default_factory=CoalescingConfig,
+        description="Sharing of identical concurrent read requests",
+    )
 
     @field_validator("server_url")
     @classmethod
@@ -126,6 +185,277 @@ class HistoricalDataConfig(BaseModel):
         return v
 
 
+class BatchConfig(BaseModel):
+    """Configuration for batch processing and background batch jobs."""
+
+    max_concurrent: int = Field(
+        default=10, description="Concurrent operations a batch starts with"
+    )
+    concurrency_ceiling: Optional[int] = Field(
+        default=None,
+        description="Upper bound the adaptive concurrency limit may grow to while "
+        "Checkmk responds quickly (None keeps it at max_concurrent, backoff only)",
+    )
+    max_retries: int = Field(default=3, description="Retry attempts per item")
+    retry_delay: float = Field(default=1.0, description="Delay between retries (seconds)")
+    rate_limit: Optional[int] = Field(
+        default=None, description="Maximum operations per second (None for unlimited)"
+    )
+    jobs_dir: str = Field(
+        default="~/.checkmk_mcp/jobs",
+        description="Directory for background batch job journals",
+    )
+
+    @field_validator("max_concurrent", "max_retries")
+    @classmethod
+    def validate_positive_int(cls, v: int) -> int:
+        """Validate positive integer fields."""
+        if v <= 0:
+            raise ValueError("Value must be positive")
+        return v
+
+    @field_validator("concurrency_ceiling")
+    @classmethod
+    def validate_concurrency_ceiling(cls, v: Optional[int]) -> Optional[int]:
+        """Validate the concurrency ceiling."""
+        if v is not None and v <= 0:
+            raise ValueError("Concurrency ceiling must be positive")
+        return v
+
+
+class MetricsConfig(BaseModel):
+    """Configuration for exporting MCP server metrics."""
+
+    http_enabled: bool = Field(
+        default=False, description="Serve OpenMetrics over a local HTTP listener"
+    )
+    http_host: str = Field(default="127.0.0.1", description="Listener bind address")
+    http_port: int = Field(default=9464, description="Listener port")
+    loop_lag_interval: float = Field(
+        default=0.5, description="Seconds between event loop lag probes"
+    )
+    loop_stall_threshold: Optional[float] = Field(
+        default=None,
+        description="Log the stack of any callback blocking the event loop longer "
+        "than this many seconds (debugging aid; off if unset unless asyncio "
+        "debug mode is on)",
+    )
+    include_breakdown_in_meta: bool = Field(
+        default=False,
+        description="Return each tool call's latency breakdown in the response meta",
+    )
+
+    @field_validator("http_port")
+    @classmethod
+    def validate_port(cls, v: int) -> int:
+        """Validate listener port."""
+        if not 0 <= v <= 65535:
+            raise ValueError("Port must be between 0 and 65535")
+        return v
+
+    @field_validator("loop_lag_interval", "loop_stall_threshold")
+    @classmethod
+    def validate_interval(cls, v: Optional[float]) -> Optional[float]:
+        """Validate probe interval and stall threshold."""
+        if v is not None and v <= 0:
+            raise ValueError("Interval must be positive")
+        return v
+
+
+class TracingConfig(BaseModel):
+    """Configuration for request tracing spans."""
+
+    enabled: bool = Field(default=True, description="Record request tracing spans")
+    buffer_size: int = Field(
+        default=4096, description="Number of finished spans kept in memory"
+    )
+    export_dir: str = Field(
+        default="~/.checkmk_mcp/traces",
+        description="Default directory for exported trace files",
+    )
+
+    @field_validator("buffer_size")
+    @classmethod
+    def validate_buffer_size(cls, v: int) -> int:
+        """Validate span buffer size."""
+        if v <= 0:
+            raise ValueError("Buffer size must be positive")
+        return v
+
+
+class ProfilingConfig(BaseModel):
+    """Configuration for on-demand tool call profiling."""
+
+    output_dir: str = Field(
+        default="~/.checkmk_mcp/profiles",
+        description="Directory for pstats and collapsed-stack profile output",
+    )
+    sample_interval: float = Field(
+        default=0.005, description="Seconds between stack samples in sampling mode"
+    )
+
+    @field_validator("sample_interval")
+    @classmethod
+    def validate_sample_interval(cls, v: float) -> float:
+        """Validate sampling interval."""
+        if v <= 0:
+            raise ValueError("Sample interval must be positive")
+        return v
+
+
+class SlowCallConfig(BaseModel):
+    """Configuration for the slow call log."""
+
+    enabled: bool = Field(default=True, description="Record slow calls")
+    path: str = Field(
+        default="~/.checkmk_mcp/slow_calls.jsonl",
+        description="JSONL file slow call records are appended to",
+    )
+    tool_threshold: float = Field(
+        default=2.0, description="Default tool call threshold in seconds"
+    )
+    request_threshold: float = Field(
+        default=1.0, description="Default Checkmk REST request threshold in seconds"
+    )
+    tool_thresholds: Dict[str, float] = Field(
+        default_factory=dict, description="Per-tool thresholds in seconds"
+    )
+    endpoint_thresholds: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Per-endpoint thresholds in seconds, keyed by endpoint template "
+        "optionally prefixed with the HTTP method",
+    )
+    max_bytes: int = Field(
+        default=10 * 1024 * 1024, description="Size at which the log file is rotated"
+    )
+    backup_count: int = Field(default=3, description="Number of rotated files kept")
+
+    @field_validator("tool_threshold", "request_threshold")
+    @classmethod
+    def validate_threshold(cls, v: float) -> float:
+        """Validate thresholds."""
+        if v < 0:
+            raise ValueError("Threshold must not be negative")
+        return v
+
+
+class ResponseConfig(BaseModel):
+    """Configuration for token-budgeted tool responses."""
+
+    default_max_bytes: Optional[int] = Field(
+        default=None,
+        description="Response budget in bytes for tools that declare none "
+        "(unbounded if unset)",
+    )
+    tool_budgets: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Per-tool response budgets in bytes, overriding the tools' own",
+    )
+    page_cache_size: int = Field(
+        default=64, description="Number of truncated results kept for continuation"
+    )
+    page_ttl: int = Field(
+        default=300, description="Seconds a continuation token stays valid"
+    )
+
+    @field_validator("page_cache_size", "page_ttl")
+    @classmethod
+    def validate_positive(cls, v: int) -> int:
+        """Validate cache size and TTL."""
+        if v <= 0:
+            raise ValueError("Value must be positive")
+        return v
+
+
+class TransportConfig(BaseModel):
+    """Configuration for the HTTP transports of the MCP server.
+
+    Used when the server runs with the ``http`` (streamable HTTP) or ``sse``
+    transport, where many MCP clients share one server process.
+    """
+
+    host: str = Field(default="127.0.0.1", description="HTTP bind address")
+    port: int = Field(default=8765, description="HTTP port (0 picks a free port)")
+    path: str = Field(default="/mcp", description="Streamable HTTP endpoint path")
+    max_sessions: int = Field(
+        default=64, description="Maximum number of concurrent client sessions"
+    )
+    session_idle_timeout: float = Field(
+        default=1800.0,
+        description="Seconds without requests after which a session is closed",
+    )
+    max_calls_per_session: Optional[int] = Field(
+        default=8,
+        description="Concurrent tool calls per session (unbounded if unset)",
+    )
+    json_response: bool = Field(
+        default=False,
+        description="Answer streamable HTTP requests with JSON instead of SSE streams",
+    )
+
+    @field_validator("port")
+    @classmethod
+    def validate_port(cls, v: int) -> int:
+        """Validate HTTP port."""
+        if not 0 <= v <= 65535:
+            raise ValueError("Port must be between 0 and 65535")
+        return v
+
+    @field_validator("path")
+    @classmethod
+    def validate_path(cls, v: str) -> str:
+        """Validate endpoint path."""
+        if not v.startswith("/") or v == "/":
+            raise ValueError("Path must start with '/' and not be the root")
+        return v.rstrip("/")
+
+    @field_validator("max_sessions", "session_idle_timeout", "max_calls_per_session")
+    @classmethod
+    def validate_positive(cls, v):
+        """Validate limits."""
+        if v is not None and v <= 0:
+            raise ValueError("Value must be positive")
+        return v
+
+
+class DeadlineConfig(BaseModel):
+    """Configuration for end-to-end tool call deadlines.
+
+    A tool call's deadline bounds everything it starts: outbound requests
+    get the remaining budget as their timeout, retries stop once it is spent
+    and batch items still waiting are failed. Deadlines are opt-in: tools
+    without one (such as bulk writes, which must not stop partway) run to
+    completion.
+    """
+
+    default_seconds: Optional[float] = Field(
+        default=None,
+        description="Deadline of tool calls that declare none, in seconds "
+        "(no deadline if unset)",
+    )
+    tool_deadlines: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Per-tool deadlines in seconds, overriding the default",
+    )
+
+    @field_validator("default_seconds")
+    @classmethod
+    def validate_default(cls, v: Optional[float]) -> Optional[float]:
+        """Validate default deadline."""
+        if v is not None and v <= 0:
+            raise ValueError("Deadline must be positive")
+        return v
+
+    @field_validator("tool_deadlines")
+    @classmethod
+    def validate_tool_deadlines(cls, v: Dict[str, float]) -> Dict[str, float]:
+        """Validate per-tool deadlines."""
+        for name, seconds in v.items():
+            if seconds <= 0:
+                raise ValueError(f"Deadline of tool '{name}' must be positive")
+        return v
+
+
 class UIConfig(BaseModel):
     """Configuration for UI appearance."""
 
@@ -148,10 +478,47 @@ class AppConfig(BaseModel):
     historical_data: HistoricalDataConfig = Field(
         default_factory=HistoricalDataConfig, description="Historical data configuration"
     )
+    batch: BatchConfig = Field(
+        default_factory=BatchConfig, description="Batch processing configuration"
+    )
+    metrics: MetricsConfig = Field(
+        default_factory=MetricsConfig, description="Metrics export configuration"
+    )
+    tracing: TracingConfig = Field(
+        default_factory=TracingConfig, description="Request tracing configuration"
+    )
+    profiling: ProfilingConfig = Field(
+        default_factory=ProfilingConfig, description="Tool call profiling configuration"
+    )
+    slow_calls: SlowCallConfig = Field(
+        default_factory=SlowCallConfig, description="Slow call log configuration"
+    )
+    responses: ResponseConfig = Field(
+        default_factory=ResponseConfig, description="Tool response budget configuration"
+    )
+    transport: TransportConfig = Field(
+        default_factory=TransportConfig, description="HTTP transport configuration"
+    )
+    deadlines: DeadlineConfig = Field(
+        default_factory=DeadlineConfig, description="Tool call deadline configuration"
+    )
     default_folder: str = Field(
         default="/", description="Default folder for host creation"
     )
     log_level: str = Field(default="INFO", description="Logging level")
+    json_backend: str = Field(
+        default="auto",
+        description="JSON backend for tool results: auto (orjson if installed), "
+        "orjson or stdlib",
+    )
+
+    @field_validator("json_backend")
+    @classmethod
+    def validate_json_backend(cls, v: str) -> str:
+        """Validate JSON backend name."""
+        if v not in ("auto", "orjson", "stdlib"):
+            raise ValueError("JSON backend must be one of auto, orjson, stdlib")
+        return v
 
 
 def load_config_file(config_path: Union[str, Path]) -> Dict[str, Any]:
@@ -274,6 +641,20 @@ def load_config(config_file: Optional[Union[str, Path]] = None) -> AppConfig:
             "max_retries": os.getenv("MAX_RETRIES"),
             "request_timeout": os.getenv("REQUEST_TIMEOUT"),
             "auto_activate_changes": os.getenv("AUTO_ACTIVATE_CHANGES"),
+            "rate_limit": {
+                "read_requests_per_second": os.getenv(
+                    "CHECKMK_RATE_LIMIT_READ_PER_SECOND"
+                ),
+                "read_burst": os.getenv("CHECKMK_RATE_LIMIT_READ_BURST"),
+                "write_requests_per_second": os.getenv(
+                    "CHECKMK_RATE_LIMIT_WRITE_PER_SECOND"
+                ),
+                "write_burst": os.getenv("CHECKMK_RATE_LIMIT_WRITE_BURST"),
+            },
+            "coalescing": {
+                "enabled": os.getenv("CHECKMK_COALESCE_READS"),
+                "ttl": os.getenv("CHECKMK_COALESCE_TTL"),
+            },
         },
         "llm": {
             "openai_api_key": os.getenv("OPENAI_API_KEY"),
@@ -285,6 +666,41 @@ def load_config(config_file: Optional[Union[str, Path]] = None) -> AppConfig:
             "cache_ttl": os.getenv("HISTORICAL_DATA_CACHE_TTL"),
             "scraper_timeout": os.getenv("HISTORICAL_DATA_SCRAPER_TIMEOUT"),
         },
+        "batch": {
+            "jobs_dir": os.getenv("CHECKMK_BATCH_JOBS_DIR"),
+        },
+        "metrics": {
+            "http_enabled": os.getenv("CHECKMK_METRICS_HTTP_ENABLED"),
+            "http_host": os.getenv("CHECKMK_METRICS_HTTP_HOST"),
+            "http_port": os.getenv("CHECKMK_METRICS_HTTP_PORT"),
+            "include_breakdown_in_meta": os.getenv("CHECKMK_METRICS_BREAKDOWN_IN_META"),
+            "loop_stall_threshold": os.getenv("CHECKMK_LOOP_STALL_THRESHOLD"),
+        },
+        "tracing": {
+            "enabled": os.getenv("CHECKMK_TRACING_ENABLED"),
+            "buffer_size": os.getenv("CHECKMK_TRACING_BUFFER_SIZE"),
+            "export_dir": os.getenv("CHECKMK_TRACING_EXPORT_DIR"),
+        },
+        "profiling": {
+            "output_dir": os.getenv("CHECKMK_PROFILING_OUTPUT_DIR"),
+        },
+        "slow_calls": {
+            "enabled": os.getenv("CHECKMK_SLOW_CALLS_ENABLED"),
+            "path": os.getenv("CHECKMK_SLOW_CALLS_PATH"),
+            "tool_threshold": os.getenv("CHECKMK_SLOW_CALLS_TOOL_THRESHOLD"),
+            "request_threshold": os.getenv("CHECKMK_SLOW_CALLS_REQUEST_THRESHOLD"),
+        },
+        "responses": {
+            "default_max_bytes": os.getenv("CHECKMK_RESPONSE_MAX_BYTES"),
+        },
+        "transport": {
+            "host": os.getenv("CHECKMK_MCP_HTTP_HOST"),
+            "port": os.getenv("CHECKMK_MCP_HTTP_PORT"),
+            "max_sessions": os.getenv("CHECKMK_MCP_MAX_SESSIONS"),
+        },
+        "deadlines": {
+            "default_seconds": os.getenv("CHECKMK_TOOL_DEADLINE"),
+        },
         "ui": {
             "theme": os.getenv("CHECKMK_UI_THEME"),
             "use_colors": os.getenv("CHECKMK_UI_USE_COLORS"),
@@ -300,6 +716,7 @@ def load_config(config_file: Optional[Union[str, Path]] = None) -> AppConfig:
         },
         "default_folder": os.getenv("DEFAULT_FOLDER"),
         "log_level": os.getenv("LOG_LEVEL"),
+        "json_backend": os.getenv("CHECKMK_JSON_BACKEND"),
     }
 
     # Remove None values from env config
@@ -323,6 +740,8 @@ def load_config(config_file: Optional[Union[str, Path]] = None) -> AppConfig:
         max_retries=int(checkmk_data.get("max_retries", 3)),
         request_timeout=int(checkmk_data.get("request_timeout", 30)),
         auto_activate_changes=bool(checkmk_data.get("auto_activate_changes", True)),
+        rate_limit=RateLimitConfig(**(checkmk_data.get("rate_limit") or {})),
+        coalescing=CoalescingConfig(**(checkmk_data.get("coalescing") or {})),
     )
 
     llm_data = final_config.get("llm", {})
@@ -383,11 +802,29 @@ def load_config(config_file: Optional[Union[str, Path]] = None) -> AppConfig:
         scraper_timeout=scraper_timeout,
     )
 
+    batch_config = BatchConfig(**(final_config.get("batch") or {}))
+    metrics_config = MetricsConfig(**(final_config.get("metrics") or {}))
+    tracing_config = TracingConfig(**(final_config.get("tracing") or {}))
+    profiling_config = ProfilingConfig(**(final_config.get("profiling") or {}))
+    slow_call_config = SlowCallConfig(**(final_config.get("slow_calls") or {}))
+    response_config = ResponseConfig(**(final_config.get("responses") or {}))
+    transport_config = TransportConfig(**(final_config.get("transport") or {}))
+    deadline_config = DeadlineConfig(**(final_config.get("deadlines") or {}))
+
     return AppConfig(
         checkmk=checkmk_config,
         llm=llm_config,
         ui=ui_config,
         historical_data=historical_data_config,
+        batch=batch_config,
+        metrics=metrics_config,
+        tracing=tracing_config,
+        profiling=profiling_config,
+        slow_calls=slow_call_config,
+        responses=response_config,
+        transport=transport_config,
+        deadlines=deadline_config,
         default_folder=final_config.get("default_folder", "/"),
         log_level=final_config.get("log_level", "INFO"),
+        json_backend=final_config.get("json_backend", "auto"),
     )
@@ -1,26 +1,38 @@
 """LLM client for natural language processing of Checkmk operations."""
 
+import importlib
+import importlib.util
 import json
 import logging
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any, Tuple, cast
 from enum import Enum
 
-try:
-    import openai
+from .config import LLMConfig
 
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# The provider SDKs take seconds to import; only check that they are
+# installed here and import the selected one when its client is created.
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+ANTHROPIC_AVAILABLE = importlib.util.find_spec("anthropic") is not None
 
-try:
-    import anthropic
 
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+def _sdk(name: str) -> Any:
+    """Get a provider SDK module, importing it on first use.
 
-from .config import LLMConfig
+    An SDK module patched onto this module takes precedence.
+    """
+    module = globals().get(name)
+    if module is None:
+        module = importlib.import_module(name)
+        globals()[name] = module
+    return module
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve the ``openai`` and ``anthropic`` SDK modules lazily (see _sdk)."""
+    if name in ("openai", "anthropic"):
+        return _sdk(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class LLMProvider(Enum):
@@ -108,7 +120,7 @@ class OpenAIClient(LLMClient):
         if not config.openai_api_key:
             raise ValueError("OpenAI API key not provided")
 
-        self.client = openai.OpenAI(api_key=config.openai_api_key)
+        self.client = _sdk("openai").OpenAI(api_key=config.openai_api_key)
         self.model = config.default_model
 
     def parse_command(self, user_input: str) -> ParsedCommand:
@@ -414,7 +426,7 @@ class AnthropicClient(LLMClient):
         if not config.anthropic_api_key:
             raise ValueError("Anthropic API key not provided")
 
-        self.client = anthropic.Anthropic(api_key=config.anthropic_api_key)
+        self.client = _sdk("anthropic").Anthropic(api_key=config.anthropic_api_key)
         self.model = "claude-3-haiku-20240307"  # Fast model for parsing
 
     def parse_command(self, user_input: str) -> ParsedCommand:
@@ -272,11 +272,14 @@ class RegistryConfig:
             "category": "advanced",
             "tools": [
                 "batch_create_hosts",
+                "get_batch_status",
+                "cancel_batch",
+                "resume_batch",
                 "get_system_info",
                 "clear_cache",
             ],
             "required_services": [],
-            "optional_services": ["batch_processor", "cached_host_service"]
+            "optional_services": ["batch_processor", "batch_jobs", "cached_host_service"]
         }
 
     def get_all_tool_configs(self) -> Dict[str, Dict[str, Any]]:
@@ -5,7 +5,19 @@ service lifecycle in the MCP server architecture.
 """
 
 import logging
-from typing import Dict, Any, Optional, TypeVar, Type
+import time
+from collections.abc import Mapping
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+)
 
 from ..config import AppConfig
 from ..async_api_client import AsyncCheckmkClient
@@ -14,22 +26,42 @@ from ..services import HostService, StatusService, ServiceService, ParameterServ
 from ..services.event_service import EventService
 from ..services.metrics_service import MetricsService
 from ..services.bi_service import BIService
-from ..services.historical_service import HistoricalDataService, CachedHistoricalDataService
-from ..services.streaming import StreamingHostService, StreamingServiceService
-from ..services.cache import CachedHostService
-from ..services.batch import BatchProcessor
+
+if TYPE_CHECKING:
+    from ..services.jobs import BatchJobManager
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
 
+class LazyServices(Mapping):
+    """Read-only mapping of a container's services, built on first access."""
+
+    def __init__(self, container: "ServiceContainer"):
+        self._container = container
+
+    def __getitem__(self, name: str) -> Any:
+        return self._container.get_service(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._container.get_service_names())
+
+    def __len__(self) -> int:
+        return len(self._container.get_service_names())
+
+
 class ServiceContainer:
     """
     Dependency injection container for managing service instances.
     
     This container manages the lifecycle of all services and provides
     clean dependency injection for the MCP server components.
+    
+    Only the API clients are created by ``initialize``. Every other service
+    is registered as a factory and built on its first ``get_service``, so
+    optional subsystems (historical scraping, streaming, caching, batch
+    jobs) and their imports cost nothing until a tool uses them.
     """
     
     def __init__(self, config: AppConfig):
@@ -40,10 +72,12 @@ class ServiceContainer:
         """
         self.config = config
         self._services: Dict[str, Any] = {}
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._build_times: Dict[str, float] = {}
         self._initialized = False
         
     async def initialize(self) -> None:
-        """Initialize all services in proper dependency order."""
+        """Create the API clients and register the service factories."""
         if self._initialized:
             return
             
@@ -54,41 +88,125 @@ class ServiceContainer:
             self._services['async_client'] = async_client
             self._services['sync_client'] = sync_client
             
-            # Initialize core services
-            self._services['host_service'] = HostService(async_client, self.config)
-            self._services['status_service'] = StatusService(async_client, self.config)
-            self._services['service_service'] = ServiceService(async_client, self.config)
-            self._services['parameter_service'] = ParameterService(async_client, self.config)
-            self._services['event_service'] = EventService(async_client, self.config)
-            self._services['metrics_service'] = MetricsService(async_client, self.config)
-            self._services['bi_service'] = BIService(async_client, self.config)
-            self._services['historical_service'] = CachedHistoricalDataService(async_client, self.config)
+            self._register_service_factories(async_client)
             
-            # Initialize services
-            self._services['streaming_host_service'] = StreamingHostService(async_client, self.config)
-            self._services['streaming_service_service'] = StreamingServiceService(async_client, self.config)
-            self._services['cached_host_service'] = CachedHostService(async_client, self.config)
+            self._initialized = True
+            logger.info(
+                f"Service container initialized with {len(self._factories)} "
+                f"lazily created services"
+            )
+            
+        except Exception as e:
+            logger.exception("Failed to initialize service container")
+            raise RuntimeError(f"Service container initialization failed: {str(e)}")
+    
+    def register_factory(self, service_name: str, factory: Callable[[], Any]) -> None:
+        """Register a factory that builds a service on its first use.
+        
+        Args:
+            service_name: Name the service is retrieved by
+            factory: Callable without arguments returning the service
+        """
+        self._factories[service_name] = factory
+        self._services.pop(service_name, None)
+    
+    def _register_service_factories(self, async_client: AsyncCheckmkClient) -> None:
+        """Register the factories of all services in the container.
+        
+        Optional subsystems are imported inside their factories so that
+        their dependencies are only loaded when the service is first used.
+        
+        Args:
+            async_client: Client shared by all services
+        """
+        config = self.config
+        
+        # Core services
+        for name, service_class in (
+            ('host_service', HostService),
+            ('status_service', StatusService),
+            ('service_service', ServiceService),
+            ('parameter_service', ParameterService),
+            ('event_service', EventService),
+            ('metrics_service', MetricsService),
+            ('bi_service', BIService),
+        ):
+            self.register_factory(
+                name, lambda service_class=service_class: service_class(async_client, config)
+            )
+        
+        def historical_service():
+            # Pulls in the web scraping stack (BeautifulSoup, lxml)
+            from ..services.historical_service import CachedHistoricalDataService
+            return CachedHistoricalDataService(async_client, config)
+        
+        def streaming_host_service():
+            from ..services.streaming import StreamingHostService
+            return StreamingHostService(async_client, config)
+        
+        def streaming_service_service():
+            from ..services.streaming import StreamingServiceService
+            return StreamingServiceService(async_client, config)
+        
+        def cached_host_service():
+            from ..services.cache import CachedHostService
+            return CachedHostService(async_client, config)
+        
+        def batch_processor():
+            from ..services.batch import BatchProcessor
             # Initialize batch processor with configuration parameters
-            batch_config = getattr(self.config, 'batch', None)
+            batch_config = getattr(config, 'batch', None)
             if batch_config:
-                self._services['batch_processor'] = BatchProcessor(
+                return BatchProcessor(
                     max_concurrent=getattr(batch_config, 'max_concurrent', 5),
                     max_retries=getattr(batch_config, 'max_retries', 3),
                     retry_delay=getattr(batch_config, 'retry_delay', 1.0),
-                    rate_limit=getattr(batch_config, 'rate_limit', None)
+                    rate_limit=getattr(batch_config, 'rate_limit', None),
+                    concurrency_ceiling=getattr(batch_config, 'concurrency_ceiling', None),
                 )
-            else:
-                self._services['batch_processor'] = BatchProcessor()
-            
-            self._initialized = True
-            logger.info(f"Service container initialized with {len(self._services)} services")
-            
-        except Exception as e:
-            logger.exception("Failed to initialize service container")
-            raise RuntimeError(f"Service container initialization failed: {str(e)}")
+            return BatchProcessor()
+        
+        def batch_jobs():
+            from ..services.jobs import BatchJobManager
+            # Background batch jobs journal their progress so they survive restarts
+            jobs_dir = getattr(getattr(config, 'batch', None), 'jobs_dir', None)
+            if not isinstance(jobs_dir, str):
+                jobs_dir = "~/.checkmk_mcp/jobs"
+            jobs = BatchJobManager(self.get_service('batch_processor'), jobs_dir)
+            self._register_batch_job_operations(jobs)
+            return jobs
+        
+        self.register_factory('historical_service', historical_service)
+        self.register_factory('streaming_host_service', streaming_host_service)
+        self.register_factory('streaming_service_service', streaming_service_service)
+        self.register_factory('cached_host_service', cached_host_service)
+        self.register_factory('batch_processor', batch_processor)
+        self.register_factory('batch_jobs', batch_jobs)
     
+    def _register_batch_job_operations(self, jobs: "BatchJobManager") -> None:
+        """Register the operations that can run as background batch jobs.
+
+        Only operations that a tool can start are registered; currently
+        batch_create_hosts with ``background``.
+        
+        Args:
+            jobs: Job manager to register the operations with
+        """
+        host_service = self.get_service('host_service')
+
+        async def create_hosts(chunk: List[Dict[str, Any]]):
+            result = await host_service.bulk_planner.create_hosts(chunk)
+            return [(entry.success, entry.error) for entry in result.results]
+
+        jobs.register_operation(
+            "create_hosts",
+            create_hosts,
+            chunk_size=host_service.bulk_planner.chunk_size,
+            item_label=lambda host: host.get("host_name") or host.get("name", ""),
+        )
+
     def get_service(self, service_name: str, service_type: Optional[Type[T]] = None) -> T:
-        """Get a service instance by name.
+        """Get a service instance by name, building it on first use.
         
         Args:
             service_name: Name of the service to retrieve
@@ -103,11 +221,23 @@ class ServiceContainer:
         """
         if not self._initialized:
             raise RuntimeError("Service container not initialized. Call initialize() first.")
+        
+        service = self._services.get(service_name)
+        if service is not None:
+            return service
             
-        if service_name not in self._services:
+        factory = self._factories.get(service_name)
+        if factory is None:
             raise KeyError(f"Service '{service_name}' not found in container")
-            
-        return self._services[service_name]
+        
+        started = time.perf_counter()
+        service = self._services[service_name] = factory()
+        self._build_times[service_name] = time.perf_counter() - started
+        logger.debug(
+            f"Created service '{service_name}' in "
+            f"{self._build_times[service_name] * 1000:.1f}ms"
+        )
+        return service
     
     def has_service(self, service_name: str) -> bool:
         """Check if a service is registered.
@@ -116,18 +246,60 @@ class ServiceContainer:
             service_name: Name of the service to check
             
         Returns:
-            True if service is registered, False otherwise
+            True if service is registered (built or not), False otherwise
+        """
+        return service_name in self._services or service_name in self._factories
+    
+    def is_service_created(self, service_name: str) -> bool:
+        """Check if a service has been built.
+        
+        Args:
+            service_name: Name of the service to check
+            
+        Returns:
+            True if the service instance exists, False otherwise
         """
         return service_name in self._services
     
+    def get_service_names(self) -> List[str]:
+        """Get the names of all registered services.
+        
+        Returns:
+            Service names, built or not
+        """
+        return list(self._services) + [
+            name for name in self._factories if name not in self._services
+        ]
+    
+    def get_service_map(self) -> LazyServices:
+        """Get a mapping of all services that builds each on first access.
+        
+        Returns:
+            Read-only mapping of service name to service instance
+        """
+        return LazyServices(self)
+    
     def get_all_services(self) -> Dict[str, Any]:
-        """Get all registered services.
+        """Get all registered services, building any not created yet.
+        
+        Prefer ``get_service_map`` where not every service is needed.
         
         Returns:
             Dictionary of service name to service instance
         """
+        if self._initialized:
+            for name in self.get_service_names():
+                self.get_service(name)
         return self._services.copy()
     
+    def get_build_times(self) -> Dict[str, float]:
+        """Get the construction time of each service built so far.
+        
+        Returns:
+            Dictionary of service name to seconds spent in its factory
+        """
+        return dict(self._build_times)
+    
     def is_initialized(self) -> bool:
         """Check if the container has been initialized.
         
@@ -140,6 +312,9 @@ class ServiceContainer:
         """Shutdown the service container and cleanup resources."""
         try:
             # Cleanup services that need explicit shutdown
+            if 'batch_jobs' in self._services:
+                await self._services['batch_jobs'].shutdown()
+
             if 'batch_processor' in self._services:
                 batch_processor = self._services['batch_processor']
                 if hasattr(batch_processor, 'shutdown'):
@@ -147,6 +322,8 @@ class ServiceContainer:
             
             # Clear all services
             self._services.clear()
+            self._factories.clear()
+            self._build_times.clear()
             self._initialized = False
             
             logger.info("Service container shutdown completed")
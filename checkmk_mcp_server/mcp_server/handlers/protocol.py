@@ -1,6 +1,7 @@
 """MCP protocol handlers for resources and prompts."""
 
 import logging
+from urllib.parse import parse_qs
 from typing import List, Dict, Optional, Any, Callable, Awaitable
 
 from mcp.types import Resource, Prompt, PromptMessage, GetPromptResult, TextContent
@@ -9,6 +10,7 @@ from pydantic import AnyUrl
 
 from ...services.models.services import ServiceState
 from ...services.metrics import get_metrics_collector
+from ...services.openmetrics import render_openmetrics
 from ..utils.serialization import safe_json_dumps
 
 logger = logging.getLogger(__name__)
@@ -90,13 +92,19 @@ class ProtocolHandlers:
             Resource(
                 uri=AnyUrl("checkmk://stream/hosts"),
                 name="Host Stream",
-                description="Streaming host data for large environments",
+                description=(
+                    "Streaming host data for large environments, one NDJSON line per "
+                    "host in bounded pages; a final next_cursor line links the next page"
+                ),
                 mimeType="application/x-ndjson",
             ),
             Resource(
                 uri=AnyUrl("checkmk://stream/services"),
                 name="Service Stream",
-                description="Streaming service data for large environments",
+                description=(
+                    "Streaming service data for large environments, one NDJSON line per "
+                    "service in bounded pages; a final next_cursor line links the next page"
+                ),
                 mimeType="application/x-ndjson",
             ),
             Resource(
@@ -105,6 +113,12 @@ class ProtocolHandlers:
                 description="MCP server performance metrics",
                 mimeType="application/json",
             ),
+            Resource(
+                uri=AnyUrl("checkmk://metrics/openmetrics"),
+                name="Server Metrics (OpenMetrics)",
+                description="MCP server metrics in OpenMetrics text format for Prometheus-compatible scrapers",
+                mimeType="application/openmetrics-text",
+            ),
             Resource(
                 uri=AnyUrl("checkmk://cache/stats"),
                 name="Cache Statistics",
@@ -122,6 +136,12 @@ class ProtocolHandlers:
         """
         return self.get_basic_resources() + self.get_streaming_resources()
 
+    @staticmethod
+    def _cursor_args(uri_str: str) -> Dict[str, str]:
+        """Extract the page cursor from a stream resource URI, if any."""
+        cursors = parse_qs(uri_str.partition("?")[2]).get("cursor")
+        return {"cursor": cursors[0]} if cursors else {}
+
     async def handle_read_resource(
         self,
         uri: AnyUrl,
@@ -180,18 +200,21 @@ class ProtocolHandlers:
                 result = await service_provider.status_service.get_performance_metrics()
                 return service_provider._handle_service_result(result)
 
-            # Streaming resources
-            elif uri_str == "checkmk://stream/hosts":
-                return await service_provider._stream_hosts_resource()
+            # Streaming resources (later pages are read with ?cursor=...)
+            elif uri_str.partition("?")[0] == "checkmk://stream/hosts":
+                return await service_provider._stream_hosts_resource(**self._cursor_args(uri_str))
 
-            elif uri_str == "checkmk://stream/services":
-                return await service_provider._stream_services_resource()
+            elif uri_str.partition("?")[0] == "checkmk://stream/services":
+                return await service_provider._stream_services_resource(**self._cursor_args(uri_str))
 
             # Advanced metrics
             elif uri_str == "checkmk://metrics/server":
                 stats = await get_metrics_collector().get_stats()
                 return safe_json_dumps(stats)
 
+            elif uri_str == "checkmk://metrics/openmetrics":
+                return render_openmetrics()
+
             elif uri_str == "checkmk://cache/stats":
                 if hasattr(service_provider, 'cached_host_service') and service_provider.cached_host_service:
                     cache_stats = await service_provider.cached_host_service.get_cache_stats()
@@ -1,16 +1,36 @@
 """Tool registry for MCP server - manages tool registration and discovery."""
 
+import asyncio
+import contextlib
+import inspect
 import logging
-from typing import Dict, List, Callable, Awaitable, Any, Optional
+import weakref
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Callable, Awaitable, Any, Optional
 
 from mcp.types import Tool
 from mcp.server import Server
 
+from ...utils.call_breakdown import (
+    CallBreakdown,
+    clear_breakdown,
+    phase,
+    start_breakdown,
+)
+from ...utils.profiling import get_tool_profiler
 from ...utils.request_context import (
+    DeadlineExceeded,
+    deadline_scope,
     generate_request_id,
+    remaining_time,
     set_request_id,
 )
+from ...utils.slow_calls import get_slow_call_log
+from ...utils.startup import get_startup_timer
+from ...utils.tracing import end_span, start_span
+from ...services.metrics import get_metrics_collector
 from ..utils.serialization import safe_json_dumps
+from .shaping import CONTINUATION_ARGUMENT, ResponseShaper
 
 logger = logging.getLogger(__name__)
 
@@ -26,11 +46,52 @@ class ToolRegistry:
     - Handler function mapping
     """
 
-    def __init__(self):
-        """Initialize the tool registry."""
+    def __init__(
+        self,
+        include_breakdown_in_meta: bool = False,
+        max_breakdowns: int = 256,
+        default_max_response_bytes: Optional[int] = None,
+        response_budgets: Optional[Dict[str, int]] = None,
+        response_shaper: Optional[ResponseShaper] = None,
+        max_calls_per_session: Optional[int] = None,
+        default_deadline: Optional[float] = None,
+        deadlines: Optional[Dict[str, float]] = None,
+    ):
+        """Initialize the tool registry.
+
+        Args:
+            include_breakdown_in_meta: Return each call's latency breakdown in
+                the response meta
+            max_breakdowns: Number of recent breakdowns kept for lookup by
+                request ID
+            default_max_response_bytes: Response budget of tools that declare
+                none (None leaves their responses unbounded)
+            response_budgets: Per-tool response budgets in bytes, overriding
+                the budgets tools declare in their metadata
+            response_shaper: Shaper that truncates over-budget responses
+            max_calls_per_session: Concurrent tool calls each MCP session may
+                run; further calls wait (None for unbounded)
+            default_deadline: Seconds a tool call may take, for tools that
+                declare no deadline (None for no deadline)
+            deadlines: Per-tool deadlines in seconds, overriding the
+                deadlines tools declare in their metadata
+        """
         self._tools: Dict[str, Tool] = {}
         self._tool_handlers: Dict[str, Callable[..., Awaitable[Any]]] = {}
         self._tool_metadata: Dict[str, Dict[str, Any]] = {}
+        self._signatures: Dict[str, inspect.Signature] = {}
+        self._breakdowns: "OrderedDict[str, CallBreakdown]" = OrderedDict()
+        self.include_breakdown_in_meta = include_breakdown_in_meta
+        self.max_breakdowns = max_breakdowns
+        self.default_max_response_bytes = default_max_response_bytes
+        self.response_budgets: Dict[str, int] = dict(response_budgets or {})
+        self.response_shaper = response_shaper or ResponseShaper()
+        self.max_calls_per_session = max_calls_per_session
+        self.default_deadline = default_deadline
+        self.deadlines: Dict[str, float] = dict(deadlines or {})
+        self._session_slots: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
 
     def register_tool(self, name: str, tool: Tool, handler: Callable[..., Awaitable[Any]], metadata: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -40,7 +101,9 @@ class ToolRegistry:
             name: Tool name/identifier
             tool: MCP Tool definition
             handler: Async function to handle tool calls
-            metadata: Optional metadata for the tool (category, priority, etc.)
+            metadata: Optional metadata for the tool (category, priority, etc.);
+                ``max_response_bytes`` declares the tool's response budget and
+                ``deadline_seconds`` its deadline
         """
         if name in self._tools:
             logger.warning(f"Tool '{name}' is already registered, overwriting")
@@ -48,9 +111,61 @@ class ToolRegistry:
         self._tools[name] = tool
         self._tool_handlers[name] = handler
         self._tool_metadata[name] = metadata or {}
+        self._signatures.pop(name, None)
+        if self.get_response_budget(name):
+            self._add_continuation_argument(tool)
         
         logger.debug(f"Registered tool: {name}")
 
+    def get_response_budget(self, name: str) -> Optional[int]:
+        """
+        Get the response budget of a tool.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            int or None: Maximum response size in bytes, None if unbounded
+        """
+        if name in self.response_budgets:
+            return self.response_budgets[name]
+        return (
+            self._tool_metadata.get(name, {}).get("max_response_bytes")
+            or self.default_max_response_bytes
+        )
+
+    def get_tool_deadline(self, name: str) -> Optional[float]:
+        """
+        Get the deadline of a tool.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            float or None: Seconds a call may take, None for no deadline
+        """
+        if name in self.deadlines:
+            return self.deadlines[name]
+        metadata = self._tool_metadata.get(name, {})
+        # An explicit None in the metadata opts the tool out of the default
+        if "deadline_seconds" in metadata:
+            return metadata["deadline_seconds"]
+        return self.default_deadline
+
+    @staticmethod
+    def _add_continuation_argument(tool: Tool) -> None:
+        """Advertise the continuation token argument in a tool's input schema."""
+        properties = tool.inputSchema.setdefault("properties", {})
+        properties.setdefault(
+            CONTINUATION_ARGUMENT,
+            {
+                "type": "string",
+                "description": "Token from a truncated response's pagination "
+                "block; returns the next page of that response instead of "
+                "running the tool again",
+            },
+        )
+
     def unregister_tool(self, name: str) -> bool:
         """
         Unregister a tool by name.
@@ -67,6 +182,7 @@ class ToolRegistry:
         del self._tools[name]
         del self._tool_handlers[name]
         del self._tool_metadata[name]
+        self._signatures.pop(name, None)
         
         logger.debug(f"Unregistered tool: {name}")
         return True
@@ -191,70 +307,237 @@ class ToolRegistry:
         @server.list_tools()
         async def list_tools() -> List[Tool]:
             """List all available MCP tools."""
-            return self.list_tools()
+            tools = self.list_tools()
+            get_startup_timer().mark_first_list_tools()
+            return tools
 
         @server.call_tool()
         async def call_tool(name: str, arguments: dict):
             """Handle MCP tool calls with request ID tracking."""
-            # Generate unique request ID for this tool call
-            request_id = generate_request_id()
-            set_request_id(request_id)
+            async with self._session_slot():
+                return await self.execute_tool_call(name, arguments, services_check_func)
+
+    @contextlib.asynccontextmanager
+    async def _session_slot(self) -> AsyncIterator[None]:
+        """
+        Hold one of the current MCP session's tool call slots.
+
+        With many clients on one server (HTTP transports) this keeps a single
+        session from occupying the shared API connection pool.
+        """
+        if self.max_calls_per_session is None:
+            yield
+            return
+        try:
+            from mcp.server.lowlevel.server import request_ctx
+
+            session = request_ctx.get().session
+        except LookupError:
+            yield
+            return
 
-            logger.info(
-                f"[{request_id}] MCP tool call: {name} with arguments: {arguments}"
+        slots = self._session_slots.get(session)
+        if slots is None:
+            slots = asyncio.Semaphore(self.max_calls_per_session)
+            self._session_slots[session] = slots
+        async with slots:
+            yield
+
+    async def execute_tool_call(
+        self,
+        name: str,
+        arguments: Optional[Dict[str, Any]],
+        services_check_func: Callable[[], bool],
+    ) -> Dict[str, Any]:
+        """
+        Run a tool call and build the raw MCP response.
+
+        Responses over the tool's budget are truncated to their first page by
+        the response shaper; a ``continuation_token`` argument fetches the next
+        page from the shaper's cache without calling the handler.
+
+        The call runs under the tool's deadline (see ``get_tool_deadline``),
+        which is carried in the request context: outbound requests made on its
+        behalf time out with the remaining budget, retries stop when it is
+        spent, and the handler is cancelled once it passes.
+
+        The call's wall time is broken down into argument validation, handler
+        time (with REST calls and model conversion attributed inside it) and
+        serialization, keyed by the request ID. Breakdowns are aggregated into
+        the metrics collector and optionally returned in the response meta.
+
+        Args:
+            name: Tool name
+            arguments: Tool arguments
+            services_check_func: Function to check if services are initialized
+
+        Returns:
+            Dict: Raw CallToolResult fields
+        """
+        # Generate unique request ID for this tool call
+        request_id = generate_request_id()
+        set_request_id(request_id)
+        arguments = arguments or {}
+
+        logger.info(
+            f"[{request_id}] MCP tool call: {name} with arguments: {arguments}"
+        )
+
+        if not services_check_func():
+            raise RuntimeError("Services not initialized")
+
+        handler = self.get_tool_handler(name)
+        if not handler:
+            raise ValueError(f"Unknown tool: {name}")
+
+        breakdown = start_breakdown(request_id, name)
+        trace, trace_token = start_span("mcp.tool_call", kind="server", tool=name)
+        status = "error"
+        error: Optional[Exception] = None
+        result: Any = None
+        try:
+            continuation = arguments.get(CONTINUATION_ARGUMENT)
+            if continuation is not None:
+                with phase("handler"):
+                    result = await self.response_shaper.next_page(name, continuation)
+            else:
+                with deadline_scope(self.get_tool_deadline(name)):
+                    result = await self._run_handler(name, handler, arguments, request_id)
+            status = (
+                "failed"
+                if isinstance(result, dict) and result.get("success") is False
+                else "ok"
             )
 
-            if not services_check_func():
-                raise RuntimeError("Services not initialized")
-
-            handler = self.get_tool_handler(name)
-            if not handler:
-                raise ValueError(f"Unknown tool: {name}")
-
-            try:
-                result = await handler(**arguments)
-
-                # Add request ID to result if possible
-                if isinstance(result, dict):
-                    result["request_id"] = request_id
-
-                logger.info(f"[{request_id}] MCP tool '{name}' completed successfully")
-
-                # Return raw dict to avoid MCP framework tuple construction bug
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": safe_json_dumps(result),
-                            "annotations": None,
-                            "meta": {"request_id": request_id},
-                        }
-                    ],
-                    "isError": False,
-                    "meta": {"request_id": request_id},
-                    "structuredContent": None,
-                }
-            except Exception as e:
-                logger.exception(f"[{request_id}] Error calling tool {name}")
-
-                # Return raw dict for error case too
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": str(e),
-                            "annotations": None,
-                            "meta": {"request_id": request_id},
-                        }
-                    ],
-                    "isError": True,
+            # Add request ID to result if possible
+            if isinstance(result, dict):
+                result["request_id"] = request_id
+
+            with phase("serialization"):
+                text = safe_json_dumps(result)
+                response_bytes = len(text.encode("utf-8"))
+                budget = self.get_response_budget(name)
+                if budget and continuation is None and response_bytes > budget:
+                    result = await self.response_shaper.shape(name, result, budget)
+                    text = safe_json_dumps(result)
+                    response_bytes = len(text.encode("utf-8"))
+            breakdown.response_bytes = response_bytes
+
+            logger.info(f"[{request_id}] MCP tool '{name}' completed successfully")
+            is_error = False
+
+        except Exception as e:
+            logger.exception(f"[{request_id}] Error calling tool {name}")
+            text = str(e)
+            is_error = True
+            error = e
+
+        finally:
+            clear_breakdown()
+            breakdown.finish()
+            self._record_breakdown(breakdown, status)
+            get_slow_call_log().check_tool_call(breakdown, arguments, status, result)
+            if trace is not None:
+                trace.set_attribute("status", status)
+                trace.set_attribute("response_bytes", breakdown.response_bytes)
+            end_span(trace, trace_token, error)
+
+        meta: Dict[str, Any] = {"request_id": request_id}
+        if self.include_breakdown_in_meta:
+            meta["breakdown"] = breakdown.to_dict()
+
+        # Return raw dict to avoid MCP framework tuple construction bug
+        return {
+            "content": [
+                {
+                    "type": "text",
+                    "text": text,
+                    "annotations": None,
                     "meta": {"request_id": request_id},
-                    "structuredContent": None,
                 }
+            ],
+            "isError": is_error,
+            "meta": meta,
+            "structuredContent": None,
+        }
+
+    async def _run_handler(
+        self,
+        name: str,
+        handler: Callable[..., Awaitable[Any]],
+        arguments: Dict[str, Any],
+        request_id: str,
+    ) -> Any:
+        """Validate the arguments and run a tool handler."""
+        with phase("validation"):
+            self._get_signature(name, handler).bind(**arguments)
+
+        profiler = get_tool_profiler()
+        capture = profiler.start_call(name, request_id) if profiler.armed else None
+        try:
+            with phase("handler"):
+                remaining = remaining_time()
+                if remaining is None:
+                    return await handler(**arguments)
+                try:
+                    return await asyncio.wait_for(handler(**arguments), remaining)
+                except asyncio.TimeoutError as e:
+                    if remaining_time() != 0 or isinstance(e, DeadlineExceeded):
+                        raise
+                    raise DeadlineExceeded(
+                        f"Tool '{name}' did not finish before its deadline"
+                    ) from e
+        finally:
+            if capture is not None:
+                profiler.finish_call(capture)
+
+    def _get_signature(self, name: str, handler: Callable[..., Any]) -> inspect.Signature:
+        """Get the cached call signature of a tool handler."""
+        signature = self._signatures.get(name)
+        if signature is None:
+            signature = self._signatures[name] = inspect.signature(handler)
+        return signature
+
+    def _record_breakdown(self, breakdown: CallBreakdown, status: str) -> None:
+        """Keep a finished breakdown and aggregate it into the metrics collector."""
+        self._breakdowns[breakdown.request_id] = breakdown
+        while len(self._breakdowns) > self.max_breakdowns:
+            self._breakdowns.popitem(last=False)
+
+        collector = get_metrics_collector()
+        collector.observe_timing(
+            "mcp.tool_call", breakdown.total, tool=breakdown.tool, status=status
+        )
+        for phase_name, seconds in breakdown.phases.items():
+            collector.observe_timing(
+                "mcp.tool_phase", seconds, tool=breakdown.tool, phase=phase_name
+            )
+        if breakdown.rest_calls:
+            collector.observe_timing(
+                "mcp.tool_phase", breakdown.rest_seconds, tool=breakdown.tool, phase="rest"
+            )
+        if breakdown.response_bytes:
+            collector.add_counter(
+                "mcp.tool_response_bytes", breakdown.response_bytes, tool=breakdown.tool
+            )
+
+    def get_call_breakdown(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latency breakdown of a recent tool call.
+
+        Args:
+            request_id: Request ID of the call
+
+        Returns:
+            Dict or None: Breakdown in milliseconds if still retained
+        """
+        breakdown = self._breakdowns.get(request_id)
+        return breakdown.to_dict() if breakdown else None
 
     def clear_registry(self) -> None:
         """Clear all registered tools (useful for testing)."""
         self._tools.clear()
         self._tool_handlers.clear()
         self._tool_metadata.clear()
+        self._signatures.clear()
         logger.debug("Cleared tool registry")
\ No newline at end of file
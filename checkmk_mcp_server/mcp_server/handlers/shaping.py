@@ -0,0 +1,245 @@
+"""
+Response Shaping
+
+Keeps tool responses within a size budget. A result whose serialized form
+exceeds its tool's budget is cut down to a ranked head of its largest list,
+most severe items first, plus aggregate counts over all items. The rest of the
+list is kept in a server-side page cache behind an opaque continuation token,
+which the client passes back as the ``continuation_token`` argument of the
+same tool to fetch the next page without running the tool again.
+"""
+
+import logging
+import secrets
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ...services.cache import LRUCache
+from ..utils.serialization import safe_json_dumps
+
+logger = logging.getLogger(__name__)
+
+CONTINUATION_ARGUMENT = "continuation_token"
+
+# Ranking of service/host states and problem severities, most urgent first
+_SEVERITY_RANK = {
+    "CRITICAL": 0,
+    "DOWN": 0,
+    "UNKNOWN": 1,
+    "UNREACH": 1,
+    "UNREACHABLE": 1,
+    "WARNING": 2,
+    "OK": 4,
+    "UP": 4,
+}
+_STATE_CODE_RANK = {2: 0, 3: 1, 1: 2, 0: 4}
+
+# Item fields counted in the summary of a truncated list
+SUMMARY_FIELDS = ("state", "severity", "category", "host_name", "folder")
+SUMMARY_TOP_VALUES = 10
+
+# Lists are looked for this many dict levels below the result
+_MAX_DEPTH = 3
+
+# Bytes kept free for the pagination block besides its summary
+_PAGINATION_RESERVE = 512
+
+
+class ResponseShaper:
+    """Truncates over-budget tool results and serves their remaining pages."""
+
+    def __init__(self, cache_size: int = 64, page_ttl: int = 300):
+        """
+        Initialize the shaper.
+
+        Args:
+            cache_size: Number of truncated results kept for continuation
+            page_ttl: Seconds a continuation token stays valid
+        """
+        self._pages = LRUCache(
+            max_size=cache_size, default_ttl=page_ttl, name="tool_result_pages"
+        )
+
+    async def shape(self, tool: str, result: Any, max_bytes: int) -> Any:
+        """
+        Fit a tool result into a response budget.
+
+        Args:
+            tool: Name of the tool that produced the result
+            result: Tool result, normally a ``{"success": ..., "data": ...}`` dict
+            max_bytes: Maximum size of the serialized response
+
+        Returns:
+            The result unchanged if it cannot be split, otherwise the first
+            page with a ``pagination`` block
+        """
+        path = _find_largest_list(result)
+        if path is None:
+            logger.debug(f"Result of '{tool}' is over budget but has no list to page")
+            return result
+
+        items = _rank(_get_path(result, path))
+        envelope = _set_path(result, path, [])
+        summary = _summarize(items)
+        limit = max_bytes - _size(summary) - _PAGINATION_RESERVE
+        entry = {
+            "tool": tool,
+            "path": path,
+            "envelope": envelope,
+            "items": items,
+            "page_size": _fit_page_size(envelope, path, items, limit),
+            "summary": summary,
+        }
+        key = secrets.token_urlsafe(12)
+        await self._pages.set(key, entry)
+        logger.info(
+            f"Truncated result of '{tool}' to {entry['page_size']} of {len(items)} items "
+            f"(budget {max_bytes} bytes)"
+        )
+        return _build_page(entry, key, 0)
+
+    async def next_page(self, tool: str, token: str) -> Dict[str, Any]:
+        """
+        Serve the page a continuation token points to.
+
+        Args:
+            tool: Name of the tool being called
+            token: Continuation token from a previous response of the tool
+
+        Returns:
+            The next page, or an error result if the token is unknown,
+            expired or belongs to another tool
+        """
+        key, _, offset = str(token).rpartition(":")
+        entry = await self._pages.get(key) if key and offset.isdigit() else None
+        if entry is None or entry["tool"] != tool:
+            return {
+                "success": False,
+                "error": "Continuation token is invalid or has expired; "
+                f"call {tool} again without continuation_token",
+            }
+        return _build_page(entry, key, int(offset))
+
+    async def clear(self) -> None:
+        """Drop all cached pages."""
+        await self._pages.clear()
+
+
+def _find_largest_list(result: Any) -> Optional[Tuple[str, ...]]:
+    """Find the path of the longest list in a result dict."""
+    best: Optional[Tuple[str, ...]] = None
+    best_len = 1
+
+    def walk(node: Any, path: Tuple[str, ...]) -> None:
+        nonlocal best, best_len
+        if len(path) > _MAX_DEPTH or not isinstance(node, dict):
+            return
+        for key, value in node.items():
+            if isinstance(value, list):
+                if len(value) > best_len:
+                    best, best_len = path + (key,), len(value)
+            else:
+                walk(value, path + (key,))
+
+    walk(result, ())
+    return best
+
+
+def _get_path(node: Any, path: Sequence[str]) -> Any:
+    for key in path:
+        node = node[key]
+    return node
+
+
+def _set_path(node: Dict[str, Any], path: Sequence[str], value: Any) -> Dict[str, Any]:
+    """Copy of ``node`` with the value at ``path`` replaced; other values are shared."""
+    copy = dict(node)
+    copy[path[0]] = value if len(path) == 1 else _set_path(node[path[0]], path[1:], value)
+    return copy
+
+
+def _field(item: Any, name: str) -> Any:
+    value = item.get(name) if isinstance(item, dict) else getattr(item, name, None)
+    return getattr(value, "value", value)
+
+
+def _severity_rank(item: Any) -> int:
+    for name in ("severity", "state"):
+        value = _field(item, name)
+        if isinstance(value, str) and value.upper() in _SEVERITY_RANK:
+            return _SEVERITY_RANK[value.upper()]
+        if isinstance(value, int) and value in _STATE_CODE_RANK:
+            return _STATE_CODE_RANK[value]
+    return len(_SEVERITY_RANK)
+
+
+def _rank(items: List[Any]) -> List[Any]:
+    """Order items most urgent first; the original order breaks ties."""
+    if not items:
+        return []
+    sample = items[0]
+    if _field(sample, "urgency_score") is not None:
+        return sorted(items, key=lambda item: -(_field(item, "urgency_score") or 0))
+    if _field(sample, "severity") is not None or _field(sample, "state") is not None:
+        return sorted(items, key=_severity_rank)
+    return list(items)
+
+
+def _summarize(items: List[Any]) -> Dict[str, Dict[str, int]]:
+    """Count the values of well-known fields over all items."""
+    summary: Dict[str, Dict[str, int]] = {}
+    if not items:
+        return summary
+    for name in SUMMARY_FIELDS:
+        if _field(items[0], name) is None:
+            continue
+        counts = Counter(str(_field(item, name)) for item in items)
+        top = dict(counts.most_common(SUMMARY_TOP_VALUES))
+        other = sum(counts.values()) - sum(top.values())
+        if other:
+            top["other"] = other
+        summary[name] = top
+    return summary
+
+
+def _size(obj: Any) -> int:
+    return len(safe_json_dumps(obj).encode("utf-8"))
+
+
+def _fit_page_size(
+    envelope: Dict[str, Any], path: Tuple[str, ...], items: List[Any], limit: int
+) -> int:
+    """Largest page size, estimated from a sample, whose page fits in ``limit`` bytes."""
+    available = limit - _size(envelope)
+    sample = items[:50]
+    average = max(1.0, (_size(sample) - 2) / max(1, len(sample)))
+    page_size = max(1, min(len(items), int(available / average)))
+
+    # The sample may not be representative; shrink until the head really fits
+    while page_size > 1 and _size(_set_path(envelope, path, items[:page_size])) > limit:
+        page_size = max(1, int(page_size * 0.8))
+    return page_size
+
+
+def _build_page(entry: Dict[str, Any], key: str, offset: int) -> Dict[str, Any]:
+    items = entry["items"]
+    end = offset + entry["page_size"]
+    page = _set_path(entry["envelope"], entry["path"], items[offset:end])
+    has_more = end < len(items)
+    page["pagination"] = {
+        "field": ".".join(entry["path"]),
+        "offset": offset,
+        "returned": len(items[offset:end]),
+        "total": len(items),
+        "truncated": has_more,
+        "continuation_token": f"{key}:{end}" if has_more else None,
+        "summary": entry["summary"],
+        "next_step": (
+            f"Call this tool again with continuation_token to get the next "
+            f"{min(entry['page_size'], len(items) - end)} items; the summary "
+            f"covers all {len(items)}"
+            if has_more
+            else "This is the last page"
+        ),
+    }
+    return page
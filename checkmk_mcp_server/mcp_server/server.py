@@ -8,16 +8,36 @@ import logging
 import asyncio
 import contextlib
 import sys
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Mapping, Optional
 
 from mcp.server import Server
 from mcp.types import Resource, Prompt, GetPromptResult
 from mcp.server.models import InitializationOptions
 from mcp.server.lowlevel.server import NotificationOptions
 
-from ..config import AppConfig
+from ..config import (
+    AppConfig,
+    DeadlineConfig,
+    MetricsConfig,
+    ProfilingConfig,
+    ResponseConfig,
+    SlowCallConfig,
+    TracingConfig,
+    TransportConfig,
+)
+from ..services.loop_monitor import (
+    get_event_loop_monitor,
+    get_stall_detector,
+    stop_stall_detector,
+)
+from ..services.openmetrics import MetricsHTTPServer
+from ..utils.profiling import get_tool_profiler
+from ..utils.slow_calls import get_slow_call_log
+from ..utils.startup import get_startup_timer
+from ..utils.tracing import get_span_recorder
 from .container import ServiceContainer
 from .handlers.registry import ToolRegistry
+from .handlers.shaping import ResponseShaper
 from .handlers.protocol import ProtocolHandlers
 from .prompts.definitions import PromptDefinitions
 from .prompts.handlers import PromptHandlers
@@ -34,7 +54,7 @@ from .tools.business import BusinessTools
 from .tools.advanced import AdvancedTools
 
 # Import utilities
-from .utils.serialization import safe_json_dumps
+from .utils.serialization import safe_json_dumps, set_json_backend
 from .utils.errors import sanitize_error
 
 # Import request tracking utilities
@@ -51,8 +71,46 @@ except ImportError:
     def set_request_id(request_id: str) -> None:
         pass
 
+if TYPE_CHECKING:
+    from ..services.streaming import NDJSONPager
+
 logger = logging.getLogger(__name__)
 
+SERVER_NAME = "checkmk-mcp-server"
+SERVER_VERSION = "1.0.0"
+
+# Stall threshold used when asyncio debug mode is on and none is configured
+DEBUG_STALL_THRESHOLD = 0.1
+
+# Transports served over HTTP by one long-lived process (see transport.py)
+HTTP_TRANSPORTS = ("http", "streamable-http", "sse")
+
+SERVER_INSTRUCTIONS = """You are an experienced Senior Network Operations Engineer with 15+ years of expertise in infrastructure monitoring and management. Your role is to provide expert guidance on Checkmk monitoring operations.
+
+Your expertise includes:
+- Deep knowledge of network protocols (TCP/IP, SNMP, ICMP, HTTP/HTTPS)
+- Infrastructure monitoring best practices and alert optimization
+- Incident response, root cause analysis, and problem resolution
+- Performance tuning and capacity planning
+- Service level management and availability optimization
+- Automation and monitoring-as-code practices
+
+Communication style:
+- Be technically precise and use appropriate networking terminology
+- Provide practical, actionable recommendations based on real-world experience
+- Include relevant CLI commands and configuration examples
+- Proactively identify potential issues and suggest preventive measures
+- Balance technical depth with clarity for different audience levels
+
+When analyzing monitoring data:
+- Look for patterns that indicate underlying infrastructure issues
+- Consider network topology and dependencies between services
+- Apply industry best practices for threshold settings
+- Recommend monitoring improvements based on observed gaps
+- Prioritize issues based on business impact and SLA requirements
+
+Always approach problems with the mindset of maintaining high availability and minimizing MTTR (Mean Time To Repair)."""
+
 
 class CheckmkMCPServer:
     """Checkmk MCP Server with modular architecture.
@@ -71,19 +129,73 @@ class CheckmkMCPServer:
         Args:
             config: Application configuration
         """
+        get_startup_timer().mark("server_created")
         self.config = config
-        self.server: Server = Server("checkmk-mcp-server")
+        self.server: Server = Server(
+            SERVER_NAME, version=SERVER_VERSION, instructions=SERVER_INSTRUCTIONS
+        )
         
         # Core components
         self.container = ServiceContainer(config)
-        self.tool_registry = ToolRegistry()
+        metrics_config = getattr(config, "metrics", None)
+        response_config = getattr(config, "responses", None)
+        if not isinstance(response_config, ResponseConfig):
+            response_config = ResponseConfig()
+        deadline_config = getattr(config, "deadlines", None)
+        if not isinstance(deadline_config, DeadlineConfig):
+            deadline_config = DeadlineConfig()
+        self.tool_registry = ToolRegistry(
+            include_breakdown_in_meta=isinstance(metrics_config, MetricsConfig)
+            and metrics_config.include_breakdown_in_meta,
+            default_max_response_bytes=response_config.default_max_bytes,
+            response_budgets=response_config.tool_budgets,
+            response_shaper=ResponseShaper(
+                cache_size=response_config.page_cache_size,
+                page_ttl=response_config.page_ttl,
+            ),
+            default_deadline=deadline_config.default_seconds,
+            deadlines=deadline_config.tool_deadlines,
+        )
         self.protocol_handlers = ProtocolHandlers()
+        # Open streams behind the cursors of paged stream resources, created
+        # on the first stream read (see _get_stream_pager)
+        self._stream_pager: Optional["NDJSONPager"] = None
         self.prompt_handlers = PromptHandlers()
         self.prompt_validators = PromptValidators()
         
+        # Request tracing spans are kept in a process-wide ring buffer
+        tracing_config = getattr(config, "tracing", None)
+        if isinstance(tracing_config, TracingConfig):
+            get_span_recorder().configure(
+                enabled=tracing_config.enabled,
+                capacity=tracing_config.buffer_size,
+                export_dir=tracing_config.export_dir,
+            )
+        
+        profiling_config = getattr(config, "profiling", None)
+        if isinstance(profiling_config, ProfilingConfig):
+            get_tool_profiler().configure(
+                output_dir=profiling_config.output_dir,
+                sample_interval=profiling_config.sample_interval,
+            )
+        
+        slow_call_config = getattr(config, "slow_calls", None)
+        if isinstance(slow_call_config, SlowCallConfig):
+            get_slow_call_log().configure(**slow_call_config.model_dump())
+        
+        json_backend = getattr(config, "json_backend", None)
+        if isinstance(json_backend, str):
+            set_json_backend(json_backend)
+        
         # Tool categories (initialized after services)
         self._tool_categories: Dict[str, Any] = {}
         
+        # Optional OpenMetrics HTTP listener (see _start_metrics_export)
+        self._metrics_http: Optional[MetricsHTTPServer] = None
+        
+        # HTTP transport while serving with run(transport_type="http")
+        self._http_transport = None
+        
         # Track initialization state
         self._initialized = False
 
@@ -111,9 +223,11 @@ class CheckmkMCPServer:
             tool_count = self.tool_registry.get_tool_count()
             prompt_count = len(self.protocol_handlers._prompts)
             
+            elapsed = get_startup_timer().mark("server_initialized")
             logger.info(
                 f"Checkmk MCP Server initialized successfully with "
-                f"{tool_count} tools and {prompt_count} prompts"
+                f"{tool_count} tools and {prompt_count} prompts "
+                f"({elapsed * 1000:.0f}ms after process start)"
             )
             
         except Exception as e:
@@ -131,7 +245,6 @@ class CheckmkMCPServer:
             event_service = self.container.get_service('event_service')
             metrics_service = self.container.get_service('metrics_service')
             bi_service = self.container.get_service('bi_service')
-            historical_service = self.container.get_service('historical_service')
             # Get all services for tool category initialization
             # (some categories may need additional services from container)
             
@@ -141,7 +254,12 @@ class CheckmkMCPServer:
             self._tool_categories['monitoring'] = MonitoringTools(status_service)
             self._tool_categories['parameters'] = ParameterTools(parameter_service)
             self._tool_categories['events'] = EventTools(event_service)
-            self._tool_categories['metrics'] = MetricsTools(metrics_service, historical_service, self)
+            # The historical service loads the scraping stack; defer it to first use
+            self._tool_categories['metrics'] = MetricsTools(
+                metrics_service,
+                server=self,
+                historical_service_factory=lambda: self.container.get_service('historical_service'),
+            )
             self._tool_categories['business'] = BusinessTools(bi_service, self)
             self._tool_categories['advanced'] = AdvancedTools(self)
             
@@ -161,6 +279,12 @@ class CheckmkMCPServer:
                 # Get tools and handlers from category
                 tools = category_instance.get_tools()
                 handlers = category_instance.get_handlers()
+                budgets = getattr(category_instance, "response_budgets", None)
+                if not isinstance(budgets, dict):
+                    budgets = {}
+                deadlines = getattr(category_instance, "deadlines", None)
+                if not isinstance(deadlines, dict):
+                    deadlines = {}
                 
                 # Register each tool with the tool registry
                 for tool_name, tool in tools.items():
@@ -170,6 +294,10 @@ class CheckmkMCPServer:
                             'category': category_name,
                             'source': f'{category_instance.__class__.__module__}.{category_instance.__class__.__name__}'
                         }
+                        if tool_name in budgets:
+                            metadata['max_response_bytes'] = budgets[tool_name]
+                        if tool_name in deadlines:
+                            metadata['deadline_seconds'] = deadlines[tool_name]
                         self.tool_registry.register_tool(tool_name, tool, handler, metadata)
                     else:
                         logger.warning(f"No handler found for tool '{tool_name}' in category '{category_name}'")
@@ -193,7 +321,7 @@ class CheckmkMCPServer:
             self.protocol_handlers.register_prompts(prompt_definitions)
             
             # Initialize prompt handlers with services
-            services = self.container.get_all_services()
+            services = self.container.get_service_map()
             self.prompt_handlers.initialize_services(services)
             
             logger.info(f"Registered {len(prompt_definitions)} prompts")
@@ -225,21 +353,53 @@ class CheckmkMCPServer:
                 request_id = generate_request_id()
                 set_request_id(request_id)
                 
+                get_stream_pager = self._get_stream_pager
+
                 try:
                     # Create a service provider object that the protocol handlers expect
                     class ServiceProvider:
-                        def __init__(self, services: Dict[str, Any]):
-                            for name, service in services.items():
-                                setattr(self, name, service)
+                        def __init__(self, services: Mapping[str, Any]):
+                            self._services = services
+                        
+                        def __getattr__(self, name: str) -> Any:
+                            # Services are built on first access
+                            if name.startswith('_'):
+                                raise AttributeError(name)
+                            try:
+                                return self._services[name]
+                            except KeyError:
+                                raise AttributeError(name) from None
+                        
+                        def _ensure_services(self) -> bool:
+                            return True
                         
                         def _handle_service_result(self, result):
                             if result.success:
-                                return safe_json_dumps(result.data.model_dump() if hasattr(result.data, 'model_dump') else result.data)
+                                return safe_json_dumps(result.data)
                             else:
                                 return safe_json_dumps({"error": result.error, "warnings": result.warnings})
-                    
-                    services = self.container.get_all_services()
-                    service_provider = ServiceProvider(services)
+
+                        async def _stream_hosts_resource(self, cursor: Optional[str] = None) -> str:
+                            service = getattr(self, 'streaming_host_service', None)
+                            if service is None:
+                                return safe_json_dumps({"error": "Streaming not enabled"})
+                            return await get_stream_pager().read(
+                                "checkmk://stream/hosts",
+                                lambda: service.iter_ndjson(service.list_hosts_streamed()),
+                                cursor,
+                            )
+
+                        async def _stream_services_resource(self, cursor: Optional[str] = None) -> str:
+                            service = getattr(self, 'streaming_service_service', None)
+                            if service is None:
+                                return safe_json_dumps({"error": "Streaming not enabled"})
+                            return await get_stream_pager().read(
+                                "checkmk://stream/services",
+                                lambda: service.iter_ndjson(service.list_all_services_streamed()),
+                                cursor,
+                            )
+
+                    service_provider = ServiceProvider(self.container.get_service_map())
                     
                     return await self.protocol_handlers.handle_read_resource(uri, service_provider, {})
                 except Exception as e:
@@ -392,6 +552,8 @@ class CheckmkMCPServer:
         if not self._initialized:
             await self.initialize()
 
+        await self._start_metrics_export()
+
         if transport_type == "stdio":
             try:
                 # Suppress stdout/stderr pipe errors that might leak during shutdown
@@ -408,39 +570,7 @@ class CheckmkMCPServer:
                             self.server.run(
                                 read_stream,
                                 write_stream,
-                                InitializationOptions(
-                                    server_name="checkmk-mcp-server",
-                                    server_version="1.0.0",
-                                    capabilities=self.server.get_capabilities(
-                                        notification_options=NotificationOptions(),
-                                        experimental_capabilities={},
-                                    ),
-                                    instructions="""You are an experienced Senior Network Operations Engineer with 15+ years of expertise in infrastructure monitoring and management. Your role is to provide expert guidance on Checkmk monitoring operations.
-
-Your expertise includes:
-- Deep knowledge of network protocols (TCP/IP, SNMP, ICMP, HTTP/HTTPS)
-- Infrastructure monitoring best practices and alert optimization
-- Incident response, root cause analysis, and problem resolution
-- Performance tuning and capacity planning
-- Service level management and availability optimization
-- Automation and monitoring-as-code practices
-
-Communication style:
-- Be technically precise and use appropriate networking terminology
-- Provide practical, actionable recommendations based on real-world experience
-- Include relevant CLI commands and configuration examples
-- Proactively identify potential issues and suggest preventive measures
-- Balance technical depth with clarity for different audience levels
-
-When analyzing monitoring data:
-- Look for patterns that indicate underlying infrastructure issues
-- Consider network topology and dependencies between services
-- Apply industry best practices for threshold settings
-- Recommend monitoring improvements based on observed gaps
-- Prioritize issues based on business impact and SLA requirements
-
-Always approach problems with the mindset of maintaining high availability and minimizing MTTR (Mean Time To Repair).""",
-                                ),
+                                self._initialization_options(),
                             )
                         )
                         
@@ -495,9 +625,85 @@ Always approach problems with the mindset of maintaining high availability and m
                 else:
                     logger.exception("Unexpected error in stdio transport")
                     raise
+        elif transport_type in HTTP_TRANSPORTS:
+            await self._run_http(shutdown_event)
         else:
             raise ValueError(f"Unsupported transport type: {transport_type}")
 
+    def _initialization_options(self) -> InitializationOptions:
+        """Initialization options sent to clients on every transport."""
+        return self.server.create_initialization_options(
+            notification_options=NotificationOptions(),
+            experimental_capabilities={},
+        )
+
+    async def _run_http(self, shutdown_event: Optional[asyncio.Event]) -> None:
+        """Serve many clients over streamable HTTP and HTTP+SSE.
+
+        All sessions share this server's service container, so API sessions,
+        caches and metrics stay warm across clients.
+
+        Args:
+            shutdown_event: Optional event to signal shutdown
+        """
+        from .transport import HTTPTransport
+
+        transport_config = getattr(self.config, "transport", None)
+        if not isinstance(transport_config, TransportConfig):
+            transport_config = TransportConfig()
+        self.tool_registry.max_calls_per_session = transport_config.max_calls_per_session
+
+        self._http_transport = HTTPTransport(self.server, transport_config)
+        serve_task = asyncio.create_task(self._http_transport.serve(shutdown_event))
+        started = asyncio.create_task(self._http_transport.wait_started())
+        try:
+            await asyncio.wait([serve_task, started], return_when=asyncio.FIRST_COMPLETED)
+            if started.done() and started.exception() is None:
+                logger.info(
+                    f"Serving MCP over HTTP at {self._http_transport.url} "
+                    f"(SSE at /sse, up to {transport_config.max_sessions} sessions)"
+                )
+            else:
+                started.cancel()
+            await serve_task
+        finally:
+            self._http_transport = None
+
+    async def _start_metrics_export(self) -> None:
+        """Start the event loop lag probe and, if configured, the stall detector
+        and the OpenMetrics listener."""
+        metrics_config = getattr(self.config, "metrics", None)
+        if not isinstance(metrics_config, MetricsConfig):
+            metrics_config = MetricsConfig()
+
+        monitor = get_event_loop_monitor()
+        monitor.interval = metrics_config.loop_lag_interval
+        monitor.start()
+
+        stall_threshold = metrics_config.loop_stall_threshold
+        if stall_threshold is None and asyncio.get_running_loop().get_debug():
+            stall_threshold = DEBUG_STALL_THRESHOLD
+        if stall_threshold is not None:
+            detector = get_stall_detector()
+            detector.threshold = stall_threshold
+            detector.start()
+
+        if metrics_config.http_enabled and self._metrics_http is None:
+            listener = MetricsHTTPServer(metrics_config.http_host, metrics_config.http_port)
+            try:
+                await listener.start()
+                self._metrics_http = listener
+            except OSError as e:
+                logger.warning(f"Could not start OpenMetrics listener: {e}")
+
+    async def _stop_metrics_export(self) -> None:
+        """Stop the lag probe, the stall detector and the OpenMetrics listener."""
+        await get_event_loop_monitor().stop()
+        stop_stall_detector()
+        if self._metrics_http is not None:
+            await self._metrics_http.stop()
+            self._metrics_http = None
+
     async def shutdown(self) -> None:
         """Shutdown the server and cleanup resources."""
         if not self._initialized:
@@ -506,6 +712,14 @@ Always approach problems with the mindset of maintaining high availability and m
         try:
             logger.debug("Starting MCP server shutdown...")
             
+            await self._stop_metrics_export()
+            
+            # Write out a profile session that is still armed
+            profiler = get_tool_profiler()
+            if profiler.armed:
+                profiler.stop()
+            get_slow_call_log().close()
+            
             # Shutdown service container
             await self.container.shutdown()
             
@@ -577,6 +791,14 @@ Always approach problems with the mindset of maintaining high availability and m
             return None
         return self.container.get_service('parameter_service')
     
+    def _get_stream_pager(self) -> "NDJSONPager":
+        """Get the pager serving stream resources page by page."""
+        if self._stream_pager is None:
+            from ..services.streaming import NDJSONPager
+
+            self._stream_pager = NDJSONPager()
+        return self._stream_pager
+
     def _get_service(self, service_name: str):
         """Backward compatibility method for accessing services.
         
@@ -607,8 +829,14 @@ Always approach problems with the mindset of maintaining high availability and m
             'initialized': self._initialized,
             'tool_count': self.tool_registry.get_tool_count() if self._initialized else 0,
             'prompt_count': len(self.protocol_handlers._prompts) if self._initialized else 0,
-            'service_count': len(self.container.get_all_services()) if self._initialized else 0,
+            'service_count': len(self.container.get_service_names()) if self._initialized else 0,
+            'created_services': [
+                name for name in self.container.get_service_names()
+                if self.container.is_service_created(name)
+            ] if self._initialized else [],
+            'startup_ms': get_startup_timer().to_dict(),
             'tool_categories': list(self._tool_categories.keys()) if self._initialized else [],
-            'server_name': 'checkmk-mcp-server',
-            'server_version': '1.0.0'
+            'transport': self._http_transport.get_status() if self._http_transport else None,
+            'server_name': SERVER_NAME,
+            'server_version': SERVER_VERSION
         }
\ No newline at end of file
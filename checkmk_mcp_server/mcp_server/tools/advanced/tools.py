@@ -4,18 +4,39 @@ This module contains all advanced operational MCP tools extracted from the main
 """
 
 import logging
+from collections import deque
 from typing import Any, Dict, Optional, List, TYPE_CHECKING
 from mcp.types import Tool
 from datetime import datetime
 
+from ....async_api_client import get_executor_stats
+from ....services.cache import get_all_cache_stats
+from ....services.loop_monitor import get_event_loop_stats
+from ....services.metrics import get_metrics_collector
+from ....services.recovery import get_all_circuit_breaker_stats
+from ....utils.profiling import PROFILE_MODES, get_tool_profiler
+from ....utils.slow_calls import get_slow_call_log
+from ....utils.tracing import TRACE_FORMATS, get_span_recorder
+from ...utils.progress import get_tool_progress
+
 if TYPE_CHECKING:
     pass  # Services would be imported here
 
 logger = logging.getLogger(__name__)
 
+# Batch summaries kept in a stream_hosts response when no partial results
+# are sent; only the latest ones are returned
+MAX_BATCH_SUMMARIES = 20
+
 
 class AdvancedTools:
     """Advanced operational tools for MCP server."""
+
+    # Deadlines in seconds; None keeps writes from being cut off by a default
+    deadlines: Dict[str, Optional[float]] = {
+        "batch_create_hosts": None,
+        "resume_batch": None,
+    }
     
     def __init__(self, server=None):
         """Initialize advanced tools with required services.
@@ -85,7 +106,7 @@ class AdvancedTools:
         # Stream hosts tool
         self._tools["stream_hosts"] = Tool(
             name="stream_hosts",
-            description="Stream hosts in batches for large environments",
+            description="Stream hosts in batches for large environments. Clients that send a progress token receive progress notifications and each batch of hosts as a partial result while the inventory is read.",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -112,30 +133,56 @@ class AdvancedTools:
                 if not streaming_host_service:
                     return {"success": False, "error": "Streaming not enabled"}
 
-                batches = []
+                # Hosts of each batch are sent as partial results when the
+                # client asked for progress, so nothing is truncated.
+                # Otherwise only the latest batch summaries are kept, so the
+                # response does not grow with the inventory
+                progress = get_tool_progress()
+                batches = [] if progress.enabled else deque(maxlen=MAX_BATCH_SUMMARIES)
+                batch_count = 0
+                total_items = 0
                 async for batch in streaming_host_service.list_hosts_streamed(
                     batch_size=batch_size, search=search, folder=folder
                 ):
-                    batch_data = batch.model_dump()
+                    if batch.metadata.get("error"):
+                        return {
+                            "success": False,
+                            "error": batch.metadata["error"],
+                            "data": {
+                                "total_items": total_items,
+                                "batches": list(batches),
+                                "batches_omitted": batch_count - len(batches),
+                            },
+                        }
+
+                    batch_count += 1
+                    total_items += len(batch.items)
                     batches.append(
                         {
-                            "batch_number": batch_data["batch_number"],
-                            "items_count": len(batch_data["items"]),
-                            "has_more": batch_data["has_more"],
-                            "timestamp": batch_data["timestamp"],
+                            "batch_number": batch.batch_number,
+                            "items_count": len(batch.items),
+                            "has_more": batch.has_more,
+                            "timestamp": batch.timestamp,
                         }
                     )
-
-                    # Limit to prevent overwhelming response
-                    if len(batches) >= 10:
-                        break
+                    await progress.partial(
+                        {"batch_number": batch.batch_number, "items": batch.items}
+                    )
+                    await progress.report(
+                        batch.metadata.get("hosts_processed", total_items),
+                        batch.metadata.get("fetched_count"),
+                        f"Streamed {total_items} hosts in {batch_count} batches",
+                    )
 
                 return {
                     "success": True,
                     "data": {
-                        "total_batches_processed": len(batches),
-                        "batches": batches,
-                        "message": f"Processed {len(batches)} batches with {batch_size} items each",
+                        "total_batches_processed": batch_count,
+                        "total_items": total_items,
+                        "batches": list(batches),
+                        "batches_omitted": batch_count - len(batches),
+                        "partial_results_sent": progress.chunks_sent,
+                        "message": f"Processed {batch_count} batches with {total_items} hosts",
                     },
                 }
 
@@ -148,57 +195,92 @@ class AdvancedTools:
         # Batch create hosts tool
         self._tools["batch_create_hosts"] = Tool(
             name="batch_create_hosts",
-            description="Create multiple hosts in a batch operation",
+            description="Create multiple hosts using chunked bulk-create requests with per-host results. Clients that send a progress token receive progress and each chunk's results as they complete.",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "hosts_data": {
                         "type": "array",
                         "items": {"type": "object"},
-                        "description": "List of host creation data",
+                        "description": "List of host creation data (host_name, folder, ip_address, attributes)",
                     },
-                    "max_concurrent": {
+                    "chunk_size": {
                         "type": "integer",
-                        "description": "Maximum concurrent operations",
-                        "default": 5,
+                        "description": "Maximum hosts per bulk request",
+                        "default": 500,
+                    },
+                    "background": {
+                        "type": "boolean",
+                        "description": "Run as a resumable background job and return its job_id immediately; poll with get_batch_status",
+                        "default": False,
                     },
                 },
                 "required": ["hosts_data"],
             },
         )
 
-        async def batch_create_hosts(hosts_data, max_concurrent=5):
+        async def batch_create_hosts(
+            hosts_data, chunk_size=500, background=False, max_concurrent=None
+        ):
+            # max_concurrent is accepted for older clients; chunks are sent sequentially
             try:
-                # Use batch processor for efficient creation
-                batch_processor = getattr(self.server, 'batch_processor', None)
+                if background:
+                    batch_jobs = self._get_service("batch_jobs")
+                    job = await batch_jobs.start_job(
+                        "create_hosts", hosts_data, params={"chunk_size": chunk_size}
+                    )
+                    return {
+                        "success": True,
+                        "data": job.to_summary(),
+                        "message": f"Started background job {job.job_id} for {job.total_items} hosts",
+                    }
+
                 host_service = getattr(self.server, 'host_service', None)
-                
-                if not batch_processor or not host_service:
-                    return {"success": False, "error": "Batch processing not available"}
+                if not host_service:
+                    return {"success": False, "error": "Host service not available"}
 
-                batch_processor.max_concurrent = max_concurrent
+                progress = get_tool_progress()
 
-                async def create_single_host(host_data: Dict[str, Any]):
-                    return await host_service.create_host(**host_data)
+                async def report_chunk(batch_progress, chunk_results):
+                    await progress.partial(
+                        {
+                            "created_hosts": [r.host_name for r in chunk_results if r.success],
+                            "failed_hosts": [
+                                {"name": r.host_name, "error": r.error}
+                                for r in chunk_results
+                                if not r.success
+                            ],
+                        }
+                    )
+                    await progress.report_batch(batch_progress)
 
-                result = await batch_processor.process_batch(
-                    items=hosts_data,
-                    operation=create_single_host,
-                    batch_id=f"create_hosts_{datetime.now().timestamp()}",
+                started = datetime.now()
+                result = await host_service.bulk_create_hosts(
+                    hosts_data,
+                    chunk_size=chunk_size,
+                    progress_callback=report_chunk if progress.enabled else None,
                 )
+                if not result.success:
+                    return {"success": False, "error": result.error}
+
+                bulk = result.data
+                duration = (datetime.now() - started).total_seconds()
 
                 return {
                     "success": True,
                     "data": {
-                        "batch_id": result.batch_id,
-                        "total_items": result.progress.total_items,
-                        "successful": result.progress.success,
-                        "failed": result.progress.failed,
-                        "skipped": result.progress.skipped,
-                        "duration_seconds": result.progress.duration,
-                        "items_per_second": result.progress.items_per_second,
+                        "total_items": bulk.total_requested,
+                        "successful": bulk.success_count,
+                        "failed": bulk.failure_count,
+                        "created_hosts": [host.name for host in bulk.created_hosts],
+                        "failed_hosts": bulk.failed_hosts,
+                        "duration_seconds": duration,
+                        "items_per_second": (
+                            bulk.total_requested / duration if duration > 0 else 0
+                        ),
                     },
-                    "message": f"Batch completed: {result.progress.success} created, {result.progress.failed} failed",
+                    "warnings": bulk.warnings,
+                    "message": f"Batch completed: {bulk.success_count} created, {bulk.failure_count} failed",
                 }
 
             except Exception as e:
@@ -207,6 +289,105 @@ class AdvancedTools:
 
         self._tool_handlers["batch_create_hosts"] = batch_create_hosts
 
+        # Batch job status tool
+        self._tools["get_batch_status"] = Tool(
+            name="get_batch_status",
+            description="Get progress of a background batch job, or list recent jobs when no job_id is given. Cheap to poll while a large operation runs.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "Job ID returned when the job was started",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum jobs to list when job_id is omitted",
+                        "default": 20,
+                    },
+                },
+            },
+        )
+
+        async def get_batch_status(job_id=None, limit=20):
+            try:
+                batch_jobs = self._get_service("batch_jobs")
+                if not job_id:
+                    jobs = batch_jobs.list_jobs(limit=limit)
+                    return {
+                        "success": True,
+                        "data": {"jobs": [job.to_summary() for job in jobs]},
+                    }
+
+                job = batch_jobs.get_job(job_id)
+                if job is None:
+                    return {"success": False, "error": f"Batch job '{job_id}' not found"}
+                return {"success": True, "data": job.to_summary()}
+
+            except Exception as e:
+                logger.exception("Error getting batch status")
+                return {"success": False, "error": sanitize_error(e)}
+
+        self._tool_handlers["get_batch_status"] = get_batch_status
+
+        # Cancel batch job tool
+        self._tools["cancel_batch"] = Tool(
+            name="cancel_batch",
+            description="Cancel a running background batch job. Items already processed stay applied and the job can be resumed later with resume_batch.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {"type": "string", "description": "Job ID to cancel"},
+                },
+                "required": ["job_id"],
+            },
+        )
+
+        async def cancel_batch(job_id):
+            try:
+                job = await self._get_service("batch_jobs").cancel_job(job_id)
+                return {
+                    "success": True,
+                    "data": job.to_summary(),
+                    "message": f"Batch job {job_id} is {job.status.value}",
+                }
+            except KeyError:
+                return {"success": False, "error": f"Batch job '{job_id}' not found"}
+            except Exception as e:
+                logger.exception("Error cancelling batch job")
+                return {"success": False, "error": sanitize_error(e)}
+
+        self._tool_handlers["cancel_batch"] = cancel_batch
+
+        # Resume batch job tool
+        self._tools["resume_batch"] = Tool(
+            name="resume_batch",
+            description="Resume an interrupted, cancelled or partially failed background batch job. Items that already succeeded are skipped.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {"type": "string", "description": "Job ID to resume"},
+                },
+                "required": ["job_id"],
+            },
+        )
+
+        async def resume_batch(job_id):
+            try:
+                job = await self._get_service("batch_jobs").resume_job(job_id)
+                return {
+                    "success": True,
+                    "data": job.to_summary(),
+                    "message": f"Resumed batch job {job_id}",
+                }
+            except KeyError:
+                return {"success": False, "error": f"Batch job '{job_id}' not found"}
+            except Exception as e:
+                logger.exception("Error resuming batch job")
+                return {"success": False, "error": sanitize_error(e)}
+
+        self._tool_handlers["resume_batch"] = resume_batch
+
         # Get server metrics tool
         self._tools["get_server_metrics"] = Tool(
             name="get_server_metrics",
@@ -216,24 +397,30 @@ class AdvancedTools:
 
         async def get_server_metrics():
             try:
-                # Get metrics from various sources - simplified for extraction
-                server_stats = {}
-                service_metrics = {}
-                cache_stats = {}
-                recovery_stats = {}
-                
-                # Try to get cache stats if available
-                cached_host_service = getattr(self.server, 'cached_host_service', None)
-                if cached_host_service:
-                    cache_stats = await cached_host_service.get_cache_stats()
+                stats = await get_metrics_collector().get_stats()
 
                 return {
                     "success": True,
                     "data": {
-                        "server_metrics": server_stats,
-                        "service_metrics": service_metrics,
-                        "cache_metrics": cache_stats,
-                        "recovery_metrics": recovery_stats,
+                        "server_metrics": {
+                            "total_metrics": stats["total_metrics"],
+                            "recent_metrics_1h": stats["recent_metrics_1h"],
+                            "request_rate_per_second": stats["request_rate_per_second"],
+                            "memory_usage": stats["memory_usage"],
+                            "executor": get_executor_stats(),
+                            "event_loop": get_event_loop_stats(),
+                        },
+                        "service_metrics": {
+                            "timing_stats": stats["timing_stats"],
+                            "counters": stats["counters"],
+                            "gauges": stats["gauges"],
+                        },
+                        "cache_metrics": get_all_cache_stats(),
+                        "recovery_metrics": {
+                            "circuit_breakers": get_all_circuit_breaker_stats()
+                        },
+                        "concurrency_metrics": stats["concurrency"],
+                        "slow_calls": get_slow_call_log().get_stats(),
                         "timestamp": datetime.now().isoformat(),
                     },
                 }
@@ -244,6 +431,150 @@ class AdvancedTools:
 
         self._tool_handlers["get_server_metrics"] = get_server_metrics
 
+        # Export trace tool
+        self._tools["export_trace"] = Tool(
+            name="export_trace",
+            description="Write recorded request tracing spans to a local trace file that can be opened in Perfetto/chrome://tracing (chrome format) or OTLP-compatible viewers such as Jaeger (otlp format). Use to see the critical path and fan-out of slow tool calls.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "format": {
+                        "type": "string",
+                        "enum": list(TRACE_FORMATS),
+                        "description": "Trace file format",
+                        "default": "chrome",
+                    },
+                    "request_id": {
+                        "type": "string",
+                        "description": "Only export spans of this request (e.g. req_a1b2c3)",
+                    },
+                    "filename": {
+                        "type": "string",
+                        "description": "Bare file name inside the configured trace directory (defaults to a timestamped name)",
+                    },
+                },
+            },
+        )
+
+        async def export_trace(format="chrome", request_id=None, filename=None):
+            try:
+                recorder = get_span_recorder()
+                if not recorder.enabled:
+                    return {"success": False, "error": "Request tracing is disabled"}
+
+                export = recorder.export(
+                    format=format, request_id=request_id, filename=filename
+                )
+                return {
+                    "success": True,
+                    "data": {**export, "recorder": recorder.get_stats()},
+                    "message": f"Exported {export['span_count']} spans to {export['path']}",
+                }
+
+            except Exception as e:
+                logger.exception("Error exporting trace")
+                return {"success": False, "error": sanitize_error(e)}
+
+        self._tool_handlers["export_trace"] = export_trace
+
+        # Profile tool calls tool
+        self._tools["profile_tool"] = Tool(
+            name="profile_tool",
+            description="Administrative: profile live tool calls. action=start arms a profiler for the next N calls of a tool (or every call within duration_seconds); matching calls run under cProfile or a sampling profiler and the pstats and collapsed-stack (flamegraph) files are written to the configured profile directory. Set wait_seconds to wait for the result in the same call, or poll with action=status. action=stop writes what was captured so far. Adds overhead only to the profiled calls.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "action": {
+                        "type": "string",
+                        "enum": ["start", "status", "stop"],
+                        "description": "Arm a session, check it, or stop it early",
+                        "default": "start",
+                    },
+                    "tool_name": {
+                        "type": "string",
+                        "description": "Tool to profile (all tools when omitted)",
+                    },
+                    "calls": {
+                        "type": "integer",
+                        "description": "Number of calls to profile",
+                        "default": 1,
+                        "minimum": 1,
+                    },
+                    "duration_seconds": {
+                        "type": "number",
+                        "description": "Profile every matching call in this time window instead of a fixed number of calls",
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": list(PROFILE_MODES),
+                        "description": "cprofile (deterministic, writes pstats) or sampling (low overhead, collapsed stacks only)",
+                        "default": "cprofile",
+                    },
+                    "wait_seconds": {
+                        "type": "number",
+                        "description": "Wait up to this long for the session to finish and return the file paths",
+                        "default": 0,
+                    },
+                },
+            },
+        )
+
+        async def profile_tool(
+            action="start",
+            tool_name=None,
+            calls=1,
+            duration_seconds=None,
+            mode="cprofile",
+            wait_seconds=0,
+        ):
+            try:
+                profiler = get_tool_profiler()
+                if action == "status":
+                    status = profiler.get_status()
+                    if status is None:
+                        return {"success": False, "error": "No profile session has been armed"}
+                    return {"success": True, "data": status}
+
+                if action == "stop":
+                    result = profiler.stop()
+                    if result is None:
+                        return {"success": False, "error": "No profile session has been armed"}
+                    return {
+                        "success": True,
+                        "data": result,
+                        "message": f"Profile written to {profiler.output_dir}",
+                    }
+
+                registry = getattr(self.server, "tool_registry", None)
+                if tool_name and registry is not None and not registry.has_tool(tool_name):
+                    return {"success": False, "error": f"Unknown tool: {tool_name}"}
+
+                capture = profiler.arm(
+                    tool=tool_name, calls=calls, duration=duration_seconds, mode=mode
+                )
+                if wait_seconds:
+                    result = await profiler.wait(wait_seconds)
+                    if result is not None:
+                        return {
+                            "success": True,
+                            "data": result,
+                            "message": f"Profiled {result['completed_calls']} call(s)",
+                        }
+
+                return {
+                    "success": True,
+                    "data": {**capture.get_status(), "output_dir": str(profiler.output_dir)},
+                    "message": "Profiler armed; check progress with action=status",
+                }
+
+            except (ValueError, RuntimeError) as e:
+                return {"success": False, "error": str(e)}
+            except Exception as e:
+                logger.exception("Error in profile tool")
+                return {"success": False, "error": sanitize_error(e)}
+
+        self._tool_handlers["profile_tool"] = profile_tool
+
         # Clear cache tool
         self._tools["clear_cache"] = Tool(
             name="clear_cache",
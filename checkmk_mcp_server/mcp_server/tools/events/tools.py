@@ -15,6 +15,19 @@ logger = logging.getLogger(__name__)
 
 class EventTools:
     """Event management tools for MCP server."""
+
+    # Response budgets in bytes; larger results are paged by the tool registry
+    response_budgets: Dict[str, int] = {
+        "list_service_events": 65536,
+        "list_host_events": 65536,
+        "get_recent_critical_events": 65536,
+        "search_events": 65536,
+    }
+
+    # Deadlines in seconds; None keeps writes from being cut off by a default
+    deadlines: Dict[str, Optional[float]] = {
+        "acknowledge_event": None,
+    }
     
     def __init__(self, event_service=None, server=None):
         """Initialize event tools with required services.
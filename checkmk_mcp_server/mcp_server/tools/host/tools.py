@@ -16,6 +16,19 @@ logger = logging.getLogger(__name__)
 
 class HostTools:
     """Host management tools for MCP server."""
+
+    # Response budgets in bytes; larger results are paged by the tool registry
+    response_budgets: Dict[str, int] = {
+        "list_hosts": 65536,
+        "list_host_services": 65536,
+    }
+
+    # Deadlines in seconds; None keeps writes from being cut off by a default
+    deadlines: Dict[str, Optional[float]] = {
+        "create_host": None,
+        "update_host": None,
+        "delete_host": None,
+    }
     
     def __init__(self, host_service: "HostService", service_service: "ServiceService"):
         """Initialize host tools with required services.
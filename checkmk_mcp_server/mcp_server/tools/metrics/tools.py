@@ -4,7 +4,7 @@ This module contains all metrics-related MCP tools extracted from the main serve
 """
 
 import logging
-from typing import Any, Dict, TYPE_CHECKING
+from typing import Any, Callable, Dict, Optional, TYPE_CHECKING
 from mcp.types import Tool
 
 if TYPE_CHECKING:
@@ -16,20 +16,41 @@ logger = logging.getLogger(__name__)
 class MetricsTools:
     """Metrics and performance tools for MCP server."""
     
-    def __init__(self, metrics_service=None, historical_service=None, server=None):
+    def __init__(
+        self,
+        metrics_service=None,
+        historical_service=None,
+        server=None,
+        historical_service_factory: Optional[Callable[[], Any]] = None,
+    ):
         """Initialize metrics tools with required services.
         
         Args:
             metrics_service: Metrics service for metrics operations
             historical_service: Historical service for historical data
             server: MCP server instance for service access
+            historical_service_factory: Provides the historical service on
+                first use when no instance is given; keeps the scraping stack
+                unloaded until a scraper request is made
         """
         self.metrics_service = metrics_service
-        self.historical_service = historical_service
+        self._historical_service = historical_service
+        self._historical_service_factory = historical_service_factory
         self.server = server
         self._tool_handlers: Dict[str, Any] = {}
         self._tools: Dict[str, Tool] = {}
         
+    @property
+    def historical_service(self):
+        """Historical service, created through the factory on first access."""
+        if self._historical_service is None and self._historical_service_factory is not None:
+            self._historical_service = self._historical_service_factory()
+        return self._historical_service
+    
+    @historical_service.setter
+    def historical_service(self, service) -> None:
+        self._historical_service = service
+        
     def get_tools(self) -> Dict[str, Tool]:
         """Get all metrics tool definitions."""
         return self._tools.copy()
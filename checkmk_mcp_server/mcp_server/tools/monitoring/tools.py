@@ -15,6 +15,12 @@ logger = logging.getLogger(__name__)
 
 class MonitoringTools:
     """Monitoring and status tools for MCP server."""
+
+    # Response budgets in bytes; larger results are paged by the tool registry
+    response_budgets: Dict[str, int] = {
+        "get_critical_problems": 65536,
+        "get_health_dashboard": 98304,
+    }
     
     def __init__(self, status_service: "StatusService"):
         """Initialize monitoring tools with required services.
@@ -16,6 +16,12 @@ logger = logging.getLogger(__name__)
 
 class ParameterTools:
     """Parameter management tools for MCP server."""
+
+    # Deadlines in seconds; None keeps writes from being cut off by a default
+    deadlines: Dict[str, Optional[float]] = {
+        "set_service_parameters": None,
+        "update_parameter_rule": None,
+    }
     
     def __init__(self, parameter_service: "ParameterService"):
         """Initialize parameter tools with required services.
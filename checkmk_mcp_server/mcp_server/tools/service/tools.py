@@ -15,6 +15,17 @@ logger = logging.getLogger(__name__)
 
 class ServiceTools:
     """Service management tools for MCP server."""
+
+    # Response budgets in bytes; larger results are paged by the tool registry
+    response_budgets: Dict[str, int] = {
+        "list_all_services": 65536,
+    }
+
+    # Deadlines in seconds; None keeps writes from being cut off by a default
+    deadlines: Dict[str, Optional[float]] = {
+        "acknowledge_service_problem": None,
+        "create_service_downtime": None,
+    }
     
     def __init__(self, service_service: "ServiceService"):
         """Initialize service tools with required services.
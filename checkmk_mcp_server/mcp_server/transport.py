@@ -0,0 +1,181 @@
+"""HTTP transports for serving many MCP clients from one server process.
+
+With stdio every agent spawns its own server, so API sessions, caches, rule
+indexes and metrics are rebuilt per agent. The HTTP transport serves one
+long-lived :class:`~mcp.server.Server` to any number of clients:
+
+- ``<path>`` (default ``/mcp``): streamable HTTP, one MCP session per client
+  identified by the ``mcp-session-id`` header;
+- ``/sse`` and ``/messages/``: the older HTTP+SSE transport for clients that
+  do not speak streamable HTTP yet;
+- ``/health``: liveness and session counts.
+
+Each client gets its own MCP session; all sessions share the server's
+service container. ``max_sessions`` bounds open sessions per transport (new
+sessions get HTTP 503 when it is reached) and the tool registry bounds
+concurrent tool calls per session.
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+import uvicorn
+from mcp.server import Server
+from mcp.server.sse import SseServerTransport
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+from ..config import TransportConfig
+
+logger = logging.getLogger(__name__)
+
+SSE_PATH = "/sse"
+SSE_MESSAGES_PATH = "/messages/"
+
+
+class _ASGIEndpoint:
+    """Starlette route endpoint that hands the raw ASGI call to ``handler``."""
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.handler(scope, receive, send)
+
+
+class HTTPTransport:
+    """Serve an MCP server over streamable HTTP and HTTP+SSE."""
+
+    def __init__(self, server: Server, config: Optional[TransportConfig] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            server: MCP server whose handlers answer every session
+            config: Bind address, endpoint path and session limits
+        """
+        self.server = server
+        self.config = config or TransportConfig()
+        self.session_manager = StreamableHTTPSessionManager(
+            app=server,
+            json_response=self.config.json_response,
+            session_idle_timeout=self.config.session_idle_timeout,
+            max_sessions=self.config.max_sessions,
+        )
+        self.sse = SseServerTransport(SSE_MESSAGES_PATH)
+        self.sse_sessions = 0
+        self._uvicorn: Optional[uvicorn.Server] = None
+
+    def build_app(self) -> Starlette:
+        """Build the ASGI application with all endpoints."""
+
+        @contextlib.asynccontextmanager
+        async def lifespan(app: Starlette) -> AsyncIterator[None]:
+            async with self.session_manager.run():
+                yield
+
+        return Starlette(
+            routes=[
+                Route(
+                    self.config.path,
+                    endpoint=_ASGIEndpoint(self.session_manager.handle_request),
+                    methods=["GET", "POST", "DELETE"],
+                ),
+                Route(SSE_PATH, endpoint=_ASGIEndpoint(self._handle_sse), methods=["GET"]),
+                Mount(SSE_MESSAGES_PATH, app=self.sse.handle_post_message),
+                Route("/health", endpoint=self._handle_health, methods=["GET"]),
+            ],
+            lifespan=lifespan,
+        )
+
+    async def _handle_sse(self, scope, receive, send) -> None:
+        """Run one MCP session over an SSE stream."""
+        if self.sse_sessions >= self.config.max_sessions:
+            logger.warning(
+                f"Refusing SSE session: {self.sse_sessions} sessions are already open"
+            )
+            response = JSONResponse({"error": "Too many open sessions"}, status_code=503)
+            await response(scope, receive, send)
+            return
+
+        self.sse_sessions += 1
+        try:
+            async with self.sse.connect_sse(scope, receive, send) as (read, write):
+                await self.server.run(
+                    read, write, self.server.create_initialization_options()
+                )
+        finally:
+            self.sse_sessions -= 1
+
+    async def _handle_health(self, request) -> JSONResponse:
+        return JSONResponse(self.get_status())
+
+    def get_status(self) -> Dict[str, Any]:
+        """Endpoint and session information."""
+        return {
+            "status": "ok",
+            "url": self.url,
+            "sse_sessions": self.sse_sessions,
+            "max_sessions": self.config.max_sessions,
+        }
+
+    @property
+    def port(self) -> Optional[int]:
+        """Bound port once the listener is up (resolves port 0)."""
+        if self._uvicorn is None or not self._uvicorn.started:
+            return None
+        for server in self._uvicorn.servers:
+            for sock in server.sockets:
+                return sock.getsockname()[1]
+        return None
+
+    @property
+    def url(self) -> str:
+        """Streamable HTTP endpoint URL."""
+        return f"http://{self.config.host}:{self.port or self.config.port}{self.config.path}"
+
+    async def wait_started(self, timeout: float = 10.0) -> None:
+        """Wait until the listener accepts connections."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.port is None:
+            if loop.time() > deadline:
+                raise TimeoutError("HTTP transport did not start")
+            await asyncio.sleep(0.01)
+
+    async def serve(self, shutdown_event: Optional[asyncio.Event] = None) -> None:
+        """
+        Serve until the listener stops or ``shutdown_event`` is set.
+
+        Args:
+            shutdown_event: Optional event to signal shutdown
+        """
+        self._uvicorn = uvicorn.Server(
+            uvicorn.Config(
+                self.build_app(),
+                host=self.config.host,
+                port=self.config.port,
+                log_config=None,
+                log_level="warning",
+                lifespan="on",
+                # Open SSE streams would otherwise hold shutdown indefinitely
+                timeout_graceful_shutdown=5,
+            )
+        )
+        serve_task = asyncio.create_task(self._uvicorn.serve())
+        if shutdown_event is None:
+            await serve_task
+            return
+
+        shutdown_task = asyncio.create_task(shutdown_event.wait())
+        await asyncio.wait([serve_task, shutdown_task], return_when=asyncio.FIRST_COMPLETED)
+        if shutdown_task.done():
+            logger.debug("Shutdown requested, stopping HTTP transport...")
+            self._uvicorn.should_exit = True
+        else:
+            shutdown_task.cancel()
+        await serve_task
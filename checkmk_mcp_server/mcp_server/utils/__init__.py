@@ -6,17 +6,28 @@ This package contains utility functions and classes used throughout the MCP serv
 Modules:
     serialization: JSON serialization utilities including MCPJSONEncoder
     errors: Error handling and sanitization utilities
+    progress: Progress notifications and partial results for long tool calls
 
 This module is part of the Phase 1 refactoring to modularize the monolithic
 MCP server implementation.
 """
 
 # Import utility functions for easy access
-from .serialization import MCPJSONEncoder, safe_json_dumps
+from .serialization import (
+    MCPJSONEncoder,
+    get_json_backend,
+    safe_json_dumps,
+    set_json_backend,
+)
 from .errors import sanitize_error
+from .progress import ToolProgress, get_tool_progress
 
 __all__ = [
     "MCPJSONEncoder",
-    "safe_json_dumps", 
-    "sanitize_error"
+    "safe_json_dumps",
+    "get_json_backend",
+    "set_json_backend",
+    "sanitize_error",
+    "ToolProgress",
+    "get_tool_progress",
 ]
\ No newline at end of file
@@ -0,0 +1,153 @@
+"""
+Tool Progress Reporting
+
+This module lets long-running tool handlers report progress and intermediate
+results while they run.
+
+Progress is sent as MCP progress notifications against the progress token the
+client supplied in the request's ``_meta``. Intermediate results are sent as
+logging notifications on the ``checkmk.partial_result`` logger, related to the
+same request, so a client can start working on the first chunk while the rest
+is still being fetched. Both are only sent when the client asked for progress;
+otherwise reporting is a no-op and the tool behaves as before.
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, Optional, Union
+
+from .serialization import safe_json_dumps
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_RESULT_LOGGER = "checkmk.partial_result"
+
+
+class ToolProgress:
+    """Reports progress and partial results of one tool call."""
+
+    def __init__(
+        self,
+        session: Any = None,
+        progress_token: Optional[Union[str, int]] = None,
+        request_id: Optional[Union[str, int]] = None,
+        min_interval: float = 0.1,
+    ):
+        """
+        Initialize the reporter.
+
+        Args:
+            session: MCP server session of the request
+            progress_token: Progress token supplied by the client
+            request_id: JSON-RPC ID of the request the notifications relate to
+            min_interval: Minimum seconds between progress notifications;
+                the final notification is never throttled
+        """
+        self.session = session
+        self.progress_token = progress_token
+        self.request_id = request_id
+        self.min_interval = min_interval
+        self.chunks_sent = 0
+        self._last_sent = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the client asked for progress of this call."""
+        return self.session is not None and self.progress_token is not None
+
+    async def report(
+        self,
+        progress: float,
+        total: Optional[float] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        """
+        Send a progress notification.
+
+        Args:
+            progress: Work done so far; must increase between calls
+            total: Total amount of work, if known
+            message: Optional human readable status
+        """
+        if not self.enabled:
+            return
+
+        now = time.monotonic()
+        final = total is not None and progress >= total
+        if not final and now - self._last_sent < self.min_interval:
+            return
+        self._last_sent = now
+
+        try:
+            await self.session.send_progress_notification(
+                self.progress_token,
+                progress,
+                total=total,
+                message=message,
+                related_request_id=self.request_id,
+            )
+        except Exception as e:
+            # A client that went away must not fail the tool call itself
+            logger.debug(f"Failed to send progress notification: {e}")
+
+    async def report_batch(self, progress: Any, message: Optional[str] = None) -> None:
+        """
+        Send a progress notification for a BatchProgress.
+
+        Args:
+            progress: BatchProgress of the running operation
+            message: Optional status; defaults to the success/failure counts
+        """
+        if message is None:
+            message = (
+                f"{progress.completed}/{progress.total_items} done "
+                f"({progress.success} succeeded, {progress.failed} failed)"
+            )
+        await self.report(progress.completed, progress.total_items, message)
+
+    async def partial(self, content: Any) -> None:
+        """
+        Send a chunk of intermediate results.
+
+        Args:
+            content: Chunk of results; models and datetimes are serialized
+        """
+        if not self.enabled:
+            return
+
+        data: Dict[str, Any] = {
+            "progressToken": self.progress_token,
+            "chunk": self.chunks_sent,
+            # Round-trip so datetimes, enums and models arrive as plain JSON
+            "content": json.loads(safe_json_dumps(content)),
+        }
+        self.chunks_sent += 1
+        try:
+            await self.session.send_log_message(
+                level="info",
+                data=data,
+                logger=PARTIAL_RESULT_LOGGER,
+                related_request_id=self.request_id,
+            )
+        except Exception as e:
+            logger.debug(f"Failed to send partial result: {e}")
+
+
+def get_tool_progress() -> ToolProgress:
+    """Get the progress reporter of the tool call being handled.
+
+    Returns:
+        ToolProgress bound to the current MCP request, or a disabled reporter
+        when called outside a request or the client sent no progress token
+    """
+    try:
+        from mcp.server.lowlevel.server import request_ctx
+
+        context = request_ctx.get()
+    except (ImportError, LookupError):
+        return ToolProgress()
+
+    meta = context.meta
+    token = getattr(meta, "progressToken", None) if meta is not None else None
+    return ToolProgress(context.session, token, context.request_id)
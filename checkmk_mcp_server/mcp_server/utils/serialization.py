@@ -5,14 +5,40 @@ This module provides utilities for safely serializing objects to JSON,
 with special handling for datetime objects, Decimal values, Enums,
 and Pydantic models.
 
+Tool results are written compactly through a pluggable backend: orjson when
+it is installed, the stdlib encoder otherwise. Top-level pydantic models are
+written with ``model_dump_json`` so they never round-trip through dicts.
+
 Extracted from the monolithic server.py during Phase 1 refactoring.
 """
 
 import json
+import logging
+import reprlib
 from datetime import datetime, date
 from decimal import Decimal
 from enum import Enum
-from typing import Any
+from typing import Any, Callable, Dict
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+JSON_BACKENDS = ("auto", "orjson", "stdlib")
+
+# Bounded repr of an object that could not be serialized
+_fallback_repr = reprlib.Repr()
+_fallback_repr.maxstring = 200
+_fallback_repr.maxother = 200
+_fallback_repr.maxlevel = 3
 
 
 class MCPJSONEncoder(json.JSONEncoder):
@@ -46,9 +72,100 @@ class MCPJSONEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def _stdlib_dumps(obj: Any) -> str:
+    """Serialize compactly with the stdlib encoder."""
+    return json.dumps(
+        obj, cls=MCPJSONEncoder, ensure_ascii=False, separators=(",", ":")
+    )
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Convert types orjson does not handle natively.
+
+    Matches MCPJSONEncoder, so both backends produce the same documents.
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if hasattr(obj, "__dict__"):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _orjson_dumps(obj: Any) -> str:
+    """Serialize compactly with orjson, falling back to stdlib for edge cases."""
+    try:
+        return orjson.dumps(
+            obj,
+            default=_orjson_default,
+            # Dataclasses go through the default hook like with the stdlib
+            # encoder; int keys are written as strings like json.dumps does
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS,
+        ).decode("utf-8")
+    except (TypeError, orjson.JSONEncodeError):
+        # Integers beyond 64 bits, lone surrogates and the like
+        return _stdlib_dumps(obj)
+
+
+_BACKENDS: Dict[str, Callable[[Any], str]] = {"stdlib": _stdlib_dumps}
+if ORJSON_AVAILABLE:
+    _BACKENDS["orjson"] = _orjson_dumps
+
+_active_backend = "orjson" if ORJSON_AVAILABLE else "stdlib"
+
+
+def set_json_backend(name: str) -> str:
+    """
+    Select the JSON backend used by safe_json_dumps.
+
+    Args:
+        name: "auto" (orjson if installed), "orjson" or "stdlib"
+
+    Returns:
+        Name of the backend now in use
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    global _active_backend
+
+    if name not in JSON_BACKENDS:
+        raise ValueError(
+            f"Unknown JSON backend '{name}', expected one of {', '.join(JSON_BACKENDS)}"
+        )
+    if name == "orjson" and not ORJSON_AVAILABLE:
+        logger.warning("orjson is not installed, using the stdlib JSON backend")
+        name = "stdlib"
+    elif name == "auto":
+        name = "orjson" if ORJSON_AVAILABLE else "stdlib"
+
+    _active_backend = name
+    return name
+
+
+def get_json_backend() -> str:
+    """Get the name of the JSON backend in use."""
+    return _active_backend
+
+
+def _dumps_envelope(obj: Dict[Any, Any]) -> str:
+    """Serialize a result envelope, writing model values with model_dump_json.
+
+    Tool results are usually ``{"success": ..., "data": <model>}``; splicing
+    the model's own JSON in avoids dumping it to dicts first.
+    """
+    dumps = _BACKENDS[_active_backend]
+    parts = []
+    for key, value in obj.items():
+        encoded = value.model_dump_json() if isinstance(value, BaseModel) else dumps(value)
+        parts.append(f"{dumps(str(key))}:{encoded}")
+    return "{" + ",".join(parts) + "}"
+
+
 def safe_json_dumps(obj: Any) -> str:
     """
-    Safely serialize object to JSON, handling datetime and other non-serializable types.
+    Safely serialize object to compact JSON, handling datetime and other non-serializable types.
     
     This function provides a fallback mechanism for serialization failures,
     ensuring that some representation is always returned even if the primary
@@ -62,12 +179,17 @@ def safe_json_dumps(obj: Any) -> str:
         
     Example:
         >>> safe_json_dumps({"timestamp": datetime.now(), "value": 42})
-        '{"timestamp": "2025-08-19T10:30:00.123456", "value": 42}'
+        '{"timestamp":"2025-08-19T10:30:00.123456","value":42}'
     """
     try:
-        return json.dumps(obj, cls=MCPJSONEncoder, ensure_ascii=False)
+        if isinstance(obj, BaseModel):
+            return obj.model_dump_json()
+        if isinstance(obj, dict) and any(isinstance(v, BaseModel) for v in obj.values()):
+            return _dumps_envelope(obj)
+        return _BACKENDS[_active_backend](obj)
     except Exception as e:
-        # Fallback: convert to string representation
+        # Fallback: a bounded representation, so a failing multi-megabyte
+        # payload is not rendered a second time in full
         return json.dumps(
-            {"error": f"Serialization failed: {str(e)}", "data": str(obj)}
-        )
\ No newline at end of file
+            {"error": f"Serialization failed: {str(e)}", "data": _fallback_repr.repr(obj)}
+        )
@@ -26,6 +26,7 @@ from ..utils.request_context import (
     ensure_request_id,
     format_request_id,
 )
+from ..utils.tracing import end_span, start_span
 
 T = TypeVar("T")
 
@@ -81,7 +82,15 @@ def track_request(
 
                 try:
                     logger.debug(f"[{current_id}] Starting {op_name}")
-                    result = await func(*args, **kwargs)
+                    # start_span/end_span instead of span(): this wraps every
+                    # call, and is a no-op while tracing is disabled
+                    trace, trace_token = start_span(op_name)
+                    try:
+                        result = await func(*args, **kwargs)
+                    except BaseException as e:
+                        end_span(trace, trace_token, e)
+                        raise
+                    end_span(trace, trace_token)
 
                     if include_timing and start_time:
                         duration_ms = (
@@ -125,7 +134,15 @@ def track_request(
 
                 try:
                     logger.debug(f"[{current_id}] Starting {op_name}")
-                    result = func(*args, **kwargs)
+                    # start_span/end_span instead of span(): this wraps every
+                    # call, and is a no-op while tracing is disabled
+                    trace, trace_token = start_span(op_name)
+                    try:
+                        result = func(*args, **kwargs)
+                    except BaseException as e:
+                        end_span(trace, trace_token, e)
+                        raise
+                    end_span(trace, trace_token)
 
                     if include_timing and start_time:
                         duration_ms = (
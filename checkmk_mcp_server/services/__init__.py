@@ -1,10 +1,28 @@
 """Service layer for Checkmk operations - presentation agnostic business logic."""
 
-from .base import BaseService, ServiceResult
-from .host_service import HostService
-from .status_service import StatusService
-from .service_service import ServiceService
-from .parameter_service import ParameterService
+import importlib
+from typing import Any
+
+# Services are imported on first access so that importing a submodule such
+# as ``services.models`` does not pull in the API clients and every service.
+_EXPORTS = {
+    "BaseService": ".base",
+    "ServiceResult": ".base",
+    "HostService": ".host_service",
+    "StatusService": ".status_service",
+    "ServiceService": ".service_service",
+    "ParameterService": ".parameter_service",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "BaseService",
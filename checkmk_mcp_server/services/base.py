@@ -10,6 +10,8 @@ from functools import wraps
 from ..async_api_client import AsyncCheckmkClient
 from ..api_client import CheckmkAPIError
 from ..config import AppConfig
+from ..utils.tracing import span
+from .concurrency import AdaptiveConcurrencyController
 
 # Import request context utilities with fallback
 try:
@@ -285,68 +287,80 @@ class BaseService:
         else:
             return "F"
 
+    @property
+    def batch_concurrency(self) -> AdaptiveConcurrencyController:
+        """Adaptive concurrency limit used by _execute_batch_operation."""
+        controller = getattr(self, "_batch_concurrency", None)
+        if controller is None:
+            controller = AdaptiveConcurrencyController(
+                name=f"{self.__class__.__name__}.batch",
+                initial_limit=10,
+                max_limit=20,
+            )
+            self._batch_concurrency = controller
+        return controller
+
     @with_request_id()
     async def _execute_batch_operation(
         self,
         items: List[Any],
         operation: Callable[[Any], Awaitable[Any]],
-        batch_size: int = 10,
+        batch_size: Optional[int] = None,
         operation_name: str = "batch_operation",
     ) -> List[ServiceResult]:
         """
         Execute a batch operation with concurrency control and request tracking.
 
+        Concurrency follows the service's adaptive limit (see
+        batch_concurrency), which grows while operations are fast and is
+        cut when Checkmk times out or reports overload.
+
         Args:
             items: List of items to process
             operation: Async function to apply to each item
-            batch_size: Number of concurrent operations
+            batch_size: Optional hard cap on concurrent operations
             operation_name: Name for logging
 
         Returns:
             List of ServiceResult objects with request ID correlation
         """
-        results = []
+        from ..utils.request_context import set_request_id
+
         parent_request_id = ensure_request_id()
+        concurrency = self.batch_concurrency
+        results: List[Optional[ServiceResult]] = [None] * len(items)
+        pending = iter(enumerate(items))
 
-        # Process items in batches to control concurrency
-        for i in range(0, len(items), batch_size):
-            batch = items[i : i + batch_size]
-            self.logger.debug(
-                f"[{parent_request_id}] Processing batch {i//batch_size + 1} of {operation_name} ({len(batch)} items)"
-            )
+        self.logger.debug(
+            f"[{parent_request_id}] Processing {len(items)} items of {operation_name} "
+            f"(concurrency limit {concurrency.limit})"
+        )
 
-            # Execute batch concurrently with sub-request IDs
-            batch_tasks = []
-            for j, item in enumerate(batch):
-                sub_request_id = generate_sub_request_id(parent_request_id, i + j)
+        async def worker():
+            for index, item in pending:
+                sub_request_id = generate_sub_request_id(parent_request_id, index)
+                set_request_id(parent_request_id)
 
                 # Create a closure that captures the sub-request ID
-                async def item_operation(item=item, sub_id=sub_request_id):
+                async def item_operation(item=item, sub_id=sub_request_id, index=index):
                     # Set sub-request ID in context for this operation
-                    from ..utils.request_context import set_request_id
-
                     set_request_id(sub_id)
-                    return await operation(item)
+                    async with concurrency.slot():
+                        with span(f"{operation_name}.item", index=index):
+                            return await operation(item)
 
-                batch_tasks.append(
-                    self._execute_with_error_handling(
-                        item_operation, f"{operation_name}_item_{i + j}"
+                try:
+                    results[index] = await self._execute_with_error_handling(
+                        item_operation, f"{operation_name}_item_{index}"
                     )
-                )
-
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-
-            # Handle any exceptions that occurred
-            for j, result in enumerate(batch_results):
-                if isinstance(result, Exception):
-                    sub_request_id = generate_sub_request_id(parent_request_id, i + j)
-                    error_result = ServiceResult.error_result(
-                        error=f"Exception in {operation_name}: {result}",
+                except Exception as e:
+                    results[index] = ServiceResult.error_result(
+                        error=f"Exception in {operation_name}: {e}",
                         request_id=sub_request_id,
                     )
-                    results.append(error_result)
-                else:
-                    results.append(result)
+
+        worker_count = min(batch_size or concurrency.max_limit, len(items))
+        await asyncio.gather(*(worker() for _ in range(worker_count)))
 
         return results
 
@@ -2,18 +2,39 @@
 
 import asyncio
 import logging
-from typing import List, Dict, Any, TypeVar, Generic, Callable, Optional, Union, Tuple
+from typing import (
+    List,
+    Dict,
+    Any,
+    TypeVar,
+    Generic,
+    Callable,
+    Optional,
+    Union,
+    Tuple,
+    Iterable,
+    AsyncIterable,
+    AsyncIterator,
+)
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
 from pydantic import BaseModel, Field
 
 from .base import ServiceResult
+from ..utils.rate_limiter import TokenBucket
+from ..utils.request_context import DeadlineExceeded, RequestCancelled, remaining_time
+from .concurrency import AdaptiveConcurrencyController
+from .metrics import get_metrics_collector
 
 
 T = TypeVar("T")
 R = TypeVar("R")
 
+# Sentinel that marks the end of input when streaming from an asyncio.Queue
+STREAM_END = object()
+
 
 class BatchItemStatus(str, Enum):
     """Status of a batch item."""
@@ -138,6 +159,40 @@ class BatchResult(BaseModel, Generic[T, R]):
         ]
 
 
+@dataclass
+class BatchItemOutcome(Generic[T, R]):
+    """Lightweight outcome of a single item processed in streaming mode."""
+
+    index: int
+    data: T
+    status: BatchItemStatus
+    result: Optional[R] = None
+    error: Optional[str] = None
+    retry_count: int = 0
+    processing_time: Optional[float] = None
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the item was processed successfully."""
+        return self.status == BatchItemStatus.SUCCESS
+
+
+class BatchStreamResult(BaseModel):
+    """Aggregate result of a streamed batch operation.
+
+    Only counters and failed outcomes are retained; successful results are
+    handed to the consumer as they are produced and then dropped.
+    """
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    batch_id: str
+    progress: BatchProgress
+    failures: List[BatchItemOutcome] = Field(default_factory=list)
+    dropped_failures: int = 0
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
 class BatchProcessor:
     """Generic batch processor with rate limiting and error handling."""
 
@@ -147,38 +202,105 @@ class BatchProcessor:
         max_retries: int = 3,
         retry_delay: float = 1.0,
         rate_limit: Optional[int] = None,
+        min_concurrent: int = 1,
+        target_latency: float = 1.0,
+        concurrency_ceiling: Optional[int] = None,
     ):
         """
         Initialize batch processor.
 
         Args:
-            max_concurrent: Maximum concurrent operations
+            max_concurrent: Concurrent operations to start with
             max_retries: Maximum retry attempts per item
             retry_delay: Delay between retries (seconds)
             rate_limit: Maximum operations per second (None for unlimited)
+            min_concurrent: Lower bound for the adaptive concurrency limit
+            target_latency: Per-operation latency (seconds) the adaptive
+                limit tries to stay under
+            concurrency_ceiling: Upper bound the adaptive limit may grow to
+                while latency stays low (None keeps it at max_concurrent,
+                so the limit only backs off)
         """
         self.max_concurrent = max_concurrent
+        self.concurrency_ceiling = max(max_concurrent, concurrency_ceiling or 0)
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.rate_limit = rate_limit
-        self._semaphore = asyncio.Semaphore(max_concurrent)
-        self._rate_limiter = asyncio.Semaphore(rate_limit) if rate_limit else None
-        self._last_operation_time = 0
+        self._semaphore = asyncio.Semaphore(self.concurrency_ceiling)
+        # Operations start at max_concurrent; the adaptive limit backs off
+        # towards min_concurrent when Checkmk shows signs of overload and
+        # grows back up to concurrency_ceiling while it responds quickly
+        self.concurrency = AdaptiveConcurrencyController(
+            name="batch_processor",
+            initial_limit=max_concurrent,
+            min_limit=min(min_concurrent, max_concurrent),
+            max_limit=self.concurrency_ceiling,
+            target_latency=target_latency,
+        )
+        # Per-batch item pacing; REST calls are additionally limited process-wide
+        # by the transport-level limiter in CheckmkClient
+        self._rate_limiter = TokenBucket(rate=rate_limit, capacity=1)
         self.logger = logging.getLogger(__name__)
 
+    def _record_item(self, status: str) -> None:
+        """Count a finished item for batch throughput metrics."""
+        get_metrics_collector().add_counter("batch.items", status=status)
+
     async def _rate_limit(self):
         """Apply rate limiting if configured."""
         if self.rate_limit:
-            # Calculate minimum time between operations
-            min_interval = 1.0 / self.rate_limit
+            await self._rate_limiter.acquire_async()
 
-            # Wait if necessary
-            current_time = asyncio.get_event_loop().time()
-            time_since_last = current_time - self._last_operation_time
-            if time_since_last < min_interval:
-                await asyncio.sleep(min_interval - time_since_last)
+    async def _run_with_retries(
+        self, data: T, operation: Callable[[T], R], item_id: str
+    ) -> Tuple[bool, Optional[R], Optional[str], int]:
+        """
+        Run an operation on one item, retrying failures with linear backoff.
 
-            self._last_operation_time = asyncio.get_event_loop().time()
+        Once the request's deadline has passed, remaining items fail without
+        being attempted, and retries are skipped when the backoff would
+        outlast the remaining budget.
+
+        Args:
+            data: Item to process
+            operation: Async function to process the item
+            item_id: Identifier used in log messages
+
+        Returns:
+            Tuple of (success, result, error message, retry count)
+        """
+        retry_count = 0
+        for attempt in range(self.max_retries):
+            if remaining_time() == 0:
+                return False, None, "Deadline exceeded", retry_count
+            try:
+                async with self.concurrency.slot():
+                    result = await operation(data)
+                return True, result, None, retry_count
+
+            except Exception as e:
+                retry_count = attempt + 1
+                wait_time = self.retry_delay * (attempt + 1)
+                remaining = remaining_time()
+                if isinstance(e, (DeadlineExceeded, RequestCancelled)) or (
+                    remaining is not None and remaining <= wait_time
+                ):
+                    self.logger.warning(
+                        f"Not retrying item {item_id}, out of time: {e}"
+                    )
+                    return False, None, str(e), retry_count
+                if attempt < self.max_retries - 1:
+                    self.logger.warning(
+                        f"Retry {attempt + 1}/{self.max_retries} for item {item_id}: {e}"
+                    )
+                    await asyncio.sleep(wait_time)
+                else:
+                    self.logger.error(
+                        f"Failed item {item_id} after {self.max_retries} attempts: {e}"
+                    )
+                    return False, None, str(e), retry_count
+
+        return False, None, "No attempts made", retry_count
 
     async def process_batch(
         self,
@@ -228,6 +350,7 @@ class BatchProcessor:
                             batch_item.mark_skipped(error_msg or "Validation failed")
                             progress.processing -= 1
                             progress.skipped += 1
+                            self._record_item("skipped")
                             return
 
                     # Apply rate limiting
@@ -236,34 +359,25 @@ class BatchProcessor:
                     # Process with retries
                     batch_item.mark_processing()
 
-                    for attempt in range(self.max_retries):
-                        try:
-                            result = await operation(batch_item.data)
-                            batch_item.mark_success(result)
-                            progress.processing -= 1
-                            progress.success += 1
-                            return
-
-                        except Exception as e:
-                            batch_item.retry_count = attempt + 1
-                            if attempt < self.max_retries - 1:
-                                self.logger.warning(
-                                    f"Retry {attempt + 1}/{self.max_retries} for item {batch_item.id}: {e}"
-                                )
-                                await asyncio.sleep(self.retry_delay * (attempt + 1))
-                            else:
-                                batch_item.mark_failed(str(e))
-                                progress.processing -= 1
-                                progress.failed += 1
-                                self.logger.error(
-                                    f"Failed item {batch_item.id} after {self.max_retries} attempts: {e}"
-                                )
+                    success, result, error, retry_count = await self._run_with_retries(
+                        batch_item.data, operation, batch_item.id
+                    )
+                    batch_item.retry_count = retry_count
+                    progress.processing -= 1
+                    if success:
+                        batch_item.mark_success(result)
+                        progress.success += 1
+                    else:
+                        batch_item.mark_failed(error)
+                        progress.failed += 1
+                    self._record_item("success" if success else "failed")
 
                 except Exception as e:
                     # Unexpected error in processing logic
                     batch_item.mark_failed(f"Processing error: {str(e)}")
                     progress.processing -= 1
                     progress.failed += 1
+                    self._record_item("failed")
                     self.logger.exception(
                         f"Unexpected error processing item {batch_item.id}"
                     )
@@ -291,6 +405,7 @@ class BatchProcessor:
                 "end_time": progress.end_time.isoformat(),
                 "duration_seconds": progress.duration,
                 "items_per_second": progress.items_per_second,
+                "concurrency_limit": self.concurrency.limit,
             },
         )
 
@@ -302,6 +417,271 @@ class BatchProcessor:
 
         return result
 
+    def process_stream(
+        self,
+        items: Union[Iterable[T], AsyncIterable[T], "asyncio.Queue[T]"],
+        operation: Callable[[T], R],
+        batch_id: Optional[str] = None,
+        total_items: Optional[int] = None,
+        progress_callback: Optional[Callable[[BatchProgress], None]] = None,
+        validate_item: Optional[Callable[[T], Tuple[bool, Optional[str]]]] = None,
+        max_failures: int = 1000,
+        buffer_size: Optional[int] = None,
+    ) -> "BatchStream[T, R]":
+        """
+        Process items in streaming mode with bounded memory.
+
+        Unlike process_batch, items are pulled lazily from the input by a fixed
+        pool of ``concurrency_ceiling`` workers (gated by the adaptive limit)
+        and outcomes are yielded as soon as they are available. Only aggregate
+        counters and failed outcomes are retained, so the input can be an
+        iterator straight from a file or CSV parser of arbitrary size.
+
+        Args:
+            items: Iterable, async iterable or asyncio.Queue of items. A queue
+                is read until STREAM_END is received.
+            operation: Async function to process each item
+            batch_id: Optional batch identifier
+            total_items: Optional total item count (for progress reporting)
+            progress_callback: Optional callback for progress updates
+            validate_item: Optional validation function (returns valid, error_msg)
+            max_failures: Maximum number of failed outcomes to retain
+            buffer_size: Maximum queued inputs/outcomes (default 2x workers)
+
+        Returns:
+            BatchStream that yields BatchItemOutcome objects when iterated
+
+        Example:
+            stream = processor.process_stream(csv.DictReader(f), create_host)
+            async for outcome in stream:
+                ...
+            summary = stream.result
+        """
+        return BatchStream(
+            processor=self,
+            items=items,
+            operation=operation,
+            batch_id=batch_id or f"stream_{datetime.now().timestamp()}",
+            total_items=total_items,
+            progress_callback=progress_callback,
+            validate_item=validate_item,
+            max_failures=max_failures,
+            buffer_size=buffer_size or self.max_concurrent * 2,
+        )
+
+
+class BatchStream(Generic[T, R]):
+    """Async iterator over the outcomes of a streamed batch operation."""
+
+    def __init__(
+        self,
+        processor: BatchProcessor,
+        items: Union[Iterable[T], AsyncIterable[T], "asyncio.Queue[T]"],
+        operation: Callable[[T], R],
+        batch_id: str,
+        total_items: Optional[int] = None,
+        progress_callback: Optional[Callable[[BatchProgress], None]] = None,
+        validate_item: Optional[Callable[[T], Tuple[bool, Optional[str]]]] = None,
+        max_failures: int = 1000,
+        buffer_size: int = 20,
+    ):
+        """
+        Initialize batch stream.
+
+        Args:
+            processor: BatchProcessor providing retry and rate limit settings
+            items: Input items (iterable, async iterable or queue)
+            operation: Async function to process each item
+            batch_id: Batch identifier
+            total_items: Optional total item count
+            progress_callback: Optional callback for progress updates
+            validate_item: Optional validation function
+            max_failures: Maximum number of failed outcomes to retain
+            buffer_size: Maximum queued inputs/outcomes
+        """
+        self.processor = processor
+        self.operation = operation
+        self.progress_callback = progress_callback
+        self.validate_item = validate_item
+        self.max_failures = max_failures
+        self.buffer_size = max(1, buffer_size)
+        self._items = items
+        self._total_known = total_items is not None
+        self._started = False
+        self.result = BatchStreamResult(
+            batch_id=batch_id,
+            progress=BatchProgress(total_items=total_items or 0),
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def __aiter__(self) -> AsyncIterator[BatchItemOutcome[T, R]]:
+        if self._started:
+            raise RuntimeError(f"Batch stream {self.result.batch_id} already consumed")
+        self._started = True
+        return self._run()
+
+    async def drain(self) -> BatchStreamResult:
+        """Consume the whole stream, discarding outcomes, and return the summary."""
+        async for _ in self:
+            pass
+        return self.result
+
+    async def _iterate_input(self) -> AsyncIterator[T]:
+        """Normalize the supported input types to an async iterator."""
+        items = self._items
+        if isinstance(items, asyncio.Queue):
+            while True:
+                item = await items.get()
+                if item is STREAM_END:
+                    return
+                yield item
+        elif hasattr(items, "__aiter__"):
+            async for item in items:
+                yield item
+        else:
+            for item in items:
+                yield item
+
+    async def _process_one(self, index: int, data: T) -> BatchItemOutcome[T, R]:
+        """Validate, rate limit and process a single item."""
+        progress = self.result.progress
+        progress.pending -= 1
+        progress.processing += 1
+        item_id = f"{self.result.batch_id}_{index}"
+        started = asyncio.get_event_loop().time()
+
+        try:
+            if self.validate_item:
+                valid, error_msg = await self.validate_item(data)
+                if not valid:
+                    progress.processing -= 1
+                    progress.skipped += 1
+                    self.processor._record_item("skipped")
+                    return BatchItemOutcome(
+                        index=index,
+                        data=data,
+                        status=BatchItemStatus.SKIPPED,
+                        error=error_msg or "Validation failed",
+                    )
+
+            await self.processor._rate_limit()
+
+            success, result, error, retry_count = (
+                await self.processor._run_with_retries(data, self.operation, item_id)
+            )
+            status = BatchItemStatus.SUCCESS if success else BatchItemStatus.FAILED
+
+        except Exception as e:
+            self.logger.exception(f"Unexpected error processing item {item_id}")
+            success, result, error, retry_count = (
+                False,
+                None,
+                f"Processing error: {str(e)}",
+                0,
+            )
+            status = BatchItemStatus.FAILED
+
+        progress.processing -= 1
+        if success:
+            progress.success += 1
+        else:
+            progress.failed += 1
+        self.processor._record_item(status.value)
+
+        return BatchItemOutcome(
+            index=index,
+            data=data,
+            status=status,
+            result=result,
+            error=error,
+            retry_count=retry_count,
+            processing_time=asyncio.get_event_loop().time() - started,
+        )
+
+    def _record_failure(self, outcome: BatchItemOutcome[T, R]) -> None:
+        """Keep failed outcomes up to the configured limit."""
+        if len(self.result.failures) < self.max_failures:
+            self.result.failures.append(outcome)
+        else:
+            self.result.dropped_failures += 1
+
+    async def _run(self) -> AsyncIterator[BatchItemOutcome[T, R]]:
+        """Run the worker pool and yield outcomes as they complete."""
+        progress = self.result.progress
+        worker_count = max(1, self.processor.concurrency_ceiling)
+        work_queue: asyncio.Queue = asyncio.Queue(maxsize=self.buffer_size)
+        outcomes: asyncio.Queue = asyncio.Queue(maxsize=self.buffer_size)
+
+        async def feed():
+            index = 0
+            try:
+                async for data in self._iterate_input():
+                    if not self._total_known:
+                        progress.total_items += 1
+                    progress.pending += 1
+                    await work_queue.put((index, data))
+                    index += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(
+                    f"Input error in batch stream {self.result.batch_id}: {e}"
+                )
+                self.result.metadata["input_error"] = str(e)
+
+            for _ in range(worker_count):
+                await work_queue.put(None)
+
+        async def work():
+            while True:
+                entry = await work_queue.get()
+                if entry is None:
+                    break
+                outcome = await self._process_one(*entry)
+                await outcomes.put(outcome)
+            await outcomes.put(None)
+
+        tasks = [asyncio.create_task(feed())]
+        tasks.extend(asyncio.create_task(work()) for _ in range(worker_count))
+
+        try:
+            finished_workers = 0
+            while finished_workers < worker_count:
+                outcome = await outcomes.get()
+                if outcome is None:
+                    finished_workers += 1
+                    continue
+
+                if outcome.status == BatchItemStatus.FAILED:
+                    self._record_failure(outcome)
+
+                if self.progress_callback:
+                    await self.progress_callback(progress)
+
+                yield outcome
+
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            progress.end_time = datetime.now()
+            self.result.metadata.update(
+                {
+                    "start_time": progress.start_time.isoformat(),
+                    "end_time": progress.end_time.isoformat(),
+                    "duration_seconds": progress.duration,
+                    "items_per_second": progress.items_per_second,
+                    "concurrency_limit": self.processor.concurrency.limit,
+                }
+            )
+            self.logger.info(
+                f"Batch stream {self.result.batch_id} finished: "
+                f"{progress.success} success, {progress.failed} failed, "
+                f"{progress.skipped} skipped in {progress.duration:.2f}s"
+            )
+
 
 class BatchOperationsMixin:
     """Mixin to add batch operation capabilities to services."""
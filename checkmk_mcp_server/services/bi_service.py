@@ -265,9 +265,8 @@ class BIService(BaseService):
     ) -> Dict[str, Any]:
         """Make an API request using the underlying client."""
         try:
-            # Use the sync client through the async wrapper
-            sync_client = self.checkmk.sync_client
-            return sync_client._make_request(method, endpoint, **kwargs)
+            # Runs in the client's executor so the event loop is not blocked
+            return await self.checkmk.make_request(method, endpoint, **kwargs)
         except Exception as e:
             self.logger.error(f"BI API request failed: {e}")
             raise CheckmkAPIError(f"BI API request failed: {e}")
@@ -0,0 +1,374 @@
+"""Bulk write planning for host configuration changes.
+
+Checkmk offers bulk-create, bulk-update and bulk-delete actions for host
+configuration. Sending many hosts per request turns a large onboarding from
+one round trip (and one pending change) per host into a few dozen requests.
+Bulk requests are all-or-nothing on the Checkmk side, so when a chunk is
+rejected because of its content the planner bisects it until the offending
+entries are isolated, and reports a result per host.
+"""
+
+import logging
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from ..api_client import CheckmkAPIError, CreateHostRequest
+from ..async_api_client import AsyncCheckmkClient
+from ..utils import validate_hostname, sanitize_folder_path
+from .batch import BatchProgress
+
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Status codes that mean the whole request (not one of its entries) was
+# rejected; splitting the chunk would not help
+_NON_BISECTABLE_STATUS_CODES = frozenset({401, 403, 408, 429})
+
+
+class BulkOperation(str, Enum):
+    """Bulk write operation types."""
+
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class BulkEntryResult(BaseModel):
+    """Result for a single host in a bulk write."""
+
+    host_name: str
+    success: bool
+    error: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+class BulkWriteResult(BaseModel):
+    """Outcome of a planned bulk write."""
+
+    operation: BulkOperation
+    results: List[BulkEntryResult] = Field(default_factory=list)
+    chunk_size: int
+    requests_made: int = 0
+    bisections: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> List[BulkEntryResult]:
+        """Entries that were applied."""
+        return [r for r in self.results if r.success]
+
+    @property
+    def failed(self) -> List[BulkEntryResult]:
+        """Entries that were rejected."""
+        return [r for r in self.results if not r.success]
+
+
+# Called after each chunk with the overall progress and the chunk's outcomes
+BulkProgressCallback = Callable[
+    [BatchProgress, List[BulkEntryResult]], Awaitable[None]
+]
+
+
+def normalize_create_entry(host_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert tool/service style host data to a bulk-create entry.
+
+    Accepts ``host_name`` or ``name`` and folds ``ip_address``, ``alias`` and
+    ``labels`` into the host attributes.
+
+    Args:
+        host_data: Host creation data
+
+    Returns:
+        Dict with folder, host_name and attributes keys
+    """
+    attributes = dict(host_data.get("attributes") or {})
+    if host_data.get("ip_address"):
+        attributes["ipaddress"] = host_data["ip_address"]
+    if host_data.get("alias"):
+        attributes["alias"] = host_data["alias"]
+    if host_data.get("labels"):
+        attributes["labels"] = host_data["labels"]
+
+    return {
+        "host_name": host_data.get("host_name") or host_data.get("name") or "",
+        "folder": sanitize_folder_path(host_data.get("folder", "/")),
+        "attributes": attributes,
+    }
+
+
+def normalize_update_entry(host_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert host update data to a bulk-update entry.
+
+    Args:
+        host_data: Dict with ``host_name`` (or ``name``) and one of
+            ``attributes`` (replace), ``update_attributes``,
+            ``remove_attributes``; ``ip_address`` is merged into
+            ``update_attributes``
+
+    Returns:
+        Dict suitable for the bulk-update endpoint
+    """
+    entry: Dict[str, Any] = {
+        "host_name": host_data.get("host_name") or host_data.get("name") or ""
+    }
+    for key in ("attributes", "update_attributes", "remove_attributes"):
+        if host_data.get(key) is not None:
+            entry[key] = host_data[key]
+
+    if host_data.get("ip_address"):
+        entry.setdefault("update_attributes", {})
+        entry["update_attributes"] = {
+            **entry["update_attributes"],
+            "ipaddress": host_data["ip_address"],
+        }
+    return entry
+
+
+def _is_entry_error(error: Exception) -> bool:
+    """Check whether a failed bulk request was rejected because of its entries."""
+    status_code = getattr(error, "status_code", None)
+    return (
+        isinstance(error, CheckmkAPIError)
+        and status_code is not None
+        and 400 <= status_code < 500
+        and status_code not in _NON_BISECTABLE_STATUS_CODES
+    )
+
+
+class BulkWritePlanner:
+    """Chunks host writes into bulk requests and isolates failing entries."""
+
+    def __init__(
+        self,
+        checkmk_client: AsyncCheckmkClient,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Initialize the planner.
+
+        Args:
+            checkmk_client: Async Checkmk API client
+            chunk_size: Maximum number of hosts per bulk request
+        """
+        self.checkmk = checkmk_client
+        self.chunk_size = max(1, chunk_size)
+        self.logger = logging.getLogger(__name__)
+
+    def plan(
+        self, entries: List[Any], chunk_size: Optional[int] = None
+    ) -> List[List[Any]]:
+        """Split entries into bulk request chunks.
+
+        Args:
+            entries: Entries to send
+            chunk_size: Override for the configured chunk size
+
+        Returns:
+            List of chunks in submission order
+        """
+        size = max(1, chunk_size or self.chunk_size)
+        return [entries[i : i + size] for i in range(0, len(entries), size)]
+
+    async def create_hosts(
+        self,
+        hosts_data: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        progress_callback: Optional[BulkProgressCallback] = None,
+    ) -> BulkWriteResult:
+        """Create hosts using bulk-create requests.
+
+        Args:
+            hosts_data: Host creation data (see normalize_create_entry)
+            chunk_size: Override for the configured chunk size
+            progress_callback: Optional callback run after each chunk
+
+        Returns:
+            BulkWriteResult with one entry per input host
+        """
+        entries = [normalize_create_entry(host) for host in hosts_data]
+
+        def validate(entry: Dict[str, Any]) -> Optional[str]:
+            try:
+                CreateHostRequest(**entry)
+            except ValidationError as e:
+                return f"Invalid host data: {e.errors()[0].get('msg', str(e))}"
+            return None
+
+        return await self._execute(
+            BulkOperation.CREATE,
+            entries,
+            key=lambda entry: entry["host_name"],
+            send=self.checkmk.bulk_create_hosts,
+            validate=validate,
+            chunk_size=chunk_size,
+            progress_callback=progress_callback,
+        )
+
+    async def update_hosts(
+        self,
+        updates: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        progress_callback: Optional[BulkProgressCallback] = None,
+    ) -> BulkWriteResult:
+        """Update hosts using bulk-update requests.
+
+        Args:
+            updates: Host update data (see normalize_update_entry)
+            chunk_size: Override for the configured chunk size
+            progress_callback: Optional callback run after each chunk
+
+        Returns:
+            BulkWriteResult with one entry per input host
+        """
+        entries = [normalize_update_entry(update) for update in updates]
+
+        def validate(entry: Dict[str, Any]) -> Optional[str]:
+            if len(entry) < 2:
+                return "No attribute changes given"
+            return None
+
+        return await self._execute(
+            BulkOperation.UPDATE,
+            entries,
+            key=lambda entry: entry["host_name"],
+            send=self.checkmk.bulk_update_hosts,
+            validate=validate,
+            chunk_size=chunk_size,
+            progress_callback=progress_callback,
+        )
+
+    async def delete_hosts(
+        self,
+        host_names: List[str],
+        chunk_size: Optional[int] = None,
+        progress_callback: Optional[BulkProgressCallback] = None,
+    ) -> BulkWriteResult:
+        """Delete hosts using bulk-delete requests.
+
+        Args:
+            host_names: Names of hosts to delete
+            chunk_size: Override for the configured chunk size
+            progress_callback: Optional callback run after each chunk
+
+        Returns:
+            BulkWriteResult with one entry per input host
+        """
+        return await self._execute(
+            BulkOperation.DELETE,
+            list(host_names),
+            key=lambda name: name,
+            send=self.checkmk.bulk_delete_hosts,
+            chunk_size=chunk_size,
+            progress_callback=progress_callback,
+        )
+
+    async def _execute(
+        self,
+        operation: BulkOperation,
+        entries: List[Any],
+        key: Callable[[Any], str],
+        send: Callable[[List[Any]], Awaitable[Any]],
+        validate: Optional[Callable[[Any], Optional[str]]] = None,
+        chunk_size: Optional[int] = None,
+        progress_callback: Optional[BulkProgressCallback] = None,
+    ) -> BulkWriteResult:
+        """Validate entries locally, then submit them chunk by chunk."""
+        started = time.monotonic()
+        result = BulkWriteResult(
+            operation=operation, chunk_size=chunk_size or self.chunk_size
+        )
+        outcomes: List[Optional[BulkEntryResult]] = [None] * len(entries)
+
+        # Reject invalid and duplicate entries without a round trip
+        seen = set()
+        sendable: List[int] = []
+        for index, entry in enumerate(entries):
+            host_name = key(entry)
+            error = None
+            if not host_name or not validate_hostname(host_name):
+                error = f"Invalid hostname: {host_name!r}"
+            elif host_name in seen:
+                error = f"Duplicate host in request: {host_name}"
+            elif validate:
+                error = validate(entry)
+
+            if error:
+                outcomes[index] = BulkEntryResult(
+                    host_name=host_name, success=False, error=error
+                )
+            else:
+                seen.add(host_name)
+                sendable.append(index)
+
+        # Chunks are sent sequentially: Checkmk serializes configuration
+        # writes, so parallel bulk requests would only queue on its side
+        progress = BatchProgress(
+            total_items=len(entries),
+            pending=len(sendable),
+            failed=len(entries) - len(sendable),
+        )
+        for chunk in self.plan(sendable, result.chunk_size):
+            await self._submit(chunk, entries, key, send, outcomes, result)
+            if progress_callback:
+                chunk_results = [outcomes[i] for i in chunk]
+                succeeded = sum(1 for outcome in chunk_results if outcome.success)
+                progress.pending -= len(chunk)
+                progress.success += succeeded
+                progress.failed += len(chunk) - succeeded
+                await progress_callback(progress, chunk_results)
+
+        result.results = [outcome for outcome in outcomes if outcome is not None]
+        result.duration_seconds = time.monotonic() - started
+
+        self.logger.info(
+            f"Bulk {operation.value} finished: {len(result.succeeded)} succeeded, "
+            f"{len(result.failed)} failed in {result.requests_made} requests"
+        )
+        return result
+
+    async def _submit(
+        self,
+        chunk: List[int],
+        entries: List[Any],
+        key: Callable[[Any], str],
+        send: Callable[[List[Any]], Awaitable[Any]],
+        outcomes: List[Optional[BulkEntryResult]],
+        result: BulkWriteResult,
+    ) -> None:
+        """Send one chunk, bisecting it if Checkmk rejects its content."""
+        result.requests_made += 1
+        try:
+            response = await send([entries[i] for i in chunk])
+
+        except Exception as e:
+            if len(chunk) > 1 and _is_entry_error(e):
+                result.bisections += 1
+                middle = len(chunk) // 2
+                self.logger.debug(
+                    f"Bulk {result.operation.value} of {len(chunk)} entries rejected "
+                    f"({e}); retrying as {middle} + {len(chunk) - middle}"
+                )
+                await self._submit(chunk[:middle], entries, key, send, outcomes, result)
+                await self._submit(chunk[middle:], entries, key, send, outcomes, result)
+                return
+
+            for i in chunk:
+                outcomes[i] = BulkEntryResult(
+                    host_name=key(entries[i]), success=False, error=str(e)
+                )
+            return
+
+        returned = {}
+        if isinstance(response, dict):
+            for item in response.get("value") or []:
+                if isinstance(item, dict) and item.get("id"):
+                    returned[item["id"]] = item
+
+        for i in chunk:
+            host_name = key(entries[i])
+            outcomes[i] = BulkEntryResult(
+                host_name=host_name, success=True, data=returned.get(host_name)
+            )
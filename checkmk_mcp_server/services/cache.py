@@ -5,6 +5,7 @@ import hashlib
 import json
 import logging
 import time
+import weakref
 from typing import Optional, Dict, Any, TypeVar, Generic, Callable, Union
 from datetime import datetime, timedelta
 from functools import wraps
@@ -61,20 +62,25 @@ class CacheStats(BaseModel):
 class LRUCache:
     """Simple async-safe LRU cache implementation."""
 
-    def __init__(self, max_size: int = 1000, default_ttl: int = 300):
+    def __init__(
+        self, max_size: int = 1000, default_ttl: int = 300, name: str = "default"
+    ):
         """
         Initialize LRU cache.
 
         Args:
             max_size: Maximum number of entries
             default_ttl: Default time-to-live in seconds
+            name: Name reported in cache metrics
         """
+        self.name = name
         self.max_size = max_size
         self.default_ttl = default_ttl
         self._cache: Dict[str, CacheEntry] = {}
         self._lock = asyncio.Lock()
         self._stats = CacheStats()
         self.logger = logging.getLogger(__name__)
+        _caches.add(self)
 
     def _make_key(self, *args, **kwargs) -> str:
         """Create a cache key from arguments."""
@@ -169,13 +175,42 @@ class LRUCache:
         return self._stats.model_copy()
 
 
+# Live caches, reported through the metrics endpoints
+_caches: "weakref.WeakSet[LRUCache]" = weakref.WeakSet()
+
+
+def get_all_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for every live cache.
+
+    Returns:
+        Dict mapping cache name to its statistics plus hit rate; duplicate
+        names are suffixed with ``#2``, ``#3``...
+    """
+    stats: Dict[str, Dict[str, Any]] = {}
+    for cache in sorted(list(_caches), key=lambda c: c.name):
+        key = cache.name
+        suffix = 2
+        while key in stats:
+            key = f"{cache.name}#{suffix}"
+            suffix += 1
+        cache_stats = cache.get_stats()
+        stats[key] = {
+            **cache_stats.model_dump(),
+            "hit_rate": cache_stats.hit_rate,
+            "max_size": cache.max_size,
+        }
+    return stats
+
+
 class CachingService:
     """Mixin to add caching capabilities to services."""
 
     def __init__(self, *args, cache_ttl: int = 300, cache_size: int = 1000, **kwargs):
         # For multiple inheritance, let other classes handle their init first
         super().__init__(*args, **kwargs)
-        self._cache = LRUCache(max_size=cache_size, default_ttl=cache_ttl)
+        self._cache = LRUCache(
+            max_size=cache_size, default_ttl=cache_ttl, name=self.__class__.__name__
+        )
         # Don't overwrite existing logger if it exists
         if not hasattr(self, "logger"):
             self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
@@ -0,0 +1,306 @@
+"""Adaptive concurrency control for batch and streaming workloads.
+
+The controller implements AIMD (additive increase, multiplicative decrease):
+while calls complete within the latency target the concurrency limit grows by
+roughly one slot per window of completed calls, and on overload signals
+(timeouts, connection failures, 429/5xx gateway errors or latency spikes) it is
+cut by a constant factor. This keeps parallelism high when Checkmk is idle and
+backs off quickly when it is struggling.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+import requests
+
+
+# HTTP status codes that indicate the server is overloaded rather than that
+# the request itself was wrong
+OVERLOAD_STATUS_CODES = frozenset({408, 429, 502, 503, 504})
+
+_OVERLOAD_EXCEPTIONS = (
+    asyncio.TimeoutError,
+    TimeoutError,
+    ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+)
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Check whether an exception signals server overload.
+
+    The exception chain is inspected because the API client re-raises
+    transport errors as CheckmkAPIError.
+
+    Args:
+        error: Exception raised by an operation
+
+    Returns:
+        bool: True for timeouts, connection failures and overload status codes
+    """
+    seen = 0
+    current: Optional[BaseException] = error
+    while current is not None and seen < 5:
+        if isinstance(current, _OVERLOAD_EXCEPTIONS):
+            return True
+        if getattr(current, "status_code", None) in OVERLOAD_STATUS_CODES:
+            return True
+        current = current.__cause__ or current.__context__
+        seen += 1
+    return False
+
+
+class AdaptiveConcurrencyController:
+    """AIMD concurrency limiter driven by observed latency and errors.
+
+    Usage:
+        async with controller.slot():
+            await do_api_call()
+
+    Calls that raise are recorded automatically; only overload errors (see
+    is_overload_error) reduce the limit, other failures leave it unchanged.
+    """
+
+    def __init__(
+        self,
+        name: str = "default",
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 50,
+        target_latency: float = 1.0,
+        spike_factor: float = 2.0,
+        backoff_factor: float = 0.5,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            name: Name used in metrics
+            initial_limit: Starting concurrency limit
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            target_latency: Latency (seconds) below which the limit may grow
+            spike_factor: Latency above target * spike_factor counts as overload
+            backoff_factor: Multiplier applied to the limit on overload
+        """
+        self.name = name
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.target_latency = target_latency
+        self.spike_factor = spike_factor
+        self.backoff_factor = backoff_factor
+
+        self._limit = float(
+            min(self.max_limit, max(self.min_limit, int(initial_limit)))
+        )
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        self._avg_latency: Optional[float] = None
+
+        # Statistics
+        self.completed = 0
+        self.overloads = 0
+        self.increases = 0
+        self.decreases = 0
+
+        self.logger = logging.getLogger(__name__)
+        _register(self)
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently holding a slot."""
+        return self._in_flight
+
+    @property
+    def average_latency(self) -> Optional[float]:
+        """Exponentially weighted average latency in seconds."""
+        return self._avg_latency
+
+    async def acquire(self) -> float:
+        """Wait for a free slot.
+
+        Returns:
+            float: Monotonic start time to pass to release()
+        """
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return time.monotonic()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just before cancellation - give it back
+                self._in_flight -= 1
+                self._wake_waiters()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+        return time.monotonic()
+
+    def release(
+        self, started: float, error: Optional[BaseException] = None
+    ) -> None:
+        """Release a slot and feed the observation into the controller.
+
+        Args:
+            started: Value returned by acquire()
+            error: Exception raised by the call, if any
+        """
+        self._in_flight = max(0, self._in_flight - 1)
+        self.record(time.monotonic() - started, error, started=started)
+        self._wake_waiters()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a concurrency slot for the duration of the block."""
+        started = await self.acquire()
+        try:
+            yield
+        except BaseException as e:
+            self.release(started, e if isinstance(e, Exception) else None)
+            raise
+        else:
+            self.release(started)
+
+    def record(
+        self,
+        latency: float,
+        error: Optional[BaseException] = None,
+        started: Optional[float] = None,
+    ) -> None:
+        """Record one completed call and adjust the limit.
+
+        Args:
+            latency: Call duration in seconds
+            error: Exception raised by the call, if any
+            started: Monotonic start time; overload signals from calls that
+                started before the last decrease are ignored so one burst of
+                failures only halves the limit once
+        """
+        self.completed += 1
+        if self._avg_latency is None:
+            self._avg_latency = latency
+        else:
+            self._avg_latency = 0.8 * self._avg_latency + 0.2 * latency
+
+        overloaded = (error is not None and is_overload_error(error)) or (
+            latency > self.target_latency * self.spike_factor
+        )
+
+        if overloaded:
+            self.overloads += 1
+            if started is None:
+                started = time.monotonic() - latency
+            if started >= self._last_decrease:
+                self._decrease()
+        elif error is None and latency <= self.target_latency:
+            self._increase()
+
+    def _increase(self) -> None:
+        if self._limit >= self.max_limit:
+            return
+        previous = self.limit
+        # One extra slot per window of `limit` successful calls
+        self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+        if self.limit > previous:
+            self.increases += 1
+            self._wake_waiters()
+
+    def _decrease(self) -> None:
+        previous = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.backoff_factor)
+        self._last_decrease = time.monotonic()
+        if self.limit < previous:
+            self.decreases += 1
+            self.logger.info(
+                f"Concurrency '{self.name}' reduced from {previous} to {self.limit}"
+            )
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def backoff_delay(self) -> float:
+        """Suggested pause between sequential calls.
+
+        Zero while the controller runs at its maximum limit; approaches the
+        average call latency as the limit is cut towards the minimum. Used by
+        sequential loops (e.g. page fetching) instead of a fixed sleep.
+        """
+        if self._avg_latency is None or self.max_limit == self.min_limit:
+            return 0.0
+        pressure = (self.max_limit - self._limit) / (self.max_limit - self.min_limit)
+        return max(0.0, pressure * self._avg_latency)
+
+    async def pace(self) -> None:
+        """Sleep for backoff_delay() if the controller has backed off."""
+        delay = self.backoff_delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get controller statistics."""
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "target_latency_ms": self.target_latency * 1000,
+            "avg_latency_ms": (
+                round(self._avg_latency * 1000, 2)
+                if self._avg_latency is not None
+                else None
+            ),
+            "completed": self.completed,
+            "overloads": self.overloads,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+# Live controllers, reported through the metrics endpoints
+_controllers: "weakref.WeakSet[AdaptiveConcurrencyController]" = weakref.WeakSet()
+
+
+def _register(controller: AdaptiveConcurrencyController) -> None:
+    _controllers.add(controller)
+
+
+def get_all_concurrency_stats() -> Dict[str, Any]:
+    """Get statistics for every live concurrency controller.
+
+    Returns:
+        Dict mapping controller name to its statistics; duplicate names are
+        suffixed with ``#2``, ``#3``...
+    """
+    stats: Dict[str, Any] = {}
+    for controller in sorted(list(_controllers), key=lambda c: c.name):
+        key = controller.name
+        suffix = 2
+        while key in stats:
+            key = f"{controller.name}#{suffix}"
+            suffix += 1
+        stats[key] = controller.get_stats()
+    return stats
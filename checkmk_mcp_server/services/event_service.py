@@ -78,8 +78,7 @@ class EventService(BaseService):
                 params["site_id"] = site_id
 
             # Use the API client's list_events method
-            sync_client = self.checkmk.sync_client
-            events_data = sync_client.list_events(**params)
+            events_data = await self.checkmk.list_events(**params)
 
             # Convert to EventInfo objects
             events = []
@@ -176,9 +175,8 @@ class EventService(BaseService):
                         }
                     )
 
-            # Use the API client's list_events method directly
-            sync_client = self.checkmk.sync_client
-            events_data = sync_client.list_events(query=query, host=host_name)
+            # Use the API client's list_events method
+            events_data = await self.checkmk.list_events(query=query, host=host_name)
 
             # Convert to EventInfo objects
             events = []
@@ -236,9 +234,8 @@ class EventService(BaseService):
                         ],
                     }
 
-            # Use the API client's list_events method directly
-            sync_client = self.checkmk.sync_client
-            events_data = sync_client.list_events(query=query, host=host_name)
+            # Use the API client's list_events method
+            events_data = await self.checkmk.list_events(query=query, host=host_name)
 
             # Convert to EventInfo objects
             events = []
@@ -277,9 +274,8 @@ class EventService(BaseService):
                 "right": "2",  # Critical state
             }
 
-            # Use the API client's list_events method directly
-            sync_client = self.checkmk.sync_client
-            events_data = sync_client.list_events(query=query, state="critical")
+            # Use the API client's list_events method
+            events_data = await self.checkmk.list_events(query=query, state="critical")
 
             # Convert to EventInfo objects
             events = []
@@ -440,9 +436,8 @@ class EventService(BaseService):
             else:
                 query = {"op": "and", "expr": query_parts}
 
-            # Use the API client's list_events method directly
-            sync_client = self.checkmk.sync_client
-            events_data = sync_client.list_events(
+            # Use the API client's list_events method
+            events_data = await self.checkmk.list_events(
                 query=query, host=host_filter, state=state_filter
             )
 
@@ -466,16 +461,9 @@ class EventService(BaseService):
         self, method: str, endpoint: str, **kwargs
     ) -> Dict[str, Any]:
         """Make an API request using the underlying client."""
-        # Since we don't have direct HTTP access in the async client,
-        # we need to add these methods to the main API client
-        # For now, we'll implement this as a fallback
         try:
-            # Use the sync client through the async wrapper
-            sync_client = self.checkmk.sync_client
-            if method == "GET":
-                return sync_client._make_request(method, endpoint, **kwargs)
-            else:
-                return sync_client._make_request(method, endpoint, **kwargs)
+            # Runs in the client's executor so the event loop is not blocked
+            return await self.checkmk.make_request(method, endpoint, **kwargs)
         except Exception as e:
             self.logger.error(f"API request failed: {e}")
             raise CheckmkAPIError(f"Event Console API request failed: {e}")
@@ -0,0 +1,264 @@
+"""Fixed-memory metric primitives.
+
+These structures back MetricsCollector. Memory depends only on the number of
+distinct metric series and the configured bucket counts, never on the number
+of recorded samples:
+
+- LogHistogram: log-bucketed (HDR-style) histogram with bounded relative
+  error; histograms with the same accuracy can be merged exactly, so
+  percentiles can be combined across tags or time slots.
+- RollingCounter: event counts over a sliding time window made of a fixed
+  ring of slots.
+- RollingHistogram: the same ring of slots, each holding a LogHistogram, for
+  recent-window percentiles.
+"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+
+
+class LogHistogram:
+    """Log-bucketed histogram with bounded relative error.
+
+    A value v > min_value is counted in bucket ceil(log(v) / log(gamma)) with
+    gamma = (1 + accuracy) / (1 - accuracy); every value in a bucket is within
+    ``accuracy`` (relative) of the bucket's representative value. Values at or
+    below min_value (including zero) share a single bucket.
+    """
+
+    __slots__ = (
+        "accuracy",
+        "min_value",
+        "_gamma_log",
+        "_min_index",
+        "buckets",
+        "count",
+        "total",
+        "min",
+        "max",
+    )
+
+    def __init__(self, accuracy: float = 0.01, min_value: float = 1e-6):
+        """
+        Initialize histogram.
+
+        Args:
+            accuracy: Maximum relative error of reported percentiles
+            min_value: Smallest distinguishable value (smaller values are
+                counted in the lowest bucket)
+        """
+        self.accuracy = accuracy
+        self.min_value = min_value
+        self._gamma_log = math.log((1 + accuracy) / (1 - accuracy))
+        self._min_index = self._index(min_value)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._gamma_log)
+
+    def _value(self, index: int) -> float:
+        if index <= self._min_index:
+            return self.min_value
+        gamma = math.exp(self._gamma_log)
+        return 2 * gamma**index / (gamma + 1)
+
+    def record(self, value: float, count: int = 1) -> None:
+        """Record a value (negative values are clamped to zero)."""
+        value = max(0.0, value)
+        index = self._min_index if value <= self.min_value else self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LogHistogram") -> "LogHistogram":
+        """Add another histogram's counts into this one.
+
+        Raises:
+            ValueError: If the histograms use different bucket layouts
+        """
+        if (other.accuracy, other.min_value) != (self.accuracy, self.min_value):
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def copy(self) -> "LogHistogram":
+        """Return an independent copy."""
+        clone = LogHistogram(self.accuracy, self.min_value)
+        return clone.merge(self)
+
+    @property
+    def mean(self) -> float:
+        """Mean of recorded values."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th percentile (0-100).
+
+        Returns:
+            float: Percentile estimate, or 0.0 if the histogram is empty
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100.0))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.max, max(self.min, self._value(index)))
+        return self.max
+
+    def percentiles(self, qs: Iterable[float]) -> Dict[float, float]:
+        """Estimate several percentiles in one pass over the buckets."""
+        wanted = sorted(qs)
+        result = {q: 0.0 for q in wanted}
+        if not self.count:
+            return result
+
+        ranks = [(q, max(1, math.ceil(self.count * q / 100.0))) for q in wanted]
+        seen = 0
+        position = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            while position < len(ranks) and seen >= ranks[position][1]:
+                value = min(self.max, max(self.min, self._value(index)))
+                result[ranks[position][0]] = value
+                position += 1
+            if position == len(ranks):
+                break
+        return result
+
+    def count_at_or_below(self, bound: float) -> int:
+        """Count values at or below a bound (within the relative accuracy)."""
+        return sum(
+            count
+            for index, count in self.buckets.items()
+            if self._value(index) <= bound
+        )
+
+    def cumulative_buckets(self) -> List[tuple]:
+        """Return (upper bound, cumulative count) pairs in ascending order."""
+        gamma = math.exp(self._gamma_log)
+        pairs = []
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            upper = self.min_value if index <= self._min_index else gamma**index
+            pairs.append((upper, seen))
+        return pairs
+
+
+class _RollingSlots(ABC):
+    """Ring of time slots covering a sliding window."""
+
+    def __init__(self, window_seconds: float, slots: int):
+        self.slots = max(1, slots)
+        self.slot_seconds = window_seconds / self.slots
+        self._epochs: List[int] = [-1] * self.slots
+
+    def _slot(self, now: Optional[float]) -> int:
+        epoch = int((time.monotonic() if now is None else now) // self.slot_seconds)
+        position = epoch % self.slots
+        if self._epochs[position] != epoch:
+            self._epochs[position] = epoch
+            self._reset(position)
+        return position
+
+    def _live_positions(self, now: Optional[float]) -> List[int]:
+        epoch = int((time.monotonic() if now is None else now) // self.slot_seconds)
+        return [
+            position
+            for position, slot_epoch in enumerate(self._epochs)
+            if epoch - self.slots < slot_epoch <= epoch
+        ]
+
+    @abstractmethod
+    def _reset(self, position: int) -> None:
+        """Clear a slot that is being reused for a new epoch."""
+
+
+class RollingCounter(_RollingSlots):
+    """Event count over a sliding window using a fixed ring of slots."""
+
+    def __init__(self, window_seconds: float = 3600, slots: int = 60):
+        """
+        Initialize counter.
+
+        Args:
+            window_seconds: Length of the sliding window
+            slots: Number of slots (window resolution)
+        """
+        self.window_seconds = window_seconds
+        self._counts: List[float] = [0.0] * max(1, slots)
+        super().__init__(window_seconds, slots)
+
+    def _reset(self, position: int) -> None:
+        self._counts[position] = 0.0
+
+    def add(self, value: float = 1.0, now: Optional[float] = None) -> None:
+        """Add to the current slot."""
+        self._counts[self._slot(now)] += value
+
+    def total(self, now: Optional[float] = None) -> float:
+        """Sum over the window."""
+        return sum(self._counts[p] for p in self._live_positions(now))
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """Average events per second over the window."""
+        return self.total(now) / self.window_seconds
+
+
+class RollingHistogram(_RollingSlots):
+    """LogHistogram over a sliding window using a fixed ring of slots."""
+
+    def __init__(
+        self,
+        window_seconds: float = 300,
+        slots: int = 10,
+        accuracy: float = 0.01,
+        min_value: float = 1e-6,
+    ):
+        """
+        Initialize rolling histogram.
+
+        Args:
+            window_seconds: Length of the sliding window
+            slots: Number of slots (window resolution)
+            accuracy: Relative accuracy of each slot histogram
+            min_value: Smallest distinguishable value
+        """
+        self.window_seconds = window_seconds
+        self._accuracy = accuracy
+        self._min_value = min_value
+        self._histograms: List[LogHistogram] = [
+            LogHistogram(accuracy, min_value) for _ in range(max(1, slots))
+        ]
+        super().__init__(window_seconds, slots)
+
+    def _reset(self, position: int) -> None:
+        self._histograms[position] = LogHistogram(self._accuracy, self._min_value)
+
+    def record(self, value: float, now: Optional[float] = None) -> None:
+        """Record a value in the current slot."""
+        self._histograms[self._slot(now)].record(value)
+
+    def merged(self, now: Optional[float] = None) -> LogHistogram:
+        """Histogram of all values in the window."""
+        result = LogHistogram(self._accuracy, self._min_value)
+        for position in self._live_positions(now):
+            result.merge(self._histograms[position])
+        return result
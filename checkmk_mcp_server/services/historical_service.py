@@ -3,11 +3,11 @@
 import logging
 import re
 from datetime import datetime
-from typing import List, Tuple, Union, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Tuple, Union, Optional, Dict, Any
 from dataclasses import asdict
 
 from ..config import AppConfig, CheckmkConfig
-from ..async_api_client import AsyncCheckmkClient
+from ..async_api_client import AsyncCheckmkClient, run_blocking
 from .base import BaseService, ServiceResult
 from .cache import CachingService
 from .models.historical import (
@@ -16,8 +16,32 @@ from .models.historical import (
     HistoricalDataRequest,
     HistoricalDataServiceResult
 )
-# Import the modular ScraperService from web_scraping module
-from .web_scraping.scraper_service import ScraperService
+
+if TYPE_CHECKING:
+    from .web_scraping.scraper_service import ScraperService
+
+
+def _scraper_class() -> Any:
+    """Get the modular ScraperService, importing it on first use.
+
+    The web_scraping module loads BeautifulSoup and lxml, which would
+    otherwise be paid for by every process importing this module. A
+    ScraperService patched onto this module takes precedence.
+    """
+    scraper_class = globals().get("ScraperService")
+    if scraper_class is None:
+        from .web_scraping.scraper_service import ScraperService as scraper_class
+
+        globals()["ScraperService"] = scraper_class
+    return scraper_class
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve ``ScraperService`` lazily (see _scraper_class)."""
+    if name == "ScraperService":
+        return _scraper_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Import request context utilities with fallback
 try:
@@ -99,7 +123,7 @@ class HistoricalDataService(BaseService):
             checkmk_config = self.config.checkmk
             
             # Create fresh scraper instance with the original working implementation
-            scraper = ScraperService(checkmk_config)
+            scraper = _scraper_class()(checkmk_config)
             
             self.logger.debug(f"Created fresh scraper instance for server: {checkmk_config.server_url}")
             return scraper
@@ -385,7 +409,9 @@ class HistoricalDataService(BaseService):
             
             # Scrape historical data
             self.logger.debug(f"[{request_id}] Scraping data with period: {request.period}")
-            scraper_result = scraper.scrape_historical_data(
+            # The scraper uses blocking requests; keep it off the event loop
+            scraper_result = await run_blocking(
+                scraper.scrape_historical_data,
                 period=request.period,
                 host=request.host_name,
                 service=request.service_name
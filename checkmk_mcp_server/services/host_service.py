@@ -5,6 +5,7 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 from .base import BaseService, ServiceResult
+from .bulk import BulkProgressCallback, BulkWritePlanner, normalize_create_entry
 from .models.hosts import (
     HostInfo,
     HostListResult,
@@ -19,6 +20,7 @@ from ..async_api_client import AsyncCheckmkClient
 from ..api_client import CheckmkAPIError
 from ..config import AppConfig
 from ..utils import validate_hostname, sanitize_folder_path
+from ..utils.call_breakdown import timed_phase
 
 
 class HostService(BaseService):
@@ -27,6 +29,7 @@ class HostService(BaseService):
     def __init__(self, checkmk_client: AsyncCheckmkClient, config: AppConfig):
         super().__init__(checkmk_client, config)
         self.logger = logging.getLogger(__name__)
+        self.bulk_planner = BulkWritePlanner(checkmk_client)
 
     async def list_hosts(
         self,
@@ -289,65 +292,110 @@ class HostService(BaseService):
         )
 
     async def bulk_create_hosts(
-        self, hosts_data: List[Dict[str, Any]]
+        self,
+        hosts_data: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        progress_callback: Optional[BulkProgressCallback] = None,
     ) -> ServiceResult[HostBulkCreateResult]:
         """
         Create multiple hosts in bulk.
 
+        Hosts are sent in bulk-create chunks; chunks rejected by Checkmk are
+        bisected so that only the offending hosts fail.
+
         Args:
             hosts_data: List of host creation data
+            chunk_size: Maximum hosts per bulk request
+            progress_callback: Optional async callback run after each chunk
+                with the BatchProgress and the chunk's per-host results
 
         Returns:
             ServiceResult containing HostBulkCreateResult
         """
 
         async def _bulk_create_operation():
-            # Validate all host data first
-            validation_errors = []
-            for i, host_data in enumerate(hosts_data):
-                name = host_data.get("name")
-                folder = host_data.get("folder", "/")
-                ip_address = host_data.get("ip_address")
-
-                errors = self._validate_create_host_params(name, folder, ip_address)
-                if errors:
-                    validation_errors.extend(
-                        [f"Host {i+1}: {error}" for error in errors]
-                    )
-
-            if validation_errors:
-                raise ValueError(f"Validation errors: {'; '.join(validation_errors)}")
-
-            # Create hosts via API
-            results = await self.checkmk.bulk_create_hosts(hosts_data)
+            outcome = await self.bulk_planner.create_hosts(
+                hosts_data, chunk_size, progress_callback
+            )
+            requested = {
+                entry["host_name"]: entry
+                for entry in map(normalize_create_entry, hosts_data)
+            }
 
             created_hosts = []
-            failed_hosts = []
-
-            for result in results:
-                if result.get("success", False):
-                    host_info = self._convert_api_host_to_model(result["data"])
-                    created_hosts.append(host_info)
+            for entry in outcome.succeeded:
+                if entry.data:
+                    created_hosts.append(self._convert_api_host_to_model(entry.data))
                 else:
-                    failed_hosts.append(
-                        {
-                            "name": result.get("name", "unknown"),
-                            "error": result.get("error", "Unknown error"),
-                        }
+                    request = requested[entry.host_name]
+                    created_hosts.append(
+                        HostInfo(
+                            name=entry.host_name,
+                            folder=request["folder"],
+                            ip_address=request["attributes"].get("ipaddress"),
+                            attributes=request["attributes"],
+                        )
                     )
 
             return HostBulkCreateResult(
                 created_hosts=created_hosts,
-                failed_hosts=failed_hosts,
+                failed_hosts=[
+                    {"name": entry.host_name, "error": entry.error or "Unknown error"}
+                    for entry in outcome.failed
+                ],
                 success_count=len(created_hosts),
-                failure_count=len(failed_hosts),
+                failure_count=len(outcome.failed),
                 total_requested=len(hosts_data),
+                warnings=(
+                    [f"{outcome.bisections} bulk requests were split to isolate failures"]
+                    if outcome.bisections
+                    else []
+                ),
             )
 
         return await self._execute_with_error_handling(
             _bulk_create_operation, "bulk_create_hosts"
         )
 
+    async def bulk_delete_hosts(
+        self,
+        host_names: List[str],
+        chunk_size: Optional[int] = None,
+        progress_callback: Optional[BulkProgressCallback] = None,
+    ) -> ServiceResult[HostBulkDeleteResult]:
+        """
+        Delete multiple hosts in bulk.
+
+        Args:
+            host_names: Names of hosts to delete
+            chunk_size: Maximum hosts per bulk request
+            progress_callback: Optional async callback run after each chunk
+
+        Returns:
+            ServiceResult containing HostBulkDeleteResult
+        """
+
+        async def _bulk_delete_operation():
+            outcome = await self.bulk_planner.delete_hosts(
+                host_names, chunk_size, progress_callback
+            )
+
+            return HostBulkDeleteResult(
+                deleted_hosts=[entry.host_name for entry in outcome.succeeded],
+                failed_hosts=[
+                    {"name": entry.host_name, "error": entry.error or "Unknown error"}
+                    for entry in outcome.failed
+                ],
+                success_count=len(outcome.succeeded),
+                failure_count=len(outcome.failed),
+                total_requested=len(host_names),
+            )
+
+        return await self._execute_with_error_handling(
+            _bulk_delete_operation, "bulk_delete_hosts"
+        )
+
+    @timed_phase("model_conversion")
     def _convert_api_host_to_model(
         self, host_data: Dict[str, Any], include_status: bool = False
     ) -> HostInfo:
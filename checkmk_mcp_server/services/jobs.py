@@ -0,0 +1,488 @@
+"""Durable, resumable batch jobs backed by an append-only journal.
+
+Long-running batch operations (such as bulk host creation) run as background
+jobs on top of BatchProcessor. Each job writes a JSONL journal: a header line
+with the operation and its input items, followed by one line per processed
+item and a line per status change. The journal is the source of truth, so
+after a server restart a job can be inspected and resumed; items that already
+succeeded are skipped. Journal writes (which fsync) run on a single writer
+thread, so they stay in order and off the event loop.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, Field
+
+from .batch import BatchProcessor
+
+
+# Per-item outcome returned by chunked job handlers: (success, error message)
+ItemOutcome = Tuple[bool, Optional[str]]
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a batch job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    INTERRUPTED = "interrupted"  # Process stopped while running; resumable
+
+
+class BatchJob(BaseModel):
+    """Status summary of a batch job."""
+
+    job_id: str
+    operation: str
+    status: JobStatus = JobStatus.PENDING
+    total_items: int = 0
+    success: int = 0
+    failed: int = 0
+    params: Dict[str, Any] = Field(default_factory=dict)
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    recent_failures: List[Dict[str, Any]] = Field(default_factory=list)
+
+    @property
+    def completed(self) -> int:
+        """Number of items with a recorded outcome."""
+        return self.success + self.failed
+
+    @property
+    def progress_percent(self) -> float:
+        """Completion percentage."""
+        if self.total_items == 0:
+            return 100.0
+        return (self.completed / self.total_items) * 100
+
+    @property
+    def is_active(self) -> bool:
+        """Whether the job is queued or running."""
+        return self.status in (JobStatus.PENDING, JobStatus.RUNNING)
+
+    def to_summary(self) -> Dict[str, Any]:
+        """Compact representation for tool responses."""
+        return {
+            "job_id": self.job_id,
+            "operation": self.operation,
+            "status": self.status.value,
+            "total_items": self.total_items,
+            "success": self.success,
+            "failed": self.failed,
+            "remaining": max(0, self.total_items - self.completed),
+            "progress_percent": round(self.progress_percent, 1),
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+            "recent_failures": self.recent_failures,
+        }
+
+
+@dataclass
+class JobOperation:
+    """A named operation that jobs can run (and re-run after a restart)."""
+
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    # When set, the handler receives lists of up to chunk_size items and
+    # returns one ItemOutcome per item; otherwise it receives single items and
+    # signals failure by raising
+    chunk_size: Optional[int] = None
+    item_label: Callable[[Any], str] = str
+
+
+class JobJournal:
+    """Append-only JSONL journal for one job."""
+
+    MAX_RECENT_FAILURES = 50
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def create(self, job: BatchJob, items: List[Any]) -> None:
+        """Write the header line for a new job."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            "type": "job",
+            "job_id": job.job_id,
+            "operation": job.operation,
+            "params": job.params,
+            "created_at": job.created_at.isoformat(),
+            "items": items,
+        }
+        with open(self.path, "x", encoding="utf-8") as f:
+            f.write(json.dumps(header, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append(self, records: List[Dict[str, Any]]) -> None:
+        """Append records and flush them to disk."""
+        if not records:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def replay(self) -> Tuple[BatchJob, List[Any], Dict[int, bool]]:
+        """Rebuild job state from the journal.
+
+        Returns:
+            Tuple of (job, input items, latest success flag per item index)
+        """
+        job: Optional[BatchJob] = None
+        items: List[Any] = []
+        outcomes: Dict[int, bool] = {}
+        failures: Dict[int, Dict[str, Any]] = {}
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line from a crash mid-write
+                    continue
+
+                kind = record.get("type")
+                if kind == "job":
+                    items = record.get("items", [])
+                    job = BatchJob(
+                        job_id=record["job_id"],
+                        operation=record["operation"],
+                        params=record.get("params") or {},
+                        total_items=len(items),
+                        created_at=record["created_at"],
+                        updated_at=record["created_at"],
+                    )
+                elif kind == "item" and job is not None:
+                    index = record["i"]
+                    outcomes[index] = bool(record.get("ok"))
+                    if record.get("ok"):
+                        failures.pop(index, None)
+                    else:
+                        failures[index] = {
+                            "index": index,
+                            "item": record.get("label"),
+                            "error": record.get("error"),
+                        }
+                elif kind == "status" and job is not None:
+                    job.status = JobStatus(record["status"])
+                    job.error = record.get("error")
+                    if record.get("at"):
+                        job.updated_at = datetime.fromisoformat(record["at"])
+                    job.finished_at = None if job.is_active else job.updated_at
+
+        if job is None:
+            raise ValueError(f"Journal {self.path} has no job header")
+
+        job.success = sum(1 for ok in outcomes.values() if ok)
+        job.failed = len(outcomes) - job.success
+        job.recent_failures = list(failures.values())[-self.MAX_RECENT_FAILURES :]
+        return job, items, outcomes
+
+
+class BatchJobManager:
+    """Runs batch operations as durable background jobs."""
+
+    def __init__(
+        self, batch_processor: BatchProcessor, jobs_dir: Union[str, Path]
+    ):
+        """
+        Initialize the job manager.
+
+        Args:
+            batch_processor: Processor providing concurrency, retries and pacing
+            jobs_dir: Directory holding one journal file per job
+        """
+        self.processor = batch_processor
+        self.jobs_dir = Path(jobs_dir).expanduser()
+        self._operations: Dict[str, JobOperation] = {}
+        self._jobs: Dict[str, BatchJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # One thread, so journal writes happen in submission order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-journal")
+        self.logger = logging.getLogger(__name__)
+
+    def register_operation(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        chunk_size: Optional[int] = None,
+        item_label: Optional[Callable[[Any], str]] = None,
+    ) -> None:
+        """Register an operation that jobs can run.
+
+        Args:
+            name: Operation name stored in the journal
+            handler: Async handler (see JobOperation)
+            chunk_size: Items per handler call for chunked operations
+            item_label: Function producing a readable label for an item
+        """
+        self._operations[name] = JobOperation(
+            name=name,
+            handler=handler,
+            chunk_size=chunk_size,
+            item_label=item_label or str,
+        )
+
+    async def _write(self, func: Callable[..., None], *args: Any) -> None:
+        """Run a journal write on the writer thread.
+
+        The write is shielded: once submitted it completes even if the job
+        is cancelled meanwhile, so recorded outcomes are never lost.
+        """
+        loop = asyncio.get_running_loop()
+        await asyncio.shield(loop.run_in_executor(self._writer, func, *args))
+
+    def _journal(self, job_id: str) -> JobJournal:
+        if not job_id or any(c in job_id for c in "/\\."):
+            raise ValueError(f"Invalid job id: {job_id!r}")
+        return JobJournal(self.jobs_dir / f"{job_id}.jsonl")
+
+    async def start_job(
+        self,
+        operation: str,
+        items: List[Any],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> BatchJob:
+        """Create a job and start it in the background.
+
+        Args:
+            operation: Registered operation name
+            items: JSON-serializable input items
+            params: Optional parameters recorded with the job
+
+        Returns:
+            BatchJob with its job_id
+        """
+        if operation not in self._operations:
+            raise ValueError(f"Unknown batch operation: {operation}")
+
+        job = BatchJob(
+            job_id=f"job_{uuid.uuid4().hex[:12]}",
+            operation=operation,
+            total_items=len(items),
+            params=params or {},
+        )
+        journal = self._journal(job.job_id)
+        await self._write(journal.create, job, items)
+        await self._launch(job, journal, items, pending=list(range(len(items))))
+        return job
+
+    async def resume_job(self, job_id: str) -> BatchJob:
+        """Resume an interrupted, cancelled or partially failed job.
+
+        Items that already succeeded are skipped; failed and unprocessed items
+        are run again.
+        """
+        if job_id in self._tasks and not self._tasks[job_id].done():
+            return self._jobs[job_id]
+
+        journal = self._journal(job_id)
+        if not journal.path.exists():
+            raise KeyError(f"Batch job '{job_id}' not found")
+
+        job, items, outcomes = journal.replay()
+        if job.operation not in self._operations:
+            raise ValueError(f"Unknown batch operation: {job.operation}")
+
+        pending = [i for i in range(len(items)) if not outcomes.get(i)]
+        # Failures are re-counted as the pending items are retried
+        job.failed = 0
+        job.recent_failures = []
+        job.error = None
+        job.finished_at = None
+        await self._launch(job, journal, items, pending)
+        self.logger.info(
+            f"Resuming batch job {job_id}: {len(pending)} of {len(items)} items remaining"
+        )
+        return job
+
+    def get_job(self, job_id: str) -> Optional[BatchJob]:
+        """Get job status from memory or, after a restart, from its journal."""
+        if job_id in self._jobs:
+            return self._jobs[job_id]
+
+        journal = self._journal(job_id)
+        if not journal.path.exists():
+            return None
+        job, _, _ = journal.replay()
+        if job.is_active:
+            # The process running it is gone
+            job.status = JobStatus.INTERRUPTED
+        return job
+
+    def list_jobs(self, limit: int = 20) -> List[BatchJob]:
+        """List the most recently modified jobs."""
+        if not self.jobs_dir.exists():
+            return []
+        paths = sorted(
+            self.jobs_dir.glob("job_*.jsonl"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        jobs = []
+        for path in paths[:limit]:
+            try:
+                job = self.get_job(path.stem)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Skipping unreadable job journal {path}: {e}")
+                continue
+            if job:
+                jobs.append(job)
+        return jobs
+
+    async def cancel_job(self, job_id: str) -> BatchJob:
+        """Cancel a running job; completed items stay recorded."""
+        task = self._tasks.get(job_id)
+        if task is None or task.done():
+            job = self.get_job(job_id)
+            if job is None:
+                raise KeyError(f"Batch job '{job_id}' not found")
+            return job
+
+        job = self._jobs[job_id]
+        job.status = JobStatus.CANCELLED
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return job
+
+    async def wait(self, job_id: str) -> Optional[BatchJob]:
+        """Wait for a running job to finish."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+        return self.get_job(job_id)
+
+    async def shutdown(self) -> None:
+        """Stop running jobs, leaving them resumable."""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _launch(
+        self, job: BatchJob, journal: JobJournal, items: List[Any], pending: List[int]
+    ) -> None:
+        job.status = JobStatus.RUNNING
+        job.updated_at = datetime.now()
+        self._jobs[job.job_id] = job
+        await self._write(journal.append, [self._status_record(job)])
+        # The job outlives the tool call that started it, so it runs in a
+        # fresh context: no deadline, call breakdown or trace span of the call
+        self._tasks[job.job_id] = contextvars.Context().run(
+            asyncio.create_task, self._run(job, journal, items, pending)
+        )
+
+    def _status_record(self, job: BatchJob) -> Dict[str, Any]:
+        return {
+            "type": "status",
+            "status": job.status.value,
+            "at": job.updated_at.isoformat(),
+            "error": job.error,
+        }
+
+    async def _run(
+        self, job: BatchJob, journal: JobJournal, items: List[Any], pending: List[int]
+    ) -> None:
+        """Process pending items and journal every outcome."""
+        operation = self._operations[job.operation]
+        chunk_size = 1
+        if operation.chunk_size:
+            chunk_size = max(1, int(job.params.get("chunk_size") or operation.chunk_size))
+        units = [pending[i : i + chunk_size] for i in range(0, len(pending), chunk_size)]
+
+        async def run_unit(indices: List[int]) -> List[ItemOutcome]:
+            if operation.chunk_size:
+                outcomes = await operation.handler([items[i] for i in indices])
+                if len(outcomes) != len(indices):
+                    raise RuntimeError(
+                        f"Operation {operation.name} returned {len(outcomes)} "
+                        f"outcomes for {len(indices)} items"
+                    )
+                return list(outcomes)
+            await operation.handler(items[indices[0]])
+            return [(True, None)]
+
+        try:
+            stream = self.processor.process_stream(
+                units, run_unit, batch_id=job.job_id, total_items=len(units)
+            )
+            async for unit_outcome in stream:
+                indices = unit_outcome.data
+                if unit_outcome.succeeded:
+                    results = unit_outcome.result
+                else:
+                    results = [(False, unit_outcome.error)] * len(indices)
+                await self._record(job, journal, operation, items, indices, results)
+
+            job.status = JobStatus.COMPLETED if job.failed == 0 else JobStatus.FAILED
+            if job.failed:
+                job.error = f"{job.failed} of {job.total_items} items failed"
+
+        except asyncio.CancelledError:
+            if job.status != JobStatus.CANCELLED:
+                job.status = JobStatus.INTERRUPTED
+            await self._finish(job, journal)
+            raise
+
+        except Exception as e:
+            self.logger.exception(f"Batch job {job.job_id} failed")
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+
+        await self._finish(job, journal)
+
+    async def _record(
+        self,
+        job: BatchJob,
+        journal: JobJournal,
+        operation: JobOperation,
+        items: List[Any],
+        indices: List[int],
+        results: List[ItemOutcome],
+    ) -> None:
+        records = []
+        for index, (ok, error) in zip(indices, results):
+            label = operation.item_label(items[index])
+            record = {"type": "item", "i": index, "ok": ok, "label": label}
+            if ok:
+                job.success += 1
+            else:
+                job.failed += 1
+                record["error"] = error
+                job.recent_failures.append({"index": index, "item": label, "error": error})
+            records.append(record)
+
+        del job.recent_failures[: -JobJournal.MAX_RECENT_FAILURES]
+        job.updated_at = datetime.now()
+        await self._write(journal.append, records)
+
+    async def _finish(self, job: BatchJob, journal: JobJournal) -> None:
+        job.updated_at = datetime.now()
+        job.finished_at = job.updated_at
+        await self._write(journal.append, [self._status_record(job)])
+        self.logger.info(
+            f"Batch job {job.job_id} {job.status.value}: "
+            f"{job.success} succeeded, {job.failed} failed"
+        )
@@ -0,0 +1,266 @@
+"""Event loop lag monitoring.
+
+A blocked event loop delays every concurrent MCP request, so the server keeps
+a small probe task that sleeps for a fixed interval and measures how late it
+wakes up. The lag is recorded as the ``event_loop.lag`` timing metric.
+
+For debugging, :class:`LoopStallDetector` finds *what* blocks the loop: a
+watchdog thread notices when the loop has not come round for longer than a
+threshold and logs the loop thread's stack at that moment, which is the
+stack of the blocking callback.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .metrics import MetricsCollector, get_metrics_collector
+
+
+class EventLoopMonitor:
+    """Measures event loop scheduling lag with a periodic probe task."""
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        collector: Optional[MetricsCollector] = None,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between probes
+            collector: Metrics collector (defaults to the global collector)
+        """
+        self.interval = interval
+        self.collector = collector or get_metrics_collector()
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self._task: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def running(self) -> bool:
+        """Whether the probe task is active."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start probing on the running event loop (no-op if already running)."""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the probe task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def record(self, lag: float) -> None:
+        """Record one lag sample in seconds."""
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.samples += 1
+        self.collector.observe_timing("event_loop.lag", lag)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - expected))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lag statistics."""
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "last_lag_seconds": self.last_lag,
+            "max_lag_seconds": self.max_lag,
+            "samples": self.samples,
+        }
+
+
+class LoopStallDetector:
+    """Reports callbacks that block the event loop, with their stack.
+
+    A heartbeat callback on the loop records each turn of the loop; a
+    watchdog thread checks the heartbeat and, once the loop is more than
+    ``threshold`` seconds late, logs a warning with the stack of the loop
+    thread. When the loop comes round again the stall's total duration is
+    recorded as the ``event_loop.stall`` timing metric.
+
+    The watchdog costs a thread wake-up every quarter threshold, so the
+    detector is meant for debug runs rather than always-on use.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        collector: Optional[MetricsCollector] = None,
+        max_reports: int = 20,
+    ):
+        """
+        Initialize the detector.
+
+        Args:
+            threshold: Seconds the loop may be blocked before it is reported
+            collector: Metrics collector (defaults to the global collector)
+            max_reports: Number of recent stall reports kept for get_stats
+        """
+        self.threshold = threshold
+        self.collector = collector or get_metrics_collector()
+        self.stalls = 0
+        self.reports: Deque[Dict[str, Any]] = deque(maxlen=max_reports)
+        self.logger = logging.getLogger(__name__)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._next_beat = 0.0
+        self._stalled_report: Optional[Dict[str, Any]] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    @property
+    def interval(self) -> float:
+        """Seconds between heartbeats and watchdog checks."""
+        return self.threshold / 4
+
+    @property
+    def running(self) -> bool:
+        """Whether the watchdog is active."""
+        return self._watchdog is not None and self._watchdog.is_alive()
+
+    def start(self) -> None:
+        """Start watching the running event loop (no-op if already running)."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._beat()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-stall-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        self.logger.info(
+            f"Event loop stall detection enabled (threshold {self.threshold * 1000:.0f}ms)"
+        )
+
+    def stop(self) -> None:
+        """Stop the heartbeat and the watchdog thread."""
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+
+    def _beat(self) -> None:
+        """Heartbeat on the loop thread; closes a stall in progress."""
+        now = time.monotonic()
+        report = self._stalled_report
+        if report is not None:
+            self._stalled_report = None
+            report["duration_seconds"] = now - report["started"]
+            self.collector.observe_timing("event_loop.stall", report["duration_seconds"])
+            self.logger.debug(
+                f"Event loop stall ended after {report['duration_seconds'] * 1000:.0f}ms"
+            )
+        self._next_beat = now + self.interval
+        if not self._stop.is_set() and self._loop is not None:
+            self._handle = self._loop.call_later(self.interval, self._beat)
+
+    def _watch(self) -> None:
+        """Watchdog thread: report the loop thread's stack when it is late."""
+        while not self._stop.wait(self.interval):
+            late = time.monotonic() - self._next_beat
+            if late > self.threshold and self._stalled_report is None:
+                self._report_stall(late)
+
+    def _report_stall(self, late: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame) if frame is not None else []
+        report = {
+            "detected_at": time.time(),
+            "started": self._next_beat,
+            "duration_seconds": None,
+            "stack": stack,
+        }
+        self._stalled_report = report
+        self.reports.append(report)
+        self.stalls += 1
+        self.collector.add_counter("event_loop.stalls")
+        self.logger.warning(
+            f"Event loop blocked for more than {late * 1000:.0f}ms; "
+            f"loop thread stack:\n{''.join(stack)}"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get stall counts and the most recent reports."""
+        recent: List[Dict[str, Any]] = [
+            {
+                "detected_at": report["detected_at"],
+                "duration_seconds": report["duration_seconds"],
+                # Innermost frames identify the blocking call
+                "stack": report["stack"][-5:],
+            }
+            for report in self.reports
+        ]
+        return {
+            "running": self.running,
+            "threshold_seconds": self.threshold,
+            "stalls": self.stalls,
+            "recent": recent,
+        }
+
+
+# Global monitor instance (lazy initialization)
+_event_loop_monitor: Optional[EventLoopMonitor] = None
+
+
+def get_event_loop_monitor() -> EventLoopMonitor:
+    """Get or create the global event loop monitor."""
+    global _event_loop_monitor
+    if _event_loop_monitor is None:
+        _event_loop_monitor = EventLoopMonitor()
+    return _event_loop_monitor
+
+
+# Global stall detector, created only when stall detection is enabled
+_stall_detector: Optional[LoopStallDetector] = None
+
+
+def get_stall_detector() -> LoopStallDetector:
+    """Get or create the global stall detector."""
+    global _stall_detector
+    if _stall_detector is None:
+        _stall_detector = LoopStallDetector()
+    return _stall_detector
+
+
+def stop_stall_detector() -> None:
+    """Stop the global stall detector if it was ever started."""
+    if _stall_detector is not None:
+        _stall_detector.stop()
+
+
+def get_event_loop_stats() -> Dict[str, Any]:
+    """Get lag statistics of the global monitor (empty if never created)."""
+    if _event_loop_monitor is None:
+        return {}
+    stats = _event_loop_monitor.get_stats()
+    if _stall_detector is not None:
+        stats["stalls"] = _stall_detector.get_stats()
+    return stats
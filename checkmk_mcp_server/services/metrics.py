@@ -4,92 +4,154 @@ import asyncio
 import time
 import logging
 import statistics
-from typing import Dict, Any, List, Optional, Callable, TypeVar
-from datetime import datetime, timedelta
-from collections import defaultdict, deque
+import threading
+from typing import Dict, Any, Optional, Callable, Tuple, TypeVar
 from functools import wraps
 from contextlib import asynccontextmanager
 
-from pydantic import BaseModel, Field
+from .concurrency import get_all_concurrency_stats
+from .histogram import LogHistogram, RollingCounter, RollingHistogram
 
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+# A series is a metric name plus its sorted tag pairs
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
 
-class PerformanceMetric(BaseModel):
-    """A single performance metric measurement."""
-
-    name: str
-    value: float
-    unit: str
-    timestamp: datetime = Field(default_factory=datetime.now)
-    tags: Dict[str, str] = Field(default_factory=dict)
-    metadata: Dict[str, Any] = Field(default_factory=dict)
-
-
-class TimingStats(BaseModel):
-    """Statistics for timing measurements."""
-
-    count: int = 0
-    total_time: float = 0.0
-    min_time: float = float("inf")
-    max_time: float = 0.0
-    avg_time: float = 0.0
-    recent_times: List[float] = Field(default_factory=list, max_length=100)
-
-    def add_measurement(self, duration: float):
-        """Add a timing measurement."""
-        self.count += 1
-        self.total_time += duration
-        self.min_time = min(self.min_time, duration)
-        self.max_time = max(self.max_time, duration)
-        self.avg_time = self.total_time / self.count
-
-        # Keep only recent measurements
-        self.recent_times.append(duration)
-        if len(self.recent_times) > 100:
-            self.recent_times.pop(0)
-
-    @property
-    def recent_avg(self) -> float:
-        """Get average of recent measurements."""
-        return statistics.mean(self.recent_times) if self.recent_times else 0.0
-
-    @property
-    def p95(self) -> float:
-        """Get 95th percentile of recent measurements."""
-        if len(self.recent_times) < 2:
-            return 0.0
-        return statistics.quantiles(self.recent_times, n=20)[18]  # 95th percentile
-
-    @property
-    def p99(self) -> float:
-        """Get 99th percentile of recent measurements."""
-        if len(self.recent_times) < 2:
-            return 0.0
-        return statistics.quantiles(self.recent_times, n=100)[98]  # 99th percentile
+# Tag sets per metric name beyond this limit are folded into one overflow
+# series so that unbounded tag values cannot grow memory without limit
+MAX_SERIES_PER_NAME = 500
+OVERFLOW_TAGS: Tuple[Tuple[str, str], ...] = (("overflow", "true"),)
+
+# Window used for request rates and recent latency percentiles
+RATE_WINDOW_SECONDS = 3600
+RECENT_WINDOW_SECONDS = 300
+
+
+def format_series(key: SeriesKey) -> str:
+    """Format a series key as ``name`` or ``name{tag=value,...}``."""
+    name, tags = key
+    if not tags:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in tags) + "}"
+
+
+class TimingSeries:
+    """Latency distribution for one series.
+
+    Keeps an all-time histogram plus a rolling histogram of the recent window;
+    memory is bounded by the bucket counts, not the number of samples.
+    """
+
+    __slots__ = ("total", "recent")
+
+    def __init__(self):
+        self.total = LogHistogram()
+        self.recent = RollingHistogram(window_seconds=RECENT_WINDOW_SECONDS, slots=10)
+
+    def record(self, duration: float, now: Optional[float] = None):
+        """Record a duration in seconds."""
+        self.total.record(duration)
+        self.recent.record(duration, now)
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Summarize in milliseconds.
+
+        Percentiles come from the recent window when it has samples and from
+        the all-time histogram otherwise.
+        """
+        recent = self.recent.merged(now)
+        source = recent if recent.count else self.total
+        quantiles = source.percentiles((50, 95, 99))
+        return {
+            "count": self.total.count,
+            "avg_ms": self.total.mean * 1000,
+            "min_ms": (self.total.min if self.total.count else 0.0) * 1000,
+            "max_ms": self.total.max * 1000,
+            "recent_avg_ms": recent.mean * 1000,
+            "p50_ms": quantiles[50] * 1000,
+            "p95_ms": quantiles[95] * 1000,
+            "p99_ms": quantiles[99] * 1000,
+        }
 
 
 class MetricsCollector:
-    """Centralized metrics collection system."""
+    """Centralized metrics collection system.
+
+    Timings are kept as log-bucketed histograms, counters and gauges as plain
+    numbers keyed by (name, tags), and rates as fixed rolling windows, so
+    memory stays flat no matter how many measurements are recorded. All
+    recording methods are cheap and thread-safe; the async variants exist for
+    the service API and never block on I/O.
+    """
 
     def __init__(self, retention_hours: int = 24):
         """
         Initialize metrics collector.
 
         Args:
-            retention_hours: How long to keep metrics in memory
+            retention_hours: Kept for compatibility; recent-window statistics
+                use fixed rolling windows and all-time aggregates have
+                constant size, so nothing needs to be expired
         """
         self.retention_hours = retention_hours
-        self.metrics: deque = deque()
-        self.timing_stats: Dict[str, TimingStats] = defaultdict(TimingStats)
-        self.counters: Dict[str, int] = defaultdict(int)
-        self.gauges: Dict[str, float] = defaultdict(float)
-        self._lock = asyncio.Lock()
+        self.timing_series: Dict[SeriesKey, TimingSeries] = {}
+        self.counters: Dict[SeriesKey, float] = {}
+        self.gauges: Dict[SeriesKey, float] = {}
+        self.total_recorded = 0
+        self._series_per_name: Dict[str, int] = {}
+        self._recent_records = RollingCounter(RATE_WINDOW_SECONDS, slots=60)
+        self._recent_timings = RollingCounter(RATE_WINDOW_SECONDS, slots=60)
+        self._lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
 
-        # Start cleanup task
-        self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+    def _key(self, store: Dict[SeriesKey, Any], name: str, tags: Dict[str, Any]) -> SeriesKey:
+        """Build a series key, folding excess tag sets into an overflow series."""
+        tag_tuple = tuple(sorted((k, str(v)) for k, v in tags.items())) if tags else ()
+        key = (name, tag_tuple)
+        if not tag_tuple or key in store:
+            return key
+
+        count = self._series_per_name.get(name, 0)
+        if count >= MAX_SERIES_PER_NAME:
+            return (name, OVERFLOW_TAGS)
+        self._series_per_name[name] = count + 1
+        return key
+
+    # Synchronous recording (usable from executor threads)
+
+    def observe_timing(self, name: str, duration: float, **tags):
+        """Record a timing measurement without awaiting."""
+        now = time.monotonic()
+        with self._lock:
+            key = self._key(self.timing_series, name, tags)
+            series = self.timing_series.get(key)
+            if series is None:
+                series = self.timing_series[key] = TimingSeries()
+            series.record(duration, now)
+            self.total_recorded += 1
+            self._recent_records.add(1, now)
+            self._recent_timings.add(1, now)
+
+    def add_counter(self, name: str, value: float = 1, **tags):
+        """Increment a counter without awaiting."""
+        now = time.monotonic()
+        with self._lock:
+            key = self._key(self.counters, name, tags)
+            self.counters[key] = self.counters.get(key, 0) + value
+            self.total_recorded += 1
+            self._recent_records.add(1, now)
+
+    def update_gauge(self, name: str, value: float, **tags):
+        """Set a gauge without awaiting."""
+        now = time.monotonic()
+        with self._lock:
+            key = self._key(self.gauges, name, tags)
+            self.gauges[key] = value
+            self.total_recorded += 1
+            self._recent_records.add(1, now)
+
+    # Async API
 
     async def record_metric(
         self,
@@ -99,126 +161,147 @@ class MetricsCollector:
         tags: Optional[Dict[str, str]] = None,
         **metadata,
     ):
-        """Record a metric."""
-        metric = PerformanceMetric(
-            name=name, value=value, unit=unit, tags=tags or {}, metadata=metadata
-        )
+        """Record a metric.
 
-        async with self._lock:
-            self.metrics.append(metric)
+        Values in seconds are recorded as timings, gauges as gauges and
+        anything else is added to a counter. Metadata is not retained.
+        """
+        if unit == "seconds":
+            self.observe_timing(name, value, **(tags or {}))
+        elif unit == "gauge":
+            self.update_gauge(name, value, **(tags or {}))
+        else:
+            self.add_counter(name, value, **(tags or {}))
 
     async def record_timing(self, name: str, duration: float, **tags):
         """Record a timing measurement."""
-        async with self._lock:
-            self.timing_stats[name].add_measurement(duration)
-
-        await self.record_metric(
-            name=f"{name}.duration", value=duration, unit="seconds", tags=tags
-        )
+        self.observe_timing(name, duration, **tags)
 
     async def increment_counter(self, name: str, value: int = 1, **tags):
         """Increment a counter."""
-        async with self._lock:
-            self.counters[name] += value
-
-        await self.record_metric(
-            name=f"{name}.count", value=value, unit="count", tags=tags
-        )
+        self.add_counter(name, value, **tags)
 
     async def set_gauge(self, name: str, value: float, **tags):
         """Set a gauge value."""
-        async with self._lock:
-            self.gauges[name] = value
-
-        await self.record_metric(
-            name=f"{name}.gauge", value=value, unit="gauge", tags=tags
-        )
+        self.update_gauge(name, value, **tags)
 
-    async def get_stats(self) -> Dict[str, Any]:
-        """Get comprehensive metrics statistics."""
-        async with self._lock:
-            now = datetime.now()
-            cutoff = now - timedelta(hours=1)  # Last hour
+    def get_histogram(self, name: str, **tags) -> LogHistogram:
+        """Get the merged all-time histogram for a metric.
 
-            # Get recent metrics
-            recent_metrics = [m for m in self.metrics if m.timestamp >= cutoff]
-
-            # Calculate request rate
-            request_rate = (
-                len([m for m in recent_metrics if m.name.endswith(".duration")]) / 3600
-            )  # per second
+        Args:
+            name: Timing metric name
+            **tags: Only merge series carrying these tags
 
+        Returns:
+            LogHistogram combining every matching series
+        """
+        wanted = {k: str(v) for k, v in tags.items()}
+        merged = LogHistogram()
+        with self._lock:
+            for (series_name, tag_tuple), series in self.timing_series.items():
+                if series_name != name:
+                    continue
+                series_tags = dict(tag_tuple)
+                if all(series_tags.get(k) == v for k, v in wanted.items()):
+                    merged.merge(series.total)
+        return merged
+
+    def snapshot(self) -> Dict[str, Dict[SeriesKey, Any]]:
+        """Copy all series for exporters.
+
+        Returns:
+            Dict with ``timings`` (all-time LogHistogram per series),
+            ``counters`` and ``gauges``
+        """
+        with self._lock:
             return {
-                "total_metrics": len(self.metrics),
-                "recent_metrics_1h": len(recent_metrics),
-                "request_rate_per_second": request_rate,
-                "timing_stats": {
-                    name: {
-                        "count": stats.count,
-                        "avg_ms": stats.avg_time * 1000,
-                        "min_ms": stats.min_time * 1000,
-                        "max_ms": stats.max_time * 1000,
-                        "recent_avg_ms": stats.recent_avg * 1000,
-                        "p95_ms": stats.p95 * 1000,
-                        "p99_ms": stats.p99 * 1000,
-                    }
-                    for name, stats in self.timing_stats.items()
+                "timings": {
+                    key: series.total.copy() for key, series in self.timing_series.items()
                 },
                 "counters": dict(self.counters),
                 "gauges": dict(self.gauges),
-                "memory_usage": {
-                    "metrics_count": len(self.metrics),
-                    "timing_stats_count": len(self.timing_stats),
-                    "counters_count": len(self.counters),
-                    "gauges_count": len(self.gauges),
-                },
             }
 
-    async def get_timing_stats(self, name: str) -> Optional[Dict[str, Any]]:
-        """Get timing statistics for a specific metric."""
-        async with self._lock:
-            stats = self.timing_stats.get(name)
-            if not stats:
-                return None
-
-            return {
-                "name": name,
-                "count": stats.count,
-                "total_time": stats.total_time,
-                "avg_time": stats.avg_time,
-                "min_time": stats.min_time,
-                "max_time": stats.max_time,
-                "recent_avg": stats.recent_avg,
-                "p95": stats.p95,
-                "p99": stats.p99,
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get comprehensive metrics statistics."""
+        now = time.monotonic()
+        with self._lock:
+            timing_stats = {
+                format_series(key): series.summary(now)
+                for key, series in self.timing_series.items()
             }
+            counters = {format_series(key): value for key, value in self.counters.items()}
+            gauges = {format_series(key): value for key, value in self.gauges.items()}
+            histogram_buckets = sum(
+                len(series.total.buckets) for series in self.timing_series.values()
+            )
+            recent_records = int(self._recent_records.total(now))
+            request_rate = self._recent_timings.rate(now)
+            total_recorded = self.total_recorded
 
-    async def _cleanup_loop(self):
-        """Background task to clean up old metrics."""
-        while True:
-            try:
-                await asyncio.sleep(3600)  # Run every hour
-                await self._cleanup_old_metrics()
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                self.logger.error(f"Error in metrics cleanup: {e}")
-
-    async def _cleanup_old_metrics(self):
-        """Remove old metrics beyond retention period."""
-        cutoff = datetime.now() - timedelta(hours=self.retention_hours)
+        return {
+            "total_metrics": total_recorded,
+            "recent_metrics_1h": recent_records,
+            "request_rate_per_second": request_rate,
+            "timing_stats": timing_stats,
+            "counters": counters,
+            "gauges": gauges,
+            "concurrency": get_all_concurrency_stats(),
+            "memory_usage": {
+                "metrics_count": len(timing_stats) + len(counters) + len(gauges),
+                "timing_stats_count": len(timing_stats),
+                "counters_count": len(counters),
+                "gauges_count": len(gauges),
+                "histogram_buckets": histogram_buckets,
+            },
+        }
 
-        async with self._lock:
-            # Remove old metrics
-            while self.metrics and self.metrics[0].timestamp < cutoff:
-                self.metrics.popleft()
+    async def get_timing_stats(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get timing statistics for a specific metric, merged across tags."""
+        now = time.monotonic()
+        total = LogHistogram()
+        recent = LogHistogram()
+        with self._lock:
+            for (series_name, _), series in self.timing_series.items():
+                if series_name == name:
+                    total.merge(series.total)
+                    recent.merge(series.recent.merged(now))
+
+        if not total.count:
+            return None
+
+        source = recent if recent.count else total
+        quantiles = source.percentiles((50, 95, 99))
+        return {
+            "name": name,
+            "count": total.count,
+            "total_time": total.total,
+            "avg_time": total.mean,
+            "min_time": total.min,
+            "max_time": total.max,
+            "recent_avg": recent.mean,
+            "p50": quantiles[50],
+            "p95": quantiles[95],
+            "p99": quantiles[99],
+        }
 
-            self.logger.debug(f"Cleaned up metrics, {len(self.metrics)} remaining")
+    def reset(self):
+        """Clear all series and rolling windows."""
+        with self._lock:
+            self.timing_series.clear()
+            self.counters.clear()
+            self.gauges.clear()
+            self._series_per_name.clear()
+            self.total_recorded = 0
+            self._recent_records = RollingCounter(RATE_WINDOW_SECONDS, slots=60)
+            self._recent_timings = RollingCounter(RATE_WINDOW_SECONDS, slots=60)
 
-    def __del__(self):
-        """Cleanup on destruction."""
-        if hasattr(self, "_cleanup_task"):
-            self._cleanup_task.cancel()
+    async def _cleanup_old_metrics(self):
+        """Kept for compatibility: aggregates have constant size and rolling
+        windows expire by themselves, so there is nothing to clean up."""
+        self.logger.debug(
+            f"Metrics cleanup not needed, {len(self.timing_series)} timing series"
+        )
 
 
 # Global metrics collector instance (lazy initialization)
@@ -273,12 +356,16 @@ def timed(metric_name: Optional[str] = None, tags: Optional[Dict[str, str]] = No
             try:
                 result = func(*args, **kwargs)
                 duration = time.time() - start_time
-                # For sync functions, we can't easily record metrics without making them async
-                # Could use a background thread, but keeping it simple for now
+                get_metrics_collector().observe_timing(name, duration, **(tags or {}))
+                get_metrics_collector().add_counter(f"{name}.success")
                 return result
 
             except Exception as e:
                 duration = time.time() - start_time
+                get_metrics_collector().observe_timing(
+                    f"{name}.error", duration, **(tags or {})
+                )
+                get_metrics_collector().add_counter(f"{name}.error")
                 raise
 
         # Return appropriate wrapper based on function type
@@ -349,9 +349,8 @@ class MetricsService(BaseService):
     ) -> Dict[str, Any]:
         """Make an API request using the underlying client."""
         try:
-            # Use the sync client through the async wrapper
-            sync_client = self.checkmk.sync_client
-            return sync_client._make_request(method, endpoint, **kwargs)
+            # Runs in the client's executor so the event loop is not blocked
+            return await self.checkmk.make_request(method, endpoint, **kwargs)
         except Exception as e:
             self.logger.error(f"Metrics API request failed: {e}")
             raise CheckmkAPIError(f"Metrics API request failed: {e}")
@@ -0,0 +1,353 @@
+"""OpenMetrics text exposition of MCP server metrics.
+
+Renders the metrics collector (timings as histograms, counters, gauges) plus
+the live cache, circuit breaker, concurrency, executor and event loop
+registries in the OpenMetrics text format, so that Prometheus-compatible
+scrapers can alert on the MCP server itself. The text is served as the
+``checkmk://metrics/openmetrics`` MCP resource and, optionally, by a small
+local HTTP listener.
+"""
+
+import asyncio
+import logging
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..async_api_client import get_executor_stats
+from .cache import get_all_cache_stats
+from .concurrency import get_all_concurrency_stats
+from .loop_monitor import get_event_loop_stats
+from .metrics import MetricsCollector, get_metrics_collector
+from .recovery import CircuitState, get_all_circuit_breaker_stats
+
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PREFIX = "checkmk_mcp_"
+
+# Fixed bucket bounds (seconds) so series stay comparable across scrapes
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+_INVALID_LABEL_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+
+Labels = Iterable[Tuple[str, str]]
+
+
+def metric_name(name: str) -> str:
+    """Convert a collector metric name to an OpenMetrics family name."""
+    sanitized = _INVALID_NAME_CHARS.sub("_", name).strip("_").lower()
+    return PREFIX + re.sub("_+", "_", sanitized)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Labels) -> str:
+    pairs = [
+        f'{_INVALID_LABEL_CHARS.sub("_", key)}="{_escape(str(value))}"'
+        for key, value in labels
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value is None:
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Writer:
+    """Collects metric families, emitting each family header once."""
+
+    def __init__(self):
+        self._families: Dict[str, Tuple[str, str, Optional[str], List[str]]] = {}
+
+    def family(
+        self, name: str, kind: str, help_text: str, unit: Optional[str] = None
+    ) -> Optional[List[str]]:
+        existing = self._families.get(name)
+        if existing is None:
+            self._families[name] = (kind, help_text, unit, [])
+            return self._families[name][3]
+        # Same name with a different type would be an invalid exposition
+        return existing[3] if existing[0] == kind else None
+
+    def sample(
+        self,
+        family: str,
+        kind: str,
+        help_text: str,
+        value: float,
+        labels: Labels = (),
+        suffix: str = "",
+        unit: Optional[str] = None,
+    ) -> None:
+        samples = self.family(family, kind, help_text, unit)
+        if samples is not None:
+            samples.append(f"{family}{suffix}{_labels(labels)} {_number(value)}")
+
+    def render(self) -> str:
+        lines = []
+        for name, (kind, help_text, unit, samples) in self._families.items():
+            lines.append(f"# TYPE {name} {kind}")
+            if unit:
+                lines.append(f"# UNIT {name} {unit}")
+            lines.append(f"# HELP {name} {_escape(help_text)}")
+            lines.extend(samples)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _write_collector(writer: _Writer, collector: MetricsCollector) -> None:
+    snapshot = collector.snapshot()
+
+    for (name, tags), histogram in sorted(snapshot["timings"].items()):
+        family = metric_name(name) + "_seconds"
+        samples = writer.family(family, "histogram", f"{name} duration", "seconds")
+        if samples is None:
+            continue
+        for bound in LATENCY_BUCKETS:
+            labels = list(tags) + [("le", _number(bound))]
+            samples.append(
+                f"{family}_bucket{_labels(labels)} "
+                f"{histogram.count_at_or_below(bound)}"
+            )
+        samples.append(
+            f"{family}_bucket{_labels(list(tags) + [('le', '+Inf')])} {histogram.count}"
+        )
+        samples.append(f"{family}_count{_labels(tags)} {histogram.count}")
+        samples.append(f"{family}_sum{_labels(tags)} {_number(histogram.total)}")
+
+    for (name, tags), value in sorted(snapshot["counters"].items()):
+        family = metric_name(name)
+        if family.endswith("_total"):
+            family = family[: -len("_total")]
+        writer.sample(family, "counter", f"{name} count", value, tags, "_total")
+
+    for (name, tags), value in sorted(snapshot["gauges"].items()):
+        writer.sample(metric_name(name), "gauge", f"{name} value", value, tags)
+
+
+def _write_caches(writer: _Writer) -> None:
+    for cache, stats in get_all_cache_stats().items():
+        labels = [("cache", cache)]
+        writer.sample(
+            f"{PREFIX}cache_hits", "counter", "Cache hits", stats["hits"], labels, "_total"
+        )
+        writer.sample(
+            f"{PREFIX}cache_misses",
+            "counter",
+            "Cache misses",
+            stats["misses"],
+            labels,
+            "_total",
+        )
+        writer.sample(
+            f"{PREFIX}cache_evictions",
+            "counter",
+            "Cache evictions",
+            stats["evictions"],
+            labels,
+            "_total",
+        )
+        writer.sample(
+            f"{PREFIX}cache_hit_ratio",
+            "gauge",
+            "Cache hit ratio since start",
+            stats["hit_rate"],
+            labels,
+        )
+        writer.sample(
+            f"{PREFIX}cache_entries",
+            "gauge",
+            "Entries currently cached",
+            stats["total_entries"],
+            labels,
+        )
+
+
+def _write_circuit_breakers(writer: _Writer) -> None:
+    for breaker, stats in get_all_circuit_breaker_stats().items():
+        for state in CircuitState:
+            writer.sample(
+                f"{PREFIX}circuit_breaker_state",
+                "stateset",
+                "Circuit breaker state",
+                int(stats["state"] == state.value),
+                [("breaker", breaker), (f"{PREFIX}circuit_breaker_state", state.value)],
+            )
+        writer.sample(
+            f"{PREFIX}circuit_breaker_failures",
+            "gauge",
+            "Consecutive failures counted by the circuit breaker",
+            stats["failure_count"],
+            [("breaker", breaker)],
+        )
+
+
+def _write_runtime(writer: _Writer) -> None:
+    for controller, stats in get_all_concurrency_stats().items():
+        labels = [("controller", controller)]
+        writer.sample(
+            f"{PREFIX}concurrency_limit",
+            "gauge",
+            "Adaptive concurrency limit",
+            stats["limit"],
+            labels,
+        )
+        writer.sample(
+            f"{PREFIX}concurrency_in_flight",
+            "gauge",
+            "Operations currently holding a concurrency slot",
+            stats["in_flight"],
+            labels,
+        )
+        writer.sample(
+            f"{PREFIX}concurrency_waiting",
+            "gauge",
+            "Operations waiting for a concurrency slot",
+            stats["waiting"],
+            labels,
+        )
+
+    executor = get_executor_stats()
+    writer.sample(
+        f"{PREFIX}executor_queue_depth",
+        "gauge",
+        "Checkmk client calls waiting for an executor thread",
+        executor["queue_depth"],
+    )
+    writer.sample(
+        f"{PREFIX}executor_active",
+        "gauge",
+        "Checkmk client calls running in executor threads",
+        executor["active"],
+    )
+    writer.sample(
+        f"{PREFIX}executor_calls",
+        "counter",
+        "Checkmk client calls completed in executor threads",
+        executor["completed"],
+        suffix="_total",
+    )
+
+    loop = get_event_loop_stats()
+    if loop:
+        writer.sample(
+            f"{PREFIX}event_loop_lag_last_seconds",
+            "gauge",
+            "Most recent event loop lag sample",
+            loop["last_lag_seconds"],
+            unit="seconds",
+        )
+        writer.sample(
+            f"{PREFIX}event_loop_lag_max_seconds",
+            "gauge",
+            "Largest event loop lag since start",
+            loop["max_lag_seconds"],
+            unit="seconds",
+        )
+
+
+def render_openmetrics(collector: Optional[MetricsCollector] = None) -> str:
+    """Render all server metrics in the OpenMetrics text format.
+
+    Args:
+        collector: Metrics collector (defaults to the global collector)
+
+    Returns:
+        str: Exposition text terminated by ``# EOF``
+    """
+    writer = _Writer()
+    _write_collector(writer, collector or get_metrics_collector())
+    _write_caches(writer)
+    _write_circuit_breakers(writer)
+    _write_runtime(writer)
+    return writer.render()
+
+
+class MetricsHTTPServer:
+    """Minimal HTTP listener serving ``GET /metrics`` on the event loop."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9464):
+        """
+        Initialize the listener.
+
+        Args:
+            host: Address to bind (keep local unless scrapes come from elsewhere)
+            port: Port to bind (0 picks a free port)
+        """
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def bound_port(self) -> Optional[int]:
+        """Actual listening port once started."""
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self) -> None:
+        """Start listening."""
+        if self._server is None:
+            self._server = await asyncio.start_server(
+                self._handle, self.host, self.port
+            )
+            self.logger.info(
+                f"Serving OpenMetrics on http://{self.host}:{self.bound_port}/metrics"
+            )
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Drain headers; the request body (if any) is ignored
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=5)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?", 1)[0] if len(parts) >= 2 else ""
+            if len(parts) >= 2 and parts[0] == "GET" and path in ("/metrics", "/"):
+                status, content_type = "200 OK", CONTENT_TYPE
+                body = render_openmetrics().encode("utf-8")
+            else:
+                status, content_type = "404 Not Found", "text/plain; charset=utf-8"
+                body = b"Not found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1")
+                + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            self.logger.debug(f"Metrics scrape connection failed: {e}")
+        except Exception:
+            self.logger.exception("Error serving metrics scrape")
+        finally:
+            writer.close()
@@ -4,10 +4,11 @@ import json
 import logging
 import re
 import fnmatch
-from typing import Optional, Dict, Any, List, Union, Tuple
+from typing import Optional, Dict, Any, List, Union, Tuple, Callable, Awaitable
 from dataclasses import dataclass
 
 from .base import BaseService, ServiceResult
+from .batch import BatchProgress
 from .models.services import ServiceParameterResult
 from .handlers import get_handler_registry, HandlerResult, ValidationSeverity
 from ..async_api_client import AsyncCheckmkClient
@@ -1858,6 +1859,9 @@ class ParameterService(BaseService):
         operations: List[Dict[str, Any]],
         validate_all: bool = True,
         stop_on_error: bool = False,
+        progress_callback: Optional[
+            Callable[[BatchProgress, Dict[str, Any]], Awaitable[None]]
+        ] = None,
     ) -> ServiceResult[BulkOperationResult]:
         """
         Set parameters for multiple services in bulk.
@@ -1867,6 +1871,8 @@ class ParameterService(BaseService):
                        {host_name, service_name, parameters, rule_properties}
             validate_all: Whether to validate all operations before executing
             stop_on_error: Whether to stop on first error
+            progress_callback: Optional async callback run after each
+                operation with the BatchProgress and that operation's result
 
         Returns:
             ServiceResult containing bulk operation results
@@ -1930,6 +1936,9 @@ class ParameterService(BaseService):
             successful = 0
             failed = 0
             errors = []
+            progress = BatchProgress(
+                total_items=len(operations), pending=len(operations)
+            )
 
             for i, op in enumerate(operations):
                 try:
@@ -1988,6 +1997,13 @@ class ParameterService(BaseService):
                     if stop_on_error:
                         break
 
+                finally:
+                    if progress_callback:
+                        progress.pending = len(operations) - i - 1
+                        progress.success = successful
+                        progress.failed = failed
+                        await progress_callback(progress, results[-1] if results else {})
+
             return BulkOperationResult(
                 total_operations=len(operations),
                 successful_operations=successful,
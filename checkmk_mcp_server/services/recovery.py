@@ -5,6 +5,7 @@ import logging
 import random
 import time
 import threading
+import weakref
 from typing import Optional, Dict, Any, Callable, TypeVar, Union, List, Type, Awaitable
 from datetime import datetime, timedelta
 from functools import wraps
@@ -80,6 +81,7 @@ class CircuitBreaker:
         failure_threshold: int = 5,
         recovery_timeout: int = 60,
         expected_exception: Type[Exception] = Exception,
+        name: str = "default",
     ):
         """
         Initialize circuit breaker.
@@ -88,6 +90,7 @@ class CircuitBreaker:
             failure_threshold: Number of failures before opening circuit
             recovery_timeout: Seconds to wait before trying half-open
             expected_exception: Exception type that triggers circuit breaker
+            name: Name reported in circuit breaker metrics
             
         Raises:
             ValueError: If parameters are invalid
@@ -97,6 +100,7 @@ class CircuitBreaker:
         if recovery_timeout <= 0:
             raise ValueError("recovery_timeout must be positive")
             
+        self.name = name
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.expected_exception = expected_exception
@@ -107,6 +111,7 @@ class CircuitBreaker:
         self._successful_calls = 0
         self._lock = threading.RLock()  # Thread-safe state access
         self.logger = logging.getLogger(__name__)
+        _circuit_breakers.add(self)
 
     @property
     def state(self) -> CircuitState:
@@ -194,6 +199,33 @@ class CircuitBreaker:
         await get_metrics_collector().increment_counter("circuit_breaker.failure")
 
 
+# Live circuit breakers, reported through the metrics endpoints
+_circuit_breakers: "weakref.WeakSet[CircuitBreaker]" = weakref.WeakSet()
+
+
+def get_all_circuit_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """Get state and counters for every live circuit breaker.
+
+    Returns:
+        Dict mapping breaker name to its statistics; duplicate names are
+        suffixed with ``#2``, ``#3``...
+    """
+    stats: Dict[str, Dict[str, Any]] = {}
+    for breaker in sorted(list(_circuit_breakers), key=lambda b: b.name):
+        key = breaker.name
+        suffix = 2
+        while key in stats:
+            key = f"{breaker.name}#{suffix}"
+            suffix += 1
+        stats[key] = {
+            "state": breaker.state.value,
+            "failure_count": breaker._failure_count,
+            "successful_calls": breaker._successful_calls,
+            "failure_threshold": breaker.failure_threshold,
+        }
+    return stats
+
+
 class RetryPolicy:
     """Configurable retry policy with different strategies."""
 
@@ -427,6 +459,7 @@ class RecoveryMixin:
     def get_circuit_breaker(self, name: str, **kwargs) -> CircuitBreaker:
         """Get or create circuit breaker for operation."""
         if name not in self.circuit_breakers:
+            kwargs.setdefault("name", f"{self.__class__.__name__}.{name}")
             self.circuit_breakers[name] = CircuitBreaker(**kwargs)
         return self.circuit_breakers[name]
 
@@ -18,6 +18,7 @@ from .models.services import (
 from ..async_api_client import AsyncCheckmkClient
 from ..api_client import CheckmkAPIError
 from ..config import AppConfig
+from ..utils.call_breakdown import timed_phase
 
 
 class ServiceService(BaseService):
@@ -446,6 +447,7 @@ class ServiceService(BaseService):
             _list_all_services_operation, "list_all_services"
         )
 
+    @timed_phase("model_conversion")
     def _convert_api_service_to_model(
         self, service_data: Dict[str, Any], include_details: bool = False
     ) -> ServiceInfo:
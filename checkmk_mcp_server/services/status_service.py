@@ -21,6 +21,7 @@ from .models.hosts import HostState
 from ..async_api_client import AsyncCheckmkClient
 from ..api_client import CheckmkAPIError
 from ..config import AppConfig
+from ..utils.call_breakdown import timed_phase
 
 
 class StatusService(BaseService):
@@ -312,6 +313,7 @@ class StatusService(BaseService):
             resolved_problems_last_hour=resolved_last_hour,  # Would need historical data
         )
 
+    @timed_phase("model_conversion")
     def _convert_service_to_problem(
         self, service_data: Dict[str, Any]
     ) -> ServiceProblem:
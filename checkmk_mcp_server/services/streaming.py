@@ -1,15 +1,31 @@
 """Streaming support for large dataset operations."""
 
 import asyncio
+import json
 import logging
-from typing import AsyncIterator, Dict, Any, List, Optional, TypeVar, Generic
+import secrets
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    TypeVar,
+)
+from collections import deque
 from datetime import datetime
 
 from pydantic import BaseModel, Field
 
-from .base import BaseService, ServiceResult
+from .base import ServiceResult
+from .cache import LRUCache
+from .concurrency import AdaptiveConcurrencyController
+from .host_service import HostService
 from .models.hosts import HostInfo
 from .models.services import ServiceInfo, ServiceState
+from .service_service import ServiceService
 
 
 T = TypeVar("T")
@@ -33,6 +49,13 @@ class StreamingMixin:
         super().__init__(*args, **kwargs)
         self.default_batch_size = 100
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        # Paces page fetches: no delay while Checkmk keeps up, backs off
+        # when fetch latency spikes or calls time out
+        self.concurrency = AdaptiveConcurrencyController(
+            name=f"streaming.{self.__class__.__name__}",
+            initial_limit=4,
+            max_limit=8,
+        )
 
     async def _stream_paginated_data(
         self, fetch_function, batch_size: Optional[int] = None, **fetch_kwargs
@@ -56,9 +79,10 @@ class StreamingMixin:
         while True:
             try:
                 # Fetch batch
-                result = await fetch_function(
-                    limit=batch_size, offset=offset, **fetch_kwargs
-                )
+                async with self.concurrency.slot():
+                    result = await fetch_function(
+                        limit=batch_size, offset=offset, **fetch_kwargs
+                    )
 
                 # Extract items based on result type
                 if hasattr(result, "items"):
@@ -105,8 +129,8 @@ class StreamingMixin:
                 offset += len(items)
                 batch_number += 1
 
-                # Small delay to prevent overwhelming the API
-                await asyncio.sleep(0.1)
+                # Back off only if the API is showing signs of overload
+                await self.concurrency.pace()
 
             except Exception as e:
                 self.logger.error(f"Error in streaming batch {batch_number}: {e}")
@@ -118,6 +142,99 @@ class StreamingMixin:
                 )
                 break
 
+    async def _batch_items(
+        self,
+        items: AsyncIterator[T],
+        batch_size: Optional[int] = None,
+        metadata: Optional[Callable[[], Dict[str, Any]]] = None,
+    ) -> AsyncIterator[StreamBatch]:
+        """
+        Group a lazily produced item stream into batches.
+
+        One full batch is held back until the next item arrives, so
+        ``has_more`` is exact even when filters drop items, and at most two
+        batches are buffered at any time.
+
+        Args:
+            items: Async iterator producing items
+            batch_size: Number of items per batch
+            metadata: Optional callable returning progress metadata for a batch
+
+        Yields:
+            StreamBatch objects containing data
+        """
+        batch_size = batch_size or self.default_batch_size
+        batch_number = 0
+        current: List[T] = []
+        ready: Optional[StreamBatch] = None
+
+        try:
+            async for item in items:
+                if ready is not None:
+                    yield ready
+                    ready = None
+                    # Back off only if the API is showing signs of overload
+                    await self.concurrency.pace()
+                current.append(item)
+                if len(current) >= batch_size:
+                    ready = StreamBatch(
+                        items=current,
+                        batch_number=batch_number,
+                        has_more=True,
+                        metadata=metadata() if metadata else {},
+                    )
+                    current = []
+                    batch_number += 1
+        except Exception as e:
+            self.logger.error(f"Error in streaming batch {batch_number}: {e}")
+            if ready is not None:
+                yield ready
+            yield StreamBatch(
+                items=[],
+                batch_number=batch_number + (1 if ready is not None else 0),
+                has_more=False,
+                metadata={"error": str(e)},
+            )
+            return
+
+        if ready is not None:
+            ready.has_more = bool(current)
+            yield ready
+        if current:
+            yield StreamBatch(
+                items=current,
+                batch_number=batch_number,
+                has_more=False,
+                metadata=metadata() if metadata else {},
+            )
+
+    async def iter_ndjson(
+        self, stream: AsyncIterator[StreamBatch]
+    ) -> AsyncIterator[str]:
+        """
+        Serialize a batch stream as newline-delimited JSON.
+
+        Each yielded chunk holds the lines of one batch, so only one batch
+        is serialized at a time. A failed batch becomes an ``{"error": ...}``
+        line.
+
+        Args:
+            stream: The async iterator of batches
+
+        Yields:
+            NDJSON text chunks
+        """
+        async for batch in stream:
+            if batch.metadata.get("error"):
+                yield json.dumps({"error": batch.metadata["error"]}) + "\n"
+                continue
+            if batch.items:
+                yield "".join(
+                    (item.model_dump_json() if isinstance(item, BaseModel) else json.dumps(item))
+                    + "\n"
+                    for item in batch.items
+                )
+
     async def _process_stream_with_callback(
         self, stream: AsyncIterator[StreamBatch], callback, max_concurrent: int = 5
     ) -> ServiceResult[Dict[str, Any]]:
@@ -200,8 +317,94 @@ class StreamingMixin:
             )
 
 
-class StreamingHostService(StreamingMixin, BaseService):
-    """Host service with streaming capabilities."""
+class NDJSONPager:
+    """Serves NDJSON streams in bounded pages behind single-use cursors.
+
+    An MCP resource read returns one string, so reading a whole inventory
+    would serialize all of it at once. Instead each read returns about
+    ``page_lines`` lines (whole batches) and, when more remain, a final
+    ``{"next_cursor": ..., "next_uri": ...}`` line. The open stream is kept
+    under the cursor and the next read of ``next_uri`` continues it, so
+    memory stays bounded by a page and the first bytes arrive after the
+    first batches rather than the whole inventory.
+    """
+
+    def __init__(self, page_lines: int = 1000, cache_size: int = 16, cursor_ttl: int = 300):
+        """
+        Initialize the pager.
+
+        Args:
+            page_lines: Lines per page (pages end on batch boundaries)
+            cache_size: Number of open streams kept for continuation
+            cursor_ttl: Seconds a cursor stays valid
+        """
+        self.page_lines = page_lines
+        self._streams = LRUCache(
+            max_size=cache_size, default_ttl=cursor_ttl, name="ndjson_cursors"
+        )
+
+    async def read(
+        self,
+        uri: str,
+        open_stream: Callable[[], AsyncIterator[str]],
+        cursor: Optional[str] = None,
+    ) -> str:
+        """
+        Read the first page of a stream, or the page a cursor points to.
+
+        Args:
+            uri: Resource URI the stream belongs to (without query)
+            open_stream: Starts the stream of NDJSON chunks (first read only)
+            cursor: Cursor from the previous page of this resource
+
+        Returns:
+            NDJSON text of the page
+        """
+        pending: Optional[str] = None
+        if cursor is None:
+            chunks = open_stream().__aiter__()
+        else:
+            entry = await self._streams.get(cursor)
+            if entry is None or entry["uri"] != uri:
+                return json.dumps(
+                    {"error": f"Cursor is invalid or has expired; read {uri} again"}
+                ) + "\n"
+            await self._streams.invalidate(cursor)
+            chunks, pending = entry["chunks"], entry["pending"]
+
+        page: List[str] = []
+        lines = 0
+        while lines < self.page_lines:
+            if pending is None:
+                try:
+                    pending = await chunks.__anext__()
+                except StopAsyncIteration:
+                    return "".join(page)
+            page.append(pending)
+            lines += pending.count("\n")
+            pending = None
+
+        # Look one chunk ahead so the last page carries no dangling cursor
+        try:
+            pending = await chunks.__anext__()
+        except StopAsyncIteration:
+            return "".join(page)
+
+        token = secrets.token_urlsafe(12)
+        await self._streams.set(token, {"uri": uri, "chunks": chunks, "pending": pending})
+        page.append(
+            json.dumps({"next_cursor": token, "next_uri": f"{uri}?cursor={token}"}) + "\n"
+        )
+        return "".join(page)
+
+
+class StreamingHostService(StreamingMixin, HostService):
+    """Host service with streaming capabilities.
+
+    The host configuration collection cannot be paged, so hosts are fetched
+    once and then converted, filtered and emitted batch by batch. Raw host
+    objects are released as they are converted.
+    """
 
     async def list_hosts_streamed(
         self,
@@ -220,42 +423,49 @@ class StreamingHostService(StreamingMixin, BaseService):
         Yields:
             StreamBatch[HostInfo] objects
         """
-
-        # Define fetch function for hosts
-        async def fetch_hosts(limit: int, offset: int):
-            result = await self.checkmk.list_hosts(
-                search=search, folder=folder, limit=limit, offset=offset
-            )
-            # Convert to HostInfo models
-            hosts = []
-            for host_data in result.get("value", []):
-                host_info = HostInfo(
-                    name=host_data.get("id", ""),
-                    folder=host_data.get("folder", "/"),
-                    attributes=host_data.get("attributes", {}),
-                    is_cluster=host_data.get("is_cluster", False),
-                )
-                hosts.append(host_info)
-
-            return type(
-                "Result", (), {"items": hosts, "total_count": result.get("total_count")}
-            )()
-
-        # Stream the data
-        async for batch in self._stream_paginated_data(
-            fetch_hosts, batch_size=batch_size
+        progress = {"fetched_count": 0, "hosts_processed": 0}
+
+        async def hosts() -> AsyncIterator[HostInfo]:
+            async with self.concurrency.slot():
+                hosts_data = await self.checkmk.list_hosts()
+            progress["fetched_count"] = len(hosts_data)
+            pending = deque(hosts_data)
+            del hosts_data
+
+            while pending:
+                page = [
+                    self._convert_api_host_to_model(pending.popleft())
+                    for _ in range(min(batch_size, len(pending)))
+                ]
+                progress["hosts_processed"] += len(page)
+                for host in self._apply_host_filters(page, search, folder):
+                    yield host
+                # Let other tasks run between pages of a large inventory
+                await asyncio.sleep(0)
+
+        async for batch in self._batch_items(
+            hosts(), batch_size, metadata=lambda: dict(progress)
         ):
             yield batch
 
 
-class StreamingServiceService(StreamingMixin, BaseService):
-    """Service operations with streaming capabilities."""
+class StreamingServiceService(StreamingMixin, ServiceService):
+    """Service operations with streaming capabilities.
+
+    Services are fetched in chunks of hosts with one Livestatus query per
+    chunk (a host name range, plus the state filter). The next chunk is
+    fetched while the current one is emitted, so memory stays bounded by
+    the chunk size rather than the inventory size.
+    """
+
+    default_hosts_per_chunk = 50
 
     async def list_all_services_streamed(
         self,
         batch_size: int = 200,
         state_filter: Optional[List[str]] = None,
         host_filter: Optional[str] = None,
+        hosts_per_chunk: Optional[int] = None,
     ) -> AsyncIterator[StreamBatch[ServiceInfo]]:
         """
         Stream all services in batches.
@@ -263,85 +473,99 @@ class StreamingServiceService(StreamingMixin, BaseService):
         Args:
             batch_size: Number of services per batch
             state_filter: Optional state filter
-            host_filter: Optional host pattern filter
+            host_filter: Optional host name substring filter
+            hosts_per_chunk: Hosts covered by each service query
 
         Yields:
             StreamBatch[ServiceInfo] objects
         """
-        # For services, we might need to stream by host first
-        # then services per host
-        batch_number = 0
-        all_services = []
-
-        # Get hosts to iterate through
-        hosts_result = await self.checkmk.list_hosts(search=host_filter)
-        hosts = hosts_result.get("value", [])
-
-        for i, host in enumerate(hosts):
-            host_name = host.get("id")
-            if not host_name:
-                continue
+        hosts_per_chunk = hosts_per_chunk or self.default_hosts_per_chunk
+        progress = {"hosts_processed": 0, "total_hosts": 0}
+
+        async def services() -> AsyncIterator[ServiceInfo]:
+            async with self.concurrency.slot():
+                hosts_data = await self.checkmk.list_hosts()
+            host_names = sorted(h["id"] for h in hosts_data if h.get("id"))
+            del hosts_data
+            if host_filter:
+                needle = host_filter.lower()
+                host_names = [name for name in host_names if needle in name.lower()]
+            progress["total_hosts"] = len(host_names)
+
+            chunks = [
+                host_names[i : i + hosts_per_chunk]
+                for i in range(0, len(host_names), hosts_per_chunk)
+            ]
+            if not chunks:
+                return
+
+            prefetch = asyncio.ensure_future(self._fetch_service_chunk(chunks[0], state_filter))
+            try:
+                for index, chunk in enumerate(chunks):
+                    rows = await prefetch
+                    if index + 1 < len(chunks):
+                        prefetch = asyncio.ensure_future(
+                            self._fetch_service_chunk(chunks[index + 1], state_filter)
+                        )
+                    wanted = set(chunk)
+                    for row in rows:
+                        service = self._convert_api_service_to_model(row)
+                        if service.host_name not in wanted:
+                            continue
+                        if state_filter and service.state not in state_filter:
+                            continue
+                        yield service
+                    progress["hosts_processed"] += len(chunk)
+                    del rows
+            finally:
+                if not prefetch.done():
+                    prefetch.cancel()
+
+        async for batch in self._batch_items(
+            services(), batch_size, metadata=lambda: dict(progress)
+        ):
+            yield batch
 
-            # Get services for this host
-            services_result = await self.checkmk.list_host_services(host_name)
-            services_data = services_result.get("value", [])
-
-            # Convert to ServiceInfo models
-            for svc_data in services_data:
-                # Convert numeric state to ServiceState enum
-                state_num = svc_data.get("state", 0)
-                state_map = {
-                    0: ServiceState.OK,
-                    1: ServiceState.WARNING,
-                    2: ServiceState.CRITICAL,
-                    3: ServiceState.UNKNOWN,
-                }
-                state = state_map.get(state_num, ServiceState.UNKNOWN)
-
-                # Provide required fields with defaults
-                from datetime import datetime
-
-                now = datetime.now()
-
-                service_info = ServiceInfo(
-                    host_name=host_name,
-                    service_name=svc_data.get("description", ""),
-                    state=state,
-                    state_type=svc_data.get("state_type", "hard"),
-                    plugin_output=svc_data.get("plugin_output", ""),
-                    last_check=svc_data.get("last_check", now),
-                    last_state_change=svc_data.get("last_state_change", now),
-                )
+    async def _fetch_service_chunk(
+        self, host_names: List[str], state_filter: Optional[List[str]]
+    ) -> List[Dict[str, Any]]:
+        """Fetch services of a sorted chunk of hosts with one query."""
+        async with self.concurrency.slot():
+            return await self.checkmk.list_all_services_with_monitoring_data(
+                query=self._chunk_query(host_names, state_filter)
+            )
 
-                # Apply state filter if needed
-                if state_filter and service_info.state not in state_filter:
-                    continue
+    def _chunk_query(
+        self, host_names: List[str], state_filter: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """Livestatus query for a host name range and optional states."""
+        expressions: List[Dict[str, Any]] = [
+            {"op": ">=", "left": "host_name", "right": host_names[0]},
+            {"op": "<=", "left": "host_name", "right": host_names[-1]},
+        ]
+        states = _state_codes(state_filter)
+        if states:
+            by_state = [{"op": "=", "left": "state", "right": code} for code in states]
+            expressions.append(
+                by_state[0] if len(by_state) == 1 else {"op": "or", "expr": by_state}
+            )
+        return {"op": "and", "expr": expressions}
 
-                all_services.append(service_info)
 
-                # Yield batch when full
-                if len(all_services) >= batch_size:
-                    yield StreamBatch(
-                        items=all_services[:batch_size],
-                        batch_number=batch_number,
-                        has_more=i < len(hosts) - 1,
-                        metadata={
-                            "current_host": host_name,
-                            "hosts_processed": i + 1,
-                            "total_hosts": len(hosts),
-                        },
-                    )
-                    all_services = all_services[batch_size:]
-                    batch_number += 1
+_STATE_CODES = {
+    ServiceState.OK: 0,
+    ServiceState.WARNING: 1,
+    ServiceState.CRITICAL: 2,
+    ServiceState.UNKNOWN: 3,
+}
 
-                    # Small delay between batches
-                    await asyncio.sleep(0.1)
 
-        # Yield remaining services
-        if all_services:
-            yield StreamBatch(
-                items=all_services,
-                batch_number=batch_number,
-                has_more=False,
-                metadata={"hosts_processed": len(hosts), "total_hosts": len(hosts)},
-            )
+def _state_codes(state_filter: Optional[List[Any]]) -> List[int]:
+    """Livestatus state codes for a state filter; unknown values are ignored."""
+    codes = []
+    for state in state_filter or []:
+        try:
+            codes.append(_STATE_CODES[ServiceState(state)])
+        except ValueError:
+            continue
+    return sorted(set(codes))
@@ -11,6 +11,11 @@ from .request_context import (
     format_request_id,
     extract_parent_id,
     REQUEST_ID_CONTEXT,
+    DeadlineExceeded,
+    RequestCancelled,
+    deadline_scope,
+    remaining_time,
+    check_deadline,
 )
 
 # Import from the common module (excluding setup_logging)
@@ -41,6 +46,12 @@ __all__ = [
     "format_request_id",
     "extract_parent_id",
     "REQUEST_ID_CONTEXT",
+    # Deadlines and cancellation
+    "DeadlineExceeded",
+    "RequestCancelled",
+    "deadline_scope",
+    "remaining_time",
+    "check_deadline",
     # Utility functions
     "setup_logging",
     "retry_on_failure",
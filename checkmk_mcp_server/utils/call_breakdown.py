@@ -0,0 +1,196 @@
+"""Per-call latency breakdown for MCP tool calls.
+
+ToolRegistry starts a breakdown for every tool call and stores it in a
+context variable next to the request ID. Code on the hot path attributes
+wall time to named phases (argument validation, model conversion,
+serialization) and outbound REST calls, which CheckmkClient records per
+endpoint. When nothing is being broken down, the helpers return after a
+single context variable lookup.
+
+REST calls made from executor threads are attributed as long as the context
+is copied into the thread (AsyncCheckmkClient does this), so the breakdown
+object is shared across threads and guarded by a lock.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class CallBreakdown:
+    """Wall time of one tool call split into phases and REST calls."""
+
+    def __init__(self, request_id: str, tool: str):
+        """
+        Initialize breakdown.
+
+        Args:
+            request_id: Request ID of the tool call
+            tool: Tool name
+        """
+        self.request_id = request_id
+        self.tool = tool
+        self.started = time.perf_counter()
+        self.total: Optional[float] = None
+        self.phases: Dict[str, float] = {}
+        self.rest_calls: Dict[str, Dict[str, float]] = {}
+        self.response_bytes = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        """Add time to a phase."""
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_rest_call(
+        self, method: str, endpoint: str, seconds: float, retried: bool = False
+    ) -> None:
+        """Add one outbound REST call (``retried`` marks a retry attempt)."""
+        key = f"{method} {endpoint}"
+        with self._lock:
+            if retried:
+                self.retries += 1
+            call = self.rest_calls.get(key)
+            if call is None:
+                call = self.rest_calls[key] = {"count": 0, "seconds": 0.0, "max": 0.0}
+            call["count"] += 1
+            call["seconds"] += seconds
+            call["max"] = max(call["max"], seconds)
+
+    def finish(self) -> float:
+        """Stop the wall clock and return the total duration."""
+        if self.total is None:
+            self.total = time.perf_counter() - self.started
+        return self.total
+
+    @property
+    def rest_seconds(self) -> float:
+        """Cumulative time spent in REST calls (concurrent calls overlap)."""
+        return sum(call["seconds"] for call in self.rest_calls.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Render the breakdown in milliseconds.
+
+        ``handler_other_ms`` is handler time not attributed to REST calls or
+        model conversion; it is clamped at zero because concurrent REST calls
+        can add up to more than the handler's wall time.
+        """
+        total = self.total if self.total is not None else time.perf_counter() - self.started
+        with self._lock:
+            phases = dict(self.phases)
+            rest_calls = {key: dict(call) for key, call in self.rest_calls.items()}
+
+        rest = sum(call["seconds"] for call in rest_calls.values())
+        handler_other = max(
+            0.0, phases.get("handler", 0.0) - rest - phases.get("model_conversion", 0.0)
+        )
+        return {
+            "request_id": self.request_id,
+            "tool": self.tool,
+            "total_ms": round(total * 1000, 3),
+            "phases_ms": {
+                **{name: round(seconds * 1000, 3) for name, seconds in phases.items()},
+                "rest": round(rest * 1000, 3),
+                "handler_other": round(handler_other * 1000, 3),
+            },
+            "rest_calls": [
+                {
+                    "endpoint": key,
+                    "count": int(call["count"]),
+                    "total_ms": round(call["seconds"] * 1000, 3),
+                    "max_ms": round(call["max"] * 1000, 3),
+                }
+                for key, call in sorted(
+                    rest_calls.items(), key=lambda item: -item[1]["seconds"]
+                )
+            ],
+            "response_bytes": self.response_bytes,
+            "retries": self.retries,
+        }
+
+
+_CURRENT_BREAKDOWN: ContextVar[Optional[CallBreakdown]] = ContextVar(
+    "call_breakdown", default=None
+)
+
+
+def start_breakdown(request_id: str, tool: str) -> CallBreakdown:
+    """Start a breakdown for the current context.
+
+    Args:
+        request_id: Request ID of the tool call
+        tool: Tool name
+
+    Returns:
+        CallBreakdown: The active breakdown
+    """
+    breakdown = CallBreakdown(request_id, tool)
+    _CURRENT_BREAKDOWN.set(breakdown)
+    return breakdown
+
+
+def get_current_breakdown() -> Optional[CallBreakdown]:
+    """Get the breakdown of the current tool call, if any."""
+    return _CURRENT_BREAKDOWN.get()
+
+
+def clear_breakdown() -> None:
+    """Detach the breakdown from the current context."""
+    _CURRENT_BREAKDOWN.set(None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Attribute the wall time of a block to a phase of the current call.
+
+    Args:
+        name: Phase name (e.g. ``"model_conversion"``)
+    """
+    breakdown = _CURRENT_BREAKDOWN.get()
+    if breakdown is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        breakdown.add_phase(name, time.perf_counter() - started)
+
+
+def timed_phase(name: str) -> Callable[[F], F]:
+    """Decorator attributing a synchronous function's time to a phase.
+
+    Args:
+        name: Phase name
+    """
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            breakdown = _CURRENT_BREAKDOWN.get()
+            if breakdown is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                breakdown.add_phase(name, time.perf_counter() - started)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+def record_rest_call(
+    method: str, endpoint: str, seconds: float, retried: bool = False
+) -> None:
+    """Attribute an outbound REST call to the current tool call, if any."""
+    breakdown = _CURRENT_BREAKDOWN.get()
+    if breakdown is not None:
+        breakdown.add_rest_call(method, endpoint, seconds, retried)
@@ -0,0 +1,439 @@
+"""On-demand profiling of live MCP tool calls.
+
+An operator arms the profiler for the next N calls of a tool (or for every
+call within a time window); matching calls then run under a profiler and the
+results are written to the profile directory as pstats and collapsed-stack
+text (the input format of flamegraph.pl, speedscope and similar viewers).
+
+Two modes are supported:
+
+- ``cprofile``: deterministic cProfile of the event loop thread while a
+  profiled call runs, plus the executor threads that run its Checkmk client
+  calls. Other tasks interleaving on the loop during the call are included.
+- ``sampling``: a background thread samples stacks at a fixed interval. Loop
+  thread samples are only kept while the profiled call's task is running, so
+  the profile is scoped to the request. Writes collapsed stacks only.
+
+The active capture is carried in a context variable next to the request ID,
+so executor threads (AsyncCheckmkClient copies the context) join the capture
+of the request they work for. While nothing is armed the only cost is an
+attribute check per tool call and a context variable lookup per client call.
+"""
+
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+PROFILE_MODES = ("cprofile", "sampling")
+
+# Guard against runaway recursion when expanding the cProfile call graph
+_MAX_STACK_DEPTH = 64
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_label(filename: str, line: int, name: str) -> str:
+    if filename == "~":
+        # Built-in functions are reported as ("~", 0, "<built-in method ...>")
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def _collapse_sampled(frame) -> str:
+    labels = []
+    while frame is not None:
+        code = frame.f_code
+        labels.append(_frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def collapse_pstats(stats: pstats.Stats) -> Dict[str, int]:
+    """
+    Approximate collapsed stacks from a cProfile call graph.
+
+    cProfile only records caller/callee edges, so each function's own time
+    is spread over the paths leading to it in proportion to the cumulative
+    time each caller spent in it.
+
+    Args:
+        stats: Loaded profile statistics
+
+    Returns:
+        Dict mapping ``;``-joined stacks to microseconds of own time
+    """
+    raw = stats.stats  # type: ignore[attr-defined]
+    callees: Dict[Tuple, List[Tuple[Tuple, float]]] = {}
+    for func, (_, _, _, cumtime, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    collapsed: Dict[str, int] = {}
+
+    def walk(func: Tuple, path: List[str], share: float, seen: Set[Tuple]) -> None:
+        _, _, tottime, cumtime, _ = raw[func]
+        path = path + [_frame_label(*func)]
+        own = int(tottime * share * 1e6)
+        if own > 0:
+            key = ";".join(path)
+            collapsed[key] = collapsed.get(key, 0) + own
+        if len(path) >= _MAX_STACK_DEPTH or cumtime <= 0:
+            return
+        for callee, edge_cumtime in callees.get(func, ()):
+            if callee in seen or callee not in raw:
+                continue
+            callee_cumtime = raw[callee][3]
+            fraction = edge_cumtime / callee_cumtime if callee_cumtime > 0 else 0.0
+            walk(callee, path, share * fraction, seen | {callee})
+
+    roots = [func for func, value in raw.items() if not value[4]]
+    for root in roots:
+        walk(root, [], 1.0, {root})
+    return collapsed
+
+
+class ProfileCapture:
+    """Profiling state of one armed session."""
+
+    def __init__(
+        self,
+        session_id: str,
+        tool: Optional[str],
+        mode: str,
+        calls: Optional[int],
+        deadline: Optional[float],
+        sample_interval: float,
+    ):
+        self.session_id = session_id
+        self.tool = tool
+        self.mode = mode
+        self.calls = calls
+        self.deadline = deadline
+        self.sample_interval = sample_interval
+        self.started_at = datetime.now()
+        self.request_ids: List[str] = []
+        self.completed_calls = 0
+        self.in_flight = 0
+        self.finished = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+
+        self._lock = threading.Lock()
+        self._loop_profiler: Optional[cProfile.Profile] = None
+        self._thread_stats: List[cProfile.Profile] = []
+        self._samples: Counter = Counter()
+        self._tasks: Set[asyncio.Task] = set()
+        self._threads: Set[int] = set()
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+
+    def matches(self, tool: str) -> bool:
+        """Whether a call of this tool should be profiled."""
+        if self.tool is not None and self.tool != tool:
+            return False
+        if self.deadline is not None:
+            return time.monotonic() < self.deadline
+        return self.calls is None or len(self.request_ids) < self.calls
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether no further calls will be profiled."""
+        if self.deadline is not None:
+            return time.monotonic() >= self.deadline
+        return self.calls is not None and len(self.request_ids) >= self.calls
+
+    def enter(self, request_id: str) -> None:
+        """Start profiling a call on the event loop thread."""
+        with self._lock:
+            self.request_ids.append(request_id)
+            self.in_flight += 1
+            first = self.in_flight == 1
+        task = asyncio.current_task()
+        if task is not None:
+            self._tasks.add(task)
+
+        if self.mode == "cprofile":
+            if first:
+                if self._loop_profiler is None:
+                    self._loop_profiler = cProfile.Profile()
+                try:
+                    self._loop_profiler.enable()
+                except ValueError as e:
+                    # Another profiler (e.g. a coverage tool) owns the thread
+                    logger.warning(f"Could not enable cProfile for {request_id}: {e}")
+        elif self._sampler is None:
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread = threading.get_ident()
+            self._sampler = threading.Thread(
+                target=self._sample, name=f"profiler-{self.session_id}", daemon=True
+            )
+            self._sampler.start()
+
+    def exit(self) -> bool:
+        """Stop profiling a call; returns True when the session is complete."""
+        with self._lock:
+            self.in_flight -= 1
+            self.completed_calls += 1
+            last = self.in_flight == 0
+        task = asyncio.current_task()
+        self._tasks.discard(task)  # type: ignore[arg-type]
+
+        if last and self._loop_profiler is not None:
+            self._loop_profiler.disable()
+        return last and self.exhausted
+
+    def run_in_thread(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking call from an executor thread inside this capture."""
+        thread_id = threading.get_ident()
+        if self.mode == "sampling":
+            self._threads.add(thread_id)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._threads.discard(thread_id)
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with self._lock:
+                self._thread_stats.append(profiler)
+
+    def _sample(self) -> None:
+        current_tasks = getattr(asyncio.tasks, "_current_tasks", {})
+        while not self._stop_sampling.wait(self.sample_interval):
+            frames = sys._current_frames()
+            loop_frame = frames.get(self._loop_thread)  # type: ignore[arg-type]
+            if loop_frame is not None and current_tasks.get(self._loop) in self._tasks:
+                self._samples[_collapse_sampled(loop_frame)] += 1
+            for thread_id in list(self._threads):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self._samples[_collapse_sampled(frame)] += 1
+
+    def write(self, output_dir: Path) -> Dict[str, Any]:
+        """Stop profiling and write the output files."""
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join(timeout=5)
+        if self._loop_profiler is not None and self.in_flight:
+            self._loop_profiler.disable()
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stem = (
+            f"profile-{self.started_at.strftime('%Y%m%d-%H%M%S')}-"
+            f"{self.tool or 'all'}-{self.session_id}"
+        )
+        files: Dict[str, str] = {}
+
+        if self.mode == "cprofile":
+            profilers = [p for p in [self._loop_profiler, *self._thread_stats] if p]
+            if profilers:
+                stats = pstats.Stats(profilers[0])
+                for profiler in profilers[1:]:
+                    stats.add(profiler)
+                pstats_path = output_dir / f"{stem}.pstats"
+                stats.dump_stats(str(pstats_path))
+                files["pstats"] = str(pstats_path)
+                collapsed = collapse_pstats(stats)
+            else:
+                collapsed = {}
+        else:
+            collapsed = dict(self._samples)
+
+        collapsed_path = output_dir / f"{stem}.collapsed.txt"
+        with open(collapsed_path, "w", encoding="utf-8") as f:
+            for stack, weight in sorted(collapsed.items()):
+                f.write(f"{stack} {weight}\n")
+        files["collapsed"] = str(collapsed_path)
+
+        self.result = {**self.get_status(), "files": files}
+        self.finished.set()
+        logger.info(f"Profile session {self.session_id} written: {files}")
+        return self.result
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get session status."""
+        return {
+            "session_id": self.session_id,
+            "tool": self.tool,
+            "mode": self.mode,
+            "calls": self.calls,
+            "window_remaining_seconds": (
+                max(0.0, round(self.deadline - time.monotonic(), 3))
+                if self.deadline is not None
+                else None
+            ),
+            "profiled_request_ids": list(self.request_ids),
+            "completed_calls": self.completed_calls,
+            "in_flight": self.in_flight,
+            "started_at": self.started_at.isoformat(),
+            "finished": self.finished.is_set(),
+        }
+
+
+_ACTIVE_CAPTURE: ContextVar[Optional[ProfileCapture]] = ContextVar(
+    "profile_capture", default=None
+)
+
+
+def get_active_capture() -> Optional[ProfileCapture]:
+    """Get the capture profiling the current request, if any."""
+    return _ACTIVE_CAPTURE.get()
+
+
+class ToolProfiler:
+    """Arms profiling sessions and applies them to matching tool calls."""
+
+    def __init__(
+        self,
+        output_dir: Union[str, Path] = "~/.checkmk_mcp/profiles",
+        sample_interval: float = 0.005,
+    ):
+        """
+        Initialize profiler.
+
+        Args:
+            output_dir: Directory for profile output files
+            sample_interval: Seconds between stack samples in sampling mode
+        """
+        self.output_dir = Path(output_dir).expanduser()
+        self.sample_interval = sample_interval
+        self.armed = False
+        self._capture: Optional[ProfileCapture] = None
+        self._last_result: Optional[Dict[str, Any]] = None
+
+    def configure(
+        self,
+        output_dir: Optional[Union[str, Path]] = None,
+        sample_interval: Optional[float] = None,
+    ) -> None:
+        """Update profiler settings (applies to sessions armed afterwards)."""
+        if output_dir is not None:
+            self.output_dir = Path(output_dir).expanduser()
+        if sample_interval is not None:
+            self.sample_interval = sample_interval
+
+    def arm(
+        self,
+        tool: Optional[str] = None,
+        calls: Optional[int] = 1,
+        duration: Optional[float] = None,
+        mode: str = "cprofile",
+    ) -> ProfileCapture:
+        """
+        Profile the next calls of a tool.
+
+        Args:
+            tool: Tool name (None profiles every tool)
+            calls: Number of calls to profile (ignored when duration is set)
+            duration: Profile every matching call started within this many
+                seconds instead of a fixed number of calls
+            mode: "cprofile" or "sampling"
+
+        Returns:
+            ProfileCapture: The armed session
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(
+                f"Unknown profile mode '{mode}', expected one of {', '.join(PROFILE_MODES)}"
+            )
+        if duration is None and (calls is None or calls <= 0):
+            raise ValueError("Either a positive number of calls or a duration is required")
+        if duration is not None and duration <= 0:
+            raise ValueError("Duration must be positive")
+        if self._capture is not None and not self._capture.finished.is_set():
+            raise RuntimeError(
+                f"Profile session {self._capture.session_id} is already armed"
+            )
+
+        self._capture = ProfileCapture(
+            session_id=secrets.token_hex(4),
+            tool=tool,
+            mode=mode,
+            calls=None if duration is not None else calls,
+            deadline=time.monotonic() + duration if duration is not None else None,
+            sample_interval=self.sample_interval,
+        )
+        self.armed = True
+        logger.info(f"Armed profile session: {self._capture.get_status()}")
+        return self._capture
+
+    def start_call(self, tool: str, request_id: str) -> Optional[ProfileCapture]:
+        """Start profiling a tool call if it matches the armed session.
+
+        Callers should check ``armed`` first so unarmed calls skip this.
+        """
+        capture = self._capture
+        if capture is None or not capture.matches(tool):
+            if capture is not None and capture.exhausted and not capture.in_flight:
+                self._finish()
+            return None
+        capture.enter(request_id)
+        _ACTIVE_CAPTURE.set(capture)
+        return capture
+
+    def finish_call(self, capture: ProfileCapture) -> None:
+        """Stop profiling a tool call, writing output once the session is done."""
+        _ACTIVE_CAPTURE.set(None)
+        if capture.exit() and capture is self._capture:
+            self._finish()
+
+    def stop(self) -> Optional[Dict[str, Any]]:
+        """Disarm and write whatever the current session captured."""
+        if self._capture is None:
+            return self._last_result
+        return self._finish()
+
+    def get_status(self) -> Optional[Dict[str, Any]]:
+        """Get the armed session's status, or the last finished session's result."""
+        capture = self._capture
+        if capture is None:
+            return self._last_result
+        if capture.deadline is not None and capture.exhausted and not capture.in_flight:
+            return self._finish()
+        return capture.get_status()
+
+    async def wait(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait for the armed session to finish (polling window deadlines)."""
+        capture = self._capture
+        if capture is None:
+            return self._last_result
+        end = time.monotonic() + timeout
+        while not capture.finished.is_set() and time.monotonic() < end:
+            self.get_status()
+            await asyncio.sleep(0.05)
+        return capture.result
+
+    def _finish(self) -> Dict[str, Any]:
+        capture = self._capture
+        assert capture is not None
+        self._capture = None
+        self.armed = False
+        self._last_result = capture.write(self.output_dir)
+        return self._last_result
+
+
+# Global profiler instance
+_tool_profiler = ToolProfiler()
+
+
+def get_tool_profiler() -> ToolProfiler:
+    """Get the global tool profiler."""
+    return _tool_profiler
@@ -0,0 +1,317 @@
+"""Process-wide token-bucket rate limiting for Checkmk REST API calls.
+
+This module provides the rate limiter that is enforced at the transport layer
+(``CheckmkClient._make_request``). Because every REST call goes through that
+single method - whether it originates from a streaming resource, a batch
+operation or an ad-hoc tool call - all callers in the process share the same
+budget per Checkmk server.
+
+Key features:
+- Token buckets with configurable rate and burst capacity
+- Separate buckets for read and write endpoint classes
+- Thread-safe (the sync client runs in executor threads) and async-safe
+- Honors ``Retry-After`` on HTTP 429 by pausing the affected bucket
+"""
+
+import asyncio
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Any
+
+from .request_context import interruptible_sleep
+
+
+READ = "read"
+WRITE = "write"
+
+# POST endpoints that only query data (Livestatus-backed collections, metrics)
+_READ_ONLY_POST_PATTERNS = [
+    re.compile(r"^/?domain-types/service/collections/all$"),
+    re.compile(r"^/?objects/host/[^/]+/collections/services$"),
+    re.compile(r"^/?domain-types/metric/actions/get/invoke$"),
+]
+
+
+def classify_endpoint(method: str, endpoint: str) -> str:
+    """Classify a REST call as a read or write operation.
+
+    Args:
+        method: HTTP method
+        endpoint: API endpoint path (with or without leading slash)
+
+    Returns:
+        str: READ or WRITE
+
+    Examples:
+        >>> classify_endpoint("GET", "/objects/host_config/web01")
+        'read'
+        >>> classify_endpoint("POST", "/domain-types/service/collections/all")
+        'read'
+        >>> classify_endpoint("POST", "/domain-types/host_config/collections/all")
+        'write'
+    """
+    method = method.upper()
+    if method in ("GET", "HEAD", "OPTIONS"):
+        return READ
+
+    if method == "POST":
+        path = endpoint.split("?", 1)[0]
+        if any(pattern.match(path) for pattern in _READ_ONLY_POST_PATTERNS):
+            return READ
+
+    return WRITE
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header value into seconds.
+
+    Args:
+        value: Header value, either delta-seconds or an HTTP date
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the value is unusable
+    """
+    if not value or not isinstance(value, str):
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Token bucket usable from both threads and coroutines.
+
+    Acquiring reserves a token immediately (the balance may go negative) and
+    returns how long the caller has to wait for it. Because the reservation is
+    made under a lock, concurrent callers are spaced out correctly instead of
+    all passing the check at once.
+    """
+
+    def __init__(self, rate: Optional[float] = None, capacity: Optional[float] = None):
+        """Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second (None or <= 0 for unlimited)
+            capacity: Maximum burst size (defaults to one second of tokens)
+        """
+        self.rate = rate if rate and rate > 0 else None
+        self.capacity = max(1.0, float(capacity or self.rate or 1.0))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        if self.rate is None:
+            return
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Reserve tokens and return the delay before they may be used.
+
+        Args:
+            tokens: Number of tokens to reserve
+
+        Returns:
+            float: Seconds the caller must wait before proceeding
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._blocked_until - now)
+
+            if self.rate is not None:
+                self._refill(now)
+                self._tokens -= tokens
+                if self._tokens < 0:
+                    # _updated is in the future while the bucket is paused
+                    deficit_wait = (self._updated - now) - self._tokens / self.rate
+                    wait = max(wait, deficit_wait)
+
+            self.acquired += 1
+            if wait > 0:
+                self.throttled += 1
+                self.total_wait += wait
+            return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block the current thread until tokens are available.
+
+        The wait ends early with RequestCancelled if the caller cancels the
+        request.
+
+        Returns:
+            float: Seconds waited
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            interruptible_sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Wait (without blocking the event loop) until tokens are available.
+
+        Returns:
+            float: Seconds waited
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for the given number of seconds.
+
+        Used to honor Retry-After from a 429 response; the pause applies to
+        every caller sharing this bucket.
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            if self.rate is not None:
+                # Do not let tokens accumulated before the pause cause a burst
+                self._tokens = min(self._tokens, 0.0)
+                self._updated = max(self._updated, self._blocked_until)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bucket statistics."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate_per_second": self.rate,
+                "capacity": self.capacity,
+                "available_tokens": (
+                    round(self._tokens, 2) if self.rate is not None else None
+                ),
+                "blocked_for_seconds": round(
+                    max(0.0, self._blocked_until - time.monotonic()), 3
+                ),
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "total_wait_seconds": round(self.total_wait, 3),
+            }
+
+
+class CheckmkRateLimiter:
+    """Read/write token buckets for one Checkmk server."""
+
+    def __init__(
+        self,
+        read_rate: Optional[float] = None,
+        read_burst: Optional[float] = None,
+        write_rate: Optional[float] = None,
+        write_burst: Optional[float] = None,
+    ):
+        """Initialize the rate limiter.
+
+        Args:
+            read_rate: Read requests per second (None for unlimited)
+            read_burst: Read burst capacity
+            write_rate: Write requests per second (None for unlimited)
+            write_burst: Write burst capacity
+        """
+        self.buckets: Dict[str, TokenBucket] = {
+            READ: TokenBucket(read_rate, read_burst),
+            WRITE: TokenBucket(write_rate, write_burst),
+        }
+
+    def bucket_for(self, method: str, endpoint: str) -> TokenBucket:
+        """Get the bucket responsible for a request."""
+        return self.buckets[classify_endpoint(method, endpoint)]
+
+    def acquire(self, method: str, endpoint: str) -> float:
+        """Block until a request may be sent (thread context)."""
+        return self.bucket_for(method, endpoint).acquire()
+
+    async def acquire_async(self, method: str, endpoint: str) -> float:
+        """Wait until a request may be sent (async context)."""
+        return await self.bucket_for(method, endpoint).acquire_async()
+
+    def handle_rate_limited(
+        self, method: str, endpoint: str, retry_after: Optional[str]
+    ) -> float:
+        """Pause the affected bucket after a 429 response.
+
+        Args:
+            method: HTTP method of the rejected request
+            endpoint: Endpoint of the rejected request
+            retry_after: Raw Retry-After header value, if any
+
+        Returns:
+            float: Pause applied in seconds
+        """
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = 1.0
+        self.bucket_for(method, endpoint).pause(delay)
+        return delay
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics for all buckets."""
+        return {name: bucket.get_stats() for name, bucket in self.buckets.items()}
+
+
+# Process-wide registry so every client for the same server shares one budget
+_rate_limiters: Dict[str, CheckmkRateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str, config: Any = None) -> CheckmkRateLimiter:
+    """Get or create the process-wide rate limiter for a Checkmk server.
+
+    Args:
+        key: Identifier for the server (e.g. the API base URL)
+        config: Optional RateLimitConfig used when the limiter is first created
+
+    Returns:
+        CheckmkRateLimiter: Shared limiter for this server
+    """
+    def setting(name: str) -> Optional[float]:
+        value = getattr(config, name, None)
+        return value if isinstance(value, (int, float)) else None
+
+    with _registry_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            limiter = CheckmkRateLimiter(
+                read_rate=setting("read_requests_per_second"),
+                read_burst=setting("read_burst"),
+                write_rate=setting("write_requests_per_second"),
+                write_burst=setting("write_burst"),
+            )
+            _rate_limiters[key] = limiter
+        return limiter
+
+
+def get_all_rate_limiter_stats() -> Dict[str, Any]:
+    """Get statistics for every registered rate limiter."""
+    with _registry_lock:
+        limiters = dict(_rate_limiters)
+    return {key: limiter.get_stats() for key, limiter in limiters.items()}
+
+
+def reset_rate_limiters() -> None:
+    """Drop all registered rate limiters (useful for testing)."""
+    with _registry_lock:
+        _rate_limiters.clear()
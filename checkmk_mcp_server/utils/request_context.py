@@ -10,17 +10,30 @@ Key features:
 - Support for sub-request IDs for batch operations
 - Automatic fallback for orphaned operations
 - Comprehensive request ID formatting and validation
+- End-to-end deadlines and cancellation that follow a request into executor
+  threads, so outbound calls and retries stop when the caller gives up
 """
 
 import secrets
 import asyncio
+import threading
+import time
+from contextlib import contextmanager
 from contextvars import ContextVar
-from typing import Optional, Callable, TypeVar, Any, Dict, Union
+from typing import Optional, Callable, TypeVar, Any, Dict, Iterator, Union
 from functools import wraps
 
 # Global context variable for request ID - thread-safe and async-safe
 REQUEST_ID_CONTEXT: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 
+# time.monotonic() by which the current request must finish, if any
+DEADLINE_CONTEXT: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+# Set when the caller of a blocking call gave up on it (see run_blocking)
+CANCELLATION_CONTEXT: ContextVar[Optional[threading.Event]] = ContextVar(
+    "cancellation", default=None
+)
+
 T = TypeVar("T")
 
 
@@ -254,9 +267,141 @@ def get_request_context() -> Dict[str, Any]:
         "request_id": get_request_id(),
         "formatted_request_id": format_request_id(get_request_id()),
         "has_request_id": get_request_id() is not None,
+        "remaining_time": remaining_time(),
     }
 
 
+class DeadlineExceeded(TimeoutError):
+    """The request's deadline passed before the work was done."""
+
+
+class RequestCancelled(Exception):
+    """The caller cancelled the request while the work was in progress."""
+
+
+def get_deadline() -> Optional[float]:
+    """Get the current request's deadline as a ``time.monotonic()`` value.
+
+    Returns:
+        Optional[float]: Deadline, or None if the request has no deadline
+    """
+    return DEADLINE_CONTEXT.get()
+
+
+def remaining_time() -> Optional[float]:
+    """Get the seconds left until the current request's deadline.
+
+    Returns:
+        Optional[float]: Remaining seconds (never negative), or None if the
+        request has no deadline
+    """
+    deadline = DEADLINE_CONTEXT.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]) -> Iterator[Optional[float]]:
+    """Run a block with a deadline ``timeout`` seconds from now.
+
+    Nested scopes can only shorten the deadline: the earlier of the
+    enclosing deadline and the new one applies. A ``timeout`` of None keeps
+    the enclosing deadline (if any).
+
+    Args:
+        timeout: Seconds the block may take, or None
+
+    Yields:
+        Optional[float]: The deadline in effect inside the block
+
+    Examples:
+        >>> with deadline_scope(30):
+        ...     remaining_time() <= 30
+        True
+    """
+    deadline = DEADLINE_CONTEXT.get()
+    if timeout is not None:
+        candidate = time.monotonic() + timeout
+        deadline = candidate if deadline is None else min(deadline, candidate)
+
+    token = DEADLINE_CONTEXT.set(deadline)
+    try:
+        yield deadline
+    finally:
+        DEADLINE_CONTEXT.reset(token)
+
+
+def clear_deadline() -> None:
+    """Remove the deadline from the current context.
+
+    For background work (e.g. batch jobs) started by a request but meant to
+    outlive it; call it at the start of the background task, whose context
+    is a copy of the request's.
+    """
+    DEADLINE_CONTEXT.set(None)
+
+
+def is_cancelled() -> bool:
+    """Check whether the caller has cancelled the current request."""
+    event = CANCELLATION_CONTEXT.get()
+    return event is not None and event.is_set()
+
+
+def check_deadline(operation: str = "request") -> None:
+    """Raise if the current request was cancelled or ran out of time.
+
+    Call this before starting work that the caller may no longer want,
+    such as an outbound request or another retry attempt.
+
+    Args:
+        operation: Description of the work for the error message
+
+    Raises:
+        RequestCancelled: If the caller cancelled the request
+        DeadlineExceeded: If the request's deadline has passed
+    """
+    if is_cancelled():
+        raise RequestCancelled(f"{format_request_id(get_request_id())}: {operation} cancelled")
+    if remaining_time() == 0:
+        raise DeadlineExceeded(
+            f"{format_request_id(get_request_id())}: deadline exceeded before {operation}"
+        )
+
+
+def bound_timeout(timeout: float) -> float:
+    """Limit a timeout to the time left until the current request's deadline.
+
+    Args:
+        timeout: Timeout the operation would use without a deadline
+
+    Returns:
+        float: The smaller of ``timeout`` and the remaining budget
+    """
+    remaining = remaining_time()
+    return timeout if remaining is None else min(timeout, remaining)
+
+
+def interruptible_sleep(seconds: float) -> None:
+    """Sleep the current thread, waking early if the request is cancelled.
+
+    Blocking waits (rate limiting, retry backoff) use this instead of
+    ``time.sleep`` so that an abandoned call releases its executor thread
+    as soon as the caller gives up.
+
+    Args:
+        seconds: Seconds to sleep
+
+    Raises:
+        RequestCancelled: If the request is cancelled while sleeping
+    """
+    event = CANCELLATION_CONTEXT.get()
+    if event is None:
+        time.sleep(seconds)
+    elif event.wait(seconds):
+        raise RequestCancelled(f"{format_request_id(get_request_id())}: wait cancelled")
+
+
 def copy_request_context() -> Optional[str]:
     """Copy the current request context for manual propagation.
 
@@ -0,0 +1,279 @@
+"""Single-flight coalescing of identical concurrent Checkmk REST reads.
+
+Several tools, resources and the CLI completer often fetch the same data at
+the same moment - typically a full ``POST /domain-types/service/collections/all``
+with identical columns. Like the rate limiter, coalescing happens at the
+transport layer (``CheckmkClient._make_request``) and is shared by every client
+for the same server and user: the first caller of a read sends the request,
+and identical reads arriving while it is in flight wait for it and receive a
+copy of its parsed result instead of sending their own.
+
+Key features:
+- Only reads are coalesced (see ``rate_limiter.classify_endpoint``); writes
+  always go to the server
+- Requests are identical when method, endpoint, query parameters and body
+  hash match
+- Optional micro-TTL: a result is also reused for this many seconds after the
+  request finished (0 shares in-flight requests only)
+- Shared results are read-only below the top level: every caller gets its own
+  shallow copy, so copying a full-table result costs next to nothing. Results
+  reused through the TTL outlive the call and are deep-copied instead
+- Waiting callers still honour their own deadline and cancellation
+- Thread-safe: the sync client runs in executor threads
+"""
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from .rate_limiter import READ, classify_endpoint
+from .request_context import (
+    DeadlineExceeded,
+    RequestCancelled,
+    check_deadline,
+    remaining_time,
+)
+
+T = TypeVar("T")
+
+# Seconds a waiting caller blocks before re-checking its deadline and
+# cancellation
+_WAIT_SLICE = 0.1
+
+# Request options that may differ between coalesced calls (headers carry the
+# caller's request ID) or that make up the request key
+_KEYED_OPTIONS = {"params", "json", "headers"}
+
+
+def request_key(
+    method: str, endpoint: str, options: Dict[str, Any]
+) -> Optional[Tuple[str, str, str, str]]:
+    """Build the coalescing key of a REST call.
+
+    Args:
+        method: HTTP method
+        endpoint: API endpoint path
+        options: Keyword arguments of the request (params, json, headers)
+
+    Returns:
+        Optional[Tuple]: Key of the request, or None if it must not be
+        coalesced (writes, or requests with options that are not keyed)
+
+    Examples:
+        >>> key = request_key("GET", "objects/host/web01", {"params": {"a": 1}})
+        >>> key == request_key("get", "objects/host/web01", {"params": {"a": 1}})
+        True
+        >>> request_key("DELETE", "objects/host_config/web01", {}) is None
+        True
+    """
+    if classify_endpoint(method, endpoint) != READ:
+        return None
+    if not set(options) <= _KEYED_OPTIONS:
+        return None
+
+    params = json.dumps(options.get("params"), sort_keys=True, default=str)
+    body = json.dumps(options.get("json"), sort_keys=True, default=str)
+    body_hash = hashlib.sha1(body.encode("utf-8")).hexdigest()
+    return method.upper(), endpoint.lstrip("/"), params, body_hash
+
+
+class _Flight:
+    """One request in flight (or cached) and the callers sharing it."""
+
+    __slots__ = ("done", "result", "error", "waiters", "expires")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self.expires: Optional[float] = None
+
+
+class SingleFlight:
+    """Run a function once for concurrent callers with the same key."""
+
+    def __init__(self, ttl: float = 0.0, collector: Any = None):
+        """Initialize the single-flight group.
+
+        Args:
+            ttl: Seconds a finished result is reused for (0 for in-flight only)
+            collector: Optional metrics collector counting coalesced calls
+        """
+        self.ttl = ttl
+        self.collector = collector
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.reused = 0
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """Run ``func`` or share the result of an identical call.
+
+        The first caller for ``key`` runs ``func``; callers arriving while it
+        runs (or within the TTL afterwards) get a copy of its result, or its
+        exception re-raised. If the first caller ran out of time or was
+        cancelled, waiting callers run ``func`` themselves instead.
+
+        Shared results must be treated as read-only below the top level
+        (see ``_share``).
+
+        Args:
+            key: Identity of the call
+            func: Function to run
+
+        Returns:
+            The function's result
+
+        Raises:
+            DeadlineExceeded: If the request's deadline passes while waiting
+            RequestCancelled: If the request is cancelled while waiting
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            if flight is not None and flight.expires is not None and flight.expires <= now:
+                del self._flights[key]
+                flight = None
+            if flight is None:
+                if self.ttl > 0:
+                    self._drop_expired(now)
+                flight = self._flights[key] = _Flight()
+                leader = True
+            else:
+                flight.waiters += 1
+                leader = False
+                cached = flight.done.is_set()
+                if cached:
+                    self.reused += 1
+                else:
+                    self.coalesced += 1
+
+        if leader:
+            return self._lead(key, flight, func)
+
+        self._count("ttl" if cached else "in_flight")
+        self._wait(flight)
+        if isinstance(flight.error, (DeadlineExceeded, RequestCancelled)):
+            return func()
+        if flight.error is not None:
+            raise flight.error
+        return self._share(flight.result)
+
+    def _wait(self, flight: _Flight) -> None:
+        """Wait for a flight in short slices, honouring deadline and cancellation."""
+        while True:
+            check_deadline("shared request")
+            remaining = remaining_time()
+            timeout = _WAIT_SLICE if remaining is None else min(_WAIT_SLICE, remaining)
+            if flight.done.wait(timeout):
+                return
+
+    def _share(self, result: T) -> T:
+        """Copy a shared result for one caller.
+
+        In-flight sharing hands out shallow copies, so the cost does not grow
+        with the size of the result; TTL-cached results are reused by later
+        calls and are deep-copied so no caller can change them for the next.
+        """
+        return copy.deepcopy(result) if self.ttl > 0 else copy.copy(result)
+
+    def _lead(self, key: Hashable, flight: _Flight, func: Callable[[], T]) -> T:
+        """Run the call for everyone waiting on ``flight``."""
+        try:
+            result = func()
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.done.set()
+            raise
+
+        flight.result = result
+        with self._lock:
+            if self.ttl > 0:
+                flight.expires = time.monotonic() + self.ttl
+            elif self._flights.get(key) is flight:
+                del self._flights[key]
+            # Nobody can join an uncached flight from here on
+            shared = flight.waiters > 0 or flight.expires is not None
+            flight.done.set()
+        return self._share(result) if shared else result
+
+    def _drop_expired(self, now: float) -> None:
+        """Forget cached results past their TTL (lock held)."""
+        expired = [
+            key
+            for key, flight in self._flights.items()
+            if flight.expires is not None and flight.expires <= now
+        ]
+        for key in expired:
+            del self._flights[key]
+
+    def _count(self, source: str) -> None:
+        if self.collector is not None:
+            self.collector.add_counter("checkmk_api.coalesced", source=source)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics."""
+        with self._lock:
+            return {
+                "ttl_seconds": self.ttl,
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "reused": self.reused,
+                "in_flight": sum(
+                    1 for flight in self._flights.values() if not flight.done.is_set()
+                ),
+            }
+
+
+# Process-wide registry so every client for the same server and user shares
+# in-flight reads (results are never shared across users)
+_single_flights: Dict[str, SingleFlight] = {}
+_registry_lock = threading.Lock()
+
+
+def get_single_flight(key: str, config: Any = None) -> Optional[SingleFlight]:
+    """Get or create the process-wide single-flight group for a server and user.
+
+    Args:
+        key: Identifier for the server and user
+        config: Optional CoalescingConfig used when the group is first created
+
+    Returns:
+        Optional[SingleFlight]: Shared group, or None if coalescing is disabled
+    """
+    if config is not None and getattr(config, "enabled", True) is False:
+        return None
+    ttl = getattr(config, "ttl", 0.0)
+    if not isinstance(ttl, (int, float)):
+        ttl = 0.0
+
+    with _registry_lock:
+        group = _single_flights.get(key)
+        if group is None:
+            from ..services.metrics import get_metrics_collector
+
+            group = SingleFlight(ttl=ttl, collector=get_metrics_collector())
+            _single_flights[key] = group
+        return group
+
+
+def get_all_single_flight_stats() -> Dict[str, Any]:
+    """Get statistics for every registered single-flight group."""
+    with _registry_lock:
+        groups = dict(_single_flights)
+    return {key: group.get_stats() for key, group in groups.items()}
+
+
+def reset_single_flights() -> None:
+    """Drop all registered single-flight groups (useful for testing)."""
+    with _registry_lock:
+        _single_flights.clear()
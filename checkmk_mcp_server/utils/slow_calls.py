@@ -0,0 +1,257 @@
+"""Slow call log for tool calls and Checkmk REST requests.
+
+Calls that take longer than their threshold append one JSON record to a
+rotating local JSONL file. Each record has the request ID, the tool or
+endpoint, a hash of the arguments, the response size and row count, the
+retry count, and (for tool calls) the phase breakdown. Fast calls cost a
+threshold lookup and a comparison, so the log can stay on in production
+and point at the queries that need pushdown or caching.
+
+Thresholds are looked up by exact tool name or endpoint, then fall back to
+the defaults. Endpoint keys may include the method (``"GET /domain-types/
+host_config/collections/all"``) or use the bare endpoint template.
+"""
+
+import hashlib
+import json
+import logging
+import logging.handlers
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .call_breakdown import CallBreakdown, get_current_breakdown
+
+
+def arguments_hash(arguments: Any) -> Optional[str]:
+    """Stable short hash of call arguments (values are never logged)."""
+    if not arguments:
+        return None
+    encoded = json.dumps(arguments, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def row_count(payload: Any) -> Optional[int]:
+    """Number of rows in an API response or tool result, if it has any."""
+    if isinstance(payload, list):
+        return len(payload)
+    if isinstance(payload, dict):
+        for key in ("value", "data"):
+            if key in payload:
+                return row_count(payload[key])
+    return None
+
+
+class SlowCallLog:
+    """Writes records of calls that exceed their latency threshold."""
+
+    def __init__(
+        self,
+        path: Union[str, Path] = "~/.checkmk_mcp/slow_calls.jsonl",
+        enabled: bool = True,
+        tool_threshold: float = 2.0,
+        request_threshold: float = 1.0,
+        tool_thresholds: Optional[Dict[str, float]] = None,
+        endpoint_thresholds: Optional[Dict[str, float]] = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 3,
+    ):
+        """
+        Initialize slow call log.
+
+        Args:
+            path: JSONL file to append records to
+            enabled: Whether slow calls are recorded
+            tool_threshold: Default tool call threshold in seconds
+            request_threshold: Default REST request threshold in seconds
+            tool_thresholds: Per-tool thresholds in seconds
+            endpoint_thresholds: Per-endpoint thresholds in seconds
+            max_bytes: Size at which the file is rotated
+            backup_count: Number of rotated files kept
+        """
+        self.enabled = enabled
+        self.path = Path(path).expanduser()
+        self.tool_threshold = tool_threshold
+        self.request_threshold = request_threshold
+        self.tool_thresholds: Dict[str, float] = dict(tool_thresholds or {})
+        self.endpoint_thresholds: Dict[str, float] = dict(endpoint_thresholds or {})
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.records_written = 0
+        self._handler: Optional[logging.Handler] = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def configure(self, **settings: Any) -> None:
+        """Update settings; the file is reopened on the next record."""
+        with self._lock:
+            for key, value in settings.items():
+                if not hasattr(self, key):
+                    raise ValueError(f"Unknown slow call log setting: {key}")
+                if key == "path":
+                    value = Path(value).expanduser()
+                setattr(self, key, value)
+            self._close_handler()
+
+    def close(self) -> None:
+        """Close the log file."""
+        with self._lock:
+            self._close_handler()
+
+    def _close_handler(self) -> None:
+        if self._handler is not None:
+            self._handler.close()
+            self._handler = None
+
+    def tool_threshold_for(self, tool: str) -> float:
+        """Threshold in seconds for a tool."""
+        return self.tool_thresholds.get(tool, self.tool_threshold)
+
+    def endpoint_threshold_for(self, method: str, endpoint: str) -> float:
+        """Threshold in seconds for a REST endpoint template."""
+        thresholds = self.endpoint_thresholds
+        if not thresholds:
+            return self.request_threshold
+        return thresholds.get(
+            f"{method} {endpoint}", thresholds.get(endpoint, self.request_threshold)
+        )
+
+    def check_tool_call(
+        self,
+        breakdown: CallBreakdown,
+        arguments: Optional[Dict[str, Any]],
+        status: str,
+        result: Any = None,
+    ) -> bool:
+        """
+        Record a finished tool call if it was slow.
+
+        Args:
+            breakdown: Finished breakdown of the call
+            arguments: Tool arguments
+            status: Call outcome ("ok", "failed" or "error")
+            result: Tool result, used for the row count
+
+        Returns:
+            bool: True if a record was written
+        """
+        if not self.enabled or breakdown.total is None:
+            return False
+        threshold = self.tool_threshold_for(breakdown.tool)
+        if breakdown.total < threshold:
+            return False
+
+        details = breakdown.to_dict()
+        self._write(
+            {
+                "kind": "tool_call",
+                "request_id": breakdown.request_id,
+                "tool": breakdown.tool,
+                "status": status,
+                "duration_ms": details["total_ms"],
+                "threshold_ms": round(threshold * 1000, 3),
+                "arguments_hash": arguments_hash(arguments),
+                "response_bytes": details["response_bytes"],
+                "row_count": row_count(result),
+                "retry_count": details["retries"],
+                "phases_ms": details["phases_ms"],
+                "rest_calls": details["rest_calls"],
+            }
+        )
+        return True
+
+    def check_request(
+        self,
+        request_id: Optional[str],
+        method: str,
+        endpoint: str,
+        seconds: float,
+        status: str,
+        arguments: Any = None,
+        response_bytes: Optional[int] = None,
+        response_data: Any = None,
+        retry_count: int = 0,
+    ) -> bool:
+        """
+        Record a finished REST request if it was slow.
+
+        Args:
+            request_id: Request ID
+            method: HTTP method
+            endpoint: Endpoint template
+            seconds: Request duration
+            status: HTTP status code or "error"
+            arguments: Query parameters and body, hashed
+            response_bytes: Response body size
+            response_data: Parsed response, used for the row count
+            retry_count: Attempts made before this one
+
+        Returns:
+            bool: True if a record was written
+        """
+        if not self.enabled:
+            return False
+        threshold = self.endpoint_threshold_for(method, endpoint)
+        if seconds < threshold:
+            return False
+
+        breakdown = get_current_breakdown()
+        self._write(
+            {
+                "kind": "checkmk_api",
+                "request_id": request_id,
+                "tool": breakdown.tool if breakdown else None,
+                "method": method,
+                "endpoint": endpoint,
+                "status": status,
+                "duration_ms": round(seconds * 1000, 3),
+                "threshold_ms": round(threshold * 1000, 3),
+                "arguments_hash": arguments_hash(arguments),
+                "response_bytes": response_bytes,
+                "row_count": row_count(response_data),
+                "retry_count": retry_count,
+            }
+        )
+        return True
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(
+            {"timestamp": datetime.now().isoformat(), **record}, default=str
+        )
+        try:
+            with self._lock:
+                if self._handler is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._handler = logging.handlers.RotatingFileHandler(
+                        self.path,
+                        maxBytes=self.max_bytes,
+                        backupCount=self.backup_count,
+                        encoding="utf-8",
+                    )
+                    self._handler.setFormatter(logging.Formatter("%(message)s"))
+                self._handler.emit(
+                    logging.LogRecord(__name__, logging.INFO, "", 0, line, None, None)
+                )
+                self.records_written += 1
+        except OSError as e:
+            self.logger.warning(f"Could not write slow call record to {self.path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get slow call log settings and counters."""
+        return {
+            "enabled": self.enabled,
+            "path": str(self.path),
+            "tool_threshold_seconds": self.tool_threshold,
+            "request_threshold_seconds": self.request_threshold,
+            "records_written": self.records_written,
+        }
+
+
+# Global slow call log
+_slow_call_log = SlowCallLog()
+
+
+def get_slow_call_log() -> SlowCallLog:
+    """Get the global slow call log."""
+    return _slow_call_log
@@ -0,0 +1,223 @@
+"""Startup timing for the MCP server.
+
+MCP clients spawn a server process per session and wait for its first
+``list_tools`` answer before the agent can do anything. This module records
+the time from process start to the milestones on that path (imports done and
+server created, server initialized, first ``list_tools`` answered) and logs
+one report line once the first ``list_tools`` has been answered. The same
+numbers are exported as ``mcp.startup_seconds`` gauges.
+
+Process start is read from ``/proc`` where available (10ms resolution) and
+otherwise approximated by the time this module was imported.
+
+The CLI entry points use :func:`profile_startup` for ``--profile-startup``:
+the command is re-run under ``python -X importtime`` and the imports are
+printed as a tree of cumulative times.
+"""
+
+import logging
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FIRST_LIST_TOOLS = "first_list_tools"
+
+
+def process_start_time() -> float:
+    """Wall clock time the current process started."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesized command name; starttime is field 22
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        age = uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+        return time.time() - max(0.0, age)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.time()
+
+
+class StartupTimer:
+    """Milestones of process startup in seconds since process start."""
+
+    def __init__(self, origin: Optional[float] = None):
+        """
+        Initialize the timer.
+
+        Args:
+            origin: Wall clock start time (default: process start)
+        """
+        self.origin = origin if origin is not None else process_start_time()
+        self.milestones: Dict[str, float] = {}
+        self.reported = False
+
+    def mark(self, name: str) -> float:
+        """
+        Record a milestone; only the first mark of a name counts.
+
+        Args:
+            name: Milestone name
+
+        Returns:
+            Seconds from process start to the milestone
+        """
+        if name not in self.milestones:
+            self.milestones[name] = time.time() - self.origin
+            try:
+                from ..services.metrics import get_metrics_collector
+
+                get_metrics_collector().update_gauge(
+                    "mcp.startup_seconds", self.milestones[name], milestone=name
+                )
+            except Exception as e:
+                logger.debug(f"Could not record startup milestone: {e}")
+        return self.milestones[name]
+
+    def mark_first_list_tools(self) -> None:
+        """Record the first list_tools answer and log the startup report once."""
+        if self.reported:
+            return
+        self.mark(FIRST_LIST_TOOLS)
+        self.reported = True
+        logger.info(f"Startup: {self.format_report()}")
+
+    def format_report(self) -> str:
+        """One-line summary of the milestones in order."""
+        return ", ".join(
+            f"{name} after {seconds * 1000:.0f}ms"
+            for name, seconds in sorted(self.milestones.items(), key=lambda m: m[1])
+        )
+
+    def to_dict(self) -> Dict[str, float]:
+        """Milestones in milliseconds since process start."""
+        return {name: round(seconds * 1000, 1) for name, seconds in self.milestones.items()}
+
+
+# Global startup timer
+_startup_timer = StartupTimer()
+
+
+def get_startup_timer() -> StartupTimer:
+    """Get the global startup timer."""
+    return _startup_timer
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """
+    Parse ``-X importtime`` output.
+
+    Args:
+        output: Standard error of a ``python -X importtime`` run
+
+    Returns:
+        List of dicts with module, depth, self_ms and cumulative_ms, in the
+        order Python reports them (a module after everything it imported)
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # header line
+        modules.append(
+            {
+                "module": name.strip(),
+                # One separator space, then two spaces per nesting level
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        )
+    return modules
+
+
+def build_import_tree(modules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Nest parsed ``-X importtime`` entries under the module that imported them.
+
+    Args:
+        modules: Entries from :func:`parse_importtime`
+
+    Returns:
+        Top-level imports in import order, each with a "children" list
+    """
+    pending: Dict[int, List[Dict[str, Any]]] = {}
+    for entry in modules:
+        depth = entry.get("depth", 0)
+        node = dict(entry, children=pending.pop(depth + 1, []))
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def format_import_tree(tree: List[Dict[str, Any]], min_ms: float = 1.0) -> str:
+    """
+    Render an import tree, skipping imports cheaper than ``min_ms``.
+
+    Args:
+        tree: Top-level nodes from :func:`build_import_tree`
+        min_ms: Cumulative time below which a module and its imports are hidden
+
+    Returns:
+        One line per module with cumulative and self time, indented by depth
+    """
+    lines = [f"{'cumulative':>10} {'self':>8}  module"]
+
+    def render(nodes: List[Dict[str, Any]], depth: int) -> None:
+        for node in sorted(nodes, key=lambda n: -n["cumulative_ms"]):
+            if node["cumulative_ms"] < min_ms:
+                continue
+            lines.append(
+                f"{node['cumulative_ms']:>8.1f}ms {node['self_ms']:>6.1f}ms  "
+                f"{'  ' * depth}{node['module']}"
+            )
+            render(node["children"], depth + 1)
+
+    render(tree, 0)
+    return "\n".join(lines)
+
+
+def profile_startup(module: str, args: List[str], min_ms: float = 1.0) -> int:
+    """
+    Run a command under ``-X importtime`` and print its import tree.
+
+    The command's own output is passed through; the tree and the totals are
+    written to standard error afterwards.
+
+    Args:
+        module: Module run with ``python -m``
+        args: Command line arguments for the module
+        min_ms: Hide imports with less cumulative time than this
+
+    Returns:
+        Exit code of the command
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", module, *args],
+        stdout=None,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    tree = build_import_tree(parse_importtime(completed.stderr))
+    # Anything else the command wrote to stderr is still shown
+    other = [
+        line for line in completed.stderr.splitlines()
+        if not line.startswith("import time:")
+    ]
+    if other:
+        print("\n".join(other), file=sys.stderr)
+    print(format_import_tree(tree, min_ms), file=sys.stderr)
+    import_ms = sum(node["cumulative_ms"] for node in tree)
+    print(
+        f"Imports: {import_ms:.0f}ms, process wall time: {wall_ms:.0f}ms "
+        f"(imports under {min_ms:g}ms hidden)",
+        file=sys.stderr,
+    )
+    return completed.returncode
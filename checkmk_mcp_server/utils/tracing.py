@@ -0,0 +1,572 @@
+"""Lightweight request tracing spans.
+
+Request IDs and sub-request IDs already describe which operations belong
+together; spans add timing and structure to that tree. A span records its
+start and end time, its parent span, the request ID active when it started
+and free-form attributes. Finished spans go into an in-memory ring buffer and
+can be exported as Chrome trace JSON (chrome://tracing, Perfetto) or OTLP
+JSON (Jaeger, otel-desktop-viewer and other local viewers) without running a
+collector.
+
+The current span is kept in a context variable, so spans opened in tool
+handlers, batch workers and executor threads (AsyncCheckmkClient copies the
+context) nest under the tool call that started them.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .request_context import extract_parent_id, get_request_id
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+SERVICE_NAME = "checkmk-mcp-server"
+TRACE_FORMATS = ("chrome", "otlp")
+
+# OTLP span kinds
+_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = (
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "request_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+        "thread_id",
+        "_perf_start",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        parent: Optional["Span"] = None,
+        kind: str = "internal",
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Start a span.
+
+        Args:
+            name: Operation name
+            parent: Parent span (a new trace is started without one)
+            kind: Span kind ("internal", "server" or "client")
+            attributes: Initial attributes
+        """
+        self.name = name
+        self.kind = kind
+        # Spans are created on every tracked call, so IDs are plain integers
+        # from a counter and only formatted as hex on export
+        self.span_id = next(_SPAN_IDS)
+        self.trace_id = parent.trace_id if parent else self.span_id
+        self.parent_id = parent.span_id if parent else None
+        self.request_id = get_request_id()
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.error: Optional[str] = None
+        self.thread_id = threading.get_ident()
+        self._perf_start = time.perf_counter_ns()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute on the span."""
+        self.attributes[key] = value
+
+    def finish(self, error: Optional[Union[BaseException, str]] = None) -> None:
+        """End the span, optionally marking it as failed."""
+        if self.end_ns is None:
+            self.end_ns = self.start_ns + time.perf_counter_ns() - self._perf_start
+        if error is not None:
+            self.error = (
+                f"{type(error).__name__}: {error}"
+                if isinstance(error, BaseException)
+                else str(error)
+            )
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration in seconds once finished."""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert span to dictionary."""
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": format_trace_id(self.trace_id),
+            "span_id": format_span_id(self.span_id),
+            "parent_id": format_span_id(self.parent_id),
+            "request_id": self.request_id,
+            "start": datetime.fromtimestamp(self.start_ns / 1e9).isoformat(),
+            "duration_ms": (
+                round(self.duration * 1000, 3) if self.duration is not None else None
+            ),
+            "attributes": dict(self.attributes),
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded while tracing is disabled."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+# Span IDs only need to be unique within the process's traces, not
+# unpredictable; a random start keeps traces of separate runs apart
+_SPAN_IDS = itertools.count(random.getrandbits(62) + 1)
+_TRACE_ID_HIGH = f"{random.getrandbits(64):016x}"
+
+
+def format_span_id(span_id: Optional[int]) -> Optional[str]:
+    """Format a span ID as 16 hex digits (OTLP span ID)."""
+    return None if span_id is None else f"{span_id:016x}"
+
+
+def format_trace_id(trace_id: int) -> str:
+    """Format a trace ID as 32 hex digits (OTLP trace ID)."""
+    return f"{_TRACE_ID_HIGH}{trace_id:016x}"
+
+
+_CURRENT_SPAN: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class SpanRecorder:
+    """Ring buffer of finished spans with trace file export."""
+
+    def __init__(
+        self,
+        capacity: int = 4096,
+        enabled: bool = True,
+        export_dir: Union[str, Path] = "~/.checkmk_mcp/traces",
+    ):
+        """
+        Initialize recorder.
+
+        Args:
+            capacity: Maximum number of finished spans kept
+            enabled: Whether spans are recorded at all
+            export_dir: Default directory for exported trace files
+        """
+        self.enabled = enabled
+        self.export_dir = Path(export_dir).expanduser()
+        self.dropped = 0
+        self._spans: Deque[Span] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of finished spans kept."""
+        return self._spans.maxlen or 0
+
+    def configure(
+        self,
+        enabled: Optional[bool] = None,
+        capacity: Optional[int] = None,
+        export_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """Update recorder settings, keeping the most recent spans."""
+        with self._lock:
+            if enabled is not None:
+                self.enabled = enabled
+            if capacity is not None and capacity != self.capacity:
+                self._spans = deque(self._spans, maxlen=capacity)
+            if export_dir is not None:
+                self.export_dir = Path(export_dir).expanduser()
+
+    def record(self, span: Span) -> None:
+        """Add a finished span, evicting the oldest when full."""
+        with self._lock:
+            if len(self._spans) == self._spans.maxlen:
+                self.dropped += 1
+            self._spans.append(span)
+
+    def get_spans(self, request_id: Optional[str] = None) -> List[Span]:
+        """
+        Get recorded spans, oldest first.
+
+        Args:
+            request_id: Only spans of this request (sub-requests included)
+
+        Returns:
+            List of finished spans
+        """
+        with self._lock:
+            spans = list(self._spans)
+        if request_id is None:
+            return spans
+        root = extract_parent_id(request_id)
+        trace_ids = {
+            span.trace_id
+            for span in spans
+            if span.request_id and extract_parent_id(span.request_id) == root
+        }
+        return [span for span in spans if span.trace_id in trace_ids]
+
+    def clear(self) -> None:
+        """Drop all recorded spans."""
+        with self._lock:
+            self._spans.clear()
+            self.dropped = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get recorder statistics."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "spans": len(self._spans),
+                "capacity": self.capacity,
+                "dropped": self.dropped,
+            }
+
+    def export(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        format: str = "chrome",
+        request_id: Optional[str] = None,
+        filename: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Write recorded spans to a trace file.
+
+        ``path`` is for trusted callers only; untrusted input (such as MCP
+        tool arguments) must use ``filename``, which always stays inside
+        ``export_dir``.
+
+        Args:
+            path: Output file (defaults to a timestamped file in export_dir)
+            format: "chrome" for Chrome trace JSON or "otlp" for OTLP JSON
+            request_id: Only export spans of this request
+            filename: Bare file name inside export_dir
+
+        Returns:
+            Dict with the written path and span count
+
+        Raises:
+            ValueError: If the format is unknown or ``filename`` is not a bare
+                file name
+        """
+        if format not in TRACE_FORMATS:
+            raise ValueError(
+                f"Unknown trace format '{format}', expected one of {', '.join(TRACE_FORMATS)}"
+            )
+        if filename is not None:
+            if (
+                not filename
+                or filename in (".", "..")
+                or Path(filename).name != filename
+                or os.sep in filename
+                or (os.altsep and os.altsep in filename)
+            ):
+                raise ValueError(
+                    f"Invalid trace file name '{filename}': expected a bare file name"
+                )
+            path = self.export_dir / filename
+
+        spans = self.get_spans(request_id)
+        document = to_chrome_trace(spans) if format == "chrome" else to_otlp_json(spans)
+
+        if path is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            suffix = request_id or f"{os.getpid()}"
+            path = self.export_dir / f"trace-{stamp}-{suffix}.{format}.json"
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f)
+
+        return {"path": str(path), "format": format, "span_count": len(spans)}
+
+
+def _assign_lanes(spans: List[Span]) -> Dict[int, int]:
+    """Place spans on lanes so that spans sharing a lane nest properly.
+
+    Trace viewers draw each thread as a stack of properly nested slices;
+    concurrent children of one parent (batch fan-out) overlap, so each is
+    moved to the first lane where it fits.
+    """
+    lanes: List[List[int]] = []  # stacks of open span end times
+    assignment: Dict[int, int] = {}
+    for span in sorted(spans, key=lambda s: (s.start_ns, -(s.end_ns or s.start_ns))):
+        end = span.end_ns or span.start_ns
+        for lane_index, stack in enumerate(lanes):
+            while stack and stack[-1] <= span.start_ns:
+                stack.pop()
+            if not stack or stack[-1] >= end:
+                stack.append(end)
+                assignment[span.span_id] = lane_index
+                break
+        else:
+            lanes.append([end])
+            assignment[span.span_id] = len(lanes) - 1
+    return assignment
+
+
+def to_chrome_trace(spans: List[Span]) -> Dict[str, Any]:
+    """
+    Convert spans to the Chrome trace event format.
+
+    Each trace becomes a process named after its request ID and root span;
+    lanes within it keep concurrent spans from overlapping.
+
+    Args:
+        spans: Finished spans
+
+    Returns:
+        Dict: Chrome trace JSON document
+    """
+    traces: Dict[int, List[Span]] = {}
+    for span in spans:
+        traces.setdefault(span.trace_id, []).append(span)
+
+    events: List[Dict[str, Any]] = []
+    for pid, (trace_id, trace_spans) in enumerate(traces.items(), start=1):
+        roots = [span for span in trace_spans if span.parent_id is None]
+        root = roots[0] if roots else trace_spans[0]
+        events.append(
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {
+                    "name": f"{root.request_id or format_trace_id(trace_id)} {root.name}"
+                },
+            }
+        )
+        lanes = _assign_lanes(trace_spans)
+        for span in trace_spans:
+            args = {
+                "span_id": format_span_id(span.span_id),
+                "parent_id": format_span_id(span.parent_id),
+                "request_id": span.request_id,
+                **span.attributes,
+            }
+            if span.error:
+                args["error"] = span.error
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.kind,
+                    "ph": "X",
+                    "ts": span.start_ns / 1000,
+                    "dur": ((span.end_ns or span.start_ns) - span.start_ns) / 1000,
+                    "pid": pid,
+                    "tid": lanes[span.span_id],
+                    "args": args,
+                }
+            )
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"key": key, "value": _otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def to_otlp_json(spans: List[Span]) -> Dict[str, Any]:
+    """
+    Convert spans to the OTLP/JSON trace format.
+
+    Args:
+        spans: Finished spans
+
+    Returns:
+        Dict: ExportTraceServiceRequest JSON document
+    """
+    otlp_spans = []
+    for span in spans:
+        attributes = dict(span.attributes)
+        attributes["request_id"] = span.request_id
+        otlp_span = {
+            "traceId": format_trace_id(span.trace_id),
+            "spanId": format_span_id(span.span_id),
+            "name": span.name,
+            "kind": _SPAN_KINDS.get(span.kind, 1),
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns or span.start_ns),
+            "attributes": _otlp_attributes(attributes),
+            "status": (
+                {"code": 2, "message": span.error} if span.error else {"code": 1}
+            ),
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = format_span_id(span.parent_id)
+        otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes(
+                        {"service.name": SERVICE_NAME, "process.pid": os.getpid()}
+                    )
+                },
+                "scopeSpans": [
+                    {"scope": {"name": "checkmk_mcp_server"}, "spans": otlp_spans}
+                ],
+            }
+        ]
+    }
+
+
+# Global recorder instance
+_span_recorder = SpanRecorder()
+
+
+def get_span_recorder() -> SpanRecorder:
+    """Get the global span recorder."""
+    return _span_recorder
+
+
+def get_current_span() -> Optional[Span]:
+    """Get the innermost open span of the current context."""
+    return _CURRENT_SPAN.get()
+
+
+def start_span(
+    name: str, kind: str = "internal", **attributes: Any
+) -> Tuple[Optional[Span], Optional[Token]]:
+    """
+    Open a span as a child of the current span.
+
+    Prefer the span() context manager; this pair exists for code that
+    already has its own try/finally around the operation.
+
+    Args:
+        name: Operation name
+        kind: Span kind ("internal", "server" or "client")
+        **attributes: Initial attributes
+
+    Returns:
+        Tuple of the span and the context token to pass to end_span
+        (both None while tracing is disabled)
+    """
+    if not _span_recorder.enabled:
+        return None, None
+    span = Span(name, _CURRENT_SPAN.get(), kind, attributes)
+    return span, _CURRENT_SPAN.set(span)
+
+
+def end_span(
+    span: Optional[Span],
+    token: Optional[Token],
+    error: Optional[Union[BaseException, str]] = None,
+) -> None:
+    """Close a span opened with start_span and record it."""
+    if span is None:
+        return
+    span.finish(error)
+    if token is not None:
+        _CURRENT_SPAN.reset(token)
+    _span_recorder.record(span)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Any]:
+    """Trace a block as a span.
+
+    Args:
+        name: Operation name
+        kind: Span kind ("internal", "server" or "client")
+        **attributes: Initial attributes
+
+    Yields:
+        The open span (attributes can be added while it runs)
+
+    Examples:
+        with span("fetch_dashboard", host_count=len(hosts)) as s:
+            data = await fetch()
+            s.set_attribute("services", len(data))
+    """
+    current, token = start_span(name, kind, **attributes)
+    if current is None:
+        yield _NOOP_SPAN
+        return
+    error: Optional[BaseException] = None
+    try:
+        yield current
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        end_span(current, token, error)
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable[[F], F]:
+    """Decorator tracing each call of a sync or async function as a span.
+
+    Args:
+        name: Span name (defaults to the function's qualified name)
+        **attributes: Attributes added to every span
+    """
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore
+
+        @wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+
+        return sync_wrapper  # type: ignore
+
+    return decorator
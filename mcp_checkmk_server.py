@@ -12,7 +12,13 @@ This script starts the Checkmk MCP server with advanced features:
 Usage:
     python mcp_checkmk_server.py [--config CONFIG_FILE] [--log-level LEVEL]
 
-The server will run on stdio by default for MCP client integration.
+The server will run on stdio by default for MCP client integration. To
+share one warm server between many clients, serve it over HTTP instead:
+
+    python mcp_checkmk_server.py --transport http --port 8765
+
+Clients then connect to http://127.0.0.1:8765/mcp (streamable HTTP) or
+http://127.0.0.1:8765/sse (HTTP+SSE).
 """
 
 import sys
@@ -31,6 +37,7 @@ sys.path.insert(0, str(project_root))
 
 from checkmk_mcp_server.config import load_config
 from checkmk_mcp_server.mcp_server import CheckmkMCPServer
+from checkmk_mcp_server.utils.profiling import get_tool_profiler
 
 
 def _is_client_disconnect_error(exception: Exception) -> bool:
@@ -246,9 +253,27 @@ async def main():
     )
     parser.add_argument(
         "--transport", "-t",
-        choices=["stdio"],
+        choices=["stdio", "http", "sse"],
         default="stdio",
-        help="Transport type for MCP server"
+        help="Transport type for MCP server (http and sse serve many clients "
+        "from one process; both endpoints are always available over HTTP)"
+    )
+    parser.add_argument(
+        "--host",
+        metavar="HOST",
+        help="Bind address for the http/sse transport (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port", "-p",
+        type=int,
+        metavar="PORT",
+        help="Port for the http/sse transport (default: 8765)"
+    )
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        metavar="N",
+        help="Maximum concurrent client sessions for the http/sse transport"
     )
     parser.add_argument(
         "--enable-caching",
@@ -265,6 +290,45 @@ async def main():
         action="store_true",
         help="Enable performance monitoring and metrics collection"
     )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="Serve OpenMetrics at http://127.0.0.1:PORT/metrics"
+    )
+    parser.add_argument(
+        "--detect-loop-stalls",
+        type=float,
+        nargs="?",
+        const=0.1,
+        metavar="SECONDS",
+        help="Log the stack of any callback blocking the event loop longer "
+        "than SECONDS (default: 0.1)"
+    )
+    parser.add_argument(
+        "--profile-tool",
+        metavar="TOOL",
+        help="Profile calls of TOOL ('all' for every tool) and write pstats/flamegraph files"
+    )
+    parser.add_argument(
+        "--profile-calls",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of calls to profile with --profile-tool (default: 1)"
+    )
+    parser.add_argument(
+        "--profile-seconds",
+        type=float,
+        metavar="SECONDS",
+        help="Profile every matching call in the first SECONDS instead of a fixed number of calls"
+    )
+    parser.add_argument(
+        "--profile-mode",
+        choices=["cprofile", "sampling"],
+        default="cprofile",
+        help="Profiler used with --profile-tool (default: cprofile)"
+    )
     parser.add_argument(
         "--force-mcp",
         action="store_true",
@@ -274,7 +338,12 @@ async def main():
     args = parser.parse_args()
     
     # Check if this is being run manually in a terminal
-    if sys.stdin.isatty() and sys.stdout.isatty() and not args.force_mcp:
+    if (
+        args.transport == "stdio"
+        and sys.stdin.isatty()
+        and sys.stdout.isatty()
+        and not args.force_mcp
+    ):
         print("╭─────────────────────────────────────────────────────────────────╮")
         print("│                      Checkmk MCP Server                         │")
         print("╰─────────────────────────────────────────────────────────────────╯")
@@ -302,6 +371,17 @@ async def main():
     try:
         # Load configuration
         config = load_config(args.config)
+        if args.metrics_port is not None:
+            config.metrics.http_enabled = True
+            config.metrics.http_port = args.metrics_port
+        if args.detect_loop_stalls is not None:
+            config.metrics.loop_stall_threshold = args.detect_loop_stalls
+        if args.host is not None:
+            config.transport.host = args.host
+        if args.port is not None:
+            config.transport.port = args.port
+        if args.max_sessions is not None:
+            config.transport.max_sessions = args.max_sessions
         
         logger.info("Starting Checkmk MCP Server...")
         logger.info(f"Checkmk URL: {config.checkmk.server_url}")
@@ -335,6 +415,18 @@ async def main():
         
         await server.initialize()
         
+        if args.profile_tool:
+            capture = get_tool_profiler().arm(
+                tool=None if args.profile_tool == "all" else args.profile_tool,
+                calls=args.profile_calls,
+                duration=args.profile_seconds,
+                mode=args.profile_mode,
+            )
+            logger.info(
+                f"Profiling {args.profile_tool} (session {capture.session_id}), "
+                f"output in {get_tool_profiler().output_dir}"
+            )
+        
         logger.info("MCP Server initialized, starting transport...")
         
         # Ensure stdio streams are properly configured for MCP communication
@@ -12,6 +12,8 @@ from checkmk_mcp_server.services.batch import (
     BatchResult,
     BatchItemStatus,
     BatchOperationsMixin,
+    BatchItemOutcome,
+    STREAM_END,
 )
 
 
@@ -285,6 +287,136 @@ class TestBatchProcessor:
         assert max_concurrent <= 2
 
 
+class TestBatchStreaming:
+    """Test BatchProcessor streaming mode."""
+
+    @pytest.mark.asyncio
+    async def test_process_stream_yields_outcomes(self, batch_processor):
+        """Test streaming yields one outcome per item and keeps only failures."""
+
+        async def operation(item):
+            await asyncio.sleep(0.001)
+            if item == "fail":
+                raise Exception("Simulated failure")
+            return f"processed_{item}"
+
+        stream = batch_processor.process_stream(
+            iter(["a", "fail", "b", "c"]), operation, batch_id="stream_test"
+        )
+        outcomes = [outcome async for outcome in stream]
+
+        assert len(outcomes) == 4
+        assert all(isinstance(o, BatchItemOutcome) for o in outcomes)
+        assert sorted(o.index for o in outcomes) == [0, 1, 2, 3]
+        assert {o.result for o in outcomes if o.succeeded} == {
+            "processed_a",
+            "processed_b",
+            "processed_c",
+        }
+
+        summary = stream.result
+        assert summary.batch_id == "stream_test"
+        assert summary.progress.total_items == 4
+        assert summary.progress.success == 3
+        assert summary.progress.failed == 1
+        assert summary.progress.end_time is not None
+        assert len(summary.failures) == 1
+        assert summary.failures[0].data == "fail"
+        assert summary.failures[0].error == "Simulated failure"
+
+    @pytest.mark.asyncio
+    async def test_process_stream_from_async_iterator_and_queue(self, batch_processor):
+        """Test streaming from async generators and queues."""
+
+        async def operation(item):
+            return item * 2
+
+        async def generate():
+            for i in range(10):
+                yield i
+
+        summary = await batch_processor.process_stream(generate(), operation).drain()
+        assert summary.progress.success == 10
+
+        queue = asyncio.Queue()
+        for i in range(5):
+            queue.put_nowait(i)
+        queue.put_nowait(STREAM_END)
+
+        results = [
+            outcome.result
+            async for outcome in batch_processor.process_stream(queue, operation)
+        ]
+        assert sorted(results) == [0, 2, 4, 6, 8]
+
+    @pytest.mark.asyncio
+    async def test_process_stream_bounded_input_consumption(self):
+        """Test workers only pull a bounded number of items ahead of the consumer."""
+        processor = BatchProcessor(max_concurrent=2, max_retries=1)
+        pulled = 0
+
+        def lazy_items():
+            nonlocal pulled
+            for i in range(10000):
+                pulled += 1
+                yield i
+
+        async def operation(item):
+            return item
+
+        stream = processor.process_stream(lazy_items(), operation, buffer_size=4)
+        consumed = 0
+        async for _ in stream:
+            consumed += 1
+            if consumed == 5:
+                break
+
+        # Only workers + buffers worth of items may have been pulled
+        assert pulled < 50
+
+    @pytest.mark.asyncio
+    async def test_process_stream_failure_cap_and_validation(self):
+        """Test failure retention is capped and skipped items are counted."""
+        processor = BatchProcessor(max_concurrent=3, max_retries=1)
+
+        async def validate(item):
+            if item % 10 == 0:
+                return False, "multiple of ten"
+            return True, None
+
+        async def operation(item):
+            raise ValueError(f"bad {item}")
+
+        summary = await processor.process_stream(
+            range(50), operation, validate_item=validate, max_failures=5
+        ).drain()
+
+        assert summary.progress.skipped == 5
+        assert summary.progress.failed == 45
+        assert len(summary.failures) == 5
+        assert summary.dropped_failures == 40
+        assert all(outcome.status == BatchItemStatus.FAILED for outcome in summary.failures)
+
+    @pytest.mark.asyncio
+    async def test_process_stream_concurrency_limit(self):
+        """Test the worker pool respects max_concurrent."""
+        processor = BatchProcessor(max_concurrent=2)
+        concurrent_count = 0
+        max_seen = 0
+
+        async def tracking_operation(item):
+            nonlocal concurrent_count, max_seen
+            concurrent_count += 1
+            max_seen = max(max_seen, concurrent_count)
+            await asyncio.sleep(0.01)
+            concurrent_count -= 1
+            return item
+
+        await processor.process_stream(range(10), tracking_operation).drain()
+
+        assert max_seen <= 2
+
+
 class TestBatchOperationsMixin:
     """Test BatchOperationsMixin functionality."""
 
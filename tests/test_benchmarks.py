@@ -0,0 +1,397 @@
+"""Tests for the offline benchmarks, load generator and synthetic Checkmk server."""
+
+import json
+
+import pytest
+
+from mcp.types import CallToolResult, TextContent
+
+from benchmarks.e2e import compare_results, main, percentile, run_suite
+from benchmarks.fake_checkmk import (
+    FakeCheckmkServer,
+    Inventory,
+    InventorySpec,
+    matches_query,
+)
+from benchmarks.loadgen import ToolSampler, classify_result, parse_mix, run_loadgen
+from benchmarks.memory import regressions, run_memory_benchmark
+from benchmarks.serialization import run_serialization_benchmark
+from benchmarks.startup import parse_importtime, run_startup_benchmark
+from benchmarks.scraping import (
+    FIXTURE_HOST,
+    FIXTURE_SERVICE,
+    FIXTURE_SITE,
+    ReplayServer,
+    load_fixtures,
+    record_fixtures,
+    run_scrape_benchmark,
+    sanitize,
+)
+from checkmk_mcp_server.api_client import CheckmkAPIError, CheckmkClient
+from checkmk_mcp_server.config import CheckmkConfig
+
+
+@pytest.fixture(scope="module")
+def fake():
+    with FakeCheckmkServer(
+        InventorySpec(hosts=6, services_per_host=12, rules_per_ruleset=3, events=10)
+    ) as fake:
+        yield fake
+
+
+@pytest.fixture
+def client(fake):
+    return CheckmkClient(
+        CheckmkConfig(
+            server_url=fake.url,
+            username="automation",
+            password="secret",
+            site=fake.site,
+            max_retries=0,
+        )
+    )
+
+
+class TestFakeCheckmkServer:
+    """Test the fake server against the real REST client."""
+
+    def test_inventory_size(self, fake):
+        assert len(fake.inventory.hosts) == 6
+        assert len(fake.inventory.services) == 72
+        assert all(len(rules) == 3 for rules in fake.inventory.rules.values())
+
+    def test_inventory_is_deterministic(self):
+        spec = InventorySpec(hosts=3, services_per_host=15, seed=7)
+        first = FakeCheckmkServer(spec)
+        second = FakeCheckmkServer(spec)
+        try:
+            assert first.inventory.rules == second.inventory.rules
+            assert [s["state"] for s in first.inventory.services] == [
+                s["state"] for s in second.inventory.services
+            ]
+        finally:
+            first.stop()
+            second.stop()
+
+    def test_host_endpoints(self, client):
+        hosts = client.list_hosts(effective_attributes=True)
+
+        assert [h["id"] for h in hosts][:2] == ["host00000", "host00001"]
+        assert hosts[0]["extensions"]["effective_attributes"]["site"] == "bench"
+        assert client.get_host("host00001")["extensions"]["folder"] == "/folder1"
+        with pytest.raises(CheckmkAPIError):
+            client.get_host("missing")
+
+    def test_service_columns_and_query(self, client, fake):
+        services = client.list_all_services(
+            query={"op": "!=", "left": "services.state", "right": "0"},
+            columns=["host_name", "description", "state"],
+        )
+
+        expected = [s for s in fake.inventory.services if s["state"] != 0]
+        assert len(services) == len(expected)
+        assert all(set(s["extensions"]) == {"host_name", "description", "state"} for s in services)
+
+    def test_effective_parameters(self, client, fake):
+        host_name = fake.inventory.host_names[0]
+
+        result = client.get_service_effective_parameters(host_name, "CPU load")
+
+        assert result["check_plugin"] == "cpu_loads"
+        assert result["status"] != "not_found"
+
+    def test_stats_and_unrouted_requests(self, client, fake):
+        fake.reset_stats()
+        client.get_version_info()
+        with pytest.raises(CheckmkAPIError):
+            client._make_request("GET", "/objects/nothing/here")
+
+        stats = fake.get_stats()
+        assert stats["routes"] == {"GET /version": 1, "GET <unrouted>": 1}
+        assert stats["bytes_sent"] > 0
+
+    def test_matches_query(self):
+        row = {"state": 2, "description": "Filesystem /data1"}
+
+        assert matches_query(row, {"op": "=", "left": "state", "right": "2"})
+        assert matches_query(
+            row,
+            {
+                "op": "and",
+                "expr": [
+                    {"op": ">=", "left": "services.state", "right": 1},
+                    {"op": "~~", "left": "description", "right": "filesystem"},
+                ],
+            },
+        )
+        assert not matches_query(
+            row, json.dumps({"op": "not", "expr": {"op": "=", "left": "state", "right": 2}})
+        )
+
+
+class TestBenchmarkSuite:
+    """Test the suite runner and result comparison."""
+
+    def test_percentile(self):
+        assert percentile([], 95) == 0.0
+        assert percentile([5.0], 99) == 5.0
+        assert percentile([1, 2, 3, 4], 50) == 2.5
+        assert percentile(list(range(101)), 95) == 95
+
+    @pytest.mark.asyncio
+    async def test_run_suite(self, tmp_path):
+        results = await run_suite(
+            InventorySpec(hosts=4, services_per_host=11, rules_per_ruleset=2, events=5),
+            ["list_hosts", "get_effective_parameters"],
+            iterations=3,
+            warmup=1,
+            concurrency=2,
+            work_dir=tmp_path,
+        )
+
+        assert set(results["scenarios"]) == {"list_hosts", "get_effective_parameters"}
+        list_hosts = results["scenarios"]["list_hosts"]
+        assert list_hosts["failures"] == 0
+        assert list_hosts["latency_ms"]["count"] == 3
+        assert list_hosts["rest_routes"] == {
+            "GET /domain-types/host_config/collections/all": 3
+        }
+        assert list_hosts["throughput"]["calls_per_second"] > 0
+        assert list_hosts["peak_rss_mb"] > 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_scenario(self):
+        with pytest.raises(ValueError):
+            await run_suite(InventorySpec(hosts=1), ["nope"])
+
+    def test_compare_results(self, tmp_path, capsys):
+        baseline = {
+            "scenarios": {
+                "list_hosts": {
+                    "latency_ms": {"p50": 10.0, "p95": 20.0, "p99": 30.0},
+                    "throughput": {"calls_per_second": 100.0},
+                    "peak_rss_mb": 80.0,
+                }
+            }
+        }
+        current = json.loads(json.dumps(baseline))
+        current["scenarios"]["list_hosts"]["latency_ms"]["p95"] = 15.0
+        current["scenarios"]["list_hosts"]["throughput"]["calls_per_second"] = 90.0
+
+        comparison = compare_results(baseline, current)["list_hosts"]
+
+        assert comparison["latency_ms.p95"]["change"] == -0.25
+        assert comparison["latency_ms.p95"]["improved"]
+        assert not comparison["throughput.calls_per_second"]["improved"]
+
+        (tmp_path / "a.json").write_text(json.dumps(baseline))
+        (tmp_path / "b.json").write_text(json.dumps(current))
+        assert main(["--compare", str(tmp_path / "a.json"), str(tmp_path / "b.json")]) == 0
+        assert "latency_ms.p95" in capsys.readouterr().out
+
+
+class TestLoadGenerator:
+    """Test the stdio load generator."""
+
+    def test_parse_mix(self):
+        assert parse_mix("list_hosts=2, get_host") == {"list_hosts": 2.0, "get_host": 1.0}
+        with pytest.raises(ValueError):
+            parse_mix("list_hosts=0")
+        with pytest.raises(ValueError):
+            parse_mix(" , ")
+
+    def test_sampler_is_deterministic(self):
+        inventory = Inventory(InventorySpec(hosts=3, services_per_host=11))
+        mix = {"list_hosts": 1, "get_effective_parameters": 3}
+
+        first = ToolSampler(mix, inventory, seed=1)
+        second = ToolSampler(mix, inventory, seed=1)
+        calls = [first.next_call() for _ in range(20)]
+
+        assert calls == [second.next_call() for _ in range(20)]
+        tool, arguments = next(c for c in calls if c[0] == "get_effective_parameters")
+        assert arguments["host_name"] in inventory.hosts
+
+    def test_classify_result(self):
+        def result(payload, is_error=False):
+            return CallToolResult(
+                content=[TextContent(type="text", text=json.dumps(payload))],
+                isError=is_error,
+            )
+
+        wrapped_failure = {
+            "content": [{"type": "text", "text": json.dumps({"success": False})}],
+            "isError": False,
+        }
+        wrapped_exception = {
+            "content": [{"type": "text", "text": "boom"}],
+            "isError": True,
+        }
+
+        assert classify_result(result({"success": True})) is None
+        assert classify_result(result({"success": False})) == "failed"
+        assert classify_result(result(wrapped_failure)) == "failed"
+        assert classify_result(result(wrapped_exception)) == "tool_error"
+        assert classify_result(result({}, is_error=True)) == "tool_error"
+
+    @pytest.mark.asyncio
+    async def test_run_loadgen(self):
+        results = await run_loadgen(
+            InventorySpec(hosts=4, services_per_host=11, rules_per_ruleset=2, events=5),
+            {"list_hosts": 1, "get_host": 1},
+            concurrency=2,
+            duration=30,
+            max_calls=6,
+            warmup_calls=1,
+        )
+
+        assert results["totals"]["calls"] == 6
+        assert results["totals"]["errors"] == 0
+        assert set(results["scenarios"]) <= {"list_hosts", "get_host"}
+        assert results["server"]["event_loop"]["samples"] >= 0
+
+
+class TestMemoryBenchmark:
+    """Test the per-stage memory benchmark."""
+
+    def test_run_memory_benchmark(self):
+        results = run_memory_benchmark(
+            InventorySpec(hosts=3, services_per_host=11, rules_per_ruleset=20),
+            ["services", "rules"],
+            top=3,
+        )
+
+        services = results["datasets"]["services"]
+        assert services["rows"] == 33
+        assert list(services["stages"]) == [
+            "raw_response",
+            "json_decode",
+            "model_conversion",
+            "list_result",
+            "model_dump",
+            "serialization",
+        ]
+        conversion = services["stages"]["model_conversion"]
+        assert conversion["retained_bytes_per_row"] > 0
+        assert conversion["peak_bytes"] >= conversion["retained_bytes"]
+        assert 0 < len(conversion["top_allocations"]) <= 3
+        assert "benchmarks/memory.py" not in json.dumps(conversion["top_allocations"])
+
+        assert results["datasets"]["rules"]["rows"] == 20
+        assert "rules/normalization" in results["scenarios"]
+
+    def test_regressions(self):
+        comparison = {
+            "services/json_decode": {
+                "peak_bytes_per_row": {"change": 0.25, "improved": False},
+                "retained_bytes_per_row": {"change": 0.05, "improved": False},
+            },
+            "services/serialization": {
+                "peak_bytes_per_row": {"change": -0.5, "improved": True},
+            },
+        }
+
+        assert regressions(comparison, 0.1) == ["services/json_decode peak_bytes_per_row"]
+        assert regressions(comparison, 0.3) == []
+
+
+class TestScrapingBenchmark:
+    """Test the recorded-fixture scraping benchmark."""
+
+    def test_run_scrape_benchmark(self):
+        results = run_scrape_benchmark(load_fixtures(periods=["4h"]), iterations=2, warmup=0)
+
+        period = results["periods"]["4h"]
+        assert period["points"] > 400
+        stages = period["stages"]
+        for stage in ("fetch_page", "parse_html", "graph.parameters", "ajax.parse", "total"):
+            assert stages[stage]["calls"] == 2
+        assert stages["total"]["peak_bytes"] >= stages["ajax.parse"]["peak_bytes"] > 0
+        assert results["requests"]["POST ajax_render_graph_content.py"] == 3
+        assert "4h/ajax.parse" in results["scenarios"]
+
+    def test_sanitize(self):
+        text = (
+            '<a href="view.py?site=prod&host=db01.corp&service=Disk+IO+db01.corp">'
+            "Disk IO db01.corp</a>"
+            '<input type="hidden" name="_csrf_token" value="abc123">'
+            '{"site_id": "prod", "url": "https://mon.corp:8443/prod/check_mk/"}'
+        )
+
+        clean = sanitize(text, "db01.corp", "Disk IO db01.corp", "prod", "https://mon.corp:8443")
+
+        assert "db01" not in clean and "prod" not in clean and "abc123" not in clean
+        assert f"host={FIXTURE_HOST}" in clean
+        assert FIXTURE_SERVICE in clean
+        assert f'"site_id": "{FIXTURE_SITE}"' in clean
+        assert "https://checkmk.example.com/bench/check_mk/" in clean
+
+    def test_record_fixtures(self, tmp_path):
+        fixtures = load_fixtures(periods=["25h"])
+        with ReplayServer(fixtures) as replay:
+            written = record_fixtures(
+                CheckmkConfig(
+                    server_url=replay.url,
+                    username="automation",
+                    password="secret",
+                    site=replay.site,
+                    max_retries=0,
+                ),
+                FIXTURE_HOST,
+                FIXTURE_SERVICE,
+                ["25h"],
+                tmp_path,
+            )
+
+        assert sorted(p.name for p in written) == ["ajax_25h.json", "view_25h.html"]
+        assert load_fixtures(tmp_path, ["25h"]) == fixtures
+
+
+class TestSerializationBenchmark:
+    """Test the JSON backend benchmark."""
+
+    def test_run_serialization_benchmark(self):
+        results = run_serialization_benchmark(
+            services=50, hosts=20, iterations=2, warmup=0, backends=["legacy", "stdlib"]
+        )
+
+        scenarios = results["scenarios"]
+        assert set(scenarios) == {
+            f"{payload}/{backend}"
+            for payload in ("service_list", "service_list_result", "dashboard", "dashboard_result")
+            for backend in ("legacy", "stdlib")
+        } | {"service_list/model_dump_json", "dashboard/model_dump_json"}
+        assert scenarios["service_list/legacy"]["latency_ms"]["count"] == 2
+        # Compact output is smaller than the legacy encoding
+        assert scenarios["service_list/stdlib"]["bytes"] < scenarios["service_list/legacy"]["bytes"]
+
+
+class TestStartupBenchmark:
+    """Test the startup benchmark."""
+
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   json.decoder\n"
+            "import time:       300 |        420 | json\n"
+        )
+
+        assert parse_importtime(output) == [
+            {"module": "json.decoder", "depth": 1, "self_ms": 0.12, "cumulative_ms": 0.12},
+            {"module": "json", "depth": 0, "self_ms": 0.3, "cumulative_ms": 0.42},
+        ]
+
+    def test_run_startup_benchmark(self):
+        results = run_startup_benchmark(runs=1, top=3)
+
+        imports = results["scenarios"]["imports"]
+        assert imports["import_ms"] > 0
+        assert len(imports["slowest_cumulative"]) == 3
+
+        spawn = results["scenarios"]["spawn"]
+        assert spawn["tools"] > 0
+        assert spawn["first_list_tools_ms"]["count"] == 1
+        assert spawn["first_list_tools_ms"]["p50"] >= spawn["imports_done_ms"]["p50"]
+        # Scraping, streaming and batch jobs load on first use only
+        assert spawn["loaded_heavy_modules"] == []
+        assert "historical_service" not in spawn["created_services"]
@@ -0,0 +1,199 @@
+"""Tests for the bulk host write planner."""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from checkmk_mcp_server.api_client import CheckmkAPIError
+from checkmk_mcp_server.async_api_client import AsyncCheckmkClient
+from checkmk_mcp_server.services.bulk import (
+    BulkOperation,
+    BulkWritePlanner,
+    normalize_create_entry,
+    normalize_update_entry,
+)
+from checkmk_mcp_server.services.host_service import HostService
+
+
+def make_client(bad_hosts=(), error_status=400):
+    """Create a client whose bulk calls reject chunks containing bad hosts."""
+    client = Mock(spec=AsyncCheckmkClient)
+
+    async def bulk_create(entries):
+        names = [entry["host_name"] for entry in entries]
+        if any(name in bad_hosts for name in names):
+            raise CheckmkAPIError("Host already exists", status_code=error_status)
+        return {
+            "value": [
+                {
+                    "id": name,
+                    "extensions": {"folder": "/", "attributes": {}},
+                }
+                for name in names
+            ]
+        }
+
+    async def bulk_delete(names):
+        if any(name in bad_hosts for name in names):
+            raise CheckmkAPIError("Host not found", status_code=404)
+        return {}
+
+    client.bulk_create_hosts = AsyncMock(side_effect=bulk_create)
+    client.bulk_delete_hosts = AsyncMock(side_effect=bulk_delete)
+    client.bulk_update_hosts = AsyncMock(return_value={})
+    return client
+
+
+class TestNormalization:
+    """Test input normalization."""
+
+    def test_create_entry(self):
+        entry = normalize_create_entry(
+            {"name": "web01", "folder": "web/", "ip_address": "10.0.0.1", "alias": "Web"}
+        )
+        assert entry == {
+            "host_name": "web01",
+            "folder": "/web",
+            "attributes": {"ipaddress": "10.0.0.1", "alias": "Web"},
+        }
+
+    def test_update_entry(self):
+        entry = normalize_update_entry(
+            {"host_name": "web01", "ip_address": "10.0.0.2", "remove_attributes": ["alias"]}
+        )
+        assert entry == {
+            "host_name": "web01",
+            "remove_attributes": ["alias"],
+            "update_attributes": {"ipaddress": "10.0.0.2"},
+        }
+
+
+class TestBulkWritePlanner:
+    """Test chunking, bisection and per-host results."""
+
+    def test_plan_chunks(self):
+        planner = BulkWritePlanner(Mock(), chunk_size=3)
+        assert planner.plan(list(range(7))) == [[0, 1, 2], [3, 4, 5], [6]]
+        assert planner.plan(list(range(4)), chunk_size=2) == [[0, 1], [2, 3]]
+
+    @pytest.mark.asyncio
+    async def test_create_in_chunks(self):
+        client = make_client()
+        planner = BulkWritePlanner(client, chunk_size=4)
+        hosts = [{"host_name": f"host{i:02d}"} for i in range(10)]
+
+        result = await planner.create_hosts(hosts)
+
+        assert result.operation == BulkOperation.CREATE
+        assert client.bulk_create_hosts.await_count == 3
+        assert result.requests_made == 3
+        assert len(result.succeeded) == 10
+        assert result.results[0].data["id"] == "host00"
+
+    @pytest.mark.asyncio
+    async def test_bisects_to_isolate_bad_entries(self):
+        client = make_client(bad_hosts={"host05", "host12"})
+        planner = BulkWritePlanner(client, chunk_size=16)
+        hosts = [{"host_name": f"host{i:02d}"} for i in range(16)]
+
+        result = await planner.create_hosts(hosts)
+
+        assert [r.host_name for r in result.failed] == ["host05", "host12"]
+        assert all("already exists" in r.error for r in result.failed)
+        assert len(result.succeeded) == 14
+        # Far fewer requests than one per host
+        assert result.requests_made < 16
+        assert result.bisections > 0
+        # Results keep input order
+        assert [r.host_name for r in result.results] == [h["host_name"] for h in hosts]
+
+    @pytest.mark.asyncio
+    async def test_request_level_errors_are_not_bisected(self):
+        client = make_client(bad_hosts={"host01"}, error_status=503)
+        planner = BulkWritePlanner(client, chunk_size=8)
+        hosts = [{"host_name": f"host{i:02d}"} for i in range(8)]
+
+        result = await planner.create_hosts(hosts)
+
+        assert result.requests_made == 1
+        assert len(result.failed) == 8
+
+    @pytest.mark.asyncio
+    async def test_invalid_and_duplicate_entries_fail_locally(self):
+        client = make_client()
+        planner = BulkWritePlanner(client)
+
+        result = await planner.create_hosts(
+            [{"host_name": "good"}, {"host_name": "bad name!"}, {"host_name": "good"}]
+        )
+
+        assert [r.success for r in result.results] == [True, False, False]
+        assert "Duplicate" in result.results[2].error
+        sent = client.bulk_create_hosts.await_args.args[0]
+        assert [entry["host_name"] for entry in sent] == ["good"]
+
+    @pytest.mark.asyncio
+    async def test_progress_callback_per_chunk(self):
+        client = make_client(bad_hosts={"host03"})
+        planner = BulkWritePlanner(client, chunk_size=2)
+        hosts = [{"host_name": f"host{i:02d}"} for i in range(5)] + [{"host_name": "bad name!"}]
+        reports = []
+
+        async def on_progress(progress, chunk_results):
+            reports.append(
+                (progress.completed, progress.failed, [r.host_name for r in chunk_results])
+            )
+
+        await planner.create_hosts(hosts, progress_callback=on_progress)
+
+        # The locally rejected entry counts as failed from the first report on
+        assert reports == [
+            (3, 1, ["host00", "host01"]),
+            (5, 2, ["host02", "host03"]),
+            (6, 2, ["host04"]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_delete_and_update(self):
+        client = make_client(bad_hosts={"gone"})
+        planner = BulkWritePlanner(client, chunk_size=10)
+
+        deleted = await planner.delete_hosts(["a", "gone", "b"])
+        assert [r.success for r in deleted.results] == [True, False, True]
+
+        updated = await planner.update_hosts(
+            [{"host_name": "a", "update_attributes": {"alias": "A"}}, {"host_name": "b"}]
+        )
+        assert [r.success for r in updated.results] == [True, False]
+        client.bulk_update_hosts.assert_awaited_once_with(
+            [{"host_name": "a", "update_attributes": {"alias": "A"}}]
+        )
+
+
+class TestHostServiceBulk:
+    """Test HostService bulk operations built on the planner."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_hosts(self):
+        client = make_client(bad_hosts={"dup"})
+        service = HostService(client, Mock())
+
+        result = await service.bulk_create_hosts(
+            [{"name": "web01", "folder": "/web"}, {"host_name": "dup"}], chunk_size=2
+        )
+
+        assert result.success
+        assert result.data.success_count == 1
+        assert len(result.data.failed_hosts) == 1
+        assert result.data.failed_hosts[0]["name"] == "dup"
+        assert "Host already exists" in result.data.failed_hosts[0]["error"]
+        assert result.data.created_hosts[0].name == "web01"
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_hosts(self):
+        service = HostService(make_client(), Mock())
+
+        result = await service.bulk_delete_hosts(["a", "b"])
+
+        assert result.success
+        assert result.data.deleted_hosts == ["a", "b"]
@@ -0,0 +1,152 @@
+"""Tests for per-call latency breakdowns."""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from checkmk_mcp_server.async_api_client import AsyncCheckmkClient
+from checkmk_mcp_server.mcp_server.handlers.registry import ToolRegistry
+from checkmk_mcp_server.services.metrics import get_metrics_collector
+from checkmk_mcp_server.utils.call_breakdown import (
+    CallBreakdown,
+    clear_breakdown,
+    get_current_breakdown,
+    phase,
+    record_rest_call,
+    start_breakdown,
+    timed_phase,
+)
+
+
+@timed_phase("model_conversion")
+def convert(value):
+    time.sleep(0.005)
+    return value * 2
+
+
+class TestCallBreakdown:
+    """Test breakdown bookkeeping."""
+
+    def teardown_method(self):
+        clear_breakdown()
+
+    def test_helpers_are_noops_without_breakdown(self):
+        assert get_current_breakdown() is None
+        with phase("validation"):
+            pass
+        record_rest_call("GET", "/version", 0.1)
+        assert convert(2) == 4
+
+    def test_phases_and_rest_calls(self):
+        breakdown = start_breakdown("req_1", "list_hosts")
+        with phase("handler"):
+            record_rest_call("GET", "/objects/host_config/{id}", 0.002)
+            record_rest_call("GET", "/objects/host_config/{id}", 0.004)
+            convert(1)
+            time.sleep(0.01)
+        breakdown.finish()
+
+        data = breakdown.to_dict()
+        assert data["request_id"] == "req_1"
+        assert data["phases_ms"]["model_conversion"] >= 5
+        assert data["phases_ms"]["rest"] == 6
+        assert data["phases_ms"]["handler_other"] > 0
+        assert data["rest_calls"] == [
+            {
+                "endpoint": "GET /objects/host_config/{id}",
+                "count": 2,
+                "total_ms": 6.0,
+                "max_ms": 4.0,
+            }
+        ]
+
+    def test_handler_other_is_clamped(self):
+        breakdown = CallBreakdown("req_2", "batch")
+        breakdown.add_phase("handler", 0.01)
+        breakdown.add_rest_call("GET", "/version", 0.05)
+
+        assert breakdown.to_dict()["phases_ms"]["handler_other"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rest_calls_in_executor_are_attributed(self):
+        sync_client = Mock()
+
+        def get_version():
+            record_rest_call("GET", "/version", 0.003)
+            return {"versions": {}}
+
+        sync_client.get_version_info = get_version
+        breakdown = start_breakdown("req_3", "get_version")
+
+        await AsyncCheckmkClient(sync_client).get_version_info()
+
+        assert breakdown.rest_calls["GET /version"]["count"] == 1
+
+
+class TestToolRegistryBreakdown:
+    """Test breakdowns recorded by tool calls."""
+
+    @pytest.mark.asyncio
+    async def test_call_records_phases(self):
+        registry = ToolRegistry(include_breakdown_in_meta=True)
+
+        async def handler(host_name: str):
+            record_rest_call("GET", "/objects/host_config/{id}", 0.001)
+            return {"success": True, "data": {"host_name": host_name}}
+
+        registry.register_tool("get_host", Mock(), handler)
+        result = await registry.execute_tool_call(
+            "get_host", {"host_name": "web01"}, lambda: True
+        )
+
+        assert result["isError"] is False
+        breakdown = result["meta"]["breakdown"]
+        assert breakdown["tool"] == "get_host"
+        assert {"validation", "handler", "serialization", "rest"} <= set(
+            breakdown["phases_ms"]
+        )
+        assert breakdown["response_bytes"] == len(result["content"][0]["text"])
+        assert registry.get_call_breakdown(result["meta"]["request_id"]) is not None
+        assert get_current_breakdown() is None
+
+        collector = get_metrics_collector()
+        assert collector.get_histogram(
+            "mcp.tool_phase", tool="get_host", phase="serialization"
+        ).count >= 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments_fail_validation(self):
+        registry = ToolRegistry()
+        handler_called = False
+
+        async def handler(host_name: str):
+            nonlocal handler_called
+            handler_called = True
+
+        registry.register_tool("get_host", Mock(), handler)
+        result = await registry.execute_tool_call(
+            "get_host", {"unknown": 1}, lambda: True
+        )
+
+        assert result["isError"] is True
+        assert not handler_called
+        assert "breakdown" not in result["meta"]
+
+    @pytest.mark.asyncio
+    async def test_retains_recent_breakdowns(self):
+        registry = ToolRegistry(max_breakdowns=2)
+
+        async def handler():
+            return {"success": True}
+
+        registry.register_tool("ping", Mock(), handler)
+        request_ids = [
+            (await registry.execute_tool_call("ping", {}, lambda: True))["meta"][
+                "request_id"
+            ]
+            for _ in range(3)
+        ]
+
+        assert registry.get_call_breakdown(request_ids[0]) is None
+        assert registry.get_call_breakdown(request_ids[2]) is not None
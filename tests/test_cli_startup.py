@@ -0,0 +1,131 @@
+"""Tests for CLI startup: deferred imports and import-time profiling."""
+
+import subprocess
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from checkmk_mcp_server.cli import CLIContext, LazyGroup, cli
+from checkmk_mcp_server.utils.startup import (
+    build_import_tree,
+    format_import_tree,
+    parse_importtime,
+)
+
+
+IMPORTTIME_OUTPUT = (
+    "import time: self [us] | cumulative | imported package\n"
+    "import time:       100 |        100 |     json.scanner\n"
+    "import time:       200 |        300 |   json.decoder\n"
+    "import time:       500 |        500 |   json.encoder\n"
+    "import time:       300 |       1100 | json\n"
+    "import time:      2000 |       2000 | yaml\n"
+)
+
+
+class TestLazyGroup:
+    """Test subcommands imported on first use."""
+
+    def test_lazy_command_loaded_by_name(self):
+        group = LazyGroup(lazy_subcommands={"direct": "checkmk_mcp_server.cli:cli"})
+
+        assert group.list_commands(None) == ["direct"]
+        assert "direct" not in group.commands
+        assert group.get_command(None, "direct") is cli
+        assert "direct" in group.commands
+
+    def test_historical_not_imported_until_invoked(self):
+        code = (
+            "import sys; import checkmk_mcp_server.cli as c; "
+            "print('checkmk_mcp_server.commands.historical_commands' in sys.modules, "
+            "'openai' in sys.modules, 'anthropic' in sys.modules, "
+            "isinstance(c.cli.get_command(None, 'historical'), c.click.Group))"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert completed.stdout.split() == ["False", "False", "False", "True"]
+
+    def test_missing_module_hides_command(self):
+        group = LazyGroup(lazy_subcommands={"gone": "nonexistent_module_xyz:cmd"})
+
+        assert group.get_command(None, "gone") is None
+
+
+class TestCLIContext:
+    """Test LLM objects created on first access."""
+
+    def make_context(self):
+        return CLIContext(checkmk_client=Mock(), config=Mock())
+
+    def test_llm_objects_created_on_first_access(self):
+        obj = self.make_context()
+        llm_client = Mock()
+
+        with patch(
+            "checkmk_mcp_server.llm_client.create_llm_client", return_value=llm_client
+        ) as create:
+            assert "llm_client" not in obj
+            host_manager = obj.get("host_manager")
+            assert obj["llm_client"] is llm_client
+            assert obj["service_manager"] is not None
+            assert obj.get("host_manager") is host_manager
+
+        create.assert_called_once()
+
+    def test_llm_failure_gives_none(self):
+        obj = self.make_context()
+
+        with patch(
+            "checkmk_mcp_server.llm_client.create_llm_client",
+            side_effect=ValueError("no API key"),
+        ):
+            assert obj["llm_client"] is None
+            assert obj.get("host_manager") is None
+            assert obj["service_manager"] is None
+
+    def test_other_keys_behave_like_dict(self):
+        obj = self.make_context()
+
+        assert obj.get("request_id", "default") == "default"
+        with pytest.raises(KeyError):
+            obj["request_id"]
+
+
+class TestImportTree:
+    """Test the --profile-startup import tree."""
+
+    def test_tree_nests_imports_under_importer(self):
+        tree = build_import_tree(parse_importtime(IMPORTTIME_OUTPUT))
+
+        assert [node["module"] for node in tree] == ["json", "yaml"]
+        json_node = tree[0]
+        assert [child["module"] for child in json_node["children"]] == [
+            "json.decoder",
+            "json.encoder",
+        ]
+        assert json_node["children"][0]["children"][0]["module"] == "json.scanner"
+
+    def test_format_sorts_and_hides_cheap_imports(self):
+        tree = build_import_tree(parse_importtime(IMPORTTIME_OUTPUT))
+
+        lines = format_import_tree(tree, min_ms=0.25).splitlines()
+
+        modules = [line.split("ms  ")[-1] for line in lines[1:]]
+        assert modules == ["yaml", "json", "  json.encoder", "  json.decoder"]
+
+    def test_flag_reruns_command_without_flag(self):
+        runner = CliRunner()
+
+        with patch(
+            "checkmk_mcp_server.utils.startup.profile_startup", return_value=0
+        ) as profile, patch.object(
+            sys, "argv", ["checkmk-mcp-server", "--profile-startup", "test"]
+        ):
+            result = runner.invoke(cli, ["--profile-startup", "test"])
+
+        assert result.exit_code == 0
+        profile.assert_called_once_with("checkmk_mcp_server.cli", ["test"])
@@ -0,0 +1,215 @@
+"""Tests for adaptive (AIMD) concurrency control."""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from checkmk_mcp_server.api_client import CheckmkAPIError
+from checkmk_mcp_server.async_api_client import AsyncCheckmkClient
+from checkmk_mcp_server.services.base import BaseService
+from checkmk_mcp_server.services.batch import BatchProcessor
+from checkmk_mcp_server.services.concurrency import (
+    AdaptiveConcurrencyController,
+    get_all_concurrency_stats,
+    is_overload_error,
+)
+from checkmk_mcp_server.services.metrics import MetricsCollector
+
+
+class TestOverloadClassification:
+    """Test which errors count as overload signals."""
+
+    def test_overload_errors(self):
+        assert is_overload_error(asyncio.TimeoutError())
+        assert is_overload_error(CheckmkAPIError("busy", status_code=429))
+        assert is_overload_error(CheckmkAPIError("gateway", status_code=503))
+
+    def test_wrapped_transport_timeout(self):
+        try:
+            try:
+                raise requests.exceptions.Timeout("read timed out")
+            except requests.exceptions.Timeout:
+                raise CheckmkAPIError("Request timeout after 30s")
+        except CheckmkAPIError as e:
+            assert is_overload_error(e)
+
+    def test_client_errors_are_not_overload(self):
+        assert not is_overload_error(CheckmkAPIError("exists", status_code=400))
+        assert not is_overload_error(ValueError("bad input"))
+
+
+class TestAdaptiveConcurrencyController:
+    """Test AIMD limit adjustments."""
+
+    def test_additive_increase_when_fast(self):
+        controller = AdaptiveConcurrencyController(
+            initial_limit=2, max_limit=5, target_latency=1.0
+        )
+
+        # Roughly one extra slot per window of `limit` fast calls
+        for _ in range(3):
+            controller.record(0.1)
+        assert controller.limit == 3
+
+        for _ in range(100):
+            controller.record(0.1)
+        assert controller.limit == 5  # Capped at max_limit
+
+    def test_multiplicative_decrease_on_overload(self):
+        controller = AdaptiveConcurrencyController(
+            initial_limit=16, min_limit=2, max_limit=32, target_latency=1.0
+        )
+
+        controller.record(0.1, CheckmkAPIError("busy", status_code=429))
+        assert controller.limit == 8
+
+        # Failures from calls started before the decrease are ignored
+        controller.record(0.1, asyncio.TimeoutError(), started=0.0)
+        assert controller.limit == 8
+
+    def test_latency_spike_decreases_and_minimum_is_kept(self):
+        controller = AdaptiveConcurrencyController(
+            initial_limit=2, min_limit=1, max_limit=10, target_latency=0.1
+        )
+
+        controller.record(0.5)
+        assert controller.limit == 1
+        controller.record(0.5)
+        assert controller.limit == 1
+        assert controller.decreases == 1
+
+    def test_non_overload_errors_hold_limit(self):
+        controller = AdaptiveConcurrencyController(initial_limit=4, max_limit=8)
+
+        for _ in range(10):
+            controller.record(0.01, ValueError("bad item"))
+        assert controller.limit == 4
+
+    def test_backoff_delay(self):
+        controller = AdaptiveConcurrencyController(
+            initial_limit=4, min_limit=1, max_limit=4, target_latency=1.0
+        )
+        controller.record(0.2)
+        assert controller.backoff_delay() == 0.0
+
+        controller.record(5.0)  # Spike halves the limit
+        assert controller.backoff_delay() > 0
+
+    @pytest.mark.asyncio
+    async def test_slot_enforces_limit(self):
+        controller = AdaptiveConcurrencyController(
+            initial_limit=3, max_limit=3, target_latency=10.0
+        )
+        active = 0
+        peak = 0
+
+        async def call():
+            nonlocal active, peak
+            async with controller.slot():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(call() for _ in range(20)))
+
+        assert peak == 3
+        assert controller.in_flight == 0
+        assert controller.completed == 20
+
+    @pytest.mark.asyncio
+    async def test_slot_records_errors(self):
+        controller = AdaptiveConcurrencyController(initial_limit=4, max_limit=4)
+
+        with pytest.raises(CheckmkAPIError):
+            async with controller.slot():
+                raise CheckmkAPIError("unavailable", status_code=503)
+
+        assert controller.limit == 2
+        assert controller.overloads == 1
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        controller = AdaptiveConcurrencyController(initial_limit=1, max_limit=1)
+        started = await controller.acquire()
+
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        controller.release(started)
+        assert controller.in_flight == 0
+        assert controller.get_stats()["waiting"] == 0
+
+
+class TestConcurrencyIntegration:
+    """Test the controller as used by batch processing and services."""
+
+    @pytest.mark.asyncio
+    async def test_batch_processor_backs_off_on_overload(self):
+        processor = BatchProcessor(max_concurrent=8, max_retries=1)
+
+        async def operation(item):
+            raise CheckmkAPIError("too many requests", status_code=429)
+
+        result = await processor.process_batch(list(range(8)), operation)
+
+        assert result.progress.failed == 8
+        assert processor.concurrency.limit < 8
+        assert result.metadata["concurrency_limit"] == processor.concurrency.limit
+
+    @pytest.mark.asyncio
+    async def test_batch_processor_grows_up_to_ceiling(self):
+        processor = BatchProcessor(max_concurrent=2, concurrency_ceiling=6)
+        active = 0
+        peak = 0
+
+        async def operation(item):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.001)
+            active -= 1
+            return item
+
+        await processor.process_stream(range(200), operation).drain()
+
+        assert 2 < processor.concurrency.limit <= 6
+        assert 2 < peak <= 6
+        assert BatchProcessor(max_concurrent=4).concurrency.max_limit == 4
+
+    @pytest.mark.asyncio
+    async def test_execute_batch_operation_uses_adaptive_limit(self):
+        service = BaseService(Mock(spec=AsyncCheckmkClient), Mock())
+        service.batch_concurrency.max_limit = 3
+        service.batch_concurrency._limit = 3.0
+        active = 0
+        peak = 0
+
+        async def operation(item):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return item * 2
+
+        results = await service._execute_batch_operation(list(range(10)), operation)
+
+        assert [r.data for r in results] == [i * 2 for i in range(10)]
+        assert peak <= 3
+
+    @pytest.mark.asyncio
+    async def test_limits_visible_in_metrics(self):
+        processor = BatchProcessor(max_concurrent=4)
+        processor.concurrency.name = "test_metrics_visibility"
+
+        stats = await MetricsCollector().get_stats()
+
+        assert stats["concurrency"]["test_metrics_visibility"]["limit"] == 4
+        assert "test_metrics_visibility" in get_all_concurrency_stats()
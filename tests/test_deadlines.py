@@ -0,0 +1,252 @@
+"""Tests for end-to-end deadlines and cancellation of tool calls."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from mcp.types import Tool
+
+from checkmk_mcp_server.api_client import CheckmkClient
+from checkmk_mcp_server.async_api_client import run_blocking
+from checkmk_mcp_server.common import retry_on_failure
+from checkmk_mcp_server.config import CheckmkConfig, DeadlineConfig
+from checkmk_mcp_server.mcp_server.handlers.registry import ToolRegistry
+from checkmk_mcp_server.mcp_server.tools.advanced.tools import AdvancedTools
+from checkmk_mcp_server.mcp_server.tools.host.tools import HostTools
+from checkmk_mcp_server.services.batch import BatchProcessor
+from checkmk_mcp_server.utils.request_context import (
+    DeadlineExceeded,
+    RequestCancelled,
+    check_deadline,
+    deadline_scope,
+    get_request_context,
+    interruptible_sleep,
+    remaining_time,
+)
+
+
+@pytest.fixture
+def client():
+    config = CheckmkConfig(
+        server_url="https://test-checkmk.com",
+        username="user",
+        password="pass",
+        site="site",
+        request_timeout=30,
+    )
+    return CheckmkClient(config)
+
+
+def ok_response():
+    response = Mock()
+    response.status_code = 200
+    response.content = b"{}"
+    response.json.return_value = {"value": []}
+    return response
+
+
+class TestDeadlineScope:
+    """Test deadlines carried in the request context."""
+
+    def test_no_deadline_by_default(self):
+        assert remaining_time() is None
+        check_deadline()
+        assert get_request_context()["remaining_time"] is None
+
+    def test_nested_scope_only_shortens(self):
+        with deadline_scope(10):
+            with deadline_scope(60):
+                assert remaining_time() <= 10
+            with deadline_scope(1):
+                assert remaining_time() <= 1
+            with deadline_scope(None):
+                assert 1 < remaining_time() <= 10
+        assert remaining_time() is None
+
+    def test_check_raises_once_spent(self):
+        with deadline_scope(0.01):
+            time.sleep(0.02)
+            assert remaining_time() == 0
+            with pytest.raises(DeadlineExceeded):
+                check_deadline("GET /version")
+
+
+class TestOutboundRequests:
+    """Test that API requests use the remaining budget."""
+
+    def test_timeout_bounded_by_deadline(self, client):
+        with patch.object(
+            client.session, "request", return_value=ok_response()
+        ) as request:
+            client._make_request("GET", "/version")
+            assert request.call_args.kwargs["timeout"] == 30
+
+            with deadline_scope(2):
+                client._make_request("GET", "/version")
+            assert request.call_args.kwargs["timeout"] <= 2
+
+    def test_not_sent_after_deadline(self, client):
+        with patch.object(client.session, "request") as request:
+            with deadline_scope(0.01):
+                time.sleep(0.02)
+                with pytest.raises(DeadlineExceeded):
+                    client._make_request("GET", "/version")
+
+        request.assert_not_called()
+
+    def test_retries_stop_when_budget_is_spent(self):
+        attempts = []
+
+        @retry_on_failure(max_retries=3, delay=1.0)
+        def flaky():
+            attempts.append(1)
+            raise ConnectionError("reset")
+
+        started = time.monotonic()
+        with deadline_scope(0.5):
+            with pytest.raises(ConnectionError):
+                flaky()
+
+        assert len(attempts) == 1
+        assert time.monotonic() - started < 0.5
+
+
+class TestCancellation:
+    """Test that abandoned executor work stops early."""
+
+    @pytest.mark.asyncio
+    async def test_deadline_returns_control_and_stops_worker(self):
+        stopped = threading.Event()
+
+        def slow_with_backoff():
+            try:
+                interruptible_sleep(5)
+            except RequestCancelled:
+                stopped.set()
+                raise
+
+        started = time.monotonic()
+        with deadline_scope(0.1):
+            with pytest.raises(DeadlineExceeded):
+                await run_blocking(slow_with_backoff)
+
+        assert time.monotonic() - started < 1
+        assert stopped.wait(1)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_stops_worker(self):
+        running = threading.Event()
+        stopped = threading.Event()
+
+        def slow_with_backoff():
+            running.set()
+            try:
+                interruptible_sleep(5)
+            except RequestCancelled:
+                stopped.set()
+                raise
+
+        task = asyncio.create_task(run_blocking(slow_with_backoff))
+        await asyncio.get_running_loop().run_in_executor(None, running.wait, 1)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert stopped.wait(1)
+
+
+class TestToolCallDeadline:
+    """Test deadlines applied to MCP tool calls."""
+
+    def register(self, registry, name, handler, metadata=None):
+        registry.register_tool(
+            name,
+            Tool(name=name, description=name, inputSchema={"type": "object"}),
+            handler,
+            metadata,
+        )
+
+    @pytest.mark.asyncio
+    async def test_handler_cancelled_at_deadline(self):
+        registry = ToolRegistry()
+        seen = {}
+
+        async def slow():
+            seen["remaining"] = remaining_time()
+            await asyncio.sleep(5)
+            return {"success": True}
+
+        self.register(registry, "slow", slow, {"deadline_seconds": 0.1})
+
+        started = time.monotonic()
+        response = await registry.execute_tool_call("slow", {}, lambda: True)
+
+        assert time.monotonic() - started < 1
+        assert response["isError"] is True
+        assert "deadline" in response["content"][0]["text"]
+        assert 0 < seen["remaining"] <= 0.1
+
+    def test_deadline_lookup(self):
+        registry = ToolRegistry(default_deadline=60, deadlines={"override": 5})
+
+        async def handler():
+            return {}
+
+        self.register(registry, "plain", handler)
+        self.register(registry, "declared", handler, {"deadline_seconds": 300})
+        self.register(registry, "override", handler, {"deadline_seconds": 300})
+        self.register(registry, "opted_out", handler, {"deadline_seconds": None})
+
+        assert registry.get_tool_deadline("plain") == 60
+        assert registry.get_tool_deadline("declared") == 300
+        assert registry.get_tool_deadline("override") == 5
+        assert registry.get_tool_deadline("opted_out") is None
+        assert ToolRegistry().get_tool_deadline("plain") is None
+
+    def test_writes_opt_out_of_default(self):
+        assert AdvancedTools.deadlines["batch_create_hosts"] is None
+        assert HostTools.deadlines["create_host"] is None
+
+    def test_config_validation(self):
+        assert DeadlineConfig().default_seconds is None
+        for invalid in ({"default_seconds": 0}, {"tool_deadlines": {"x": -1}}):
+            with pytest.raises(ValueError):
+                DeadlineConfig(**invalid)
+
+
+class TestBatchDeadline:
+    """Test that batch workers give up once the budget is spent."""
+
+    @pytest.mark.asyncio
+    async def test_items_not_attempted_after_deadline(self):
+        processor = BatchProcessor(max_concurrent=2, max_retries=3, retry_delay=0.01)
+        calls = []
+
+        async def operation(item):
+            calls.append(item)
+            return item
+
+        with deadline_scope(0.01):
+            await asyncio.sleep(0.02)
+            result = await processor.process_batch([1, 2, 3], operation)
+
+        assert calls == []
+        assert result.progress.failed == 3
+        assert all(item.error == "Deadline exceeded" for item in result.items)
+
+    @pytest.mark.asyncio
+    async def test_no_retry_that_outlasts_budget(self):
+        processor = BatchProcessor(max_concurrent=1, max_retries=3, retry_delay=1.0)
+        calls = []
+
+        async def operation(item):
+            calls.append(item)
+            raise ConnectionError("reset")
+
+        with deadline_scope(0.5):
+            result = await processor.process_batch([1], operation)
+
+        assert calls == [1]
+        assert result.progress.failed == 1
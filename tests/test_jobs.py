@@ -0,0 +1,188 @@
+"""Tests for resumable background batch jobs."""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from checkmk_mcp_server.services.batch import BatchProcessor
+from checkmk_mcp_server.services.jobs import BatchJobManager, JobJournal, JobStatus
+from checkmk_mcp_server.utils.call_breakdown import (
+    clear_breakdown,
+    get_current_breakdown,
+    start_breakdown,
+)
+from checkmk_mcp_server.utils.request_context import deadline_scope, remaining_time
+from checkmk_mcp_server.utils.tracing import get_current_span, span
+
+
+@pytest.fixture
+def processor():
+    """Fast batch processor without retry delays."""
+    return BatchProcessor(max_concurrent=4, max_retries=1, retry_delay=0)
+
+
+def read_journal(manager, job_id):
+    path = manager.jobs_dir / f"{job_id}.jsonl"
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestBatchJobManager:
+    """Test job lifecycle, journaling and resume."""
+
+    @pytest.mark.asyncio
+    async def test_job_runs_in_background_and_journals(self, processor, tmp_path):
+        manager = BatchJobManager(processor, tmp_path)
+        processed = []
+
+        async def handler(item):
+            processed.append(item)
+            if item == 3:
+                raise ValueError("bad item")
+
+        manager.register_operation("square", handler)
+        job = await manager.start_job("square", [1, 2, 3, 4])
+        assert job.status == JobStatus.RUNNING
+
+        job = await manager.wait(job.job_id)
+
+        assert sorted(processed) == [1, 2, 3, 4]
+        assert job.status == JobStatus.FAILED
+        assert (job.success, job.failed) == (3, 1)
+        assert job.recent_failures[0]["error"] == "bad item"
+
+        records = read_journal(manager, job.job_id)
+        assert records[0]["type"] == "job"
+        assert records[0]["items"] == [1, 2, 3, 4]
+        assert sum(1 for r in records if r["type"] == "item") == 4
+        assert records[-1] == {**records[-1], "type": "status", "status": "failed"}
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_items(self, processor, tmp_path):
+        manager = BatchJobManager(processor, tmp_path)
+        fail = {"b"}
+        calls = []
+
+        async def handler(item):
+            calls.append(item)
+            if item in fail:
+                raise RuntimeError("temporary failure")
+
+        manager.register_operation("touch", handler, item_label=str.upper)
+        job = await manager.start_job("touch", ["a", "b", "c"])
+        await manager.wait(job.job_id)
+        assert manager.get_job(job.job_id).recent_failures[0]["item"] == "B"
+
+        # Simulate a restart: a new manager only has the journal
+        fail.clear()
+        calls.clear()
+        restarted = BatchJobManager(processor, tmp_path)
+        restarted.register_operation("touch", handler)
+        await restarted.resume_job(job.job_id)
+        job = await restarted.wait(job.job_id)
+
+        assert calls == ["b"]
+        assert job.status == JobStatus.COMPLETED
+        assert (job.success, job.failed) == (3, 0)
+
+    @pytest.mark.asyncio
+    async def test_chunked_operation_records_per_item(self, processor, tmp_path):
+        manager = BatchJobManager(processor, tmp_path)
+        chunks = []
+
+        async def handler(chunk):
+            chunks.append(list(chunk))
+            return [(item % 2 == 0, None if item % 2 == 0 else "odd") for item in chunk]
+
+        manager.register_operation("bulk", handler, chunk_size=10)
+        job = await manager.start_job("bulk", list(range(25)), params={"chunk_size": 5})
+        job = await manager.wait(job.job_id)
+
+        assert [len(chunk) for chunk in sorted(chunks)] == [5, 5, 5, 5, 5]
+        assert (job.success, job.failed) == (13, 12)
+
+    @pytest.mark.asyncio
+    async def test_journal_written_off_event_loop(self, processor, tmp_path, monkeypatch):
+        manager = BatchJobManager(processor, tmp_path)
+        threads = set()
+        append = JobJournal.append
+
+        def tracking_append(journal, records):
+            threads.add(threading.get_ident())
+            append(journal, records)
+
+        monkeypatch.setattr(JobJournal, "append", tracking_append)
+
+        async def handler(item):
+            return item
+
+        manager.register_operation("noop", handler)
+        job = await manager.start_job("noop", list(range(5)))
+        await manager.wait(job.job_id)
+
+        assert len(threads) == 1
+        assert threading.get_ident() not in threads
+        assert len(read_journal(manager, job.job_id)) == 8
+
+    @pytest.mark.asyncio
+    async def test_job_does_not_inherit_call_context(self, processor, tmp_path):
+        manager = BatchJobManager(processor, tmp_path)
+        seen = []
+
+        async def handler(item):
+            seen.append((remaining_time(), get_current_breakdown(), get_current_span()))
+
+        manager.register_operation("noop", handler)
+        start_breakdown("req-1", "batch_create_hosts")
+        try:
+            with deadline_scope(30), span("tool.batch_create_hosts"):
+                job = await manager.start_job("noop", [1])
+        finally:
+            clear_breakdown()
+        await manager.wait(job.job_id)
+
+        assert seen == [(None, None, None)]
+
+    @pytest.mark.asyncio
+    async def test_cancel_and_interrupted_status(self, processor, tmp_path):
+        manager = BatchJobManager(processor, tmp_path)
+        started = asyncio.Event()
+
+        async def slow(item):
+            started.set()
+            await asyncio.sleep(10)
+
+        manager.register_operation("slow", slow)
+        job = await manager.start_job("slow", list(range(10)))
+        await started.wait()
+
+        job = await manager.cancel_job(job.job_id)
+        assert job.status == JobStatus.CANCELLED
+        assert read_journal(manager, job.job_id)[-1]["status"] == "cancelled"
+
+        # A journal left in "running" by a dead process reads as interrupted
+        other = await manager.start_job("slow", [1])
+        await started.wait()
+        fresh = BatchJobManager(processor, tmp_path)
+        assert fresh.get_job(other.job_id).status == JobStatus.INTERRUPTED
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_list_and_unknown_jobs(self, processor, tmp_path):
+        manager = BatchJobManager(processor, tmp_path / "jobs")
+        assert manager.list_jobs() == []
+
+        async def handler(item):
+            return item
+
+        manager.register_operation("noop", handler)
+        job = await manager.start_job("noop", [1])
+        await manager.wait(job.job_id)
+
+        assert [j.job_id for j in manager.list_jobs()] == [job.job_id]
+        assert manager.get_job("job_missing") is None
+        with pytest.raises(ValueError):
+            manager.get_job("../etc/passwd")
+        with pytest.raises(ValueError):
+            await manager.start_job("unknown", [1])
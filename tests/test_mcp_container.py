@@ -0,0 +1,146 @@
+"""Tests for the lazily building service container."""
+
+from unittest.mock import Mock
+
+import pytest
+import pytest_asyncio
+
+from checkmk_mcp_server.config import AppConfig, BatchConfig, CheckmkConfig, LLMConfig
+from checkmk_mcp_server.mcp_server.container import ServiceContainer
+from checkmk_mcp_server.mcp_server.tools.metrics import MetricsTools
+from checkmk_mcp_server.services import HostService
+from checkmk_mcp_server.utils.startup import StartupTimer
+
+
+@pytest.fixture
+def config(tmp_path):
+    return AppConfig(
+        checkmk=CheckmkConfig(
+            server_url="http://checkmk.test",
+            username="automation",
+            password="secret",
+            site="test",
+        ),
+        llm=LLMConfig(),
+        batch=BatchConfig(jobs_dir=str(tmp_path / "jobs")),
+    )
+
+
+@pytest_asyncio.fixture
+async def container(config):
+    container = ServiceContainer(config)
+    await container.initialize()
+    yield container
+    await container.shutdown()
+
+
+class TestServiceContainer:
+    """Test lazy service construction."""
+
+    @pytest.mark.asyncio
+    async def test_initialize_creates_only_clients(self, container):
+        assert container.is_service_created("async_client")
+        assert container.is_service_created("sync_client")
+        for name in ("host_service", "historical_service", "batch_jobs"):
+            assert container.has_service(name)
+            assert not container.is_service_created(name)
+
+    @pytest.mark.asyncio
+    async def test_service_built_once_on_first_use(self, container):
+        host_service = container.get_service("host_service")
+
+        assert isinstance(host_service, HostService)
+        assert container.get_service("host_service") is host_service
+        assert "host_service" in container.get_build_times()
+        assert not container.is_service_created("status_service")
+
+    @pytest.mark.asyncio
+    async def test_dependencies_built_on_demand(self, container):
+        jobs = container.get_service("batch_jobs")
+
+        assert jobs.processor is container.get_service("batch_processor")
+        assert container.is_service_created("host_service")
+        assert not container.is_service_created("parameter_service")
+
+    @pytest.mark.asyncio
+    async def test_unknown_service(self, container):
+        assert not container.has_service("nonexistent")
+        with pytest.raises(KeyError):
+            container.get_service("nonexistent")
+
+    @pytest.mark.asyncio
+    async def test_service_map_is_lazy(self, container):
+        services = container.get_service_map()
+
+        assert "historical_service" in list(services)
+        assert len(services) == len(container.get_service_names())
+        assert services.get("nonexistent") is None
+        assert services["status_service"] is container.get_service("status_service")
+        assert not container.is_service_created("historical_service")
+
+    @pytest.mark.asyncio
+    async def test_get_all_services_builds_everything(self, container):
+        services = container.get_all_services()
+
+        assert set(services) == set(container.get_service_names())
+        assert all(container.is_service_created(name) for name in services)
+
+    @pytest.mark.asyncio
+    async def test_get_service_requires_initialize(self, config):
+        with pytest.raises(RuntimeError):
+            ServiceContainer(config).get_service("host_service")
+
+    @pytest.mark.asyncio
+    async def test_register_factory(self, container):
+        service = Mock()
+        container.register_factory("custom_service", lambda: service)
+
+        assert container.get_service("custom_service") is service
+
+
+class TestLazyHistoricalService:
+    """Test the metrics tools' deferred historical service."""
+
+    def test_factory_called_on_first_access(self):
+        historical = Mock()
+        factory = Mock(return_value=historical)
+        tools = MetricsTools(Mock(), historical_service_factory=factory)
+        tools.register_tools()
+
+        factory.assert_not_called()
+        assert tools.historical_service is historical
+        assert tools.historical_service is historical
+        factory.assert_called_once()
+
+    def test_instance_takes_precedence(self):
+        historical = Mock()
+        factory = Mock()
+        tools = MetricsTools(Mock(), historical, historical_service_factory=factory)
+
+        assert tools.historical_service is historical
+        factory.assert_not_called()
+
+
+class TestStartupTimer:
+    """Test startup milestones."""
+
+    def test_first_mark_wins(self):
+        timer = StartupTimer(origin=0.0)
+
+        first = timer.mark("server_created")
+        assert timer.mark("server_created") == first
+        assert timer.to_dict()["server_created"] == round(first * 1000, 1)
+
+    def test_report_logged_once(self, caplog):
+        timer = StartupTimer()
+        timer.mark("server_initialized")
+
+        with caplog.at_level("INFO", logger="checkmk_mcp_server.utils.startup"):
+            timer.mark_first_list_tools()
+            timer.mark_first_list_tools()
+
+        reports = [r for r in caplog.records if r.message.startswith("Startup:")]
+        assert len(reports) == 1
+        assert "server_initialized after" in reports[0].message
+        assert "first_list_tools after" in reports[0].message
+        assert 0 <= timer.milestones["first_list_tools"] < 3600
@@ -1,5 +1,6 @@
 """Tests for MCP server protocol handlers."""
 
+import json
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 from typing import List
@@ -74,7 +75,7 @@ class TestProtocolHandlers:
         """Test getting streaming resource definitions."""
         resources = protocol_handlers.get_streaming_resources()
         
-        assert len(resources) == 4
+        assert len(resources) == 5
         assert all(isinstance(r, Resource) for r in resources)
         
         # Check specific resources
@@ -82,6 +83,7 @@ class TestProtocolHandlers:
         assert "checkmk://stream/hosts" in uris
         assert "checkmk://stream/services" in uris
         assert "checkmk://metrics/server" in uris
+        assert "checkmk://metrics/openmetrics" in uris
         assert "checkmk://cache/stats" in uris
 
     def test_get_all_resources(self, protocol_handlers):
@@ -89,7 +91,7 @@ class TestProtocolHandlers:
         resources = protocol_handlers.get_all_resources()
         
         # Should include both basic and streaming resources
-        assert len(resources) == 9
+        assert len(resources) == 10
         
         basic_count = len(protocol_handlers.get_basic_resources())
         streaming_count = len(protocol_handlers.get_streaming_resources())
@@ -152,6 +154,14 @@ class TestProtocolHandlers:
         mock_service_provider._stream_hosts_resource.assert_called_once()
         assert result == '{"streaming": "hosts"}'
 
+    @pytest.mark.asyncio
+    async def test_handle_read_resource_streaming_cursor(self, protocol_handlers, mock_service_provider):
+        """Test later stream pages pass their cursor to the provider."""
+        uri = AnyUrl("checkmk://stream/hosts?cursor=abc123")
+        await protocol_handlers.handle_read_resource(uri, mock_service_provider, {})
+
+        mock_service_provider._stream_hosts_resource.assert_called_once_with(cursor="abc123")
+
     @pytest.mark.asyncio
     async def test_handle_read_resource_streaming_services(self, protocol_handlers, mock_service_provider):
         """Test reading streaming services resource."""
@@ -173,8 +183,20 @@ class TestProtocolHandlers:
             result = await protocol_handlers.handle_read_resource(uri, mock_service_provider, {})
             
             mock_collector.assert_called_once()
-            assert '"cpu": 50' in result
-            assert '"memory": 75' in result
+            assert json.loads(result) == {"cpu": 50, "memory": 75}
+
+    @pytest.mark.asyncio
+    async def test_handle_read_resource_openmetrics(self, protocol_handlers, mock_service_provider):
+        """Test reading the OpenMetrics exposition resource."""
+        with patch(
+            'checkmk_mcp_server.mcp_server.handlers.protocol.render_openmetrics',
+            return_value="# EOF\n",
+        ) as mock_render:
+            uri = AnyUrl("checkmk://metrics/openmetrics")
+            result = await protocol_handlers.handle_read_resource(uri, mock_service_provider, {})
+
+            mock_render.assert_called_once()
+            assert result == "# EOF\n"
 
     @pytest.mark.asyncio
     async def test_handle_read_resource_cache_stats_enabled(self, protocol_handlers, mock_service_provider):
@@ -187,8 +209,7 @@ class TestProtocolHandlers:
         result = await protocol_handlers.handle_read_resource(uri, mock_service_provider, {})
         
         mock_service_provider.cached_host_service.get_cache_stats.assert_called_once()
-        assert '"hits": 100' in result
-        assert '"misses": 10' in result
+        assert json.loads(result) == {"hits": 100, "misses": 10}
 
     @pytest.mark.asyncio
     async def test_handle_read_resource_cache_stats_disabled(self, protocol_handlers, mock_service_provider):
@@ -199,7 +220,7 @@ class TestProtocolHandlers:
         uri = AnyUrl("checkmk://cache/stats")
         result = await protocol_handlers.handle_read_resource(uri, mock_service_provider, {})
         
-        assert '"error": "Cache not enabled"' in result
+        assert json.loads(result) == {"error": "Cache not enabled"}
 
     @pytest.mark.asyncio
     async def test_handle_read_resource_custom_handler(self, protocol_handlers, mock_service_provider):
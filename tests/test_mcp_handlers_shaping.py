@@ -0,0 +1,196 @@
+"""Tests for token-budgeted tool responses."""
+
+import json
+
+import pytest
+from mcp.types import Tool
+
+from checkmk_mcp_server.config import ResponseConfig
+from checkmk_mcp_server.mcp_server.handlers.registry import ToolRegistry
+from checkmk_mcp_server.mcp_server.handlers.shaping import ResponseShaper
+from checkmk_mcp_server.mcp_server.utils.serialization import safe_json_dumps
+
+
+def service_rows(count):
+    states = ["OK", "OK", "OK", "WARNING", "CRITICAL", "UNKNOWN"]
+    return [
+        {
+            "host_name": f"host{i % 7:02d}",
+            "service_name": f"Service {i:04d}",
+            "state": states[i % len(states)],
+            "plugin_output": "x" * 80,
+        }
+        for i in range(count)
+    ]
+
+
+def make_tool(name):
+    return Tool(
+        name=name,
+        description="List things",
+        inputSchema={"type": "object", "properties": {"limit": {"type": "integer"}}},
+    )
+
+
+class TestResponseShaper:
+    """Test truncation and paging of results."""
+
+    @pytest.mark.asyncio
+    async def test_over_budget_result_truncated_to_ranked_head(self):
+        shaper = ResponseShaper()
+        rows = service_rows(300)
+        result = {"success": True, "data": {"services": rows, "total_count": 300}}
+
+        page = await shaper.shape("list_all_services", result, 8192)
+
+        assert len(safe_json_dumps(page)) <= 8192
+        pagination = page["pagination"]
+        assert pagination["field"] == "data.services"
+        assert pagination["total"] == 300
+        assert pagination["truncated"] is True
+        assert pagination["returned"] == len(page["data"]["services"]) < 300
+        assert pagination["continuation_token"]
+        # Most severe first, then original order
+        states = [row["state"] for row in page["data"]["services"]]
+        assert states[0] == "CRITICAL"
+        assert states == sorted(
+            states, key=["CRITICAL", "UNKNOWN", "WARNING", "OK"].index
+        )
+        # Summary covers all items, not just the page
+        assert sum(pagination["summary"]["state"].values()) == 300
+        assert pagination["summary"]["state"]["OK"] == 150
+        # Unrelated fields and the original result are untouched
+        assert page["data"]["total_count"] == 300
+        assert len(result["data"]["services"]) == 300
+
+    @pytest.mark.asyncio
+    async def test_continuation_pages_through_all_items(self):
+        shaper = ResponseShaper()
+        rows = service_rows(200)
+        page = await shaper.shape(
+            "list_all_services", {"success": True, "data": {"services": rows}}, 6000
+        )
+
+        seen = list(page["data"]["services"])
+        while page["pagination"]["truncated"]:
+            page = await shaper.next_page(
+                "list_all_services", page["pagination"]["continuation_token"]
+            )
+            seen.extend(page["data"]["services"])
+
+        assert page["pagination"]["continuation_token"] is None
+        assert sorted(row["service_name"] for row in seen) == sorted(
+            row["service_name"] for row in rows
+        )
+
+    @pytest.mark.asyncio
+    async def test_urgency_score_ranks_problems(self):
+        shaper = ResponseShaper()
+        problems = [
+            {"host_name": f"h{i}", "urgency_score": i % 10, "detail": "y" * 100}
+            for i in range(100)
+        ]
+
+        page = await shaper.shape("get_critical_problems", {"data": problems}, 2048)
+
+        scores = [p["urgency_score"] for p in page["data"]]
+        assert scores[0] == 9
+        assert scores == sorted(scores, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_invalid_token(self):
+        shaper = ResponseShaper()
+        page = await shaper.shape(
+            "list_all_services", {"data": {"services": service_rows(100)}}, 4096
+        )
+        token = page["pagination"]["continuation_token"]
+
+        for tool, bad in [
+            ("list_all_services", "unknown:10"),
+            ("list_all_services", "garbage"),
+            ("list_hosts", token),
+        ]:
+            result = await shaper.next_page(tool, bad)
+            assert result["success"] is False
+            assert "continuation_token" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_result_without_list_returned_unchanged(self):
+        shaper = ResponseShaper()
+        result = {"success": True, "data": {"text": "z" * 10000}}
+
+        assert await shaper.shape("get_host", result, 1024) is result
+
+
+class TestRegistryResponseBudgets:
+    """Test response budgets applied by the tool registry."""
+
+    @pytest.mark.asyncio
+    async def test_budgeted_tool_pages_through_registry(self):
+        registry = ToolRegistry()
+        calls = 0
+
+        async def handler(limit=None):
+            nonlocal calls
+            calls += 1
+            return {"success": True, "data": {"services": service_rows(200)}}
+
+        tool = make_tool("list_all_services")
+        registry.register_tool(
+            "list_all_services", tool, handler, {"max_response_bytes": 8192}
+        )
+        assert "continuation_token" in tool.inputSchema["properties"]
+
+        result = await registry.execute_tool_call("list_all_services", {}, lambda: True)
+        text = result["content"][0]["text"]
+        assert len(text.encode("utf-8")) <= 8192
+        first = json.loads(text)
+        assert first["pagination"]["truncated"] is True
+
+        result = await registry.execute_tool_call(
+            "list_all_services",
+            {"continuation_token": first["pagination"]["continuation_token"]},
+            lambda: True,
+        )
+        second = json.loads(result["content"][0]["text"])
+
+        assert calls == 1
+        assert second["pagination"]["offset"] == first["pagination"]["returned"]
+        assert second["request_id"] == result["meta"]["request_id"]
+        assert second["request_id"] != first["request_id"]
+
+    @pytest.mark.asyncio
+    async def test_under_budget_and_unbudgeted_responses_unchanged(self):
+        registry = ToolRegistry()
+
+        async def handler(limit=None):
+            return {"success": True, "data": {"services": service_rows(200)}}
+
+        small = make_tool("small")
+        registry.register_tool("small", small, handler, {"max_response_bytes": 10**6})
+        unbudgeted = make_tool("unbudgeted")
+        registry.register_tool("unbudgeted", unbudgeted, handler)
+
+        for name in ("small", "unbudgeted"):
+            result = await registry.execute_tool_call(name, {}, lambda: True)
+            payload = json.loads(result["content"][0]["text"])
+            assert "pagination" not in payload
+            assert len(payload["data"]["services"]) == 200
+        assert "continuation_token" not in unbudgeted.inputSchema["properties"]
+
+    def test_budget_precedence(self):
+        registry = ToolRegistry(
+            default_max_response_bytes=1000, response_budgets={"b": 3000}
+        )
+        registry.register_tool("a", make_tool("a"), None, {"max_response_bytes": 2000})
+        registry.register_tool("b", make_tool("b"), None, {"max_response_bytes": 2000})
+        registry.register_tool("c", make_tool("c"), None)
+
+        assert registry.get_response_budget("a") == 2000
+        assert registry.get_response_budget("b") == 3000
+        assert registry.get_response_budget("c") == 1000
+
+    def test_response_config_validation(self):
+        assert ResponseConfig().default_max_bytes is None
+        with pytest.raises(ValueError):
+            ResponseConfig(page_ttl=0)
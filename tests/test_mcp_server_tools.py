@@ -30,9 +30,9 @@ class TestMCPServerTools:
         with patch("checkmk_mcp_server.api_client.CheckmkClient"):
             await server.initialize()
 
-        # Check tools are registered (refactored architecture has 37 tools)
-        assert len(server._tools) == 37
-        assert len(server._tool_handlers) == 37
+        # Check tools are registered (refactored architecture has 42 tools)
+        assert len(server._tools) == 42
+        assert len(server._tool_handlers) == 42
 
         # Check host tools
         assert "list_hosts" in server._tools
@@ -74,6 +74,9 @@ class TestMCPServerTools:
         # Check advanced tools
         assert "stream_hosts" in server._tools
         assert "batch_create_hosts" in server._tools
+        assert "get_batch_status" in server._tools
+        assert "cancel_batch" in server._tools
+        assert "resume_batch" in server._tools
         assert "get_server_metrics" in server._tools
         assert "clear_cache" in server._tools
         assert "get_system_info" in server._tools
@@ -0,0 +1,192 @@
+"""Tests for serving many MCP clients over the HTTP transports."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamable_http_client
+from mcp.types import Tool
+
+from checkmk_mcp_server.config import (
+    AppConfig,
+    BatchConfig,
+    CheckmkConfig,
+    LLMConfig,
+    TransportConfig,
+)
+from checkmk_mcp_server.mcp_server.server import CheckmkMCPServer
+
+
+def make_config(tmp_path, **transport):
+    return AppConfig(
+        checkmk=CheckmkConfig(
+            server_url="http://127.0.0.1:9",
+            username="automation",
+            password="secret",
+            site="test",
+            max_retries=0,
+        ),
+        llm=LLMConfig(),
+        batch=BatchConfig(jobs_dir=str(tmp_path / "jobs")),
+        transport=TransportConfig(port=0, **transport),
+    )
+
+
+async def start_server(config):
+    server = CheckmkMCPServer(config)
+    await server.initialize()
+
+    # A tool that reports which process-wide objects served the call
+    async def whoami(delay: float = 0.0):
+        await asyncio.sleep(delay)
+        return {"success": True, "container": id(server.container)}
+
+    server.tool_registry.register_tool(
+        "whoami",
+        Tool(
+            name="whoami",
+            description="Report the serving container",
+            inputSchema={"type": "object", "properties": {"delay": {"type": "number"}}},
+        ),
+        whoami,
+    )
+
+    shutdown = asyncio.Event()
+    task = asyncio.create_task(server.run(transport_type="http", shutdown_event=shutdown))
+    for _ in range(500):
+        if server._http_transport is not None and server._http_transport.port:
+            break
+        await asyncio.sleep(0.01)
+    return server, shutdown, task
+
+
+@pytest_asyncio.fixture
+async def http_server(tmp_path):
+    server, shutdown, task = await start_server(make_config(tmp_path, max_sessions=2))
+    yield server
+    shutdown.set()
+    await asyncio.wait_for(task, timeout=10)
+    await server.shutdown()
+
+
+def tool_payload(result):
+    # The registry returns raw CallToolResult fields, which arrive as text
+    raw = json.loads(result.content[0].text)
+    return json.loads(raw["content"][0]["text"])
+
+
+async def call_whoami(url, delay=0.0):
+    async with streamable_http_client(url) as (read, write, get_session_id):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            tools = await session.list_tools()
+            result = await session.call_tool("whoami", {"delay": delay})
+            return get_session_id(), len(tools.tools), tool_payload(result)["container"]
+
+
+class TestHTTPTransport:
+    """Test the shared streamable HTTP and SSE endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_clients_share_one_server(self, http_server):
+        url = http_server._http_transport.url
+
+        results = await asyncio.gather(call_whoami(url, 0.1), call_whoami(url, 0.1))
+
+        session_ids = {session_id for session_id, _, _ in results}
+        assert len(session_ids) == 2
+        assert {container for _, _, container in results} == {id(http_server.container)}
+        assert results[0][1] == http_server.tool_registry.get_tool_count()
+
+    @pytest.mark.asyncio
+    async def test_sse_endpoint(self, http_server):
+        base = http_server._http_transport.url.rsplit("/", 1)[0]
+
+        async with sse_client(f"{base}/sse") as (read, write):
+            async with ClientSession(read, write) as session:
+                init = await session.initialize()
+                result = await session.call_tool("whoami", {})
+
+        assert init.serverInfo.name == "checkmk-mcp-server"
+        assert init.instructions
+        assert tool_payload(result)["container"] == id(http_server.container)
+
+    @pytest.mark.asyncio
+    async def test_session_limit(self, http_server):
+        url = http_server._http_transport.url
+        opened = []
+
+        async with streamable_http_client(url) as (r1, w1, _):
+            async with ClientSession(r1, w1) as first:
+                await first.initialize()
+                async with streamable_http_client(url) as (r2, w2, _):
+                    async with ClientSession(r2, w2) as second:
+                        await second.initialize()
+                        opened.append(True)
+
+                        async with httpx.AsyncClient() as client:
+                            response = await client.post(
+                                url,
+                                json={
+                                    "jsonrpc": "2.0",
+                                    "id": 1,
+                                    "method": "initialize",
+                                    "params": {
+                                        "protocolVersion": "2025-03-26",
+                                        "capabilities": {},
+                                        "clientInfo": {"name": "third", "version": "0"},
+                                    },
+                                },
+                                headers={"Accept": "application/json, text/event-stream"},
+                            )
+
+        assert opened
+        assert response.status_code == 503
+
+    @pytest.mark.asyncio
+    async def test_health(self, http_server):
+        base = http_server._http_transport.url.rsplit("/", 1)[0]
+
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{base}/health")
+
+        assert response.json()["status"] == "ok"
+        assert http_server.get_server_info()["transport"]["max_sessions"] == 2
+
+
+class TestSessionCallLimit:
+    """Test per-session tool call limits."""
+
+    @pytest.mark.asyncio
+    async def test_calls_of_one_session_are_bounded(self, tmp_path):
+        server, shutdown, task = await start_server(
+            make_config(tmp_path, max_calls_per_session=1)
+        )
+        try:
+            url = server._http_transport.url
+            async with streamable_http_client(url) as (read, write, _):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    loop = asyncio.get_running_loop()
+                    started = loop.time()
+                    await asyncio.gather(
+                        session.call_tool("whoami", {"delay": 0.2}),
+                        session.call_tool("whoami", {"delay": 0.2}),
+                    )
+                    elapsed = loop.time() - started
+        finally:
+            shutdown.set()
+            await asyncio.wait_for(task, timeout=10)
+            await server.shutdown()
+
+        assert elapsed >= 0.4
+
+    def test_transport_config_validation(self):
+        assert TransportConfig(path="/mcp/").path == "/mcp"
+        for invalid in ({"port": 70000}, {"path": "/"}, {"max_sessions": 0}):
+            with pytest.raises(ValueError):
+                TransportConfig(**invalid)
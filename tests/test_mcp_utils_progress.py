@@ -0,0 +1,177 @@
+"""Tests for tool progress notifications and partial results."""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from mcp.server.lowlevel.server import request_ctx
+
+from checkmk_mcp_server.mcp_server.tools.advanced import tools as advanced_tools
+from checkmk_mcp_server.mcp_server.tools.advanced.tools import AdvancedTools
+from checkmk_mcp_server.mcp_server.utils.progress import (
+    PARTIAL_RESULT_LOGGER,
+    ToolProgress,
+    get_tool_progress,
+)
+from checkmk_mcp_server.services.batch import BatchProgress
+from checkmk_mcp_server.services.models.hosts import HostInfo
+from checkmk_mcp_server.services.streaming import StreamBatch
+
+
+def make_session():
+    session = Mock()
+    session.send_progress_notification = AsyncMock()
+    session.send_log_message = AsyncMock()
+    return session
+
+
+def request_context(session, progress_token="tok"):
+    """Minimal MCP request context as seen by a tool handler."""
+    meta = SimpleNamespace(progressToken=progress_token)
+    return SimpleNamespace(request_id=7, meta=meta, session=session)
+
+
+class TestToolProgress:
+    """Test the progress reporter."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_token(self):
+        session = make_session()
+        progress = ToolProgress(session, None)
+
+        await progress.report(1, 2)
+        await progress.partial({"items": []})
+
+        assert not progress.enabled
+        session.send_progress_notification.assert_not_called()
+        session.send_log_message.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_report_is_throttled_except_final(self):
+        session = make_session()
+        progress = ToolProgress(session, "tok", request_id=7, min_interval=60)
+
+        await progress.report(1, 10)
+        await progress.report(2, 10)
+        await progress.report(10, 10, "done")
+
+        assert session.send_progress_notification.await_count == 2
+        session.send_progress_notification.assert_awaited_with(
+            "tok", 10, total=10, message="done", related_request_id=7
+        )
+
+    @pytest.mark.asyncio
+    async def test_report_batch(self):
+        session = make_session()
+        progress = ToolProgress(session, "tok")
+
+        await progress.report_batch(BatchProgress(total_items=4, success=2, failed=1))
+
+        args = session.send_progress_notification.await_args
+        assert args.args[1] == 3
+        assert args.kwargs["total"] == 4
+        assert args.kwargs["message"] == "3/4 done (2 succeeded, 1 failed)"
+
+    @pytest.mark.asyncio
+    async def test_partial_serializes_models(self):
+        session = make_session()
+        progress = ToolProgress(session, "tok", request_id=7)
+
+        await progress.partial({"items": [HostInfo(name="web01", folder="/")]})
+        await progress.partial({"at": datetime(2024, 1, 1)})
+
+        first, second = session.send_log_message.await_args_list
+        assert first.kwargs["logger"] == PARTIAL_RESULT_LOGGER
+        assert first.kwargs["related_request_id"] == 7
+        assert first.kwargs["data"]["chunk"] == 0
+        assert first.kwargs["data"]["content"]["items"][0]["name"] == "web01"
+        assert second.kwargs["data"] == {
+            "progressToken": "tok",
+            "chunk": 1,
+            "content": {"at": "2024-01-01T00:00:00"},
+        }
+        assert progress.chunks_sent == 2
+
+    @pytest.mark.asyncio
+    async def test_send_failures_are_ignored(self):
+        session = make_session()
+        session.send_log_message.side_effect = BrokenPipeError()
+        progress = ToolProgress(session, "tok")
+
+        await progress.partial({"items": []})
+
+        assert progress.chunks_sent == 1
+
+    def test_get_tool_progress(self):
+        assert not get_tool_progress().enabled
+
+        session = make_session()
+        token = request_ctx.set(request_context(session))
+        try:
+            progress = get_tool_progress()
+        finally:
+            request_ctx.reset(token)
+
+        assert progress.enabled
+        assert progress.session is session
+        assert progress.progress_token == "tok"
+        assert progress.request_id == 7
+
+
+class TestStreamHostsProgress:
+    """Test stream_hosts reports every batch."""
+
+    @pytest.fixture
+    def stream_hosts(self):
+        async def list_hosts_streamed(batch_size, search, folder):
+            for number in range(12):
+                yield StreamBatch(
+                    items=[HostInfo(name=f"host{number}", folder="/")],
+                    batch_number=number,
+                    has_more=number < 11,
+                    metadata={"hosts_processed": number + 1, "fetched_count": 12},
+                )
+
+        server = Mock()
+        server.streaming_host_service.list_hosts_streamed = list_hosts_streamed
+        tools = AdvancedTools(server)
+        tools.register_tools()
+        return tools.get_handlers()["stream_hosts"]
+
+    @pytest.mark.asyncio
+    async def test_all_batches_streamed_as_partial_results(self, stream_hosts):
+        session = make_session()
+        token = request_ctx.set(request_context(session))
+        try:
+            result = await stream_hosts(batch_size=1)
+        finally:
+            request_ctx.reset(token)
+
+        assert result["success"]
+        assert result["data"]["total_batches_processed"] == 12
+        assert result["data"]["partial_results_sent"] == 12
+        chunks = [call.kwargs["data"] for call in session.send_log_message.await_args_list]
+        assert [c["content"]["items"][0]["name"] for c in chunks] == [
+            f"host{i}" for i in range(12)
+        ]
+        final = session.send_progress_notification.await_args
+        assert final.args == ("tok", 12)
+        assert final.kwargs["total"] == 12
+
+    @pytest.mark.asyncio
+    async def test_without_progress_token(self, stream_hosts):
+        result = await stream_hosts(batch_size=1)
+
+        assert result["data"]["total_items"] == 12
+        assert result["data"]["partial_results_sent"] == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_summaries_capped_without_progress_token(self, stream_hosts):
+        with patch.object(advanced_tools, "MAX_BATCH_SUMMARIES", 5):
+            result = await stream_hosts(batch_size=1)
+
+        data = result["data"]
+        assert data["total_batches_processed"] == 12
+        assert [b["batch_number"] for b in data["batches"]] == [7, 8, 9, 10, 11]
+        assert data["batches_omitted"] == 7
@@ -14,7 +14,14 @@ from enum import Enum
 from dataclasses import dataclass
 from typing import Any
 
-from checkmk_mcp_server.mcp_server.utils.serialization import MCPJSONEncoder, safe_json_dumps
+from checkmk_mcp_server.mcp_server.utils.serialization import (
+    ORJSON_AVAILABLE,
+    MCPJSONEncoder,
+    get_json_backend,
+    safe_json_dumps,
+    set_json_backend,
+)
+from checkmk_mcp_server.services.models.services import ServiceListResult
 
 
 # Test fixtures and helper classes
@@ -233,6 +240,69 @@ class TestSafeJsonDumps:
         assert abs(parsed["precision"] - 123.456789012345678901234567890) < 1e-10
 
 
+class TestJSONBackends:
+    """Test the pluggable JSON backends."""
+
+    @pytest.fixture(autouse=True)
+    def restore_backend(self):
+        backend = get_json_backend()
+        yield
+        set_json_backend(backend)
+
+    @pytest.mark.parametrize("backend", ["stdlib", "orjson"])
+    def test_backends_produce_same_document(self, backend):
+        if backend == "orjson" and not ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        data = {
+            "timestamp": datetime(2025, 8, 19, 10, 30, 45, 123456),
+            "decimal": Decimal("1.5"),
+            "enum": SerializationTestEnum.VALUE1,
+            "model": MockPydanticModel("item", 1),
+            "object": MockDataClass("plain", 2),
+            1: "int key",
+            "unicode": "Hello 世界",
+        }
+
+        set_json_backend(backend)
+        result = safe_json_dumps(data)
+
+        assert get_json_backend() == backend
+        assert json.loads(result) == json.loads(json.dumps(data, cls=MCPJSONEncoder))
+        # Compact output
+        assert ", " not in result and '": ' not in result
+        assert "世界" in result
+
+    def test_large_integers_fall_back_to_stdlib(self):
+        set_json_backend("auto")
+        assert json.loads(safe_json_dumps({"big": 2**70})) == {"big": 2**70}
+
+    def test_top_level_model_uses_model_dump_json(self):
+        model = ServiceListResult(services=[], total_count=0)
+
+        assert safe_json_dumps(model) == model.model_dump_json()
+
+    def test_models_in_result_envelope(self):
+        model = ServiceListResult(services=[], total_count=0)
+
+        result = safe_json_dumps({"success": True, "data": model, "count": 3})
+
+        assert result == f'{{"success":true,"data":{model.model_dump_json()},"count":3}}'
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            set_json_backend("simdjson")
+
+    def test_failure_fallback_is_bounded(self):
+        class Loop:
+            def __init__(self):
+                self.items = [self] + list(range(10000))
+
+        parsed = json.loads(safe_json_dumps({"loop": Loop()}))
+
+        assert "Serialization failed" in parsed["error"]
+        assert len(parsed["data"]) < 1000
+
+
 class TestUtilityIntegration:
     """Integration tests for utility functions."""
     
@@ -0,0 +1,172 @@
+"""Tests for the histogram-based metrics collector."""
+
+import random
+
+import pytest
+
+from checkmk_mcp_server.services.histogram import (
+    LogHistogram,
+    RollingCounter,
+    RollingHistogram,
+)
+from checkmk_mcp_server.services.metrics import (
+    MAX_SERIES_PER_NAME,
+    MetricsCollector,
+)
+
+
+class TestLogHistogram:
+    """Test log-bucketed histogram accuracy and merging."""
+
+    def test_percentiles_within_relative_accuracy(self):
+        rng = random.Random(42)
+        values = [rng.lognormvariate(-3, 1) for _ in range(20000)]
+        histogram = LogHistogram(accuracy=0.01)
+        for value in values:
+            histogram.record(value)
+
+        ordered = sorted(values)
+        for q in (50, 95, 99):
+            exact = ordered[int(len(ordered) * q / 100) - 1]
+            assert histogram.percentile(q) == pytest.approx(exact, rel=0.03)
+
+        assert histogram.count == 20000
+        assert histogram.min == min(values)
+        assert histogram.max == max(values)
+        assert histogram.mean == pytest.approx(sum(values) / len(values))
+
+    def test_bucket_count_is_bounded(self):
+        histogram = LogHistogram(accuracy=0.01)
+        for i in range(100000):
+            histogram.record(0.001 + (i % 1000) * 0.001)
+        # 1ms..1s at 1% accuracy needs a few hundred buckets at most
+        assert len(histogram.buckets) < 400
+
+    def test_merge_matches_single_histogram(self):
+        left, right, combined = LogHistogram(), LogHistogram(), LogHistogram()
+        for i in range(1, 1001):
+            (left if i % 2 else right).record(i / 1000)
+            combined.record(i / 1000)
+
+        merged = left.copy().merge(right)
+
+        assert merged.buckets == combined.buckets
+        assert merged.percentile(99) == combined.percentile(99)
+        assert left.count == 500
+
+    def test_merge_rejects_different_layouts(self):
+        with pytest.raises(ValueError):
+            LogHistogram(accuracy=0.01).merge(LogHistogram(accuracy=0.05))
+
+    def test_zero_and_empty(self):
+        histogram = LogHistogram()
+        assert histogram.percentile(95) == 0.0
+        histogram.record(0.0)
+        assert histogram.percentile(50) == 0.0
+
+
+class TestRollingWindows:
+    """Test fixed-slot rolling windows."""
+
+    def test_counter_expires_old_slots(self):
+        counter = RollingCounter(window_seconds=60, slots=6)
+        counter.add(5, now=0)
+        counter.add(3, now=30)
+        assert counter.total(now=59) == 8
+        assert counter.total(now=65) == 3
+        assert counter.total(now=200) == 0
+        assert counter.rate(now=59) == pytest.approx(8 / 60)
+
+    def test_histogram_window(self):
+        window = RollingHistogram(window_seconds=10, slots=5)
+        window.record(1.0, now=0)
+        window.record(2.0, now=9)
+        assert window.merged(now=9).count == 2
+        assert window.merged(now=11).count == 1
+
+
+class TestMetricsCollector:
+    """Test the collector built on the fixed-memory primitives."""
+
+    @pytest.mark.asyncio
+    async def test_timing_stats(self):
+        collector = MetricsCollector()
+        for i in range(1, 101):
+            await collector.record_timing("op", i / 1000)
+
+        stats = await collector.get_stats()
+        op = stats["timing_stats"]["op"]
+        assert op["count"] == 100
+        assert op["avg_ms"] == pytest.approx(50.5)
+        assert op["min_ms"] == pytest.approx(1.0)
+        assert op["max_ms"] == pytest.approx(100.0)
+        assert op["p95_ms"] == pytest.approx(95, rel=0.02)
+        assert stats["total_metrics"] == 100
+        assert stats["request_rate_per_second"] > 0
+
+        detail = await collector.get_timing_stats("op")
+        assert detail["total_time"] == pytest.approx(5.05)
+        assert await collector.get_timing_stats("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_tags_key_separate_series(self):
+        collector = MetricsCollector()
+        await collector.increment_counter("api.calls", endpoint="/hosts")
+        await collector.increment_counter("api.calls", endpoint="/hosts")
+        await collector.increment_counter("api.calls", endpoint="/services")
+        await collector.increment_counter("api.calls")
+        await collector.set_gauge("queue", 3, queue="jobs")
+        await collector.record_timing("api", 0.1, endpoint="/a", method="GET")
+        await collector.record_timing("api", 0.3, endpoint="/b", method="GET")
+
+        stats = await collector.get_stats()
+        assert stats["counters"]["api.calls{endpoint=/hosts}"] == 2
+        assert stats["counters"]["api.calls{endpoint=/services}"] == 1
+        assert stats["counters"]["api.calls"] == 1
+        assert stats["gauges"]["queue{queue=jobs}"] == 3
+        assert "api{endpoint=/a,method=GET}" in stats["timing_stats"]
+
+        assert collector.get_histogram("api").count == 2
+        assert collector.get_histogram("api", endpoint="/b").max == pytest.approx(0.3)
+        assert (await collector.get_timing_stats("api"))["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_memory_is_flat(self):
+        collector = MetricsCollector()
+        for i in range(5000):
+            await collector.record_timing("op", (i % 500) / 1000)
+        buckets = len(collector.timing_series[("op", ())].total.buckets)
+
+        for i in range(50000):
+            await collector.record_timing("op", (i % 500) / 1000)
+
+        assert len(collector.timing_series) == 1
+        assert len(collector.timing_series[("op", ())].total.buckets) == buckets
+        assert collector.total_recorded == 55000
+
+    @pytest.mark.asyncio
+    async def test_tag_cardinality_is_capped(self):
+        collector = MetricsCollector()
+        for i in range(MAX_SERIES_PER_NAME + 50):
+            await collector.increment_counter("cache.hits", cache_key=f"key{i}")
+
+        stats = await collector.get_stats()
+        assert len(stats["counters"]) == MAX_SERIES_PER_NAME + 1
+        assert stats["counters"]["cache.hits{overflow=true}"] == 50
+
+    @pytest.mark.asyncio
+    async def test_record_metric_and_reset(self):
+        collector = MetricsCollector()
+        await collector.record_metric("latency", 0.2, unit="seconds")
+        await collector.record_metric("temperature", 21.5, unit="gauge")
+        await collector.record_metric("bytes", 512)
+
+        stats = await collector.get_stats()
+        assert stats["timing_stats"]["latency"]["count"] == 1
+        assert stats["gauges"]["temperature"] == 21.5
+        assert stats["counters"]["bytes"] == 512
+
+        collector.reset()
+        stats = await collector.get_stats()
+        assert stats["total_metrics"] == 0
+        assert stats["timing_stats"] == {}
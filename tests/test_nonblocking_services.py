@@ -0,0 +1,114 @@
+"""Tests that service layer I/O does not block the event loop."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from checkmk_mcp_server.async_api_client import AsyncCheckmkClient
+from checkmk_mcp_server.common import retry_on_failure
+from checkmk_mcp_server.services.bi_service import BIService
+from checkmk_mcp_server.services.event_service import EventService
+from checkmk_mcp_server.services.metrics_service import MetricsService
+
+BLOCKING_SECONDS = 0.2
+
+
+def blocking(result):
+    """A sync client method that holds its thread like a slow request."""
+
+    def call(*args, **kwargs):
+        time.sleep(BLOCKING_SECONDS)
+        return result
+
+    return call
+
+
+async def max_loop_gap(coro):
+    """Run ``coro`` while ticking the loop; return its result and the largest gap."""
+    gaps = []
+    done = asyncio.Event()
+
+    async def ticker():
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+            now = loop.time()
+            gaps.append(now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    try:
+        result = await coro
+    finally:
+        done.set()
+        await task
+    return result, max(gaps)
+
+
+@pytest.fixture
+def client():
+    sync_client = Mock()
+    sync_client.list_events = blocking([])
+    sync_client._make_request = blocking({"value": []})
+    return AsyncCheckmkClient(sync_client)
+
+
+class TestServicesDoNotBlockLoop:
+    """Test that slow API calls run off the event loop thread."""
+
+    @pytest.mark.asyncio
+    async def test_event_service_list_and_search(self, client):
+        service = EventService(client, Mock())
+
+        result, gap = await max_loop_gap(service.list_events(host="web01"))
+        assert result.success
+        assert gap < BLOCKING_SECONDS / 2
+
+        result, gap = await max_loop_gap(service.search_events("disk"))
+        assert result.success
+        assert gap < BLOCKING_SECONDS / 2
+
+    @pytest.mark.asyncio
+    async def test_raw_api_requests(self, client):
+        for service_class in (EventService, MetricsService, BIService):
+            service = service_class(client, Mock())
+            result, gap = await max_loop_gap(
+                service._make_api_request("GET", "/objects/test")
+            )
+            assert result == {"value": []}
+            assert gap < BLOCKING_SECONDS / 2
+
+
+class TestRetryOnFailure:
+    """Test retries of coroutine functions."""
+
+    @pytest.mark.asyncio
+    async def test_coroutine_retries_without_blocking(self):
+        attempts = []
+
+        @retry_on_failure(max_retries=2, delay=BLOCKING_SECONDS / 2, backoff_multiplier=1)
+        async def flaky():
+            attempts.append(threading.get_ident())
+            if len(attempts) < 3:
+                raise ConnectionError("reset")
+            return "ok"
+
+        result, gap = await max_loop_gap(flaky())
+
+        assert result == "ok"
+        assert len(attempts) == 3
+        assert gap < BLOCKING_SECONDS / 2
+
+    @pytest.mark.asyncio
+    async def test_coroutine_gives_up(self):
+        @retry_on_failure(max_retries=1, delay=0)
+        async def failing():
+            raise ConnectionError("reset")
+
+        with pytest.raises(ConnectionError):
+            await failing()
@@ -0,0 +1,174 @@
+"""Tests for the OpenMetrics exposition."""
+
+import asyncio
+import time
+
+import pytest
+
+from checkmk_mcp_server.api_client import endpoint_template
+from checkmk_mcp_server.services.cache import LRUCache, get_all_cache_stats
+from checkmk_mcp_server.services.loop_monitor import EventLoopMonitor, LoopStallDetector
+from checkmk_mcp_server.services.metrics import MetricsCollector
+from checkmk_mcp_server.services.openmetrics import (
+    MetricsHTTPServer,
+    metric_name,
+    render_openmetrics,
+)
+from checkmk_mcp_server.services.recovery import (
+    CircuitBreaker,
+    CircuitState,
+    get_all_circuit_breaker_stats,
+)
+
+
+def sample_lines(text, family):
+    return [line for line in text.splitlines() if line.startswith(family)]
+
+
+class TestRenderOpenMetrics:
+    """Test the exposition text."""
+
+    def test_collector_series(self):
+        collector = MetricsCollector()
+        collector.observe_timing("mcp.tool_call", 0.004, tool="list_hosts", status="ok")
+        collector.observe_timing("mcp.tool_call", 0.2, tool="list_hosts", status="ok")
+        collector.add_counter("batch.items", 3, status="success")
+        collector.update_gauge("queue.size", 7)
+
+        text = render_openmetrics(collector)
+
+        assert "# TYPE checkmk_mcp_mcp_tool_call_seconds histogram" in text
+        assert "# UNIT checkmk_mcp_mcp_tool_call_seconds seconds" in text
+        assert (
+            'checkmk_mcp_mcp_tool_call_seconds_bucket{status="ok",tool="list_hosts",le="0.005"} 1'
+            in text
+        )
+        assert (
+            'checkmk_mcp_mcp_tool_call_seconds_bucket{status="ok",tool="list_hosts",le="+Inf"} 2'
+            in text
+        )
+        assert 'checkmk_mcp_mcp_tool_call_seconds_count{status="ok",tool="list_hosts"} 2' in text
+        assert "# TYPE checkmk_mcp_batch_items counter" in text
+        assert 'checkmk_mcp_batch_items_total{status="success"} 3' in text
+        assert "checkmk_mcp_queue_size 7" in text
+        assert text.endswith("# EOF\n")
+
+    def test_each_family_declared_once(self):
+        collector = MetricsCollector()
+        for endpoint in ("/a", "/b"):
+            collector.observe_timing("checkmk_api.request", 0.1, endpoint=endpoint)
+
+        text = render_openmetrics(collector)
+
+        assert text.count("# TYPE checkmk_mcp_checkmk_api_request_seconds ") == 1
+        assert len(sample_lines(text, "checkmk_mcp_checkmk_api_request_seconds_count")) == 2
+
+    def test_label_values_are_escaped(self):
+        collector = MetricsCollector()
+        collector.add_counter("errors", reason='bad "quote"\nline')
+
+        text = render_openmetrics(collector)
+
+        assert 'checkmk_mcp_errors_total{reason="bad \\"quote\\"\\nline"} 1' in text
+
+    def test_registries(self):
+        cache = LRUCache(name="test_cache")
+        cache._stats.hits, cache._stats.misses = 3, 1
+        breaker = CircuitBreaker(name="test_breaker")
+        breaker._state = CircuitState.OPEN
+
+        text = render_openmetrics(MetricsCollector())
+
+        assert 'checkmk_mcp_cache_hit_ratio{cache="test_cache"} 0.75' in text
+        assert 'checkmk_mcp_cache_hits_total{cache="test_cache"} 3' in text
+        assert (
+            'checkmk_mcp_circuit_breaker_state{breaker="test_breaker",'
+            'checkmk_mcp_circuit_breaker_state="open"} 1'
+        ) in text
+        assert "checkmk_mcp_executor_queue_depth" in text
+        assert get_all_cache_stats()["test_cache"]["hit_rate"] == 0.75
+        assert get_all_circuit_breaker_stats()["test_breaker"]["state"] == "open"
+
+    def test_metric_name(self):
+        assert metric_name("CachedHostService.list-hosts") == (
+            "checkmk_mcp_cachedhostservice_list_hosts"
+        )
+
+
+class TestEndpointTemplate:
+    """Test REST endpoint normalization for per-endpoint metrics."""
+
+    def test_object_ids_are_replaced(self):
+        assert endpoint_template("objects/host_config/web01") == "/objects/host_config/{id}"
+        assert (
+            endpoint_template("/objects/host/web01/collections/services")
+            == "/objects/host/{id}/collections/services"
+        )
+        assert (
+            endpoint_template("/domain-types/host_config/collections/all")
+            == "/domain-types/host_config/collections/all"
+        )
+
+
+class TestRuntimeExport:
+    """Test the HTTP listener and event loop monitor."""
+
+    @pytest.mark.asyncio
+    async def test_http_listener_serves_metrics(self):
+        server = MetricsHTTPServer(port=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.bound_port)
+            writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            await writer.drain()
+            response = (await reader.read()).decode()
+            writer.close()
+
+            assert response.startswith("HTTP/1.1 200 OK")
+            assert "application/openmetrics-text" in response
+            assert response.endswith("# EOF\n")
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.bound_port)
+            writer.write(b"GET /other HTTP/1.1\r\n\r\n")
+            await writer.drain()
+            assert (await reader.read()).startswith(b"HTTP/1.1 404")
+            writer.close()
+        finally:
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_event_loop_monitor_records_lag(self):
+        collector = MetricsCollector()
+        monitor = EventLoopMonitor(interval=0.01, collector=collector)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        # Block the loop so the next probe wakes up late
+        time.sleep(0.05)
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+        assert monitor.samples > 0
+        assert monitor.max_lag >= 0.03
+        assert collector.get_histogram("event_loop.lag").count == monitor.samples
+        assert not monitor.running
+
+    @pytest.mark.asyncio
+    async def test_stall_detector_reports_blocking_stack(self, caplog):
+        collector = MetricsCollector()
+        detector = LoopStallDetector(threshold=0.04, collector=collector)
+        detector.start()
+        try:
+            await asyncio.sleep(0.05)
+            with caplog.at_level("WARNING", logger="checkmk_mcp_server.services.loop_monitor"):
+                time.sleep(0.2)  # blocks the loop
+                await asyncio.sleep(0.05)
+        finally:
+            detector.stop()
+
+        stats = detector.get_stats()
+        assert stats["stalls"] == 1
+        assert stats["recent"][0]["duration_seconds"] >= 0.15
+        assert any("time.sleep(0.2)" in line for line in stats["recent"][0]["stack"])
+        assert "test_stall_detector_reports_blocking_stack" in caplog.text
+        assert collector.get_histogram("event_loop.stall").count == 1
+        assert not detector.running
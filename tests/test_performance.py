@@ -109,23 +109,17 @@ class TestStreamingPerformance:
         total_items = 10000
         batch_size = 100
 
-        def create_batch_data(offset, limit):
-            return {
-                "value": [
-                    {"id": f"host_{i}", "folder": "/", "attributes": {}}
-                    for i in range(offset, min(offset + limit, total_items))
-                ],
-                "total_count": total_items,
-            }
-
-        # Mock API responses
+        # Mock API response; the host collection is fetched in one call
         call_count = 0
 
-        async def mock_list_hosts(limit=None, offset=0, **kwargs):
+        async def mock_list_hosts(**kwargs):
             nonlocal call_count
             call_count += 1
             await asyncio.sleep(0.001)  # Simulate small API delay
-            return create_batch_data(offset, limit)
+            return [
+                {"id": f"host_{i}", "folder": "/", "attributes": {}}
+                for i in range(total_items)
+            ]
 
         streaming_service.checkmk.list_hosts = mock_list_hosts
 
@@ -144,6 +138,8 @@ class TestStreamingPerformance:
         print(f"Streaming throughput: {items_per_second:.0f} items/second")
         print(f"Processed {processed_items} items in {duration:.2f} seconds")
 
+        assert processed_items == 5000
+        assert call_count == 1
         # Should process at least 500 items/second (conservative estimate)
         assert items_per_second > 500
 
@@ -163,26 +159,20 @@ class TestStreamingPerformance:
         # Mock large dataset that would consume significant memory if loaded all at once
         total_items = 50000
 
-        def create_batch_data(offset, limit):
-            return {
-                "value": [
-                    {
-                        "id": f"host_{i}",
-                        "folder": f"/folder/{i % 10}",
-                        "attributes": {
-                            "alias": f"Host {i}",
-                            "description": f"This is host number {i} with lots of data"
-                            * 10,
-                        },
-                    }
-                    for i in range(offset, min(offset + limit, total_items))
-                ],
-                "total_count": total_items,
-            }
-
-        async def mock_list_hosts(limit=None, offset=0, **kwargs):
+        async def mock_list_hosts(**kwargs):
             await asyncio.sleep(0.001)
-            return create_batch_data(offset, limit)
+            return [
+                {
+                    "id": f"host_{i}",
+                    "folder": f"/folder/{i % 10}",
+                    "attributes": {
+                        "alias": f"Host {i}",
+                        "description": f"This is host number {i} with lots of data"
+                        * 10,
+                    },
+                }
+                for i in range(total_items)
+            ]
 
         streaming_service.checkmk.list_hosts = mock_list_hosts
 
@@ -0,0 +1,140 @@
+"""Tests for on-demand tool call profiling."""
+
+import pstats
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from checkmk_mcp_server.async_api_client import AsyncCheckmkClient
+from checkmk_mcp_server.mcp_server.handlers.registry import ToolRegistry
+from checkmk_mcp_server.utils.profiling import (
+    ToolProfiler,
+    collapse_pstats,
+    get_active_capture,
+    get_tool_profiler,
+)
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return seconds
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = get_tool_profiler()
+    original_dir = profiler.output_dir
+    profiler.configure(output_dir=tmp_path, sample_interval=0.001)
+    yield profiler
+    if profiler.armed:
+        profiler.stop()
+    profiler.configure(output_dir=original_dir, sample_interval=0.005)
+
+
+@pytest.fixture
+def registry():
+    sync_client = Mock()
+    sync_client.list_hosts = lambda effective_attributes=False: busy(0.02) and []
+    client = AsyncCheckmkClient(sync_client)
+    registry = ToolRegistry()
+
+    async def list_hosts():
+        busy(0.01)
+        return {"success": True, "data": await client.list_hosts()}
+
+    async def get_version():
+        return {"success": True}
+
+    registry.register_tool("list_hosts", Mock(), list_hosts)
+    registry.register_tool("get_version", Mock(), get_version)
+    return registry
+
+
+class TestToolProfiler:
+    """Test arming and session lifecycle."""
+
+    def test_unarmed_by_default(self):
+        assert not ToolProfiler().armed
+        assert get_active_capture() is None
+
+    def test_arm_validation(self, tmp_path):
+        profiler = ToolProfiler(output_dir=tmp_path)
+        with pytest.raises(ValueError):
+            profiler.arm(mode="perf")
+        with pytest.raises(ValueError):
+            profiler.arm(calls=0)
+
+        profiler.arm(tool="list_hosts")
+        with pytest.raises(RuntimeError):
+            profiler.arm(tool="list_hosts")
+
+    @pytest.mark.asyncio
+    async def test_cprofile_next_calls(self, profiler, registry):
+        profiler.arm(tool="list_hosts", calls=2)
+
+        await registry.execute_tool_call("get_version", {}, lambda: True)
+        first = await registry.execute_tool_call("list_hosts", {}, lambda: True)
+        assert profiler.armed
+        second = await registry.execute_tool_call("list_hosts", {}, lambda: True)
+
+        assert not profiler.armed
+        result = profiler.get_status()
+        assert result["profiled_request_ids"] == [
+            first["meta"]["request_id"],
+            second["meta"]["request_id"],
+        ]
+        stats = pstats.Stats(result["files"]["pstats"])
+        functions = {name for _, _, name in stats.stats}
+        # Loop thread and executor thread work are both captured
+        assert "list_hosts" in functions
+        assert "<lambda>" in functions
+        with open(result["files"]["collapsed"]) as f:
+            assert any("busy" in line for line in f)
+
+    @pytest.mark.asyncio
+    async def test_sampling_window(self, profiler, registry):
+        profiler.arm(tool="list_hosts", duration=0.2, mode="sampling")
+
+        await registry.execute_tool_call("list_hosts", {}, lambda: True)
+        result = await profiler.wait(timeout=2)
+
+        assert result["completed_calls"] == 1
+        assert "pstats" not in result["files"]
+        with open(result["files"]["collapsed"]) as f:
+            lines = f.read().splitlines()
+        assert lines
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    @pytest.mark.asyncio
+    async def test_stop_writes_partial_session(self, profiler):
+        profiler.arm(tool="list_hosts", calls=5)
+
+        result = profiler.stop()
+
+        assert not profiler.armed
+        assert result["completed_calls"] == 0
+        assert result["files"]["collapsed"].startswith(str(profiler.output_dir))
+
+
+class TestCollapsePstats:
+    """Test flamegraph conversion of cProfile output."""
+
+    def test_stacks_follow_call_graph(self):
+        import cProfile
+
+        def outer():
+            busy(0.01)
+
+        profile = cProfile.Profile()
+        profile.enable()
+        outer()
+        profile.disable()
+
+        collapsed = collapse_pstats(pstats.Stats(profile))
+
+        busy_stacks = [stack for stack in collapsed if stack.split(";")[-1].startswith("busy")]
+        assert busy_stacks
+        assert all("outer" in stack for stack in busy_stacks)
@@ -0,0 +1,159 @@
+"""Tests for the process-wide Checkmk API rate limiter."""
+
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from checkmk_mcp_server.api_client import CheckmkClient, CheckmkAPIError
+from checkmk_mcp_server.config import CheckmkConfig, RateLimitConfig
+from checkmk_mcp_server.utils.rate_limiter import (
+    TokenBucket,
+    CheckmkRateLimiter,
+    classify_endpoint,
+    parse_retry_after,
+    get_rate_limiter,
+    reset_rate_limiters,
+    READ,
+    WRITE,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_rate_limiters():
+    """Isolate the process-wide limiter registry between tests."""
+    reset_rate_limiters()
+    yield
+    reset_rate_limiters()
+
+
+class TestEndpointClassification:
+    """Test read/write classification of REST calls."""
+
+    def test_get_is_read(self):
+        assert classify_endpoint("GET", "/objects/host_config/web01") == READ
+        assert classify_endpoint("get", "version") == READ
+
+    def test_query_posts_are_read(self):
+        assert classify_endpoint("POST", "/domain-types/service/collections/all") == READ
+        assert classify_endpoint("POST", "domain-types/service/collections/all") == READ
+        assert classify_endpoint("POST", "/objects/host/web01/collections/services") == READ
+        assert classify_endpoint("POST", "/domain-types/metric/actions/get/invoke") == READ
+
+    def test_mutations_are_write(self):
+        assert classify_endpoint("POST", "/domain-types/host_config/collections/all") == WRITE
+        assert classify_endpoint("PUT", "/objects/rule/abc") == WRITE
+        assert classify_endpoint("DELETE", "/objects/host_config/web01") == WRITE
+
+
+class TestRetryAfter:
+    """Test Retry-After parsing."""
+
+    def test_seconds(self):
+        assert parse_retry_after("5") == 5.0
+        assert parse_retry_after(" 0.5 ") == 0.5
+
+    def test_http_date(self):
+        delay = parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT")
+        assert delay == 0.0  # In the past
+
+    def test_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(Mock()) is None
+
+
+class TestTokenBucket:
+    """Test token bucket behaviour."""
+
+    def test_unlimited_never_waits(self):
+        bucket = TokenBucket(rate=None)
+        assert all(bucket.reserve() == 0 for _ in range(1000))
+
+    def test_burst_then_throttle(self):
+        bucket = TokenBucket(rate=10, capacity=5)
+        waits = [bucket.reserve() for _ in range(8)]
+
+        assert waits[:5] == [0, 0, 0, 0, 0]
+        # Subsequent reservations are spaced 1/rate apart
+        assert waits[5] == pytest.approx(0.1, abs=0.02)
+        assert waits[7] == pytest.approx(0.3, abs=0.02)
+        assert bucket.throttled == 3
+
+    def test_pause_blocks_all_callers(self):
+        bucket = TokenBucket(rate=None)
+        bucket.pause(0.5)
+        assert bucket.reserve() == pytest.approx(0.5, abs=0.05)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_async_callers_are_spaced(self):
+        """Concurrent workers must not all pass the check at once."""
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+
+        await asyncio.gather(*(bucket.acquire_async() for _ in range(6)))
+
+        # 1 token up front, then 5 more at 50/s
+        assert time.monotonic() - start >= 0.09
+
+
+class TestCheckmkRateLimiter:
+    """Test the shared limiter and its integration with CheckmkClient."""
+
+    def test_separate_read_and_write_buckets(self):
+        limiter = CheckmkRateLimiter(read_rate=100, read_burst=1, write_rate=1, write_burst=1)
+
+        assert limiter.acquire("POST", "/domain-types/host_config/collections/all") == 0
+        assert limiter.acquire("GET", "/version") == 0
+        # Write bucket is empty now but reads are unaffected by it
+        assert limiter.bucket_for("DELETE", "/objects/rule/x").reserve() > 0.5
+        assert limiter.bucket_for("GET", "/version").reserve() < 0.05
+
+    def test_registry_is_shared_per_server(self):
+        config = RateLimitConfig(read_requests_per_second=5)
+        first = get_rate_limiter("https://a/site", config)
+        assert get_rate_limiter("https://a/site") is first
+        assert get_rate_limiter("https://b/site") is not first
+        assert first.buckets[READ].rate == 5
+
+    def test_clients_share_limiter(self):
+        config = CheckmkConfig(
+            server_url="https://test-checkmk.com",
+            username="user",
+            password="pass",
+            site="site",
+            rate_limit=RateLimitConfig(write_requests_per_second=2),
+        )
+        client_a = CheckmkClient(config)
+        client_b = CheckmkClient(config)
+
+        assert client_a.rate_limiter is client_b.rate_limiter
+        assert client_a.rate_limiter.buckets[WRITE].rate == 2
+
+    @patch("checkmk_mcp_server.api_client.requests.Session.request")
+    def test_429_pauses_bucket(self, mock_request):
+        config = CheckmkConfig(
+            server_url="https://test-checkmk.com",
+            username="user",
+            password="pass",
+            site="site",
+        )
+        client = CheckmkClient(config)
+
+        response = Mock()
+        response.status_code = 429
+        response.headers = {"Retry-After": "30"}
+        response.json.return_value = {"title": "Too many requests"}
+        mock_request.return_value = response
+
+        with patch("checkmk_mcp_server.common.time.sleep"), patch(
+            "checkmk_mcp_server.utils.rate_limiter.time.sleep"
+        ):
+            with pytest.raises(CheckmkAPIError) as exc_info:
+                client._make_request("GET", "/version")
+
+        assert exc_info.value.status_code == 429
+        read_stats = client.rate_limiter.get_stats()[READ]
+        assert read_stats["blocked_for_seconds"] > 25
+        assert read_stats["throttled"] >= 1
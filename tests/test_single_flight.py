@@ -0,0 +1,271 @@
+"""Tests for coalescing identical concurrent Checkmk reads."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+from checkmk_mcp_server.api_client import CheckmkAPIError, CheckmkClient
+from checkmk_mcp_server.async_api_client import AsyncCheckmkClient
+from checkmk_mcp_server.config import CheckmkConfig, CoalescingConfig
+from checkmk_mcp_server.utils.request_context import (
+    CANCELLATION_CONTEXT,
+    DeadlineExceeded,
+    RequestCancelled,
+)
+from checkmk_mcp_server.utils.single_flight import (
+    SingleFlight,
+    get_all_single_flight_stats,
+    request_key,
+    reset_single_flights,
+)
+
+SERVICES = "/domain-types/service/collections/all"
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    reset_single_flights()
+    yield
+    reset_single_flights()
+
+
+def make_client(**coalescing):
+    config = CheckmkConfig(
+        server_url="https://test-checkmk.com",
+        username="user",
+        password="pass",
+        site="site",
+        coalescing=CoalescingConfig(**coalescing),
+    )
+    return CheckmkClient(config)
+
+
+def slow_response(calls, delay=0.1):
+    def request(**kwargs):
+        calls.append(kwargs)
+        time.sleep(delay)
+        response = Mock()
+        response.status_code = 200
+        response.content = b"{}"
+        response.json.return_value = {"value": [{"id": "web01/CPU load"}]}
+        return response
+
+    return request
+
+
+def run_together(func, count):
+    barrier = threading.Barrier(count)
+
+    def call():
+        barrier.wait()
+        return func()
+
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        futures = [pool.submit(call) for _ in range(count)]
+    return [future.result() for future in futures]
+
+
+class TestRequestKey:
+    """Test which requests are coalesced and what makes them identical."""
+
+    def test_reads_keyed_by_method_endpoint_params_and_body(self):
+        key = request_key("POST", SERVICES, {"json": {"columns": ["a", "b"], "query": None}})
+
+        assert key == request_key(
+            "post",
+            SERVICES.lstrip("/"),
+            {"json": {"query": None, "columns": ["a", "b"]}, "headers": {"X-Request-ID": "x"}},
+        )
+        assert key != request_key("POST", SERVICES, {"json": {"columns": ["a"]}})
+        assert request_key("GET", "/version", {"params": {"a": 1}}) != request_key(
+            "GET", "/version", {"params": {"a": 2}}
+        )
+
+    def test_writes_and_unkeyed_options_not_coalesced(self):
+        assert request_key("POST", "/domain-types/host_config/collections/all", {}) is None
+        assert request_key("DELETE", "/objects/host_config/web01", {}) is None
+        assert request_key("GET", "/version", {"stream": True}) is None
+
+
+class TestSingleFlight:
+    """Test sharing of one call between concurrent callers."""
+
+    def test_concurrent_calls_share_one_result(self):
+        group = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"value": [1, 2]}
+
+        results = run_together(lambda: group.do("key", fetch), 4)
+
+        assert len(calls) == 1
+        assert all(result == {"value": [1, 2]} for result in results)
+        assert len({id(result) for result in results}) == 4
+        assert group.get_stats()["coalesced"] == 3
+        assert group.get_stats()["in_flight"] == 0
+
+    def test_shared_results_copied_shallow_unless_cached(self):
+        def fetch():
+            time.sleep(0.1)
+            return {"value": [{"id": "web01"}]}
+
+        group = SingleFlight()
+        first, second = run_together(lambda: group.do("key", fetch), 2)
+        assert first is not second
+        assert first["value"] is second["value"]
+
+        cached = SingleFlight(ttl=5)
+        first = cached.do("key", fetch)
+        second = cached.do("key", fetch)
+        assert first == second
+        assert first["value"] is not second["value"]
+
+    def test_cancelled_waiter_stops_waiting(self):
+        group = SingleFlight()
+        started = threading.Event()
+        cancelled = threading.Event()
+
+        def leader():
+            started.set()
+            time.sleep(1)
+            return "late"
+
+        def waiter():
+            CANCELLATION_CONTEXT.set(cancelled)
+            began = time.monotonic()
+            with pytest.raises(RequestCancelled):
+                group.do("key", lambda: "own")
+            return time.monotonic() - began
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            pool.submit(group.do, "key", leader)
+            started.wait(1)
+            waited = pool.submit(waiter)
+            time.sleep(0.1)
+            cancelled.set()
+            assert waited.result() < 0.5
+
+    def test_error_shared(self):
+        group = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            raise CheckmkAPIError("boom", status_code=500)
+
+        def call():
+            try:
+                return group.do("key", fetch)
+            except CheckmkAPIError as e:
+                return e.status_code
+
+        assert run_together(call, 3) == [500, 500, 500]
+        assert len(calls) == 1
+
+    def test_ttl_reuses_finished_result(self):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return {"value": []}
+
+        group = SingleFlight(ttl=0.2)
+        group.do("key", fetch)
+        group.do("key", fetch)
+        assert len(calls) == 1
+        assert group.get_stats()["reused"] == 1
+
+        time.sleep(0.25)
+        group.do("key", fetch)
+        assert len(calls) == 2
+
+        SingleFlight().do("key", fetch)
+        SingleFlight().do("key", fetch)
+        assert len(calls) == 4
+
+    def test_leader_deadline_not_shared(self):
+        group = SingleFlight()
+        started = threading.Event()
+        calls = []
+
+        def leader():
+            calls.append("leader")
+            started.set()
+            time.sleep(0.1)
+            raise DeadlineExceeded("leader out of time")
+
+        def follower():
+            calls.append("follower")
+            return "own result"
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(group.do, "key", leader)
+            started.wait(1)
+            second = pool.submit(group.do, "key", follower)
+
+        with pytest.raises(DeadlineExceeded):
+            first.result()
+        assert second.result() == "own result"
+        assert calls == ["leader", "follower"]
+
+
+class TestClientCoalescing:
+    """Test coalescing in the API client."""
+
+    @pytest.mark.asyncio
+    async def test_identical_async_reads_share_one_request(self):
+        client = make_client()
+        calls = []
+        body = {"columns": ["host_name", "description", "state"]}
+
+        with patch.object(client.session, "request", side_effect=slow_response(calls)):
+            results = await asyncio.gather(
+                *(
+                    AsyncCheckmkClient(client).make_request("POST", SERVICES, json=body)
+                    for _ in range(5)
+                )
+            )
+
+        assert len(calls) == 1
+        assert all(result == results[0] for result in results)
+        assert get_all_single_flight_stats()[
+            f"user@{client.base_url}"
+        ]["coalesced"] == 4
+
+    def test_writes_and_different_reads_not_shared(self):
+        client = make_client()
+        calls = []
+
+        with patch.object(client.session, "request", side_effect=slow_response(calls)):
+            run_together(lambda: client._make_request("POST", SERVICES, json={"q": 1}), 2)
+            run_together(
+                lambda: client._make_request(
+                    "POST", "/domain-types/host_config/collections/all", json={"host_name": "a"}
+                ),
+                2,
+            )
+            client._make_request("POST", SERVICES, json={"q": 2})
+
+        assert len(calls) == 4
+
+    def test_disabled(self):
+        client = make_client(enabled=False)
+        calls = []
+
+        assert client.single_flight is None
+        with patch.object(client.session, "request", side_effect=slow_response(calls)):
+            run_together(lambda: client._make_request("GET", "/version"), 2)
+
+        assert len(calls) == 2
+
+    def test_ttl_validation(self):
+        with pytest.raises(ValueError):
+            CoalescingConfig(ttl=-1)
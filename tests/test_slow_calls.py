@@ -0,0 +1,187 @@
+"""Tests for the slow call log."""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from checkmk_mcp_server.api_client import CheckmkClient
+from checkmk_mcp_server.common import get_retry_attempt, retry_on_failure
+from checkmk_mcp_server.config import CheckmkConfig
+from checkmk_mcp_server.mcp_server.handlers.registry import ToolRegistry
+from checkmk_mcp_server.utils.call_breakdown import CallBreakdown
+from checkmk_mcp_server.utils.slow_calls import (
+    SlowCallLog,
+    arguments_hash,
+    get_slow_call_log,
+    row_count,
+)
+
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def slow_log(tmp_path):
+    slow_log = get_slow_call_log()
+    original = slow_log.get_stats()
+    slow_log.configure(
+        path=tmp_path / "slow.jsonl", tool_threshold=0.0, request_threshold=0.0
+    )
+    yield slow_log
+    slow_log.configure(
+        path=original["path"],
+        tool_threshold=original["tool_threshold_seconds"],
+        request_threshold=original["request_threshold_seconds"],
+        tool_thresholds={},
+        endpoint_thresholds={},
+    )
+
+
+class TestSlowCallLog:
+    """Test thresholds and records."""
+
+    def test_thresholds(self, tmp_path):
+        slow_log = SlowCallLog(
+            path=tmp_path / "slow.jsonl",
+            tool_thresholds={"list_hosts": 5.0},
+            endpoint_thresholds={
+                "GET /objects/host/{id}": 0.1,
+                "/domain-types/host_config/collections/all": 3.0,
+            },
+        )
+
+        assert slow_log.tool_threshold_for("list_hosts") == 5.0
+        assert slow_log.tool_threshold_for("get_host") == 2.0
+        assert slow_log.endpoint_threshold_for("GET", "/objects/host/{id}") == 0.1
+        assert slow_log.endpoint_threshold_for("POST", "/objects/host/{id}") == 1.0
+        assert (
+            slow_log.endpoint_threshold_for(
+                "GET", "/domain-types/host_config/collections/all"
+            )
+            == 3.0
+        )
+
+    def test_fast_calls_are_not_written(self, tmp_path):
+        slow_log = SlowCallLog(path=tmp_path / "slow.jsonl")
+
+        assert not slow_log.check_request("req_1", "GET", "/version", 0.01, "200")
+        assert not (tmp_path / "slow.jsonl").exists()
+
+    def test_request_record(self, tmp_path):
+        slow_log = SlowCallLog(path=tmp_path / "slow.jsonl", request_threshold=0.5)
+
+        assert slow_log.check_request(
+            "req_1",
+            "GET",
+            "/domain-types/host_config/collections/all",
+            0.75,
+            "200",
+            arguments={"params": {"effective_attributes": True}},
+            response_bytes=2048,
+            response_data={"value": [{}, {}, {}]},
+            retry_count=1,
+        )
+
+        (record,) = read_records(tmp_path / "slow.jsonl")
+        assert record["kind"] == "checkmk_api"
+        assert record["duration_ms"] == 750.0
+        assert record["threshold_ms"] == 500.0
+        assert record["row_count"] == 3
+        assert record["retry_count"] == 1
+        assert record["arguments_hash"] == arguments_hash(
+            {"params": {"effective_attributes": True}}
+        )
+
+    def test_rotation(self, tmp_path):
+        slow_log = SlowCallLog(
+            path=tmp_path / "slow.jsonl",
+            request_threshold=0.0,
+            max_bytes=400,
+            backup_count=1,
+        )
+        for _ in range(10):
+            slow_log.check_request("req_1", "GET", "/version", 0.1, "200")
+        slow_log.close()
+
+        assert (tmp_path / "slow.jsonl.1").exists()
+        assert slow_log.records_written == 10
+
+    def test_helpers(self):
+        assert row_count({"data": {"value": [1, 2]}}) == 2
+        assert row_count({"success": True}) is None
+        assert arguments_hash({}) is None
+        assert arguments_hash({"a": 1, "b": 2}) == arguments_hash({"b": 2, "a": 1})
+
+
+class TestSlowCallIntegration:
+    """Test records written by tool calls and REST requests."""
+
+    @pytest.mark.asyncio
+    async def test_tool_call_record(self, slow_log):
+        registry = ToolRegistry()
+
+        async def list_hosts(search=None):
+            return {"success": True, "data": [{"name": "web01"}, {"name": "web02"}]}
+
+        registry.register_tool("list_hosts", Mock(), list_hosts)
+        result = await registry.execute_tool_call(
+            "list_hosts", {"search": "web"}, lambda: True
+        )
+
+        (record,) = read_records(slow_log.path)
+        assert record["kind"] == "tool_call"
+        assert record["request_id"] == result["meta"]["request_id"]
+        assert record["row_count"] == 2
+        assert record["response_bytes"] > 0
+        assert "handler" in record["phases_ms"]
+        assert record["arguments_hash"] == arguments_hash({"search": "web"})
+
+    @patch("checkmk_mcp_server.api_client.requests.Session.request")
+    def test_request_record_counts_retries(self, mock_request, slow_log):
+        client = CheckmkClient(
+            CheckmkConfig(
+                server_url="https://test-checkmk.com",
+                username="user",
+                password="pass",
+                site="site",
+            )
+        )
+        response = Mock(status_code=200, content=b'{"value": [1]}')
+        response.json.return_value = {"value": [1]}
+        mock_request.return_value = response
+
+        client._make_request("GET", "/objects/host_config/web01")
+
+        (record,) = read_records(slow_log.path)
+        assert record["endpoint"] == "/objects/host_config/{id}"
+        assert record["response_bytes"] == 14
+        assert record["row_count"] == 1
+        assert record["retry_count"] == 0
+
+
+class TestRetryAttempt:
+    """Test retry attempt tracking in retry_on_failure."""
+
+    def test_attempt_is_visible_to_the_wrapped_call(self):
+        attempts = []
+
+        @retry_on_failure(max_retries=2, delay=0)
+        def flaky():
+            attempts.append(get_retry_attempt())
+            if len(attempts) < 3:
+                raise ConnectionError("temporary")
+            return "ok"
+
+        assert flaky() == "ok"
+        assert attempts == [0, 1, 2]
+        assert get_retry_attempt() == 0
+
+    def test_breakdown_counts_retries(self):
+        breakdown = CallBreakdown("req_1", "get_host")
+        breakdown.add_rest_call("GET", "/version", 0.1)
+        breakdown.add_rest_call("GET", "/version", 0.1, retried=True)
+
+        assert breakdown.to_dict()["retries"] == 1
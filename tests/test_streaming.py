@@ -1,11 +1,13 @@
 """Tests for streaming functionality."""
 
+import json
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, Mock
 from datetime import datetime
 
 from checkmk_mcp_server.services.streaming import (
+    NDJSONPager,
     StreamingMixin,
     StreamBatch,
     StreamingHostService,
@@ -141,6 +143,18 @@ class TestStreamingMixin:
         assert processed_items == ["item1", "item2", "item3"]
 
 
+def service_row(host, description, state):
+    """Service row as returned by the monitoring data collection."""
+    return {
+        "extensions": {
+            "host_name": host,
+            "description": description,
+            "state": state,
+            "plugin_output": "output",
+        }
+    }
+
+
 class TestStreamingHostService:
     """Test StreamingHostService functionality."""
 
@@ -152,32 +166,75 @@ class TestStreamingHostService:
 
     @pytest.mark.asyncio
     async def test_list_hosts_streamed(self, streaming_host_service, sample_hosts):
-        """Test streaming hosts."""
-        # Mock the checkmk client
-        streaming_host_service.checkmk.list_hosts = AsyncMock()
-
-        # First call returns 2 hosts
-        streaming_host_service.checkmk.list_hosts.side_effect = [
-            {"value": sample_hosts[:2], "total_count": 3},
-            {"value": sample_hosts[2:], "total_count": 3},
-        ]
+        """Test streaming hosts fetches the inventory once."""
+        streaming_host_service.checkmk.list_hosts = AsyncMock(return_value=sample_hosts)
 
-        # Test streaming
         batches = []
         async for batch in streaming_host_service.list_hosts_streamed(batch_size=2):
             batches.append(batch)
-            if len(batches) >= 2:  # Prevent infinite loop
-                break
 
-        assert len(batches) == 2
-        assert len(batches[0].items) == 2
-        assert len(batches[1].items) == 1
+        streaming_host_service.checkmk.list_hosts.assert_awaited_once_with()
+        assert [len(batch.items) for batch in batches] == [2, 1]
+        assert [batch.has_more for batch in batches] == [True, False]
+        assert [batch.batch_number for batch in batches] == [0, 1]
 
         # Check that HostInfo objects were created
         assert isinstance(batches[0].items[0], HostInfo)
         assert batches[0].items[0].name == "host1"
         assert batches[0].items[1].name == "host2"
         assert batches[1].items[0].name == "host3"
+        assert batches[1].metadata["fetched_count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_list_hosts_streamed_with_filter(self, streaming_host_service):
+        """Test has_more stays exact when filters drop hosts."""
+        hosts = [
+            {"id": f"host{i}", "extensions": {"folder": "/servers" if i < 3 else "/"}}
+            for i in range(6)
+        ]
+        streaming_host_service.checkmk.list_hosts = AsyncMock(return_value=hosts)
+
+        batches = []
+        async for batch in streaming_host_service.list_hosts_streamed(
+            batch_size=3, folder="/servers"
+        ):
+            batches.append(batch)
+
+        assert len(batches) == 1
+        assert [host.name for host in batches[0].items] == ["host0", "host1", "host2"]
+        assert batches[0].has_more is False
+
+    @pytest.mark.asyncio
+    async def test_iter_ndjson(self, streaming_host_service, sample_hosts):
+        """Test hosts serialize as one JSON object per line."""
+        streaming_host_service.checkmk.list_hosts = AsyncMock(return_value=sample_hosts)
+
+        chunks = [
+            chunk
+            async for chunk in streaming_host_service.iter_ndjson(
+                streaming_host_service.list_hosts_streamed(batch_size=2)
+            )
+        ]
+
+        assert len(chunks) == 2
+        lines = "".join(chunks).splitlines()
+        assert [json.loads(line)["name"] for line in lines] == ["host1", "host2", "host3"]
+
+    @pytest.mark.asyncio
+    async def test_iter_ndjson_error(self, streaming_host_service):
+        """Test a failed fetch becomes an error line."""
+        streaming_host_service.checkmk.list_hosts = AsyncMock(
+            side_effect=Exception("API Error")
+        )
+
+        chunks = [
+            chunk
+            async for chunk in streaming_host_service.iter_ndjson(
+                streaming_host_service.list_hosts_streamed()
+            )
+        ]
+
+        assert [json.loads(chunk) for chunk in chunks] == [{"error": "API Error"}]
 
 
 class TestStreamingServiceService:
@@ -192,40 +249,39 @@ class TestStreamingServiceService:
     @pytest.mark.asyncio
     async def test_list_all_services_streamed(self, streaming_service_service):
         """Test streaming all services."""
-        # Mock data
-        hosts_data = [{"id": "host1"}, {"id": "host2"}]
-
-        services_host1 = [
-            {"description": "CPU", "state": 0, "plugin_output": "OK"},
-            {"description": "Memory", "state": 1, "plugin_output": "Warning"},
-        ]
-
-        services_host2 = [
-            {"description": "Disk", "state": 2, "plugin_output": "Critical"}
+        hosts_data = [{"id": "host2"}, {"id": "host1"}]
+        services = [
+            service_row("host1", "CPU", 0),
+            service_row("host1", "Memory", 1),
+            service_row("host2", "Disk", 2),
         ]
 
-        # Mock the checkmk client
-        streaming_service_service.checkmk.list_hosts = AsyncMock(
-            return_value={"value": hosts_data}
+        streaming_service_service.checkmk.list_hosts = AsyncMock(return_value=hosts_data)
+        streaming_service_service.checkmk.list_all_services_with_monitoring_data = (
+            AsyncMock(return_value=services)
         )
-        streaming_service_service.checkmk.list_host_services = AsyncMock()
-        streaming_service_service.checkmk.list_host_services.side_effect = [
-            {"value": services_host1},
-            {"value": services_host2},
-        ]
 
-        # Test streaming
         batches = []
         async for batch in streaming_service_service.list_all_services_streamed(
             batch_size=2
         ):
             batches.append(batch)
-            if not batch.has_more:
-                break
 
-        # Should have all 3 services in batches
-        total_services = sum(len(batch.items) for batch in batches)
-        assert total_services == 3
+        assert [len(batch.items) for batch in batches] == [2, 1]
+        assert [batch.has_more for batch in batches] == [True, False]
+        streaming_service_service.checkmk.list_host_services.assert_not_called()
+
+        # One query covers the whole host name range
+        fetch = streaming_service_service.checkmk.list_all_services_with_monitoring_data
+        fetch.assert_awaited_once_with(
+            query={
+                "op": "and",
+                "expr": [
+                    {"op": ">=", "left": "host_name", "right": "host1"},
+                    {"op": "<=", "left": "host_name", "right": "host2"},
+                ],
+            }
+        )
 
         # Check ServiceInfo objects were created
         first_batch = batches[0]
@@ -233,25 +289,22 @@ class TestStreamingServiceService:
         assert first_batch.items[0].host_name == "host1"
         assert first_batch.items[0].service_name == "CPU"
         assert first_batch.items[0].state == ServiceState.OK
+        assert batches[-1].metadata["hosts_processed"] == 2
 
     @pytest.mark.asyncio
     async def test_list_services_streamed_with_filter(self, streaming_service_service):
         """Test streaming services with state filter."""
-        # Mock data with different states
-        hosts_data = [{"id": "host1"}]
         services_data = [
-            {"description": "CPU", "state": 0, "plugin_output": "OK"},
-            {"description": "Memory", "state": 1, "plugin_output": "Warning"},
-            {"description": "Disk", "state": 2, "plugin_output": "Critical"},
+            service_row("host1", "CPU", 0),
+            service_row("host1", "Memory", 1),
+            service_row("host1", "Disk", 2),
         ]
 
-        # Mock the checkmk client
         streaming_service_service.checkmk.list_hosts = AsyncMock(
-            return_value={"value": hosts_data}
-        )
-        streaming_service_service.checkmk.list_host_services = AsyncMock(
-            return_value={"value": services_data}
+            return_value=[{"id": "host1"}]
         )
+        fetch = AsyncMock(return_value=services_data)
+        streaming_service_service.checkmk.list_all_services_with_monitoring_data = fetch
 
         # Test streaming with state filter (only non-OK states)
         batches = []
@@ -259,22 +312,125 @@ class TestStreamingServiceService:
             batch_size=10, state_filter=[ServiceState.WARNING, ServiceState.CRITICAL]
         ):
             batches.append(batch)
-            if not batch.has_more:
-                break
 
-        # Should only have 2 services (Warning and Critical)
-        total_services = sum(len(batch.items) for batch in batches)
-        assert total_services == 2
+        # The filter is pushed into the query and applied to the results
+        state_query = fetch.await_args.kwargs["query"]["expr"][2]
+        assert state_query == {
+            "op": "or",
+            "expr": [
+                {"op": "=", "left": "state", "right": 1},
+                {"op": "=", "left": "state", "right": 2},
+            ],
+        }
+
+        states = [service.state for batch in batches for service in batch.items]
+        assert states == [ServiceState.WARNING, ServiceState.CRITICAL]
+
+    @pytest.mark.asyncio
+    async def test_services_fetched_in_host_chunks(self, streaming_service_service):
+        """Test each chunk of hosts is fetched with one range query."""
+        hosts = [{"id": f"host{i}"} for i in range(5)]
+        streaming_service_service.checkmk.list_hosts = AsyncMock(return_value=hosts)
+
+        async def fetch(query):
+            low, high = query["expr"][0]["right"], query["expr"][1]["right"]
+            # Range queries can match hosts outside the chunk, e.g. unknown ones
+            rows = [service_row(h["id"], "CPU", 0) for h in hosts if low <= h["id"] <= high]
+            return rows + [service_row("host1-unmanaged", "CPU", 0)]
+
+        streaming_service_service.checkmk.list_all_services_with_monitoring_data = (
+            AsyncMock(side_effect=fetch)
+        )
+
+        services = []
+        async for batch in streaming_service_service.list_all_services_streamed(
+            batch_size=2, hosts_per_chunk=2, host_filter="HOST"
+        ):
+            services.extend(batch.items)
+
+        calls = streaming_service_service.checkmk.list_all_services_with_monitoring_data
+        assert calls.await_count == 3
+        assert [service.host_name for service in services] == [
+            f"host{i}" for i in range(5)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_early_close_cancels_prefetch(self, streaming_service_service):
+        """Test closing the stream cancels the prefetched chunk."""
+        hosts = [{"id": f"host{i}"} for i in range(4)]
+        streaming_service_service.checkmk.list_hosts = AsyncMock(return_value=hosts)
+        cancelled = asyncio.Event()
+
+        async def fetch(query):
+            if query["expr"][0]["right"] == "host0":
+                return [service_row("host0", "CPU", 0), service_row("host1", "CPU", 0)]
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        streaming_service_service.checkmk.list_all_services_with_monitoring_data = (
+            AsyncMock(side_effect=fetch)
+        )
+
+        stream = streaming_service_service.list_all_services_streamed(
+            batch_size=1, hosts_per_chunk=2
+        )
+        first = await stream.__anext__()
+        await stream.aclose()
+
+        assert first.items[0].host_name == "host0"
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+
+class TestNDJSONPager:
+    """Test paged reads of NDJSON stream resources."""
+
+    URI = "checkmk://stream/hosts"
+
+    @staticmethod
+    def open_stream(batches, pulled):
+        async def chunks():
+            for number in range(batches):
+                pulled.append(number)
+                yield "".join(
+                    json.dumps({"n": number * 2 + i}) + "\n" for i in range(2)
+                )
+
+        return chunks
+
+    @pytest.mark.asyncio
+    async def test_pages_follow_cursor(self):
+        pager = NDJSONPager(page_lines=4)
+        pulled = []
+        opener = self.open_stream(5, pulled)
+
+        first = [json.loads(line) for line in (await pager.read(self.URI, opener)).splitlines()]
+        assert [line["n"] for line in first[:-1]] == [0, 1, 2, 3]
+        # Only the page plus one look-ahead batch is read
+        assert pulled == [0, 1, 2]
+        cursor = first[-1]["next_cursor"]
+        assert first[-1]["next_uri"] == f"{self.URI}?cursor={cursor}"
+
+        second = [json.loads(line) for line in (await pager.read(self.URI, opener, cursor)).splitlines()]
+        assert [line["n"] for line in second[:-1]] == [4, 5, 6, 7]
+
+        last = await pager.read(self.URI, opener, second[-1]["next_cursor"])
+        assert [json.loads(line)["n"] for line in last.splitlines()] == [8, 9]
+        assert pulled == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_cursor_single_use_and_bound_to_uri(self):
+        pager = NDJSONPager(page_lines=2)
+        opener = self.open_stream(3, [])
 
-        # Check filtered services
-        all_services = []
-        for batch in batches:
-            all_services.extend(batch.items)
+        cursor = json.loads((await pager.read(self.URI, opener)).splitlines()[-1])["next_cursor"]
+        other = await pager.read("checkmk://stream/services", opener, cursor)
+        assert "error" in json.loads(other)
 
-        states = [service.state for service in all_services]
-        assert ServiceState.OK not in states
-        assert ServiceState.WARNING in states
-        assert ServiceState.CRITICAL in states
+        await pager.read(self.URI, opener, cursor)
+        assert "error" in json.loads(await pager.read(self.URI, opener, cursor))
 
 
 @pytest.mark.asyncio
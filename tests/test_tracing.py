@@ -0,0 +1,186 @@
+"""Tests for request tracing spans."""
+
+import asyncio
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from checkmk_mcp_server.async_api_client import AsyncCheckmkClient
+from checkmk_mcp_server.mcp_server.handlers.registry import ToolRegistry
+from checkmk_mcp_server.middleware.request_tracking import track_request
+from checkmk_mcp_server.utils.request_context import set_request_id
+from checkmk_mcp_server.utils.tracing import (
+    Span,
+    SpanRecorder,
+    get_current_span,
+    get_span_recorder,
+    span,
+    to_chrome_trace,
+    to_otlp_json,
+    traced,
+)
+
+
+@pytest.fixture
+def recorder():
+    recorder = get_span_recorder()
+    recorder.clear()
+    recorder.configure(enabled=True)
+    yield recorder
+    recorder.configure(enabled=True)
+    recorder.clear()
+
+
+class TestSpans:
+    """Test span recording."""
+
+    def test_nested_spans_share_trace(self, recorder):
+        set_request_id("req_aaaaaa")
+        with span("outer", hosts=2) as outer:
+            with span("inner") as inner:
+                inner.set_attribute("rows", 5)
+
+        inner_span, outer_span = recorder.get_spans()
+        assert outer_span is outer
+        assert outer_span.name == "outer"
+        assert inner_span.parent_id == outer_span.span_id
+        assert inner_span.trace_id == outer_span.trace_id
+        assert inner_span.attributes == {"rows": 5}
+        assert outer_span.request_id == "req_aaaaaa"
+        assert outer_span.duration >= inner_span.duration
+        assert get_current_span() is None
+
+    def test_errors_are_recorded(self, recorder):
+        with pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+
+        assert recorder.get_spans()[0].error == "ValueError: boom"
+
+    def test_disabled_recorder_is_noop(self, recorder):
+        recorder.configure(enabled=False)
+        with span("ignored") as current:
+            current.set_attribute("key", "value")
+
+        assert recorder.get_spans() == []
+
+    def test_ring_buffer_drops_oldest(self):
+        recorder = SpanRecorder(capacity=2)
+        for name in ("a", "b", "c"):
+            finished = Span(name)
+            finished.finish()
+            recorder.record(finished)
+
+        assert [s.name for s in recorder.get_spans()] == ["b", "c"]
+        assert recorder.get_stats()["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_traced_decorator_and_fan_out(self, recorder):
+        @traced("fetch")
+        async def fetch(index):
+            await asyncio.sleep(0.01)
+            return index
+
+        @track_request(operation_name="dashboard")
+        async def dashboard():
+            return await asyncio.gather(*(fetch(i) for i in range(3)))
+
+        assert await dashboard() == [0, 1, 2]
+
+        spans = recorder.get_spans()
+        root = [s for s in spans if s.name == "dashboard"][0]
+        children = [s for s in spans if s.name == "fetch"]
+        assert len(children) == 3
+        assert all(child.parent_id == root.span_id for child in children)
+        assert recorder.get_spans(request_id=root.request_id + ".001") == spans
+
+
+class TestIntegration:
+    """Test spans recorded by tool calls and the API client."""
+
+    @pytest.mark.asyncio
+    async def test_tool_call_parents_executor_spans(self, recorder):
+        sync_client = Mock()
+
+        def get_version():
+            with span("checkmk_api.request", kind="client"):
+                return {"versions": {}}
+
+        sync_client.get_version_info = get_version
+        client = AsyncCheckmkClient(sync_client)
+        registry = ToolRegistry()
+
+        async def handler():
+            return {"success": True, "data": await client.get_version_info()}
+
+        registry.register_tool("get_system_info", Mock(), handler)
+        result = await registry.execute_tool_call("get_system_info", {}, lambda: True)
+
+        spans = recorder.get_spans(request_id=result["meta"]["request_id"])
+        assert [s.name for s in spans] == ["checkmk_api.request", "mcp.tool_call"]
+        assert spans[0].parent_id == spans[1].span_id
+        assert spans[1].attributes["status"] == "ok"
+
+
+class TestExport:
+    """Test trace file formats."""
+
+    def make_spans(self, recorder):
+        set_request_id("req_bbbbbb")
+        with span("tool", kind="server"):
+            with span("first", kind="client", status="200"):
+                pass
+            with span("second"):
+                pass
+        return recorder.get_spans()
+
+    def test_chrome_trace(self, recorder):
+        document = to_chrome_trace(self.make_spans(recorder))
+
+        events = document["traceEvents"]
+        assert events[0]["ph"] == "M"
+        assert events[0]["args"]["name"] == "req_bbbbbb tool"
+        complete = [e for e in events if e["ph"] == "X"]
+        assert {e["name"] for e in complete} == {"tool", "first", "second"}
+        assert all(e["dur"] >= 0 for e in complete)
+
+    def test_otlp_json(self, recorder):
+        document = to_otlp_json(self.make_spans(recorder))
+
+        spans = document["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        by_name = {s["name"]: s for s in spans}
+        assert len(by_name["tool"]["traceId"]) == 32
+        assert by_name["first"]["parentSpanId"] == by_name["tool"]["spanId"]
+        assert by_name["first"]["kind"] == 3
+        assert {"key": "status", "value": {"stringValue": "200"}} in by_name["first"][
+            "attributes"
+        ]
+        assert "parentSpanId" not in by_name["tool"]
+
+    def test_export_writes_file(self, recorder, tmp_path):
+        self.make_spans(recorder)
+
+        result = recorder.export(tmp_path / "trace.json", format="otlp")
+
+        assert result["span_count"] == 3
+        with open(result["path"]) as f:
+            assert "resourceSpans" in json.load(f)
+
+    def test_export_filename_stays_in_export_dir(self, recorder, tmp_path):
+        self.make_spans(recorder)
+        export_dir = recorder.export_dir
+        recorder.configure(export_dir=str(tmp_path))
+        try:
+            result = recorder.export(filename="slow.json")
+
+            assert result["path"] == str(tmp_path / "slow.json")
+            for name in ("../escape.json", "/tmp/abs.json", "sub/x.json", "..", ""):
+                with pytest.raises(ValueError):
+                    recorder.export(filename=name)
+        finally:
+            recorder.configure(export_dir=export_dir)
+
+    def test_export_rejects_unknown_format(self, recorder, tmp_path):
+        with pytest.raises(ValueError):
+            recorder.export(tmp_path / "trace.json", format="zipkin")